@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AcademicsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.academics'
+
+    def ready(self):
+        from apps.academics import rollups
+        rollups.connect_signals()
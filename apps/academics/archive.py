@@ -0,0 +1,297 @@
+# apps/academics/archive.py
+"""
+Compact attendance archive for closed academic years.
+
+An ArchivedAttendanceMonth row replaces the Attendance rows of one student
+for one month, class and section. codes holds one character per (day,
+session) slot, at (day - 1) * 3 + session index, with '.' where there is
+no row. Status counts are stored alongside and non-empty remarks are kept
+by slot. The audit columns, signature and marked_by of the original rows
+are not kept.
+
+Percentage queries (apps.academics.rollups) count codes in SQL; streaks
+are computed from the decoded timeline. archive_year() moves a closed
+year's live rows into the archive and verifies row-level equivalence
+before deleting them.
+"""
+import calendar
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Length, Replace, Substr
+from django.utils import timezone
+
+from apps.academics.rollups import STATUS_FIELDS, month_start
+
+SESSIONS = ('MORNING', 'AFTERNOON', 'FULL_DAY')
+SLOTS_PER_DAY = len(SESSIONS)
+EMPTY = '.'
+STATUS_CODES = {
+    'PRESENT': 'P',
+    'ABSENT': 'A',
+    'LATE': 'L',
+    'HALF_DAY': 'D',
+    'HOLIDAY': 'H',
+    'LEAVE': 'V',
+}
+CODE_STATUSES = {code: status for status, code in STATUS_CODES.items()}
+
+# Attendance columns the archive reproduces, in the order rows are compared
+ROW_FIELDS = ('student_id', 'date', 'session', 'status', 'class_name_id', 'section_id', 'remarks')
+
+# Statuses counted as attending for streaks
+ATTENDED = frozenset({'PRESENT', 'LATE', 'HALF_DAY'})
+
+
+class ArchiveVerificationError(Exception):
+    """
+    Raised when archived attendance does not reproduce the original rows
+    """
+
+
+def slot_index(day, session):
+    return (day.day - 1) * SLOTS_PER_DAY + SESSIONS.index(session)
+
+
+def empty_codes(month):
+    return EMPTY * (calendar.monthrange(month.year, month.month)[1] * SLOTS_PER_DAY)
+
+
+def decode(archive):
+    """
+    Rows of an archived month as ROW_FIELDS tuples, in slot order
+    """
+    for index, code in enumerate(archive.codes):
+        if code == EMPTY:
+            continue
+        day, session = divmod(index, SLOTS_PER_DAY)
+        yield (
+            archive.student_id,
+            archive.month + timedelta(days=day),
+            SESSIONS[session],
+            CODE_STATUSES[code],
+            archive.class_name_id,
+            archive.section_id,
+            archive.remarks.get(str(index), ''),
+        )
+
+
+def code_counts(codes):
+    """
+    Rollup counters of a codes string
+    """
+    counts = Counter(codes)
+    values = {field: counts[STATUS_CODES[status]] for status, field in STATUS_FIELDS.items()}
+    values['total'] = len(codes) - counts[EMPTY]
+    return values
+
+
+def archived_slot_counts(students, piece_start, piece_end):
+    """
+    (student_id, present, absent, total) per archived row for the days
+    piece_start..piece_end of one month, counted in SQL
+    """
+    from apps.academics.models import ArchivedAttendanceMonth
+
+    window = Substr(
+        'codes',
+        (piece_start.day - 1) * SLOTS_PER_DAY + 1,
+        (piece_end.day - piece_start.day + 1) * SLOTS_PER_DAY,
+    )
+
+    def occurrences(code):
+        return Length(window) - Length(Replace(window, Value(code), Value('')))
+
+    return (
+        ArchivedAttendanceMonth.objects.filter(student__in=students, month=month_start(piece_start))
+        .order_by()
+        .annotate(
+            archived_present=occurrences(STATUS_CODES['PRESENT']),
+            archived_absent=occurrences(STATUS_CODES['ABSENT']),
+            archived_total=Length(window) - occurrences(EMPTY),
+        )
+        .values_list('student_id', 'archived_present', 'archived_absent', 'archived_total')
+    )
+
+
+# ==================== TIMELINE AND STREAKS ====================
+
+def attendance_timeline(student, start=None, end=None):
+    """
+    (date, session, status) of a student's live and archived attendance
+    between start and end inclusive, in date order
+    """
+    from apps.academics.models import Attendance, ArchivedAttendanceMonth
+
+    rows = Attendance._base_manager.filter(student=student, is_active=True)
+    archived = ArchivedAttendanceMonth.objects.filter(student=student)
+    if start is not None:
+        rows = rows.filter(date__gte=start)
+        archived = archived.filter(month__gte=month_start(start))
+    if end is not None:
+        rows = rows.filter(date__lte=end)
+        archived = archived.filter(month__lte=end)
+
+    timeline = list(rows.values_list('date', 'session', 'status'))
+    for archive in archived:
+        for _, day, session, status, _, _, _ in decode(archive):
+            if (start is None or day >= start) and (end is None or day <= end):
+                timeline.append((day, session, status))
+    timeline.sort(key=lambda row: (row[0], SESSIONS.index(row[1])))
+    return timeline
+
+
+def absence_streaks(student, start=None, end=None, min_days=1):
+    """
+    Runs of consecutive absent school days, as (first day, last day, days).
+
+    A day is absent when it has an ABSENT mark and no attended mark.
+    Holidays, leave and days without marks neither extend nor break a run.
+    """
+    days = defaultdict(set)
+    for day, _, status in attendance_timeline(student, start, end):
+        days[day].add(status)
+
+    streaks = []
+    run = None
+    for day in sorted(days):
+        statuses = days[day]
+        if statuses & ATTENDED:
+            absent = False
+        elif 'ABSENT' in statuses:
+            absent = True
+        else:
+            continue
+        if absent:
+            run = [run[0], day, run[2] + 1] if run else [day, day, 1]
+        elif run:
+            streaks.append(tuple(run))
+            run = None
+    if run:
+        streaks.append(tuple(run))
+    return [streak for streak in streaks if streak[2] >= min_days]
+
+
+def longest_absence_streak(student, start=None, end=None):
+    """
+    Longest run from absence_streaks(), or None
+    """
+    return max(absence_streaks(student, start, end), key=lambda streak: streak[2], default=None)
+
+
+# ==================== ARCHIVING ====================
+
+def closed_years():
+    """
+    Academic years that have ended and are not current
+    """
+    from apps.academics.models import AcademicYear
+
+    return AcademicYear.objects.filter(is_current=False, end_date__lt=timezone.now().date())
+
+
+def _raw_rows(year, student_ids=None):
+    from apps.academics.models import Attendance
+
+    rows = Attendance._base_manager.filter(
+        is_active=True,
+        date__gte=year.start_date,
+        date__lte=year.end_date,
+    )
+    if student_ids is not None:
+        rows = rows.filter(student_id__in=student_ids)
+    return rows
+
+
+def _archived_rows(year, student_ids):
+    from apps.academics.models import ArchivedAttendanceMonth
+
+    return {
+        row
+        for archive in ArchivedAttendanceMonth.objects.filter(academic_year=year, student_id__in=student_ids)
+        for row in decode(archive)
+    }
+
+
+def archive_year(year, batch_size=200, dry_run=False):
+    """
+    Move the live Attendance rows of a closed academic year into
+    ArchivedAttendanceMonth, batch_size students per transaction.
+
+    Each batch is merged with months already archived, re-read and compared
+    row by row with the original rows before those are deleted; a mismatch
+    raises ArchiveVerificationError and rolls the batch back. Soft-deleted
+    rows are left in place. With dry_run every batch is rolled back after
+    verification. Returns {'students', 'rows', 'months'} moved.
+    """
+    from apps.academics.models import ArchivedAttendanceMonth
+
+    if year.is_current or year.end_date >= timezone.now().date():
+        raise ValueError(f'Academic year {year.code} is not closed')
+
+    student_ids = sorted(_raw_rows(year).order_by().values_list('student_id', flat=True).distinct())
+    moved = {'students': 0, 'rows': 0, 'months': 0}
+
+    for offset in range(0, len(student_ids), batch_size):
+        batch = student_ids[offset:offset + batch_size]
+        with transaction.atomic():
+            raw = _raw_rows(year, batch)
+            rows = list(raw.values_list('pk', *ROW_FIELDS))
+            months = {
+                (archive.student_id, archive.month, archive.class_name_id, archive.section_id): archive
+                for archive in ArchivedAttendanceMonth.objects.filter(academic_year=year, student_id__in=batch)
+            }
+            before = {row for archive in months.values() for row in decode(archive)}
+            for _, student_id, day, session, status, class_name_id, section_id, remarks in rows:
+                month = month_start(day)
+                key = (student_id, month, class_name_id, section_id)
+                archive = months.get(key)
+                if archive is None:
+                    archive = months[key] = ArchivedAttendanceMonth(
+                        academic_year=year, student_id=student_id, month=month,
+                        class_name_id=class_name_id, section_id=section_id,
+                        codes=empty_codes(month), remarks={},
+                    )
+                index = slot_index(day, session)
+                code = STATUS_CODES[status]
+                if archive.codes[index] not in (EMPTY, code):
+                    raise ArchiveVerificationError(
+                        f'{student_id} {day} {session}: archived as '
+                        f'{CODE_STATUSES[archive.codes[index]]}, row says {status}'
+                    )
+                archive.codes = archive.codes[:index] + code + archive.codes[index + 1:]
+                if remarks:
+                    archive.remarks[str(index)] = remarks
+
+            for archive in months.values():
+                for field, value in code_counts(archive.codes).items():
+                    setattr(archive, field, value)
+            ArchivedAttendanceMonth.objects.bulk_create(
+                list(months.values()),
+                update_conflicts=True,
+                unique_fields=['academic_year', 'student', 'month', 'class_name', 'section'],
+                update_fields=['codes', 'remarks', 'updated_at', *STATUS_FIELDS.values(), 'total'],
+            )
+
+            expected = before | {row[1:] for row in rows}
+            after = _archived_rows(year, batch)
+            if after != expected:
+                missing = sorted(expected - after, key=str)[:5]
+                extra = sorted(after - expected, key=str)[:5]
+                raise ArchiveVerificationError(
+                    f'Archive of {year.code} does not match its rows: missing {missing}, unexpected {extra}'
+                )
+
+            if dry_run:
+                transaction.set_rollback(True)
+            else:
+                # The rows are already counted in the rollups, so the
+                # per-row delete signals are skipped
+                raw.filter(pk__in=[row[0] for row in rows])._raw_delete(raw.db)
+
+        moved['students'] += len(batch)
+        moved['rows'] += len(rows)
+        moved['months'] += len(months)
+    return moved
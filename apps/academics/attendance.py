@@ -0,0 +1,133 @@
+# apps/academics/attendance.py
+"""
+Bulk attendance marking.
+
+A teacher submits one payload per (section, date, session). The marks are
+checked against the section roll in one query and written with a single
+INSERT ... ON CONFLICT (student, date, session) DO UPDATE through
+bulk_upsert_secure, instead of a full_clean() and save() per student.
+The attendance rollups (apps.academics.rollups) are adjusted in the same
+transaction.
+"""
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from apps.academics import rollups
+from apps.academics.models import Attendance, Section
+
+STATUSES = frozenset(code for code, _ in Attendance.ATTENDANCE_STATUS)
+SESSIONS = frozenset(code for code, _ in Attendance._meta.get_field('session').choices)
+
+# Columns refreshed when a student is marked again for the same session.
+# Marking a soft-deleted row restores it, so the soft-delete columns are
+# reset from the new row's defaults.
+UPSERT_FIELDS = [
+    'status', 'remarks', 'class_name', 'section', 'marked_by', 'updated_by', 'updated_at',
+    'is_active', 'deleted_at', 'deleted_by', 'deletion_reason', 'deletion_category',
+]
+
+CREATED = 'created'
+UPDATED = 'updated'
+REJECTED = 'rejected'
+
+
+def mark_section_attendance(section, date, session, marks, user=None, tenant=None):
+    """
+    Record attendance for a whole section in one statement.
+
+    marks is an iterable of {'student': id, 'status': code, 'remarks': str}.
+    Marks that are not objects, for students outside the section roll,
+    with an unknown status or repeating a student are rejected
+    individually; the rest are written. Marking a soft-deleted row
+    restores it.
+    Returns a summary with one result per submitted mark, in order.
+    """
+    if session not in SESSIONS:
+        raise ValidationError({'session': f'Unknown session {session!r}'})
+    if not isinstance(section, Section):
+        section = Section.objects.filter(pk=section).only('pk', 'class_name_id').first()
+        if section is None:
+            raise ValidationError({'section': 'Section does not exist.'})
+
+    roll = {
+        str(pk): pk
+        for pk in section.students.filter(is_active=True).values_list('pk', flat=True)
+    }
+
+    results = []
+    objs = []
+    seen = set()
+    for mark in marks:
+        if not isinstance(mark, dict):
+            results.append({'student': None, 'status': None, 'result': REJECTED, 'error': 'Mark must be an object.'})
+            continue
+        student = str(mark.get('student', ''))
+        status = mark.get('status')
+        result = {'student': student, 'status': status}
+        results.append(result)
+        if student not in roll:
+            result.update(result=REJECTED, error='Student is not enrolled in this section.')
+        elif status not in STATUSES:
+            result.update(result=REJECTED, error=f'Unknown status {status!r}.')
+        elif student in seen:
+            result.update(result=REJECTED, error='Student is marked more than once.')
+        else:
+            seen.add(student)
+            obj = Attendance(
+                student_id=roll[student],
+                date=date,
+                session=session,
+                status=status,
+                remarks=mark.get('remarks') or '',
+                class_name_id=section.class_name_id,
+                section_id=section.pk,
+                marked_by=user,
+            )
+            objs.append(obj)
+            result['obj'] = obj
+
+    with transaction.atomic():
+        # Serialises submissions for this section and date, so the stored
+        # statuses read below stay current until the rollups are adjusted
+        rollups.lock_section_day(section.pk, date)
+        stored = {
+            # Soft-deleted rows are not counted in the rollups
+            student_id: (section_id, status if is_active else None)
+            for student_id, section_id, status, is_active in Attendance._base_manager.filter(
+                student_id__in=[obj.student_id for obj in objs], date=date, session=session
+            ).values_list('student_id', 'section_id', 'status', 'is_active')
+        }
+
+        # Rows that collide with stored ones are repointed at the stored
+        # primary key, so a changed pk means the row was updated
+        generated = {obj.pk for obj in objs}
+        Attendance.objects.bulk_upsert_secure(
+            objs,
+            unique_fields=['student', 'date', 'session'],
+            update_fields=UPSERT_FIELDS,
+            user=user,
+            tenant=tenant,
+        )
+
+        changes = []
+        for obj in objs:
+            old_section_id, old_status = stored.get(obj.student_id, (None, None))
+            changes.append((obj.student_id, old_section_id, old_status, section.pk, obj.status))
+        rollups.apply_changes(date, changes)
+
+    summary = {
+        'section': str(section.pk),
+        'date': date.isoformat(),
+        'session': session,
+        CREATED: 0,
+        UPDATED: 0,
+        REJECTED: 0,
+        'results': results,
+    }
+    for result in results:
+        obj = result.pop('obj', None)
+        if obj is not None:
+            result['result'] = CREATED if obj.pk in generated else UPDATED
+            result['id'] = str(obj.pk)
+        summary[result['result']] += 1
+    return summary
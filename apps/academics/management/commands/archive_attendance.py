@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import get_public_schema_name, schema_context
+
+from apps.academics.archive import ArchiveVerificationError, archive_year, closed_years
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = (
+        'Move attendance of closed academic years into the compact monthly archive, '
+        'verifying every batch row by row before the original rows are deleted'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant',
+            action='append',
+            dest='schemas',
+            help='Schema name of a tenant to archive (repeatable). Defaults to all tenants.'
+        )
+        parser.add_argument(
+            '--year',
+            action='append',
+            dest='years',
+            help='Code of a closed academic year to archive (repeatable). Defaults to all closed years.'
+        )
+        parser.add_argument('--batch-size', type=int, default=200, help='Students per transaction (default: 200)')
+        parser.add_argument('--dry-run', action='store_true', help='Verify the archive, then roll every batch back')
+
+    def handle(self, *args, **options):
+        tenants = Tenant.all_objects.exclude(schema_name=get_public_schema_name())
+        if options['schemas']:
+            tenants = tenants.filter(schema_name__in=options['schemas'])
+
+        for tenant in tenants:
+            with schema_context(tenant.schema_name):
+                years = closed_years().order_by('start_date')
+                if options['years']:
+                    years = years.filter(code__in=options['years'])
+                for year in years:
+                    try:
+                        moved = archive_year(year, batch_size=options['batch_size'], dry_run=options['dry_run'])
+                    except ArchiveVerificationError as exc:
+                        raise CommandError(f'{tenant.schema_name} {year.code}: {exc}')
+                    self.stdout.write(
+                        f"  {tenant.schema_name} {year.code}: students={moved['students']} "
+                        f"rows={moved['rows']} archived months={moved['months']}"
+                    )
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run: archives verified and rolled back'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Archived attendance of closed academic years'))
@@ -296,67 +296,34 @@ class Command(BaseCommand):
         # Core subjects for all classes
         core_subjects = ['ENG', 'MATH', 'HIN']
         
+        subjects_by_code = {subject.code: subject for subject in Subject.objects.all()}
+        teachers = list(User.objects.filter(role='teacher'))
+        
         for school_class in classes:
-            # Get teachers
-            teachers = list(User.objects.filter(role='teacher'))
+            assignments = [(code, True, (5, 7)) for code in core_subjects]
             
-            # Assign core subjects
-            for subject_code in core_subjects:
-                subject = Subject.objects.get(code=subject_code)
-                teacher = random.choice(teachers) if teachers else None
-                
-                class_subject, created = ClassSubject.objects.get_or_create(
-                    class_name=school_class,
-                    subject=subject,
-                    academic_year=academic_year,
-                    defaults={
-                        'is_compulsory': True,
-                        'periods_per_week': random.randint(5, 7),
-                        'teacher': teacher,
-                    }
-                )
-                class_subjects.append(class_subject)
-            
-            # Add level-specific subjects
+            # Add level-specific subjects (Science and Social Studies)
             if school_class.level in ['PRIMARY', 'MIDDLE']:
-                # Add Science and Social Studies
-                for subject_code in ['SCI', 'SST']:
-                    subject = Subject.objects.get(code=subject_code)
-                    teacher = random.choice(teachers) if teachers else None
-                    
-                    class_subject, created = ClassSubject.objects.get_or_create(
-                        class_name=school_class,
-                        subject=subject,
-                        academic_year=academic_year,
-                        defaults={
-                            'is_compulsory': True,
-                            'periods_per_week': random.randint(4, 6),
-                            'teacher': teacher,
-                        }
-                    )
-                    class_subjects.append(class_subject)
+                assignments += [(code, True, (4, 6)) for code in ['SCI', 'SST']]
             
             # Add co-curricular
-            for subject_code in ['CS', 'PE']:
-                try:
-                    subject = Subject.objects.get(code=subject_code)
-                    teacher = random.choice(teachers) if teachers else None
-                    
-                    class_subject, created = ClassSubject.objects.get_or_create(
-                        class_name=school_class,
-                        subject=subject,
-                        academic_year=academic_year,
-                        defaults={
-                            'is_compulsory': False,
-                            'periods_per_week': random.randint(2, 3),
-                            'teacher': teacher,
-                        }
-                    )
-                    class_subjects.append(class_subject)
-                except Subject.DoesNotExist:
-                    pass
-                    
-        return class_subjects
+            assignments += [(code, False, (2, 3)) for code in ['CS', 'PE']]
+            
+            for subject_code, is_compulsory, periods in assignments:
+                subject = subjects_by_code.get(subject_code)
+                if subject is None:
+                    continue
+                class_subjects.append(ClassSubject(
+                    class_name=school_class,
+                    subject=subject,
+                    academic_year=academic_year,
+                    is_compulsory=is_compulsory,
+                    periods_per_week=random.randint(*periods),
+                    teacher=random.choice(teachers) if teachers else None,
+                ))
+        
+        # Existing assignments are kept as they are, like get_or_create
+        return ClassSubject.objects.bulk_upsert_secure(class_subjects, update_fields=[])
 
     def create_timetables(self, sections, class_subjects, academic_year):
         """Create timetable entries"""
@@ -383,7 +350,7 @@ class Command(BaseCommand):
             subjects_for_class = list(ClassSubject.objects.filter(
                 class_name=section.class_name,
                 academic_year=academic_year
-            ))
+            ).select_related('subject'))
             
             if not subjects_for_class:
                 continue
@@ -397,26 +364,21 @@ class Command(BaseCommand):
                     # Pick a random subject
                     class_subject = random.choice(subjects_for_class)
                     
-                    try:
-                        timetable, created = TimeTable.objects.get_or_create(
-                            class_name=section.class_name,
-                            section=section,
-                            day=day,
-                            period_number=period_num,
-                            academic_year=academic_year,
-                            defaults={
-                                'start_time': start_time,
-                                'end_time': end_time,
-                                'subject': class_subject,
-                                'teacher': class_subject.teacher,
-                                'room': section.room_number,
-                                'period_type': 'PRACTICAL' if class_subject.subject.has_practical and random.random() < 0.3 else 'LECTURE',
-                            }
-                        )
-                        if created:
-                            timetables.append(timetable)
-                    except Exception as e:
-                        # Skip if there's a conflict
-                        continue
+                    timetables.append(TimeTable(
+                        class_name=section.class_name,
+                        section=section,
+                        day=day,
+                        period_number=period_num,
+                        academic_year=academic_year,
+                        start_time=start_time,
+                        end_time=end_time,
+                        subject=class_subject,
+                        teacher=class_subject.teacher,
+                        room=section.room_number,
+                        period_type='PRACTICAL' if class_subject.subject.has_practical and random.random() < 0.3 else 'LECTURE',
+                    ))
+        
+        # Existing periods are kept as they are, like get_or_create
+        timetables = TimeTable.objects.bulk_upsert_secure(timetables, update_fields=[])
                         
         return timetables
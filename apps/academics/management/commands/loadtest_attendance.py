@@ -0,0 +1,137 @@
+"""
+Load test for bulk attendance marking: every section of a tenant submits
+its morning roll at the same moment, each from its own thread and database
+connection, as teachers do in the first minutes of the school day.
+"""
+import json
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django_tenants.utils import schema_context
+
+from apps.academics.attendance import SESSIONS, mark_section_attendance
+from apps.core.utils.tenant import call_in_tenant
+from apps.tenants.models import Tenant
+
+# Status mix of a typical school day
+STATUS_WEIGHTS = (('PRESENT', 88), ('ABSENT', 6), ('LATE', 3), ('LEAVE', 2), ('HALF_DAY', 1))
+
+
+class Command(BaseCommand):
+    help = (
+        'Submit bulk attendance for every section of a tenant concurrently and report '
+        'per-section latency, queries and throughput. Writes are rolled back unless --commit.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('tenant', help='Schema name of the tenant to load')
+        parser.add_argument('--date', type=date.fromisoformat, default=None,
+                            help='Attendance date, YYYY-MM-DD (default: today)')
+        parser.add_argument('--session', default='FULL_DAY', choices=sorted(SESSIONS))
+        parser.add_argument('--concurrency', type=int, default=0,
+                            help='Sections submitting at once (default: all of them)')
+        parser.add_argument('--rounds', type=int, default=1,
+                            help='Submit every section this many times; with --commit later rounds hit the update path')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for the status mix')
+        parser.add_argument('--commit', action='store_true', help='Keep the written attendance rows')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        tenant = Tenant.objects.filter(schema_name=options['tenant']).first()
+        if tenant is None:
+            raise CommandError(f"Tenant {options['tenant']} does not exist")
+
+        marked_on = options['date'] or date.today()
+        session = options['session']
+        rng = random.Random(options['seed'])
+        statuses, weights = zip(*STATUS_WEIGHTS)
+
+        with schema_context(tenant.schema_name):
+            from apps.students.models import Student
+            from apps.users.models import User
+
+            rolls = {}
+            for section_id, student_id in Student.objects.filter(
+                section__is_active=True, is_active=True
+            ).values_list('section_id', 'pk'):
+                rolls.setdefault(section_id, []).append(student_id)
+            user = User._base_manager.filter(tenant=tenant, is_superuser=True).first()
+        if not rolls:
+            raise CommandError(f'Tenant {tenant.schema_name} has no students assigned to sections')
+
+        payloads = [
+            (section_id, [
+                {'student': str(student_id), 'status': rng.choices(statuses, weights)[0]}
+                for student_id in students
+            ])
+            for section_id, students in rolls.items()
+        ]
+        workers = min(options['concurrency'] or len(payloads), len(payloads))
+
+        def submit(section_id, marks, barrier):
+            if barrier is not None:
+                barrier.wait()
+            started = time.perf_counter()
+            try:
+                with CaptureQueriesContext(connection) as queries, transaction.atomic():
+                    summary = call_in_tenant(
+                        tenant, mark_section_attendance, section_id, marked_on, session, marks,
+                        user=user, tenant=tenant,
+                    )
+                    if not options['commit']:
+                        transaction.set_rollback(True)
+            finally:
+                elapsed = (time.perf_counter() - started) * 1000
+                connection.close()
+            return elapsed, len(queries), summary
+
+        rounds = []
+        for round_number in range(1, options['rounds'] + 1):
+            # Release every section at once; with a lower --concurrency the
+            # sections queue on the pool instead
+            barrier = threading.Barrier(workers) if workers == len(payloads) else None
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(lambda payload: submit(*payload, barrier), payloads))
+            wall = time.perf_counter() - started
+
+            timings = [elapsed for elapsed, _, _ in outcomes]
+            marks = sum(len(summary['results']) for _, _, summary in outcomes)
+            rounds.append({
+                'round': round_number,
+                'sections': len(outcomes),
+                'marks': marks,
+                'created': sum(summary['created'] for _, _, summary in outcomes),
+                'updated': sum(summary['updated'] for _, _, summary in outcomes),
+                'rejected': sum(summary['rejected'] for _, _, summary in outcomes),
+                'queries_per_section': max(count for _, count, _ in outcomes),
+                'wall_s': round(wall, 3),
+                'marks_per_s': round(marks / wall, 1) if wall else None,
+                'p50_ms': round(statistics.median(timings), 2),
+                'p95_ms': round(statistics.quantiles(timings, n=20)[-1], 2) if len(timings) > 1 else round(timings[0], 2),
+                'max_ms': round(max(timings), 2),
+            })
+
+        if options['json']:
+            self.stdout.write(json.dumps(rounds, indent=2))
+            return
+
+        self.stdout.write(
+            f"{'round':>5} {'sections':>8} {'marks':>7} {'created':>8} {'updated':>8} {'rejected':>8} "
+            f"{'queries':>7} {'wall s':>8} {'marks/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"
+        )
+        for row in rounds:
+            self.stdout.write(
+                f"{row['round']:>5} {row['sections']:>8} {row['marks']:>7} {row['created']:>8} "
+                f"{row['updated']:>8} {row['rejected']:>8} {row['queries_per_section']:>7} "
+                f"{row['wall_s']:>8} {row['marks_per_s']:>9} {row['p50_ms']:>9} {row['p95_ms']:>9} {row['max_ms']:>9}"
+            )
+        if not options['commit']:
+            self.stdout.write(self.style.WARNING('Writes were rolled back; pass --commit to keep them'))
@@ -0,0 +1,34 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django_tenants.utils import get_public_schema_name, schema_context
+
+from apps.academics.rollups import rebuild_rollups
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Recompute student monthly and section daily attendance rollups from raw attendance rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant',
+            action='append',
+            dest='schemas',
+            help='Schema name of a tenant to rebuild (repeatable). Defaults to all tenants.'
+        )
+        parser.add_argument('--start', type=date.fromisoformat, help='First month to rebuild, YYYY-MM-DD')
+        parser.add_argument('--end', type=date.fromisoformat, help='Last month to rebuild, YYYY-MM-DD')
+
+    def handle(self, *args, **options):
+        tenants = Tenant.all_objects.exclude(schema_name=get_public_schema_name())
+        if options['schemas']:
+            tenants = tenants.filter(schema_name__in=options['schemas'])
+
+        rebuilt = 0
+        for tenant in tenants:
+            with schema_context(tenant.schema_name):
+                months, days = rebuild_rollups(start=options['start'], end=options['end'])
+            self.stdout.write(f'  {tenant.schema_name}: student months={months} section days={days}')
+            rebuilt += 1
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt attendance rollups for {rebuilt} tenant(s)'))
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.7 on 2026-10-16 21:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('academics', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SectionAttendanceDay',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True, verbose_name='Universal ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Creation Timestamp')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='Last Modification Timestamp')),
+                ('present', models.PositiveIntegerField(default=0, verbose_name='Present')),
+                ('absent', models.PositiveIntegerField(default=0, verbose_name='Absent')),
+                ('late', models.PositiveIntegerField(default=0, verbose_name='Late')),
+                ('half_day', models.PositiveIntegerField(default=0, verbose_name='Half Day')),
+                ('holiday', models.PositiveIntegerField(default=0, verbose_name='Holiday')),
+                ('leave', models.PositiveIntegerField(default=0, verbose_name='On Leave')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Total')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_days', to='academics.section', verbose_name='Section')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_created', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_updated', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+            ],
+            options={
+                'verbose_name': 'Section Daily Attendance',
+                'verbose_name_plural': 'Section Daily Attendance',
+                'db_table': 'academics_attendance_section_day',
+                'ordering': ['section', 'date'],
+                'unique_together': {('section', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentAttendanceMonth',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True, verbose_name='Universal ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Creation Timestamp')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='Last Modification Timestamp')),
+                ('present', models.PositiveIntegerField(default=0, verbose_name='Present')),
+                ('absent', models.PositiveIntegerField(default=0, verbose_name='Absent')),
+                ('late', models.PositiveIntegerField(default=0, verbose_name='Late')),
+                ('half_day', models.PositiveIntegerField(default=0, verbose_name='Half Day')),
+                ('holiday', models.PositiveIntegerField(default=0, verbose_name='Holiday')),
+                ('leave', models.PositiveIntegerField(default=0, verbose_name='On Leave')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Total')),
+                ('month', models.DateField(help_text='First day of the month', verbose_name='Month')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_months', to='students.student', verbose_name='Student')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_created', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_updated', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+            ],
+            options={
+                'verbose_name': 'Student Monthly Attendance',
+                'verbose_name_plural': 'Student Monthly Attendance',
+                'db_table': 'academics_attendance_student_month',
+                'ordering': ['student', 'month'],
+                'unique_together': {('student', 'month')},
+            },
+        ),
+    ]
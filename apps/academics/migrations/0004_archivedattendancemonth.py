@@ -0,0 +1,50 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('academics', '0003_attendance_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedAttendanceMonth',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True, verbose_name='Universal ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Creation Timestamp')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='Last Modification Timestamp')),
+                ('present', models.PositiveIntegerField(default=0, verbose_name='Present')),
+                ('absent', models.PositiveIntegerField(default=0, verbose_name='Absent')),
+                ('late', models.PositiveIntegerField(default=0, verbose_name='Late')),
+                ('half_day', models.PositiveIntegerField(default=0, verbose_name='Half Day')),
+                ('holiday', models.PositiveIntegerField(default=0, verbose_name='Holiday')),
+                ('leave', models.PositiveIntegerField(default=0, verbose_name='On Leave')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Total')),
+                ('month', models.DateField(help_text='First day of the month', verbose_name='Month')),
+                ('codes', models.CharField(max_length=93, verbose_name='Status Codes')),
+                ('remarks', models.JSONField(blank=True, default=dict, verbose_name='Remarks by Slot')),
+                ('academic_year', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_attendance', to='academics.academicyear', verbose_name='Academic Year')),
+                ('class_name', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_attendance', to='academics.schoolclass', verbose_name='Class')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_created', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_attendance', to='academics.section', verbose_name='Section')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_attendance', to='students.student', verbose_name='Student')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_updated', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+            ],
+            options={
+                'verbose_name': 'Archived Attendance',
+                'verbose_name_plural': 'Archived Attendance',
+                'db_table': 'academics_attendance_archive',
+                'ordering': ['student', 'month'],
+                'indexes': [models.Index(fields=['student', 'month'], name='academics_a_student_89c274_idx'), models.Index(fields=['section', 'month'], name='academics_a_section_7d8fb6_idx')],
+                'unique_together': {('academic_year', 'student', 'month', 'class_name', 'section')},
+            },
+        ),
+    ]
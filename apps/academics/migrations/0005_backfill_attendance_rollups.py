@@ -0,0 +1,82 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:10
+
+from django.db import migrations
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
+
+
+# Frozen copy of apps.academics.rollups.STATUS_FIELDS as of this migration
+STATUS_FIELDS = {
+    'PRESENT': 'present',
+    'ABSENT': 'absent',
+    'LATE': 'late',
+    'HALF_DAY': 'half_day',
+    'HOLIDAY': 'holiday',
+    'LEAVE': 'leave',
+}
+COUNT_FIELDS = tuple(STATUS_FIELDS.values()) + ('total',)
+
+
+def _count_annotations():
+    counts = {
+        field: Count('pk', filter=Q(status=status))
+        for status, field in STATUS_FIELDS.items()
+    }
+    counts['total'] = Count('pk')
+    return counts
+
+
+def backfill_rollups(apps, schema_editor):
+    # Queries without a date range read the rollups only, so they must
+    # cover existing attendance before the code that relies on them runs.
+    # Historical models only: the live rebuild (rebuild_attendance_rollups)
+    # would name columns added by later migrations. Archived months need
+    # no backfill, their table was only created by 0004.
+    Attendance = apps.get_model('academics', 'Attendance')
+    StudentAttendanceMonth = apps.get_model('academics', 'StudentAttendanceMonth')
+    SectionAttendanceDay = apps.get_model('academics', 'SectionAttendanceDay')
+
+    rows = Attendance._base_manager.filter(is_active=True).order_by()
+
+    StudentAttendanceMonth._base_manager.bulk_create(
+        [
+            StudentAttendanceMonth(
+                student_id=row['student_id'],
+                month=row['rollup_month'],
+                **{field: row[field] for field in COUNT_FIELDS},
+            )
+            for row in rows.annotate(rollup_month=TruncMonth('date'))
+            .values('student_id', 'rollup_month')
+            .annotate(**_count_annotations())
+            .iterator()
+        ],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['student', 'month'],
+        update_fields=[*COUNT_FIELDS, 'updated_at'],
+    )
+    SectionAttendanceDay._base_manager.bulk_create(
+        [
+            SectionAttendanceDay(
+                section_id=row['section_id'],
+                date=row['date'],
+                **{field: row[field] for field in COUNT_FIELDS},
+            )
+            for row in rows.values('section_id', 'date').annotate(**_count_annotations()).iterator()
+        ],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['section', 'date'],
+        update_fields=[*COUNT_FIELDS, 'updated_at'],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0004_archivedattendancemonth'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
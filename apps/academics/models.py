@@ -5,7 +5,8 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from apps.core.models import BaseModel
+from apps.core.models import BaseModel, UUIDModel, TimeStampedModel
+from apps.core.utils.queries import query_budget
 
 
 class AcademicYear(BaseModel):
@@ -148,7 +149,11 @@ class SchoolClass(BaseModel):
         return self.name
 
     @property
+    @query_budget(1)
     def current_strength(self):
+        # List views annotate the count to avoid a query per row
+        if hasattr(self, 'active_students'):
+            return self.active_students
         return self.students.filter(is_active=True).count()
 
     @property
@@ -214,7 +219,11 @@ class Section(BaseModel):
         return f"{self.class_name.name} - {self.name}"
 
     @property
+    @query_budget(1)
     def current_strength(self):
+        # List views annotate the count to avoid a query per row
+        if hasattr(self, 'active_students'):
+            return self.active_students
         return self.students.filter(is_active=True).count()
 
     @property
@@ -596,6 +605,123 @@ class Attendance(BaseModel):
         return self.status in ["PRESENT", "LATE", "HALF_DAY"]
 
 
+class AttendanceRollup(UUIDModel, TimeStampedModel):
+    """
+    Attendance row counts by status, maintained incrementally by the bulk
+    marking path and attendance signals (see apps.academics.rollups) and
+    recomputed by rebuild_attendance_rollups
+    """
+    present = models.PositiveIntegerField(default=0, verbose_name=_("Present"))
+    absent = models.PositiveIntegerField(default=0, verbose_name=_("Absent"))
+    late = models.PositiveIntegerField(default=0, verbose_name=_("Late"))
+    half_day = models.PositiveIntegerField(default=0, verbose_name=_("Half Day"))
+    holiday = models.PositiveIntegerField(default=0, verbose_name=_("Holiday"))
+    leave = models.PositiveIntegerField(default=0, verbose_name=_("On Leave"))
+    total = models.PositiveIntegerField(default=0, verbose_name=_("Total"))
+
+    class Meta:
+        abstract = True
+
+    @property
+    def percentage(self):
+        return (self.present / self.total) * 100 if self.total else 0.0
+
+
+class StudentAttendanceMonth(AttendanceRollup):
+    """
+    Attendance counts of one student for one calendar month
+    """
+    student = models.ForeignKey(
+        "students.Student",
+        on_delete=models.CASCADE,
+        related_name="attendance_months",
+        verbose_name=_("Student")
+    )
+    month = models.DateField(verbose_name=_("Month"), help_text=_("First day of the month"))
+
+    class Meta:
+        db_table = "academics_attendance_student_month"
+        verbose_name = _("Student Monthly Attendance")
+        verbose_name_plural = _("Student Monthly Attendance")
+        unique_together = [['student', 'month']]
+        ordering = ["student", "month"]
+
+    def __str__(self):
+        return f"{self.student_id} - {self.month:%Y-%m}"
+
+
+class SectionAttendanceDay(AttendanceRollup):
+    """
+    Attendance counts of one section for one date, across sessions
+    """
+    section = models.ForeignKey(
+        Section,
+        on_delete=models.CASCADE,
+        related_name="attendance_days",
+        verbose_name=_("Section")
+    )
+    date = models.DateField(verbose_name=_("Date"))
+
+    class Meta:
+        db_table = "academics_attendance_section_day"
+        verbose_name = _("Section Daily Attendance")
+        verbose_name_plural = _("Section Daily Attendance")
+        unique_together = [['section', 'date']]
+        ordering = ["section", "date"]
+
+    def __str__(self):
+        return f"{self.section_id} - {self.date}"
+
+
+class ArchivedAttendanceMonth(AttendanceRollup):
+    """
+    Compact attendance of one student for one month of a closed academic
+    year, replacing its Attendance rows (see apps.academics.archive).
+    codes holds one status character per (day, session) slot.
+    """
+    academic_year = models.ForeignKey(
+        AcademicYear,
+        on_delete=models.CASCADE,
+        related_name="archived_attendance",
+        verbose_name=_("Academic Year")
+    )
+    student = models.ForeignKey(
+        "students.Student",
+        on_delete=models.CASCADE,
+        related_name="archived_attendance",
+        verbose_name=_("Student")
+    )
+    month = models.DateField(verbose_name=_("Month"), help_text=_("First day of the month"))
+    class_name = models.ForeignKey(
+        SchoolClass,
+        on_delete=models.CASCADE,
+        related_name="archived_attendance",
+        verbose_name=_("Class")
+    )
+    section = models.ForeignKey(
+        Section,
+        on_delete=models.CASCADE,
+        related_name="archived_attendance",
+        verbose_name=_("Section")
+    )
+    codes = models.CharField(max_length=93, verbose_name=_("Status Codes"))
+    remarks = models.JSONField(default=dict, blank=True, verbose_name=_("Remarks by Slot"))
+
+    class Meta:
+        db_table = "academics_attendance_archive"
+        verbose_name = _("Archived Attendance")
+        verbose_name_plural = _("Archived Attendance")
+        unique_together = [['academic_year', 'student', 'month', 'class_name', 'section']]
+        ordering = ["student", "month"]
+        indexes = [
+            models.Index(fields=['student', 'month']),
+            models.Index(fields=['section', 'month']),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} - {self.month:%Y-%m} (archived)"
+
+
 class Holiday(BaseModel):
     """
     School Holidays and Events
@@ -0,0 +1,477 @@
+# apps/academics/rollups.py
+"""
+Attendance rollups.
+
+StudentAttendanceMonth and SectionAttendanceDay hold attendance row counts
+by status, so percentages over any date range sum a few dozen rollup rows
+instead of counting raw Attendance rows. Only live (not soft-deleted)
+attendance rows are counted.
+
+The bulk marking path (apps.academics.attendance) applies F() deltas in
+the transaction that writes the marks. Single-row saves and deletes
+recompute the affected rollups from raw rows through signals.
+rebuild_rollups() recomputes everything in bulk from raw rows and the
+attendance archive (apps.academics.archive), as a safety net for changes
+that bypass both (queryset updates, raw SQL).
+"""
+import calendar
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.db.models import Count, F, IntegerField, Q, Sum, Value
+from django.db.models.functions import TruncMonth
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+# Attendance status -> rollup counter
+STATUS_FIELDS = {
+    'PRESENT': 'present',
+    'ABSENT': 'absent',
+    'LATE': 'late',
+    'HALF_DAY': 'half_day',
+    'HOLIDAY': 'holiday',
+    'LEAVE': 'leave',
+}
+COUNT_FIELDS = tuple(STATUS_FIELDS.values()) + ('total',)
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def month_end(day):
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def _count_annotations():
+    counts = {
+        field: Count('pk', filter=Q(status=status))
+        for status, field in STATUS_FIELDS.items()
+    }
+    counts['total'] = Count('pk')
+    return counts
+
+
+# ==================== INCREMENTAL MAINTENANCE ====================
+
+def lock_section_day(section_id, day):
+    """
+    Create the section's rollup row for day if needed and lock it. Marking
+    holds this lock, so concurrent submissions for one section and date
+    apply their deltas one after another.
+    """
+    from apps.academics.models import SectionAttendanceDay
+
+    SectionAttendanceDay.objects.bulk_create(
+        [SectionAttendanceDay(section_id=section_id, date=day)], ignore_conflicts=True
+    )
+    return SectionAttendanceDay.objects.select_for_update().get(section_id=section_id, date=day)
+
+
+def _delta(old_status, new_status):
+    delta = Counter()
+    if old_status is not None:
+        delta[STATUS_FIELDS[old_status]] -= 1
+        delta['total'] -= 1
+    if new_status is not None:
+        delta[STATUS_FIELDS[new_status]] += 1
+        delta['total'] += 1
+    return Counter({field: amount for field, amount in delta.items() if amount})
+
+
+def _increments(delta):
+    return {field: F(field) + amount for field, amount in delta.items()}
+
+
+def apply_changes(day, changes):
+    """
+    Apply attendance changes on one date to the rollups.
+
+    changes is an iterable of (student_id, old_section_id, old_status,
+    new_section_id, new_status); a status of None means no live row.
+    Students sharing a delta are updated together, so a typical section
+    costs a handful of UPDATEs.
+    """
+    from apps.academics.models import SectionAttendanceDay, StudentAttendanceMonth
+
+    month = month_start(day)
+    by_delta = defaultdict(list)
+    sections = defaultdict(Counter)
+    for student_id, old_section_id, old_status, new_section_id, new_status in changes:
+        if old_status == new_status and old_section_id == new_section_id:
+            continue
+        if old_status is not None:
+            sections[old_section_id].update(_delta(old_status, None))
+        if new_status is not None:
+            sections[new_section_id].update(_delta(None, new_status))
+        delta = _delta(old_status, new_status)
+        if delta:
+            by_delta[tuple(sorted(delta.items()))].append(student_id)
+
+    now = timezone.now()
+    if by_delta:
+        student_ids = {student_id for ids in by_delta.values() for student_id in ids}
+        StudentAttendanceMonth.objects.bulk_create(
+            [StudentAttendanceMonth(student_id=student_id, month=month) for student_id in student_ids],
+            ignore_conflicts=True,
+        )
+        for delta, ids in by_delta.items():
+            StudentAttendanceMonth.objects.filter(student_id__in=ids, month=month).update(
+                updated_at=now, **_increments(dict(delta))
+            )
+
+    sections = {
+        section_id: {field: amount for field, amount in delta.items() if amount}
+        for section_id, delta in sections.items()
+    }
+    sections = {section_id: delta for section_id, delta in sections.items() if delta}
+    if sections:
+        SectionAttendanceDay.objects.bulk_create(
+            [SectionAttendanceDay(section_id=section_id, date=day) for section_id in sections],
+            ignore_conflicts=True,
+        )
+        for section_id, delta in sections.items():
+            SectionAttendanceDay.objects.filter(section_id=section_id, date=day).update(
+                updated_at=now, **_increments(delta)
+            )
+
+
+def _lock_student_months(keys):
+    from apps.academics.models import StudentAttendanceMonth
+
+    StudentAttendanceMonth.objects.bulk_create(
+        [StudentAttendanceMonth(student_id=student_id, month=month) for student_id, month in keys],
+        ignore_conflicts=True,
+    )
+    locked = Q()
+    for student_id, month in keys:
+        locked |= Q(student_id=student_id, month=month)
+    list(StudentAttendanceMonth.objects.select_for_update().filter(locked).order_by('student_id', 'month'))
+
+
+def refresh_rollups(keys):
+    """
+    Recompute the rollups touched by (student_id, section_id, date) keys
+    from raw attendance rows.
+
+    The section days are locked first, as marking does, then the student
+    months, before raw rows are read: a concurrent bulk mark either
+    commits before the recount reads its rows or waits and applies its
+    deltas on top of the recount.
+    """
+    from django.db import transaction
+
+    keys = list(keys)
+    if not keys:
+        return
+    dates = [day for _, _, day in keys]
+    with transaction.atomic():
+        for section_id, day in sorted({(section_id, day) for _, section_id, day in keys if section_id}):
+            lock_section_day(section_id, day)
+        _lock_student_months(sorted({(student_id, month_start(day)) for student_id, _, day in keys}))
+        rebuild_rollups(
+            start=month_start(min(dates)),
+            end=month_end(max(dates)),
+            students={student_id for student_id, _, _ in keys},
+            sections={section_id for _, section_id, _ in keys},
+            days=set(dates),
+        )
+
+
+def _on_pre_save(sender, instance, raw=False, **kwargs):
+    # Remember the stored keys, the save may move the row to another
+    # student, section or date
+    if raw or instance._state.adding:
+        return
+    instance._rollup_keys = list(
+        sender._base_manager.filter(pk=instance.pk).values_list('student_id', 'section_id', 'date')
+    )
+
+
+def _on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    keys = getattr(instance, '_rollup_keys', [])
+    refresh_rollups(keys + [(instance.student_id, instance.section_id, instance.date)])
+
+
+def _on_delete(sender, instance, **kwargs):
+    refresh_rollups([(instance.student_id, instance.section_id, instance.date)])
+
+
+def connect_signals():
+    label = 'academics.Attendance'
+    pre_save.connect(_on_pre_save, sender=label, dispatch_uid='attendance_rollup_pre_save')
+    post_save.connect(_on_save, sender=label, dispatch_uid='attendance_rollup_save')
+    post_delete.connect(_on_delete, sender=label, dispatch_uid='attendance_rollup_delete')
+
+
+# ==================== REBUILD ====================
+
+def rebuild_rollups(start=None, end=None, students=None, sections=None, days=None, batch_size=1000):
+    """
+    Recompute rollups from raw and archived attendance, overwriting the
+    stored ones.
+
+    Student months are rebuilt for the months between start and end (whole
+    months, default: all) and, if given, only for students. Section days
+    are rebuilt for the same range and, if given, only for sections and
+    days. Returns (student month rows, section day rows) written.
+    """
+    from django.db import transaction
+    from apps.academics.archive import CODE_STATUSES, EMPTY, SLOTS_PER_DAY
+    from apps.academics.models import (
+        ArchivedAttendanceMonth, Attendance, SectionAttendanceDay, StudentAttendanceMonth
+    )
+
+    if start is not None:
+        start = month_start(start)
+    if end is not None:
+        end = month_end(end)
+
+    def scoped(queryset, field):
+        if start is not None:
+            queryset = queryset.filter(**{f'{field}__gte': start})
+        if end is not None:
+            queryset = queryset.filter(**{f'{field}__lte': end})
+        return queryset
+
+    # Schema-wide: rebuilds run per tenant schema, without a current tenant
+    rows = scoped(Attendance._base_manager.filter(is_active=True).order_by(), 'date')
+
+    archived = scoped(ArchivedAttendanceMonth.objects.order_by(), 'month')
+
+    month_totals = defaultdict(Counter)
+    student_rows = rows
+    student_archive = archived
+    stored_months = scoped(StudentAttendanceMonth.objects.all(), 'month')
+    if students is not None:
+        student_rows = student_rows.filter(student_id__in=students)
+        student_archive = student_archive.filter(student_id__in=students)
+        stored_months = stored_months.filter(student_id__in=students)
+    for row in (
+        student_rows.annotate(rollup_month=TruncMonth('date'))
+        .values('student_id', 'rollup_month')
+        .annotate(**_count_annotations())
+        .iterator()
+    ):
+        month_totals[(row['student_id'], row['rollup_month'])].update(
+            {field: row[field] for field in COUNT_FIELDS}
+        )
+    # A student month may be archived in several rows (section changes)
+    for row in student_archive.values('student_id', 'month', *COUNT_FIELDS).iterator():
+        month_totals[(row['student_id'], row['month'])].update(
+            {field: row[field] for field in COUNT_FIELDS}
+        )
+
+    day_totals = defaultdict(Counter)
+    section_rows = rows
+    section_archive = archived
+    stored_days = scoped(SectionAttendanceDay.objects.all(), 'date')
+    if sections is not None:
+        section_rows = section_rows.filter(section_id__in=sections)
+        section_archive = section_archive.filter(section_id__in=sections)
+        stored_days = stored_days.filter(section_id__in=sections)
+    if days is not None:
+        section_rows = section_rows.filter(date__in=days)
+        section_archive = section_archive.filter(month__in={month_start(day) for day in days})
+        stored_days = stored_days.filter(date__in=days)
+    for row in section_rows.values('section_id', 'date').annotate(**_count_annotations()).iterator():
+        day_totals[(row['section_id'], row['date'])].update({field: row[field] for field in COUNT_FIELDS})
+    for section_id, month, codes in section_archive.values_list('section_id', 'month', 'codes').iterator():
+        for index, code in enumerate(codes):
+            if code == EMPTY:
+                continue
+            day = month + timedelta(days=index // SLOTS_PER_DAY)
+            if days is None or day in days:
+                day_totals[(section_id, day)].update({STATUS_FIELDS[CODE_STATUSES[code]]: 1, 'total': 1})
+
+    # Stored rows are overwritten in place (zeroed when nothing is left),
+    # never deleted and reinserted, so increments waiting on their locks
+    # apply to the rebuilt values instead of being lost
+    for key in stored_months.values_list('student_id', 'month'):
+        month_totals.setdefault(key, Counter())
+    for key in stored_days.values_list('section_id', 'date'):
+        day_totals.setdefault(key, Counter())
+
+    with transaction.atomic():
+        months = StudentAttendanceMonth.objects.bulk_create(
+            [
+                StudentAttendanceMonth(
+                    student_id=student_id,
+                    month=month,
+                    **{field: counts[field] for field in COUNT_FIELDS},
+                )
+                for (student_id, month), counts in month_totals.items()
+            ],
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['student', 'month'],
+            update_fields=[*COUNT_FIELDS, 'updated_at'],
+        )
+        day_rows = SectionAttendanceDay.objects.bulk_create(
+            [
+                SectionAttendanceDay(
+                    section_id=section_id,
+                    date=day,
+                    **{field: counts[field] for field in COUNT_FIELDS},
+                )
+                for (section_id, day), counts in day_totals.items()
+            ],
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['section', 'date'],
+            update_fields=[*COUNT_FIELDS, 'updated_at'],
+        )
+    return len(months), len(day_rows)
+
+
+# ==================== QUERIES ====================
+
+def _split_range(start, end):
+    """
+    Split [start, end] into the whole months answered from rollups and the
+    partial edge ranges answered from raw and archived rows. Open ends
+    cover all months.
+    """
+    first_full = start if start is None or start.day == 1 else month_end(start) + timedelta(days=1)
+    last_full = end if end is None or end == month_end(end) else month_start(end) - timedelta(days=1)
+    if first_full is not None and last_full is not None and first_full > last_full:
+        # The range lies within one month or spans two partial months
+        return None, [(start, end)]
+    edges = []
+    if start is not None and first_full != start:
+        edges.append((start, first_full - timedelta(days=1)))
+    if end is not None and last_full != end:
+        edges.append((last_full + timedelta(days=1), end))
+    return (first_full, last_full), edges
+
+
+def _month_pieces(start, end):
+    """
+    Split [start, end] at month boundaries
+    """
+    while start <= end:
+        piece_end = min(month_end(start), end)
+        yield start, piece_end
+        start = piece_end + timedelta(days=1)
+
+
+def _count_query(students, start=None, end=None):
+    """
+    One UNION ALL query yielding (student_id, present, absent, total) parts:
+    rollup sums for whole months, raw and archived counts for the edges and
+    a zero row per student so students without attendance are included
+    """
+    from apps.academics.archive import archived_slot_counts
+    from apps.academics.models import Attendance, StudentAttendanceMonth
+
+    zero = Value(0, output_field=IntegerField())
+    parts = [
+        students.order_by().annotate(present=zero, absent=zero, total=zero)
+        .values_list('pk', 'present', 'absent', 'total')
+    ]
+    if start is not None and end is not None and start > end:
+        return parts[0]
+
+    full, edges = _split_range(start, end)
+    if full is not None:
+        months = StudentAttendanceMonth.objects.filter(student__in=students)
+        if full[0] is not None:
+            months = months.filter(month__gte=full[0])
+        if full[1] is not None:
+            months = months.filter(month__lte=full[1])
+        parts.append(
+            months.order_by().values('student_id')
+            .annotate(present_sum=Sum('present'), absent_sum=Sum('absent'), total_sum=Sum('total'))
+            .values_list('student_id', 'present_sum', 'absent_sum', 'total_sum')
+        )
+    for edge_start, edge_end in edges:
+        rows = Attendance._base_manager.filter(
+            student__in=students, is_active=True, date__gte=edge_start, date__lte=edge_end
+        )
+        parts.append(
+            rows.order_by().values('student_id')
+            .annotate(
+                present_count=Count('pk', filter=Q(status='PRESENT')),
+                absent_count=Count('pk', filter=Q(status='ABSENT')),
+                total_count=Count('pk'),
+            )
+            .values_list('student_id', 'present_count', 'absent_count', 'total_count')
+        )
+        # Closed years keep their edge days in the archive instead
+        for piece_start, piece_end in _month_pieces(edge_start, edge_end):
+            parts.append(archived_slot_counts(students, piece_start, piece_end))
+    if len(parts) == 1:
+        return parts[0]
+    return parts[0].union(*parts[1:], all=True)
+
+
+def attendance_counts(students, start=None, end=None):
+    """
+    {student_id: {'present', 'absent', 'total'}} attendance row counts of
+    each student in the students queryset between start and end inclusive,
+    live and archived, in one query
+    """
+    counts = defaultdict(lambda: {'present': 0, 'absent': 0, 'total': 0})
+    for student_id, present, absent, total in _count_query(students, start, end):
+        row = counts[student_id]
+        row['present'] += present
+        row['absent'] += absent
+        row['total'] += total
+    return dict(counts)
+
+
+def attendance_percentages(students, start=None, end=None):
+    """
+    Attendance percentage (present rows over all rows) of each student in
+    the students queryset between start and end inclusive, in one query.
+    Students without attendance get 0.0.
+    """
+    return {
+        student_id: (row['present'] / row['total']) * 100 if row['total'] else 0.0
+        for student_id, row in attendance_counts(students, start, end).items()
+    }
+
+
+def chronic_absentees(students, start=None, end=None, threshold=10.0):
+    """
+    {student_id: absence percentage} of students absent for at least
+    threshold percent of their attendance rows between start and end
+    """
+    absentees = {}
+    for student_id, row in attendance_counts(students, start, end).items():
+        if row['total'] and (row['absent'] / row['total']) * 100 >= threshold:
+            absentees[student_id] = (row['absent'] / row['total']) * 100
+    return absentees
+
+
+def class_attendance_percentages(school_class=None, section=None, start=None, end=None):
+    """
+    Attendance percentages of every student of a class or section
+    """
+    from apps.students.models import Student
+
+    students = Student.objects.all()
+    if section is not None:
+        students = students.filter(section=section)
+    if school_class is not None:
+        students = students.filter(current_class=school_class)
+    return attendance_percentages(students, start, end)
+
+
+def section_attendance_summary(section, start=None, end=None):
+    """
+    Summed SectionAttendanceDay counts of a section between start and end
+    """
+    from apps.academics.models import SectionAttendanceDay
+
+    days = SectionAttendanceDay.objects.filter(section=section)
+    if start is not None:
+        days = days.filter(date__gte=start)
+    if end is not None:
+        days = days.filter(date__lte=end)
+    summary = days.aggregate(**{field: Sum(field) for field in COUNT_FIELDS})
+    summary = {field: value or 0 for field, value in summary.items()}
+    summary['percentage'] = (summary['present'] / summary['total']) * 100 if summary['total'] else 0.0
+    return summary
@@ -1,3 +1,375 @@
+from datetime import date, time, timedelta
+
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.testing import TenantQueryBudgetTestCase
+
+
+def seed_academic_year(tenant, code='A'):
+    """
+    Create the current 2025-26 academic year
+    """
+    from apps.academics.models import AcademicYear
+
+    return AcademicYear.objects.create(
+        tenant=tenant, name='2025-26', code=f'AY-{code}',
+        start_date=date(2025, 4, 1), end_date=date(2026, 3, 31), is_current=True,
+    )
+
+
+def seed_section(tenant, size, code='A'):
+    """
+    Create a class with one section of size students through the bulk API
+    """
+    from apps.academics.models import SchoolClass, Section
+    from apps.students.models import Student
+
+    year = seed_academic_year(tenant, code)
+    school_class = SchoolClass.objects.create(
+        tenant=tenant, name=f'Class {code}', numeric_name=5, code=f'C5{code}', level='PRIMARY', order=5,
+    )
+    section = Section.objects.create(tenant=tenant, class_name=school_class, name=code, code=code)
+    students = [
+        Student(
+            tenant=tenant, admission_number=f'ADM-{code}-{n:03}', university_reg_no=f'REG-{code}-{n:03}',
+            first_name='Student', last_name=f'{code}{n}', date_of_birth=date(2014, 1, 1), gender='F',
+            personal_email=f'student-{code.lower()}{n}@example.com', mobile_primary='+919999999999',
+            academic_year=year, current_class=school_class, section=section,
+        )
+        for n in range(size)
+    ]
+    Student.objects.bulk_create_secure(students, tenant=tenant, audit=False)
+    return section, students
+
+
+def seed_timetable(tenant, section, year, teacher, periods):
+    """
+    Give a section one Monday period per subject, taught by teacher
+    """
+    from apps.academics.models import ClassSubject, Subject, TimeTable
+
+    subjects = [
+        Subject(tenant=tenant, name=f'Subject {n}', code=f'SUB-{section.code}{n}', subject_group='GENERAL')
+        for n in range(periods)
+    ]
+    Subject.objects.bulk_create_secure(subjects, tenant=tenant, audit=False)
+    class_subjects = [
+        ClassSubject(tenant=tenant, class_name=section.class_name, subject=subject, academic_year=year, teacher=teacher)
+        for subject in subjects
+    ]
+    ClassSubject.objects.bulk_create_secure(class_subjects, tenant=tenant, audit=False)
+    TimeTable.objects.bulk_create_secure([
+        TimeTable(
+            tenant=tenant, class_name=section.class_name, section=section, academic_year=year, day='MONDAY',
+            period_number=n + 1, start_time=time(9 + n), end_time=time(9 + n, 45), subject=class_subject,
+            teacher=teacher,
+        )
+        for n, class_subject in enumerate(class_subjects)
+    ], tenant=tenant, audit=False)
+    return class_subjects
+
+
+class AcademicsQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        from apps.academics.models import SchoolClass, Section, Term
+
+        super().setUp()
+        section, students = seed_section(self.tenant, 3)
+        year = students[0].academic_year
+        seed_timetable(self.tenant, section, year, self.user, 3)
+        SchoolClass.objects.filter(pk=section.class_name_id).update(class_teacher=self.user)
+        Section.objects.filter(pk=section.pk).update(section_incharge=self.user)
+        Term.objects.bulk_create_secure([
+            Term(
+                tenant=self.tenant, academic_year=year, name=name, term_type=term_type, order=n,
+                start_date=start, end_date=end,
+            )
+            for n, (name, term_type, start, end) in enumerate([
+                ('Term 1', 'FIRST_TERM', date(2025, 4, 1), date(2025, 9, 30)),
+                ('Term 2', 'SECOND_TERM', date(2025, 10, 1), date(2026, 3, 31)),
+            ])
+        ], tenant=self.tenant, audit=False)
+
+    def test_teacher_dashboard(self):
+        self.assertViewQueryBudget('academics:teacher-dashboard')
+
+    def test_academic_year_list(self):
+        self.assertViewQueryBudget('academics:academic_year_list')
+
+    def test_term_list(self):
+        self.assertViewQueryBudget('academics:term_list')
+
+    def test_class_list(self):
+        self.assertViewQueryBudget('academics:class_list')
+
+    def test_section_list(self):
+        self.assertViewQueryBudget('academics:section_list')
+
+    def test_subject_list(self):
+        self.assertViewQueryBudget('academics:subject_list')
+
+    def test_schedule(self):
+        self.assertViewQueryBudget('academics:schedule')
+
+    def test_my_courses(self):
+        self.assertViewQueryBudget('academics:my_courses')
+
+
+class BulkAttendanceTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.section, self.students = seed_section(self.tenant, 40)
+        self.day = date(2025, 7, 1)
+
+    def _mark(self, status='PRESENT', students=None):
+        from apps.academics.attendance import mark_section_attendance
+
+        return mark_section_attendance(
+            self.section.pk, self.day, 'FULL_DAY',
+            [{'student': str(student.pk), 'status': status} for student in students or self.students],
+            user=self.user, tenant=self.tenant,
+        )
+
+    def test_section_is_written_in_one_statement(self):
+        from apps.academics.models import Attendance
+
+        with self.assertQueryBudget(16) as analyzer:
+            summary = self._mark()
+        self.assertEqual(summary['created'], 40)
+        self.assertEqual(Attendance.objects.filter(section=self.section, date=self.day).count(), 40)
+        inserts = [
+            shape for shape, sql in analyzer.samples.items()
+            if sql.startswith('INSERT INTO "academics_attendance"')
+        ]
+        self.assertEqual([analyzer.shapes[shape] for shape in inserts], [1])
+        self.assertIn('ON CONFLICT', analyzer.samples[inserts[0]])
+
+    def test_marking_again_updates_in_place(self):
+        from apps.academics.models import Attendance
+
+        first = self._mark()
+        second = self._mark(status='ABSENT', students=self.students[:10])
+        self.assertEqual((second['created'], second['updated']), (0, 10))
+        self.assertEqual(
+            [result['id'] for result in second['results']],
+            [result['id'] for result in first['results'][:10]],
+        )
+        self.assertEqual(Attendance.objects.filter(section=self.section, status='ABSENT').count(), 10)
+
+    def test_invalid_marks_are_rejected_individually(self):
+        from apps.academics.attendance import mark_section_attendance
+
+        _, outsiders = seed_section(self.tenant, 1, code='B')
+        summary = mark_section_attendance(self.section, self.day, 'FULL_DAY', [
+            {'student': str(self.students[0].pk), 'status': 'PRESENT'},
+            {'student': str(self.students[0].pk), 'status': 'ABSENT'},
+            {'student': str(self.students[1].pk), 'status': 'SICK'},
+            {'student': str(outsiders[0].pk), 'status': 'PRESENT'},
+        ], user=self.user, tenant=self.tenant)
+        self.assertEqual([result['result'] for result in summary['results']],
+                         ['created', 'rejected', 'rejected', 'rejected'])
+        self.assertEqual((summary['created'], summary['rejected']), (1, 3))
+
+    def _attendance(self, student, status):
+        from apps.academics.models import Attendance
+
+        return Attendance(
+            student=student, date=self.day, session='FULL_DAY', status=status,
+            class_name_id=self.section.class_name_id, section=self.section,
+        )
+
+    def test_upsert_without_update_fields_keeps_stored_rows(self):
+        from apps.academics.models import Attendance
+
+        first = self._mark(students=self.students[:1])
+        rows = Attendance.objects.bulk_upsert_secure(
+            [self._attendance(student, 'ABSENT') for student in self.students[:2]],
+            update_fields=[], tenant=self.tenant, audit=False,
+        )
+        self.assertEqual([row.status for row in rows], ['PRESENT', 'ABSENT'])
+        self.assertEqual(str(rows[0].pk), first['results'][0]['id'])
+        self.assertEqual(Attendance.objects.get(pk=rows[0].pk).status, 'PRESENT')
+        self.assertEqual(Attendance.objects.filter(section=self.section, date=self.day).count(), 2)
+
+    def test_upsert_rejects_repeated_keys(self):
+        from apps.academics.models import Attendance
+
+        with self.assertRaises(ValueError):
+            Attendance.objects.bulk_upsert_secure(
+                [self._attendance(self.students[0], 'PRESENT'), self._attendance(self.students[0], 'ABSENT')],
+                unique_fields=['student', 'date', 'session'], tenant=self.tenant, audit=False,
+            )
+        self.assertFalse(Attendance.objects.filter(section=self.section).exists())
+
+    def test_non_object_marks_are_rejected(self):
+        from apps.academics.attendance import mark_section_attendance
+
+        summary = mark_section_attendance(self.section, self.day, 'FULL_DAY', [
+            str(self.students[0].pk),
+            None,
+            {'student': str(self.students[1].pk), 'status': 'PRESENT'},
+        ], user=self.user, tenant=self.tenant)
+        self.assertEqual([result['result'] for result in summary['results']],
+                         ['rejected', 'rejected', 'created'])
+
+    def test_marking_a_deleted_row_restores_it(self):
+        from apps.academics.models import Attendance, SectionAttendanceDay
+
+        first = self._mark(students=self.students[:1])
+        Attendance.objects.get(pk=first['results'][0]['id']).delete(user=self.user, category='USER_REQUEST')
+        summary = self._mark(status='ABSENT', students=self.students[:1])
+        self.assertEqual(summary['updated'], 1)
+        restored = Attendance.objects.get(pk=first['results'][0]['id'])
+        self.assertEqual((restored.status, restored.deleted_at), ('ABSENT', None))
+        day = SectionAttendanceDay.objects.get(section=self.section, date=self.day)
+        self.assertEqual((day.present, day.absent), (0, 1))
+
+
+class MarkedSectionMixin:
+    """
+    A section of five students marked through the bulk path for six days
+    across the June/July 2025 boundary
+    """
+
+    def setUp(self):
+        from apps.academics.attendance import mark_section_attendance
+
+        super().setUp()
+        self.section, self.students = seed_section(self.tenant, 5)
+        statuses = ['PRESENT', 'ABSENT', 'LATE', 'PRESENT', 'LEAVE']
+        # Six school days across the June/July boundary
+        for offset in range(6):
+            day = date(2025, 6, 28) + timedelta(days=offset)
+            mark_section_attendance(self.section, day, 'FULL_DAY', [
+                {'student': str(student.pk), 'status': statuses[(n + offset) % len(statuses)]}
+                for n, student in enumerate(self.students)
+            ], user=self.user, tenant=self.tenant)
+        # Re-marking updates rows in place
+        mark_section_attendance(self.section, date(2025, 7, 1), 'FULL_DAY', [
+            {'student': str(student.pk), 'status': 'PRESENT'} for student in self.students[:3]
+        ], user=self.user, tenant=self.tenant)
+
+    def _stored(self):
+        from apps.academics.models import SectionAttendanceDay, StudentAttendanceMonth
+        from apps.academics.rollups import COUNT_FIELDS
+
+        return (
+            sorted(StudentAttendanceMonth.objects.values_list('student_id', 'month', *COUNT_FIELDS)),
+            sorted(SectionAttendanceDay.objects.values_list('section_id', 'date', *COUNT_FIELDS)),
+        )
+
+    def _raw_percentage(self, student, start, end):
+        from apps.academics.models import Attendance
+
+        rows = Attendance.objects.filter(student=student, date__gte=start, date__lte=end)
+        total = rows.count()
+        return (rows.filter(status='PRESENT').count() / total) * 100 if total else 0.0
+
+
+class AttendanceRollupTests(MarkedSectionMixin, TenantQueryBudgetTestCase):
+
+    def test_bulk_marking_matches_rebuild(self):
+        from apps.academics.rollups import rebuild_rollups
+
+        incremental = self._stored()
+        rebuild_rollups()
+        self.assertEqual(self._stored(), incremental)
+
+    def test_percentages_match_raw_counts(self):
+        from apps.academics.rollups import attendance_percentages
+        from apps.students.models import Student
+
+        ranges = [
+            (date(2025, 6, 1), date(2025, 7, 31)),
+            (date(2025, 6, 29), date(2025, 7, 2)),
+            (date(2025, 6, 1), date(2025, 7, 2)),
+            (date(2025, 6, 30), date(2025, 7, 31)),
+            (date(2025, 8, 1), date(2025, 8, 31)),
+        ]
+        for start, end in ranges:
+            percentages = attendance_percentages(Student.objects.all(), start, end)
+            for student in self.students:
+                self.assertAlmostEqual(
+                    percentages[student.pk], self._raw_percentage(student, start, end),
+                    msg=f'{start} - {end}',
+                )
+
+    def test_class_percentages_in_one_query(self):
+        from apps.academics.rollups import class_attendance_percentages
+
+        with self.assertNumQueries(1):
+            percentages = class_attendance_percentages(
+                section=self.section, start=date(2025, 6, 1), end=date(2025, 7, 2)
+            )
+        self.assertEqual(set(percentages), {student.pk for student in self.students})
+
+    def test_single_row_changes_refresh_rollups(self):
+        from apps.academics.models import Attendance
+        from apps.academics.rollups import rebuild_rollups
+
+        row = Attendance.objects.get(student=self.students[0], date=date(2025, 7, 2))
+        row.delete(user=self.user, reason='Marked in error')
+        refreshed = self._stored()
+        rebuild_rollups()
+        self.assertEqual(self._stored(), refreshed)
+
+
+class AttendanceArchiveTests(MarkedSectionMixin, TenantQueryBudgetTestCase):
+    ranges = [
+        (None, None),
+        (date(2025, 6, 1), date(2025, 7, 31)),
+        (date(2025, 6, 29), date(2025, 7, 2)),
+        (date(2025, 6, 30), date(2025, 7, 31)),
+    ]
+
+    def setUp(self):
+        from apps.academics.models import AcademicYear
+
+        super().setUp()
+        AcademicYear.objects.filter(pk=self.students[0].academic_year_id).update(is_current=False)
+        self.year = AcademicYear.objects.get(pk=self.students[0].academic_year_id)
+
+    def _snapshot(self):
+        from apps.academics.archive import absence_streaks, attendance_timeline
+        from apps.academics.rollups import attendance_counts
+        from apps.students.models import Student
+
+        return (
+            [attendance_counts(Student.objects.all(), start, end) for start, end in self.ranges],
+            [attendance_timeline(student) for student in self.students],
+            [absence_streaks(student) for student in self.students],
+        )
+
+    def test_archived_year_answers_like_raw_rows(self):
+        from apps.academics.archive import archive_year
+        from apps.academics.models import ArchivedAttendanceMonth, Attendance
+        from apps.academics.rollups import rebuild_rollups
+
+        before = self._snapshot()
+        rollups = self._stored()
+        moved = archive_year(self.year, batch_size=2)
+
+        self.assertEqual(moved['rows'], 30)
+        self.assertEqual(moved['months'], 10)
+        self.assertFalse(Attendance.objects.filter(section=self.section).exists())
+        self.assertEqual(ArchivedAttendanceMonth.objects.count(), 10)
+        self.assertEqual(self._snapshot(), before)
+        rebuild_rollups()
+        self.assertEqual(self._stored(), rollups)
+
+    def test_dry_run_keeps_rows(self):
+        from apps.academics.archive import archive_year
+        from apps.academics.models import ArchivedAttendanceMonth, Attendance
+
+        archive_year(self.year, dry_run=True)
+        self.assertEqual(Attendance.objects.filter(section=self.section).count(), 30)
+        self.assertFalse(ArchivedAttendanceMonth.objects.exists())
+
+    def test_current_year_is_not_archived(self):
+        from apps.academics.archive import archive_year
+
+        self.year.is_current = True
+        with self.assertRaises(ValueError):
+            archive_year(self.year)
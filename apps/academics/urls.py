@@ -39,6 +39,7 @@ urlpatterns = [
     # Staff/Teacher URLs
     path('schedule/', views.ScheduleView.as_view(), name='schedule'),
     path('attendance/', views.AttendanceView.as_view(), name='attendance'),
+    path('attendance/bulk/', views.BulkAttendanceView.as_view(), name='attendance_bulk'),
     path('grading/', views.GradingView.as_view(), name='grading'),
     path('assignments/', views.AssignmentsView.as_view(), name='assignments'),
     
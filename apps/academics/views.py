@@ -1,10 +1,17 @@
-from django.views.generic import TemplateView, ListView, DetailView, CreateView, UpdateView, DeleteView
+import json
+from datetime import date
+
+from django.views.generic import TemplateView, ListView, DetailView, CreateView, UpdateView, DeleteView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
 from django.utils import timezone
 from django.contrib import messages
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from django.db.models import Count, Q
 from apps.core.utils.tenant import get_current_tenant
 from apps.core.permissions.mixins import PermissionRequiredMixin
+from .attendance import mark_section_attendance
 from .models import (
     TimeTable, Attendance, ClassSubject, StudyMaterial, 
     SchoolClass, Section, AcademicYear, Term, Subject
@@ -14,6 +21,7 @@ from .models import (
 
 class TeacherDashboardView(LoginRequiredMixin, TemplateView):
     template_name = 'academics/dashboard.html'
+    query_budget = 3
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -49,6 +57,7 @@ class AcademicYearListView(LoginRequiredMixin, PermissionRequiredMixin, ListView
     template_name = 'academics/academic_year_list.html'
     context_object_name = 'academic_years'
     permission_required = 'academics.view_academicyear'
+    query_budget = 3
 
 class AcademicYearCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = AcademicYear
@@ -89,6 +98,10 @@ class TermListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'academics/term_list.html'
     context_object_name = 'terms'
     permission_required = 'academics.view_term'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('academic_year')
 
 class TermCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = Term
@@ -129,6 +142,12 @@ class SchoolClassListView(LoginRequiredMixin, PermissionRequiredMixin, ListView)
     template_name = 'academics/class_list.html'
     context_object_name = 'classes'
     permission_required = 'academics.view_schoolclass'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('class_teacher').annotate(
+            active_students=Count('students', filter=Q(students__is_active=True))
+        )
 
 class SchoolClassCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = SchoolClass
@@ -169,6 +188,12 @@ class SectionListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'academics/section_list.html'
     context_object_name = 'sections'
     permission_required = 'academics.view_section'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('class_name', 'section_incharge').annotate(
+            active_students=Count('students', filter=Q(students__is_active=True))
+        )
 
 class SectionCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = Section
@@ -209,6 +234,7 @@ class SubjectListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'academics/subject_list.html'
     context_object_name = 'subjects'
     permission_required = 'academics.view_subject'
+    query_budget = 3
 
 class SubjectCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = Subject
@@ -249,12 +275,13 @@ class ScheduleView(LoginRequiredMixin, ListView):
     model = TimeTable
     template_name = 'academics/schedule.html'
     context_object_name = 'schedule_entries'
+    query_budget = 3
 
     def get_queryset(self):
         user = self.request.user
         return TimeTable.objects.filter(
             teacher=user
-        ).order_by('day', 'start_time')
+        ).select_related('class_name', 'section', 'subject__subject').order_by('day', 'start_time')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -262,10 +289,11 @@ class ScheduleView(LoginRequiredMixin, ListView):
         schedule_by_day = {}
         days = ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY', 'SATURDAY']
         
-        for day in days:
-            entries = self.get_queryset().filter(day=day)
-            if entries.exists():
-                schedule_by_day[day] = entries
+        # One query for the week, grouped in Python
+        for entry in context['schedule_entries']:
+            if entry.day in days:
+                schedule_by_day.setdefault(entry.day, []).append(entry)
+        schedule_by_day = {day: schedule_by_day[day] for day in days if day in schedule_by_day}
                 
         context['schedule_by_day'] = schedule_by_day
         context['days'] = days
@@ -286,6 +314,34 @@ class AttendanceView(LoginRequiredMixin, TemplateView):
         
         return context
 
+class BulkAttendanceView(LoginRequiredMixin, PermissionRequiredMixin, View):
+    """
+    Mark a whole section for one date and session from a JSON payload:
+    {"section": id, "date": "YYYY-MM-DD", "session": "FULL_DAY",
+     "marks": [{"student": id, "status": "PRESENT", "remarks": ""}, ...]}
+    """
+    permission_required = 'academics.add_attendance'
+
+    def post(self, request, *args, **kwargs):
+        try:
+            payload = json.loads(request.body)
+            marks = payload['marks']
+            if not isinstance(marks, list):
+                raise TypeError('marks must be a list')
+            summary = mark_section_attendance(
+                payload['section'],
+                date.fromisoformat(payload['date']),
+                payload.get('session', 'FULL_DAY'),
+                marks,
+                user=request.user,
+                tenant=get_current_tenant(),
+            )
+        except ValidationError as exc:
+            return JsonResponse({'success': False, 'errors': exc.messages}, status=400)
+        except (ValueError, KeyError, TypeError) as exc:
+            return JsonResponse({'success': False, 'errors': [f'Invalid payload: {exc}']}, status=400)
+        return JsonResponse({'success': True, **summary})
+
 class GradingView(LoginRequiredMixin, TemplateView):
     template_name = 'academics/grading.html'
 
@@ -296,6 +352,7 @@ class StudentCoursesView(LoginRequiredMixin, ListView):
     model = ClassSubject
     template_name = 'academics/student_courses.html'
     context_object_name = 'courses'
+    query_budget = 3
 
     def get_queryset(self):
         # Assuming student is linked to a user
@@ -12,6 +12,7 @@ from django.contrib.auth import get_user_model
 
 # Import core models
 from apps.core.models import BaseModel, UUIDModel, TimeStampedModel
+from apps.core.utils.queries import query_budget
 from encrypted_model_fields.fields import EncryptedCharField, EncryptedTextField
 
 # Phone regex for validation
@@ -296,8 +297,12 @@ class AdmissionProgram(BaseModel):
         return f"{self.class_grade}{stream_display} - {self.admission_cycle}"
 
     @property
+    @query_budget(1)
     def filled_seats(self):
         """Get number of filled seats"""
+        # List views annotate the count to avoid a query per row
+        if hasattr(self, 'admitted'):
+            return self.admitted
         return self.applications.filter(status="ADMITTED").count()
 
     @property
@@ -545,19 +550,11 @@ class OnlineApplication(BaseModel):
 
     def generate_application_number(self):
         """Generate unique application number"""
-        prefix = f"APP-{self.admission_cycle.code}-"
-        last_app = OnlineApplication.objects.filter(
-            application_number__startswith=prefix,
-            tenant=self.tenant
-        ).order_by('application_number').last()
+        from apps.tenants.sequences import next_document_number
         
-        if last_app:
-            last_num = int(last_app.application_number.split('-')[-1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
-            
-        return f"{prefix}{new_num:05d}"
+        # Numbering restarts with each admission cycle rather than each year
+        prefix = f"APP-{self.admission_cycle.code}-"
+        return next_document_number(self, 'application_number', prefix, width=5, yearly=False)
 
     @property
     def full_name(self):
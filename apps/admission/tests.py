@@ -1,3 +1,59 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
 from django.test import TestCase
 
-# Create your tests here.
+from apps.academics.tests import seed_academic_year
+from apps.core.testing import TenantQueryBudgetTestCase
+
+
+def seed_applications(tenant, count):
+    """
+    Create count admission cycles with one program and one application each
+    """
+    from apps.admission.models import AdmissionCycle, AdmissionProgram, OnlineApplication
+
+    year = seed_academic_year(tenant)
+    cycles = [
+        AdmissionCycle(
+            tenant=tenant, name=f'Cycle {n}', code=f'CYC-{n}', academic_year=year,
+            start_date=datetime(2025, 1, 1, tzinfo=timezone.utc), end_date=datetime(2025, 3, 31, tzinfo=timezone.utc),
+        )
+        for n in range(count)
+    ]
+    AdmissionCycle.objects.bulk_create_secure(cycles, tenant=tenant, audit=False)
+    programs = [
+        AdmissionProgram(
+            tenant=tenant, admission_cycle=cycle, program_name=f'Program {n}', program_type='PRIMARY',
+            class_grade='Class 1', stream='GENERAL', total_seats=40, general_seats=40,
+            application_fee=Decimal('500'), tuition_fee=Decimal('20000'),
+        )
+        for n, cycle in enumerate(cycles)
+    ]
+    AdmissionProgram.objects.bulk_create_secure(programs, tenant=tenant, audit=False)
+    applications = [
+        OnlineApplication(
+            tenant=tenant, application_number=f'APP-{n}', admission_cycle=program.admission_cycle,
+            program=program, first_name='Applicant', last_name=str(n), date_of_birth=date(2019, 1, 1),
+            gender='F', category='GENERAL', blood_group='A+', status='ADMITTED',
+        )
+        for n, program in enumerate(programs)
+    ]
+    OnlineApplication.objects.bulk_create_secure(applications, tenant=tenant, audit=False)
+    return applications
+
+
+class AdmissionQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_applications(self.tenant, 3)
+
+    def test_staff_list(self):
+        self.assertViewQueryBudget('admission:staff_list')
+
+    def test_cycle_list(self):
+        self.assertViewQueryBudget('admission:cycle_list')
+
+    def test_program_list(self):
+        self.assertViewQueryBudget('admission:program_list')
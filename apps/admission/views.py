@@ -5,6 +5,7 @@ from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
+from django.db.models import Count, Q
 from .models import AdmissionCycle, AdmissionProgram, OnlineApplication
 from .forms import AdmissionApplicationForm, AdmissionStatusCheckForm
 
@@ -98,9 +99,10 @@ class AdmissionListView(LoginRequiredMixin, ListView):
     template_name = 'admission/staff/list.html'
     context_object_name = 'applications'
     paginate_by = 20
+    query_budget = 3
     
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related('program__admission_cycle__academic_year')
         # Filter by tenant if applicable
         if hasattr(self.request, 'tenant'):
             queryset = queryset.filter(tenant=self.request.tenant)
@@ -114,9 +116,9 @@ class AdmissionListView(LoginRequiredMixin, ListView):
         search = self.request.GET.get('search')
         if search:
             queryset = queryset.filter(
-                models.Q(first_name__icontains=search) |
-                models.Q(last_name__icontains=search) |
-                models.Q(application_number__icontains=search)
+                Q(first_name__icontains=search) |
+                Q(last_name__icontains=search) |
+                Q(application_number__icontains=search)
             )
         return queryset
 
@@ -152,6 +154,10 @@ class AdmissionCycleListView(LoginRequiredMixin, PermissionRequiredMixin, ListVi
     template_name = 'admission/staff/cycle_list.html'
     context_object_name = 'cycles'
     permission_required = 'admission.view_admissioncycle'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('academic_year')
 
 class AdmissionCycleCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = AdmissionCycle
@@ -192,6 +198,12 @@ class AdmissionProgramListView(LoginRequiredMixin, PermissionRequiredMixin, List
     template_name = 'admission/staff/program_list.html'
     context_object_name = 'programs'
     permission_required = 'admission.view_admissionprogram'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('admission_cycle').annotate(
+            admitted=Count('applications', filter=Q(applications__status='ADMITTED'))
+        )
 
 class AdmissionProgramCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = AdmissionProgram
@@ -1,3 +1,40 @@
 from django.test import TestCase
+from django.utils import timezone
 
-# Create your tests here.
+from apps.core.testing import TenantQueryBudgetTestCase
+from apps.users.tests import seed_users
+
+
+def seed_reports(tenant, count):
+    """
+    Create count reports with one execution each, and a dashboard
+    """
+    from apps.analytics.models import Dashboard, Report, ReportExecution
+
+    reports = [Report(tenant=tenant, title=f'Report {n}', report_type='TABULAR') for n in range(count)]
+    Report.objects.bulk_create_secure(reports, tenant=tenant, audit=False)
+    analysts = seed_users(tenant, count, prefix='analyst')
+    ReportExecution.objects.bulk_create_secure([
+        ReportExecution(tenant=tenant, report=report, executed_by=analyst, started_at=timezone.now())
+        for report, analyst in zip(reports, analysts)
+    ], tenant=tenant, audit=False)
+    Dashboard.objects.bulk_create_secure([Dashboard(tenant=tenant, title='Overview')], tenant=tenant, audit=False)
+    return reports
+
+
+class AnalyticsQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_reports(self.tenant, 3)
+
+    def test_dashboard(self):
+        self.assertViewQueryBudget('analytics:dashboard')
+
+    def test_async_dashboard(self):
+        sync_response = self.assertViewQueryBudget('analytics:dashboard')
+        response = self.renderAsyncView('analytics:dashboard_async')
+        self.assertEqual(response.context_data.keys(), sync_response.context_data.keys())
+
+    def test_report_list(self):
+        self.assertViewQueryBudget('analytics:report_list')
@@ -5,6 +5,7 @@ app_name = 'analytics'
 
 urlpatterns = [
     path('', views.AnalyticsDashboardView.as_view(), name='dashboard'),
+    path('async/', views.AsyncAnalyticsDashboardView.as_view(), name='dashboard_async'),
     path('reports/', views.ReportListView.as_view(), name='report_list'),
     path('reports/<uuid:pk>/', views.ReportDetailView.as_view(), name='report_detail'),
     path('reports/<uuid:pk>/export/', views.ExportReportView.as_view(), name='report_export'),
@@ -4,32 +4,52 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import HttpResponse
 from django.utils import timezone
 from .models import Report, Dashboard, KPI, ReportExecution
+from apps.core.mixins import AsyncDashboardMixin, DashboardSectionsMixin
 from apps.core.permissions.mixins import PermissionRequiredMixin
 import csv
 import json
 
-class AnalyticsDashboardView(LoginRequiredMixin,  TemplateView):
+def _dashboards(tenant):
+    # Get active dashboard or default
+    dashboards = list(Dashboard.objects.filter(is_active=True))
+    return {'dashboards': dashboards, 'active_dashboard': dashboards[0] if dashboards else None}
+
+
+def _report_count(tenant):
+    return {'total_reports': Report.objects.filter(is_active=True).count()}
+
+
+def _recent_executions(tenant):
+    return {
+        'recent_executions': list(
+            ReportExecution.objects.select_related('report', 'executed_by').order_by('-started_at')[:5]
+        ),
+    }
+
+
+def _kpis(tenant):
+    return {'kpis': list(KPI.objects.filter(is_active=True)[:6])}
+
+
+class AnalyticsDashboardView(LoginRequiredMixin, DashboardSectionsMixin, TemplateView):
     template_name = "analytics/dashboard.html"
     permission_required = "analytics.view_dashboard"
+    sections = (_dashboards, _report_count, _recent_executions, _kpis)
+    query_budget = 5
+
+
+class AsyncAnalyticsDashboardView(AsyncDashboardMixin, AnalyticsDashboardView):
+    """
+    AnalyticsDashboardView with its sections queried concurrently
+    """
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        # Get active dashboard or default
-        context['dashboards'] = Dashboard.objects.filter(is_active=True)
-        context['active_dashboard'] = context['dashboards'].first()
-        
-        # Get key metrics
-        context['total_reports'] = Report.objects.filter(is_active=True).count()
-        context['recent_executions'] = ReportExecution.objects.order_by('-started_at')[:5]
-        context['kpis'] = KPI.objects.filter(is_active=True)[:6]
-        
-        return context
 
 class ReportListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     model = Report
     template_name = "analytics/report_list.html"
     context_object_name = "reports"
     permission_required = "analytics.view_report"
+    query_budget = 3
 
     def get_queryset(self):
         return Report.objects.filter(is_active=True).order_by('title')
@@ -17,6 +17,7 @@ from .serializers import (
 from .models import SecurityEvent
 from apps.users.models import User
 from apps.tenants.models import Tenant
+from apps.core.utils.audit import record_audit_event
 
 
 @api_view(['POST'])
@@ -76,14 +77,14 @@ def logout_view(request):
     User logout
     """
     # Log security event
-    SecurityEvent.objects.create(
+    record_audit_event(SecurityEvent(
         user=request.user,
         event_type='logout',
         severity='low',
         description='User logged out',
         ip_address=request.META.get('REMOTE_ADDR'),
         tenant=request.user.tenant
-    )
+    ))
 
     logout(request)
     return Response({'detail': 'Successfully logged out'}, status=status.HTTP_200_OK)
@@ -179,14 +180,14 @@ def password_reset_confirm(request):
             user.save()
             
             # Log security event
-            SecurityEvent.objects.create(
+            record_audit_event(SecurityEvent(
                 user=user,
                 event_type='password_change',
                 severity='medium',
                 description='Password reset via email',
                 ip_address=request.META.get('REMOTE_ADDR'),
                 tenant=user.tenant
-            )
+            ))
             
             return Response({
                 'detail': 'Password has been reset successfully.'
@@ -216,14 +217,14 @@ def change_password(request):
         user.save()
         
         # Log security event
-        SecurityEvent.objects.create(
+        record_audit_event(SecurityEvent(
             user=user,
             event_type='password_change',
             severity='medium',
             description='Password changed by user',
             ip_address=request.META.get('REMOTE_ADDR'),
             tenant=user.tenant
-        )
+        ))
         
         return Response({
             'detail': 'Password changed successfully.'
@@ -250,14 +251,14 @@ def enable_mfa(request):
         request.user.save()
         
         # Log security event
-        SecurityEvent.objects.create(
+        record_audit_event(SecurityEvent(
             user=request.user,
             event_type='mfa_enabled',
             severity='medium',
             description='Multi-factor authentication enabled',
             ip_address=request.META.get('REMOTE_ADDR'),
             tenant=request.user.tenant
-        )
+        ))
         
         return Response({
             'detail': 'MFA has been enabled successfully.'
@@ -282,14 +283,14 @@ def disable_mfa(request):
     request.user.save()
     
     # Log security event
-    SecurityEvent.objects.create(
+    record_audit_event(SecurityEvent(
         user=request.user,
         event_type='mfa_disabled',
         severity='medium',
         description='Multi-factor authentication disabled',
         ip_address=request.META.get('REMOTE_ADDR'),
         tenant=request.user.tenant
-    )
+    ))
     
     return Response({
         'detail': 'MFA has been disabled successfully.'
@@ -339,13 +340,13 @@ def verify_email(request):
         user.save()
         
         # Log security event
-        SecurityEvent.objects.create(
+        record_audit_event(SecurityEvent(
             user=user,
             event_type='email_verified',
             severity='low',
             description='Email address verified',
             tenant=user.tenant
-        )
+        ))
         
         return Response({
             'detail': 'Email verified successfully. You can now log in.'
@@ -1,8 +1,10 @@
 from django.contrib.auth.backends import ModelBackend
 from django.core.exceptions import PermissionDenied
 from django.utils import timezone
+from apps.tenants.models import TenantConfiguration
 from apps.users.models import User
 from .models import LoginAttempt, SecurityEvent
+from apps.core.utils.audit import record_audit_event
 
 
 class TenantAwareAuthenticationBackend(ModelBackend):
@@ -71,7 +73,7 @@ class TenantAwareAuthenticationBackend(ModelBackend):
             user.failed_login_attempts += 1
             
             # Lock account if too many failed attempts
-            max_attempts = user.tenant.configuration.max_login_attempts
+            max_attempts = TenantConfiguration.get_for_tenant(user.tenant).max_login_attempts
             if user.failed_login_attempts >= max_attempts:
                 user.locked_until = timezone.now() + timezone.timedelta(minutes=30)
                 self._log_security_event(
@@ -93,7 +95,7 @@ class TenantAwareAuthenticationBackend(ModelBackend):
 
     def _is_password_expired(self, user):
         """Check if user's password has expired"""
-        password_expiry_days = user.tenant.configuration.password_expiry_days
+        password_expiry_days = TenantConfiguration.get_for_tenant(user.tenant).password_expiry_days
         expiry_date = user.password_changed_at + timezone.timedelta(days=password_expiry_days)
         return timezone.now() > expiry_date
 
@@ -108,7 +110,7 @@ class TenantAwareAuthenticationBackend(ModelBackend):
 
     def _log_login_attempt(self, email, request, success, failure_reason="", user=None):
         """Log login attempt for security monitoring"""
-        LoginAttempt.objects.create(
+        record_audit_event(LoginAttempt(
             user=user,
             email=email,
             ip_address=self._get_client_ip(request),
@@ -116,18 +118,18 @@ class TenantAwareAuthenticationBackend(ModelBackend):
             success=success,
             failure_reason=failure_reason,
             tenant=user.tenant if user else None
-        )
+        ))
 
     def _log_security_event(self, user, event_type, severity, description):
         """Log security event"""
-        SecurityEvent.objects.create(
+        record_audit_event(SecurityEvent(
             user=user,
             event_type=event_type,
             severity=severity,
             description=description,
             ip_address=user.current_login_ip,
             tenant=user.tenant
-        )
+        ))
 
     def get_user(self, user_id):
         """Get user by ID"""
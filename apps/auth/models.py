@@ -4,6 +4,7 @@ from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
 from apps.core.models import BaseModel
+from apps.core.utils.queries import query_budget
 
 
 # In your auth/models.py
@@ -63,9 +64,9 @@ class RolePermission(BaseModel):
         return f"{self.role} - {self.permission}"
 
     @classmethod
-    def get_permissions_for_role(cls, role, tenant=None):
+    def get_role_queryset(cls, role, tenant=None):
         """
-        Get all permissions for a specific role
+        RolePermission rows that apply to a role, optionally for a tenant
         """
         queryset = cls.objects.filter(role=role, is_active=True)
         
@@ -73,11 +74,19 @@ class RolePermission(BaseModel):
             # Get tenant-specific permissions first, then global ones
             tenant_perms = queryset.filter(tenant=tenant, tenant_specific=True)
             global_perms = queryset.filter(tenant_specific=False)
-            permissions = tenant_perms | global_perms
-        else:
-            permissions = queryset.filter(tenant_specific=False)
-            
-        return [rp.permission.codename for rp in permissions.distinct()]
+            return tenant_perms | global_perms
+        return queryset.filter(tenant_specific=False)
+
+    @classmethod
+    @query_budget(1)
+    def get_permissions_for_role(cls, role, tenant=None):
+        """
+        Get all permissions for a specific role
+        """
+        permissions = cls.get_role_queryset(role, tenant)
+        return list(
+            permissions.order_by().values_list('permission__codename', flat=True).distinct()
+        )
 
     @classmethod
     def get_permissions_with_modules(cls, role, tenant=None):
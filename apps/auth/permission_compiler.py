@@ -0,0 +1,125 @@
+# apps/auth/permission_compiler.py
+"""
+Compiled per-role permission sets.
+
+RolePermission rows for a (tenant, role) pair are compiled once into an
+immutable CompiledPermissions object and kept in a process-local LRU and
+in Redis. Cache keys embed a per-tenant version number stored in Redis;
+any RolePermission change bumps the version, so stale sets are never read.
+"""
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.core.cache import LocalLRUCache
+from apps.core.utils import metrics
+
+
+VERSION_KEY = 'role_permissions:version:{tenant}'
+GLOBAL_TENANT = 'global'
+CACHE_TIMEOUT = 60 * 60 * 24
+
+_local_cache = LocalLRUCache(max_entries=1024, timeout=300)
+
+
+class CompiledPermissions:
+    """
+    Immutable permission set for one role within one tenant.
+    Membership checks accept both 'app_label.codename' and bare codenames.
+    """
+    __slots__ = ('codenames', 'app_labels')
+
+    def __init__(self, codenames, app_labels):
+        self.codenames = frozenset(codenames)
+        self.app_labels = frozenset(app_labels)
+
+    def __contains__(self, perm):
+        return perm in self.codenames
+
+    def __iter__(self):
+        return iter(self.codenames)
+
+    def __len__(self):
+        return len(self.codenames)
+
+    def __getstate__(self):
+        return (self.codenames, self.app_labels)
+
+    def __setstate__(self, state):
+        self.codenames, self.app_labels = state
+
+    def has_module(self, app_label):
+        return app_label in self.app_labels
+
+
+def _tenant_key(tenant):
+    if tenant is None:
+        return GLOBAL_TENANT
+    return str(getattr(tenant, 'pk', tenant))
+
+
+def _get_versions(tenant_key):
+    """
+    Current (tenant, global) versions, fetched in a single cache round trip
+    """
+    keys = [VERSION_KEY.format(tenant=tenant_key), VERSION_KEY.format(tenant=GLOBAL_TENANT)]
+    versions = cache.get_many(keys)
+    return tuple(versions.get(key, 0) for key in keys)
+
+
+def compile_role_permissions(role, tenant=None):
+    """
+    Build the permission set for a role with a single query
+    """
+    from apps.auth.models import RolePermission
+
+    rows = (
+        RolePermission.get_role_queryset(role, tenant)
+        .order_by()
+        .values_list('permission__content_type__app_label', 'permission__codename')
+        .distinct()
+    )
+    codenames = set()
+    app_labels = set()
+    for app_label, codename in rows:
+        codenames.add(codename)
+        codenames.add(f"{app_label}.{codename}")
+        app_labels.add(app_label)
+    return CompiledPermissions(codenames, app_labels)
+
+
+def get_role_permissions(role, tenant=None):
+    """
+    Get the compiled permission set for a role, compiling it on first use
+    """
+    tenant_key = _tenant_key(tenant)
+    versions = _get_versions(tenant_key)
+    key = f"role_permissions:{tenant_key}:{role}:{versions[0]}:{versions[1]}"
+
+    compiled = _local_cache.get(key)
+    if compiled is not None:
+        metrics.increment('role_permissions.l1_hit')
+        return compiled
+
+    compiled = cache.get(key)
+    if compiled is None:
+        metrics.increment('role_permissions.compiled')
+        compiled = compile_role_permissions(role, tenant)
+        cache.set(key, compiled, CACHE_TIMEOUT)
+    else:
+        metrics.increment('role_permissions.l2_hit')
+    _local_cache.set(key, compiled)
+    return compiled
+
+
+def bump_permissions_version(tenant=None):
+    """
+    Invalidate compiled permission sets for a tenant (or all tenants when
+    tenant is None) once the current transaction commits
+    """
+    version_key = VERSION_KEY.format(tenant=_tenant_key(tenant))
+
+    def _bump():
+        if not cache.add(version_key, 1, None):
+            cache.incr(version_key)
+
+    transaction.on_commit(_bump)
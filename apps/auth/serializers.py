@@ -6,6 +6,7 @@ from django.core.exceptions import ValidationError
 from apps.users.models import User
 from apps.tenants.models import Tenant, Domain
 from .models import SecurityEvent
+from apps.core.utils.audit import record_audit_event
 
 
 class LoginSerializer(serializers.Serializer):
@@ -198,13 +199,13 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         user.send_verification_email()
 
         # Log security event
-        SecurityEvent.objects.create(
+        record_audit_event(SecurityEvent(
             user=user,
             event_type='user_registered',
             severity='low',
             description='New user registration',
             tenant=tenant
-        )
+        ))
 
         return user
 
@@ -0,0 +1,24 @@
+# apps/auth/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.core.signals import records_bulk_created, records_bulk_updated
+from .models import RolePermission
+from .permission_compiler import bump_permissions_version
+
+
+@receiver(post_save, sender=RolePermission)
+@receiver(post_delete, sender=RolePermission)
+def invalidate_role_permissions(sender, instance, **kwargs):
+    """Recompile permission sets affected by a RolePermission change"""
+    if instance.tenant_specific:
+        bump_permissions_version(instance.tenant_id)
+    else:
+        # Global rows apply to every tenant
+        bump_permissions_version(None)
+
+
+@receiver(records_bulk_created, sender=RolePermission)
+@receiver(records_bulk_updated, sender=RolePermission)
+def invalidate_bulk_role_permissions(sender, tenant_id, **kwargs):
+    """Bulk writes may touch global rows, so every tenant is recompiled"""
+    bump_permissions_version(None)
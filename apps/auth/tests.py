@@ -1,3 +1,93 @@
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.testing import TenantQueryBudgetTestCase
+
+
+class AuthQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def test_dashboard_switcher(self):
+        self.assertViewQueryBudget('dashboard_switcher')
+
+    def test_staff_dashboard(self):
+        self.assertViewQueryBudget('staff_dashboard')
+
+    def test_system_admin_dashboard(self):
+        self.assertViewQueryBudget('system_admin_dashboard')
+
+    def test_permissions_for_role(self):
+        from django.contrib.auth.models import Permission
+
+        from apps.auth.models import RolePermission
+
+        permissions = list(Permission.objects.order_by('pk')[:3])
+        RolePermission.objects.bulk_create_secure([
+            RolePermission(tenant=self.tenant, role='teacher', permission=permission) for permission in permissions
+        ], tenant=self.tenant, audit=False)
+        granted = self.assertMethodQueryBudget(RolePermission.get_permissions_for_role, 'teacher', self.tenant)
+        self.assertEqual(sorted(granted), sorted({permission.codename for permission in permissions}))
+
+
+class CompiledPermissionTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        from django.contrib.auth.models import Permission
+        from django.core.cache import cache
+        from apps.auth import permission_compiler
+        from apps.users.models import User
+
+        super().setUp()
+        cache.clear()
+        permission_compiler._local_cache.clear()
+        self.teacher = User.objects.create_user(
+            email='teacher@example.com', password='x', tenant=self.tenant, role='teacher'
+        )
+        self.permissions = list(
+            Permission.objects.exclude(role_permissions__role__in=['teacher', 'student'])
+            .select_related('content_type').order_by('pk')[:2]
+        )
+
+    def _grant(self, permission, role='teacher'):
+        from apps.auth.models import RolePermission
+
+        with self.captureOnCommitCallbacks(execute=True):
+            return RolePermission.objects.create(
+                tenant=self.tenant, role=role, permission=permission, tenant_specific=True
+            )
+
+    def _fresh(self, user):
+        from apps.users.models import User
+
+        return User.objects.get(pk=user.pk)
+
+    def test_compiled_set_answers_without_queries(self):
+        permission = self.permissions[0]
+        self._grant(permission)
+        teacher = self._fresh(self.teacher)
+        label = f'{permission.content_type.app_label}.{permission.codename}'
+        self.assertTrue(teacher.has_perm(label))
+        with self.assertNumQueries(0):
+            self.assertTrue(teacher.has_perm(permission.codename))
+            self.assertTrue(teacher.has_module_perms(permission.content_type.app_label))
+            self.assertFalse(teacher.has_perm(self.permissions[1].codename))
+
+    def test_permission_changes_bump_the_version(self):
+        first, second = self.permissions
+        grant = self._grant(first)
+        self.assertTrue(self._fresh(self.teacher).has_perm(first.codename))
+
+        self._grant(second)
+        with self.captureOnCommitCallbacks(execute=True):
+            grant.hard_delete()
+        teacher = self._fresh(self.teacher)
+        self.assertFalse(teacher.has_perm(first.codename))
+        self.assertTrue(teacher.has_perm(second.codename))
+
+    def test_changing_the_role_recompiles(self):
+        first, second = self.permissions
+        self._grant(first)
+        self._grant(second, role='student')
+        teacher = self._fresh(self.teacher)
+        self.assertTrue(teacher.has_perm(first.codename))
+        teacher.role = 'student'
+        self.assertFalse(teacher.has_perm(first.codename))
+        self.assertTrue(teacher.has_perm(second.codename))
@@ -363,6 +363,7 @@ def dashboard_redirect(request):
 class DashboardSwitcherView(LoginRequiredMixin, TemplateView):
     """View to switch between available dashboards"""
     template_name = 'auth/dashboard_switcher.html'
+    query_budget = 2
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -458,6 +459,7 @@ class SystemAdminDashboardView(BaseDashboardView):
     template_name = 'dashboards/system_admin.html'
     dashboard_name = 'System Administration'
     dashboard_type = 'system'
+    query_budget = 5
     
     def get_quick_actions(self):
         return [
@@ -499,6 +501,7 @@ class StaffDashboardView(BaseDashboardView):
     template_name = 'dashboards/staff.html'
     dashboard_name = 'Staff Portal'
     dashboard_type = 'staff'
+    query_budget = 2
     
     def get_quick_actions(self):
         user = self.request.user
@@ -538,6 +541,7 @@ class StudentPortalDashboardView(BaseDashboardView):
     template_name = 'dashboards/student_portal.html'
     dashboard_name = 'Student Portal'
     dashboard_type = 'student_family'
+    query_budget = 6
     
     def get_quick_actions(self):
         user = self.request.user
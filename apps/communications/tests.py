@@ -1,3 +1,38 @@
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.testing import TenantQueryBudgetTestCase
+from apps.users.tests import seed_users
+
+
+def seed_messages(tenant, recipient, count):
+    """
+    Send count in-app messages from different senders to recipient
+    """
+    from django.contrib.contenttypes.models import ContentType
+
+    from apps.communications.models import Communication, CommunicationChannel
+
+    channel = CommunicationChannel.objects.create(tenant=tenant, name='In-App', code='IN_APP', channel_type='IN_APP')
+    recipient_type = ContentType.objects.get_for_model(recipient)
+    messages = [
+        Communication(
+            tenant=tenant, channel=channel, sender=sender, recipient_type=recipient_type,
+            recipient_id=recipient.pk, subject=f'Message {n}', content='Hello',
+        )
+        for n, sender in enumerate(seed_users(tenant, count, prefix='sender'))
+    ]
+    Communication.objects.bulk_create_secure(messages, tenant=tenant, audit=False)
+    return messages
+
+
+class CommunicationQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_messages(self.tenant, self.user, 3)
+
+    def test_messages(self):
+        self.assertViewQueryBudget('communications:messages')
+
+    def test_parent_messages(self):
+        self.assertViewQueryBudget('communications:parent_messages')
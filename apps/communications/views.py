@@ -11,6 +11,7 @@ from apps.academics.models import AcademicYear
 
 class CommunicationDashboardView(LoginRequiredMixin, TemplateView):
     template_name = 'communications/dashboard.html'
+    query_budget = 6
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -46,6 +47,7 @@ class MessageListView(LoginRequiredMixin, ListView):
     template_name = 'communications/message_list.html'
     context_object_name = 'messages'
     paginate_by = 20
+    query_budget = 3
 
     def get_queryset(self):
         user = self.request.user
@@ -63,7 +65,7 @@ class MessageListView(LoginRequiredMixin, ListView):
         elif folder == 'drafts':
             queryset = queryset.filter(sender=user, status='DRAFT')
             
-        return queryset.order_by('-created_at')
+        return queryset.select_related('sender').order_by('-created_at')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -107,6 +109,7 @@ class ParentMessageListView(LoginRequiredMixin, ListView):
     model = Communication
     template_name = 'communications/parent_message_list.html'
     context_object_name = 'messages'
+    query_budget = 3
     
     def get_queryset(self):
         # Placeholder for parent messages
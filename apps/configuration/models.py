@@ -11,6 +11,7 @@ from django.urls import reverse
 from encrypted_model_fields.fields import EncryptedCharField, EncryptedTextField
 
 # Import core base models
+from apps.core import config_cache
 from apps.core.models import BaseModel, UUIDModel, TimeStampedModel
 from apps.academics.models import AcademicYear
 
@@ -560,8 +561,7 @@ class FinancialConfiguration(BaseModel):
 
     @classmethod
     def get_for_tenant(cls, tenant):
-        obj, created = cls.objects.get_or_create(tenant=tenant)
-        return obj
+        return config_cache.get_for_tenant(cls, tenant)
 
     def clean(self):
         """Financial configuration validation"""
@@ -688,8 +688,7 @@ class SecurityConfiguration(BaseModel):
 
     @classmethod
     def get_for_tenant(cls, tenant):
-        obj, created = cls.objects.get_or_create(tenant=tenant)
-        return obj
+        return config_cache.get_for_tenant(cls, tenant)
 
     def clean(self):
         """Security configuration validation"""
@@ -791,8 +790,7 @@ class NotificationConfiguration(BaseModel):
 
     @classmethod
     def get_for_tenant(cls, tenant):
-        obj, created = cls.objects.get_or_create(tenant=tenant)
-        return obj
+        return config_cache.get_for_tenant(cls, tenant)
 
     def clean(self):
         """Notification configuration validation"""
@@ -925,8 +923,7 @@ class AppearanceConfiguration(BaseModel):
 
     @classmethod
     def get_for_tenant(cls, tenant):
-        obj, created = cls.objects.get_or_create(tenant=tenant)
-        return obj
+        return config_cache.get_for_tenant(cls, tenant)
 
 
 class IntegrationConfiguration(BaseModel):
@@ -1270,5 +1267,4 @@ class BackupConfiguration(BaseModel):
     # ---------------------------
     @classmethod
     def get_for_tenant(cls, tenant):
-        obj, created = cls.objects.get_or_create(tenant=tenant)
-        return obj
+        return config_cache.get_for_tenant(cls, tenant)
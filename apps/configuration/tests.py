@@ -1,3 +1,30 @@
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.testing import TenantQueryBudgetTestCase
+
+
+def seed_settings(tenant, count):
+    """
+    Create count string settings
+    """
+    from apps.configuration.models import SystemSetting
+
+    settings = [
+        SystemSetting(tenant=tenant, key=f'setting_{n}', name=f'Setting {n}', value_string=str(n))
+        for n in range(count)
+    ]
+    SystemSetting.objects.bulk_create_secure(settings, tenant=tenant, audit=False)
+    return settings
+
+
+class ConfigurationQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_settings(self.tenant, 3)
+
+    def test_dashboard(self):
+        self.assertViewQueryBudget('configuration:dashboard')
+
+    def test_setting_list(self):
+        self.assertViewQueryBudget('configuration:setting_list')
@@ -12,6 +12,7 @@ from .models import (
 class ConfigurationDashboardView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
     template_name = 'configuration/dashboard.html'
     permission_required = 'configuration.view_systemsetting'
+    query_budget = 7
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -32,6 +33,7 @@ class SystemSettingListView(LoginRequiredMixin, PermissionRequiredMixin, ListVie
     template_name = 'configuration/system_setting_list.html'
     context_object_name = 'settings'
     permission_required = 'configuration.view_systemsetting'
+    query_budget = 3
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -1,6 +1,45 @@
 from django.apps import AppConfig
 
 
+def _reset_tenant_context(**kwargs):
+    from apps.core.utils.tenant import clear_tenant
+    clear_tenant()
+
+
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
+
+    def ready(self):
+        from django.utils.module_loading import autodiscover_modules
+        from apps.core import config_cache
+        from apps.core.cache import invalidate_on
+
+        # Cached tenant context (apps.core.context_processors)
+        invalidate_on(('tenants.Tenant', 'tenants.TenantConfiguration'), 'tenant')
+
+        # Objects held in the two-level configuration cache
+        config_cache.track(
+            'tenants.TenantConfiguration',
+            'configuration.FinancialConfiguration',
+            'configuration.SecurityConfiguration',
+            'configuration.NotificationConfiguration',
+            'configuration.AppearanceConfiguration',
+            'configuration.BackupConfiguration',
+            'exams.GradingSystem',
+            'exams.Grade',
+            'library.Library',
+        )
+
+        # Dashboard metrics declared in each app's dashboard module; importing
+        # them registers their cache invalidation in every process
+        autodiscover_modules('dashboard')
+
+        # Celery reuses worker threads between tasks; never let one task's
+        # tenant leak into the next
+        try:
+            from celery.signals import task_prerun, task_postrun
+        except ImportError:
+            return
+        task_prerun.connect(_reset_tenant_context, weak=False)
+        task_postrun.connect(_reset_tenant_context, weak=False)
@@ -1,5 +1,41 @@
-from django_tenants.cache import TenantCache
+# apps/core/cache.py
+"""
+Cache backends and the tenant cache layer.
+
+TenantCache stores entries per tenant together with the version tokens of
+the tags they depend on. Invalidating a tag replaces its token, so every
+entry tagged with it becomes a miss at once, for that tenant only. A miss
+is recomputed by a single worker holding a short lock while the others
+wait for its result. Entries are recomputed early, probabilistically, as
+they approach expiry and are served stale for a grace period while one
+worker refreshes them. TTLs are jittered so entries written together do
+not expire together.
+
+@cached memoizes functions, model methods and view fragments through the
+tenant cache. invalidate_on() connects model signals to tag invalidation.
+"""
+import hashlib
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
 from django.core.cache import cache as default_cache
+from django.db import transaction
+from django.db.models import Model
+from django.http import HttpRequest
+
+from apps.core.utils import metrics
+
+
+logger = logging.getLogger(__name__)
 
 
 def tenant_cache_key(key, key_prefix, version):
@@ -18,11 +54,350 @@ def tenant_cache_key(key, key_prefix, version):
     return f"{key_prefix}:{key}:{version}"
 
 
-class CustomTenantCache(TenantCache):
+class CustomTenantCache(RedisCache):
     """
     Custom tenant-aware cache implementation
     """
     
     def make_key(self, key, version=None):
         key = super().make_key(key, version)
-        return tenant_cache_key(key, self._key_prefix, version or self._version)
\ No newline at end of file
+        return tenant_cache_key(key, self._key_prefix, version or self._version)
+
+
+class InstrumentedCacheMixin:
+    """
+    Report cache hits and misses to the request profiler
+    (apps.core.utils.perf)
+    """
+    _MISSING = object()
+
+    def get(self, key, default=None, version=None):
+        from apps.core.utils.perf import record_cache_lookup
+
+        value = super().get(key, self._MISSING, version=version)
+        if value is self._MISSING:
+            record_cache_lookup(0, 1)
+            return default
+        record_cache_lookup(1, 0)
+        return value
+
+    def get_many(self, keys, version=None):
+        from apps.core.utils.perf import record_cache_lookup
+
+        keys = list(keys)
+        found = super().get_many(keys, version=version)
+        record_cache_lookup(len(found), len(keys) - len(found))
+        return found
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    """
+    Redis cache that reports hits and misses to the request profiler
+    """
+
+
+class LocalLRUCache:
+    """
+    Thread-safe, size-bounded in-process cache with per-entry expiry.
+    Intended as an L1 in front of the shared Redis cache.
+    """
+    _MISSING = object()
+
+    def __init__(self, max_entries=1024, timeout=60):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Return the cached value for key, or default if missing or expired
+        """
+        with self._lock:
+            entry = self._data.get(key, self._MISSING)
+            if entry is self._MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        """
+        Store value under key, evicting the least recently used entry if full
+        """
+        timeout = self.timeout if timeout is None else timeout
+        expires_at = time.monotonic() + timeout if timeout else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Implicit tag carried by every entry, invalidated by invalidate_tenant()
+TENANT_TAG = '*'
+
+
+def _config(name, default):
+    return getattr(settings, 'TENANT_CACHE', {}).get(name, default)
+
+
+def jittered(timeout, jitter=None):
+    """
+    timeout spread by +/- jitter (a fraction) so entries written together
+    do not expire together
+    """
+    if not timeout:
+        return timeout
+    jitter = _config('JITTER', 0.1) if jitter is None else jitter
+    return max(1, int(timeout * (1 + random.uniform(-jitter, jitter))))
+
+
+class TenantCache:
+    """
+    Tenant-scoped cache with tag invalidation and stampede protection
+    """
+    _MISSING = object()
+
+    def __init__(self, alias=None):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias or _config('CACHE_ALIAS', 'default')]
+
+    def _tenant_key(self, tenant=None):
+        if tenant is None:
+            from apps.core.utils.tenant import get_current_tenant
+            tenant = get_current_tenant()
+        if tenant is None:
+            return 'public'
+        return str(getattr(tenant, 'pk', tenant))
+
+    def _entry_key(self, tenant_key, key):
+        return f'tcache:{tenant_key}:{key}'
+
+    def _tag_key(self, tenant_key, tag):
+        return f'tcache:{tenant_key}:tag:{tag}'
+
+    def _lookup(self, tenant_key, key, tags):
+        """
+        (entry, tag tokens) fetched in one round trip. Tags without a token
+        yet are given one.
+        """
+        if isinstance(tags, str):
+            tags = (tags,)
+        tags = sorted({TENANT_TAG, *tags})
+        entry_key = self._entry_key(tenant_key, key)
+        tag_keys = [self._tag_key(tenant_key, tag) for tag in tags]
+        found = self.cache.get_many([entry_key, *tag_keys])
+        tokens = []
+        for tag_key in tag_keys:
+            token = found.get(tag_key)
+            if token is None:
+                self.cache.add(tag_key, uuid.uuid4().hex[:12], None)
+                token = self.cache.get(tag_key)
+            tokens.append(token)
+        return found.get(entry_key), tuple(tokens)
+
+    def get(self, key, default=None, tags=(), tenant=None):
+        entry, tokens = self._lookup(self._tenant_key(tenant), key, tags)
+        if entry is None or entry[1] != tokens:
+            return default
+        return entry[0]
+
+    def set(self, key, value, timeout=None, tags=(), tenant=None, _tokens=None, _delta=0.0):
+        tenant_key = self._tenant_key(tenant)
+        if _tokens is None:
+            _, _tokens = self._lookup(tenant_key, key, tags)
+        timeout = jittered(_config('DEFAULT_TIMEOUT', 300) if timeout is None else timeout)
+        grace = _config('STALE_GRACE', 60)
+        entry = (value, _tokens, time.time() + timeout, _delta)
+        self.cache.set(self._entry_key(tenant_key, key), entry, timeout + grace)
+
+    def delete(self, key, tenant=None):
+        self.cache.delete(self._entry_key(self._tenant_key(tenant), key))
+
+    def _needs_refresh(self, expires_at, delta):
+        """
+        Probabilistic early expiry: the closer an entry is to expiring and
+        the longer it took to compute, the likelier a refresh
+        """
+        beta = _config('EARLY_RECOMPUTE_BETA', 1.0)
+        return time.time() - delta * beta * math.log(1 - random.random()) >= expires_at
+
+    def get_or_set(self, key, compute, timeout=None, tags=(), tenant=None):
+        """
+        Cached value for key, computing it with compute() on a miss. Only one
+        worker per key computes at a time.
+        """
+        tenant_key = self._tenant_key(tenant)
+        entry, tokens = self._lookup(tenant_key, key, tags)
+        valid = entry is not None and entry[1] == tokens
+
+        if valid and not self._needs_refresh(entry[2], entry[3]):
+            metrics.increment('tenant_cache.hit')
+            return entry[0]
+
+        lock_key = self._entry_key(tenant_key, f'lock:{key}')
+        lock_token = uuid.uuid4().hex
+        if self.cache.add(lock_key, lock_token, _config('LOCK_TIMEOUT', 30)):
+            try:
+                metrics.increment('tenant_cache.refresh' if valid else 'tenant_cache.miss')
+                return self._compute(key, compute, timeout, tags, tenant_key, tokens)
+            finally:
+                if self.cache.get(lock_key) == lock_token:
+                    self.cache.delete(lock_key)
+
+        if valid:
+            # Another worker is refreshing it, the current value is still good
+            metrics.increment('tenant_cache.stale')
+            return entry[0]
+
+        value = self._wait_for(tenant_key, key, tags)
+        if value is not self._MISSING:
+            metrics.increment('tenant_cache.waited')
+            return value
+        metrics.increment('tenant_cache.lock_timeout')
+        return self._compute(key, compute, timeout, tags, tenant_key, tokens)
+
+    def _compute(self, key, compute, timeout, tags, tenant_key, tokens):
+        started = time.perf_counter()
+        value = compute()
+        self.set(
+            key, value, timeout, tags, tenant_key,
+            _tokens=tokens, _delta=time.perf_counter() - started,
+        )
+        return value
+
+    def _wait_for(self, tenant_key, key, tags):
+        deadline = time.monotonic() + _config('LOCK_WAIT', 5)
+        interval = 0.02
+        while time.monotonic() < deadline:
+            time.sleep(interval)
+            interval = min(interval * 2, 0.2)
+            entry, tokens = self._lookup(tenant_key, key, tags)
+            if entry is not None and entry[1] == tokens:
+                return entry[0]
+        return self._MISSING
+
+    def invalidate_tags(self, tags, tenant=None):
+        """
+        Invalidate every entry carrying any of tags for a tenant, once the
+        current transaction commits
+        """
+        if isinstance(tags, str):
+            tags = (tags,)
+        tenant_key = self._tenant_key(tenant)
+        tag_keys = {self._tag_key(tenant_key, tag): uuid.uuid4().hex[:12] for tag in tags}
+
+        def _invalidate():
+            self.cache.set_many(tag_keys, None)
+            metrics.increment('tenant_cache.invalidated', len(tag_keys))
+
+        transaction.on_commit(_invalidate)
+
+    def invalidate_tenant(self, tenant=None):
+        self.invalidate_tags((TENANT_TAG,), tenant)
+
+
+tenant_cache = TenantCache()
+
+
+def _key_part(value):
+    if isinstance(value, Model):
+        return f'{value._meta.label_lower}:{value.pk}'
+    if isinstance(value, HttpRequest):
+        user = getattr(value, 'user', None)
+        return f'{value.path}?{value.GET.urlencode()}|{getattr(user, "pk", None)}'
+    return repr(value)
+
+
+def make_key(func, args, kwargs):
+    """
+    Cache key for a call: function name plus a digest of its arguments,
+    with model instances reduced to label and pk
+    """
+    parts = [_key_part(arg) for arg in args]
+    parts.extend(f'{name}={_key_part(value)}' for name, value in sorted(kwargs.items()))
+    digest = hashlib.blake2b('|'.join(parts).encode(), digest_size=10).hexdigest()
+    return f'fn:{func.__module__}.{func.__qualname__}:{digest}'
+
+
+def cached(timeout=None, tags=(), models=(), key=None):
+    """
+    Memoize a function, model method or view fragment in the tenant cache.
+
+    tags are the tags the result depends on; saving or deleting any of
+    models invalidates them (see invalidate_on). key, if given, builds the
+    cache key from the call arguments instead of make_key().
+    """
+    tags = (tags,) if isinstance(tags, str) else tuple(tags)
+
+    def decorator(func):
+        if models:
+            invalidate_on(models, tags)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if key else make_key(func, args, kwargs)
+            return tenant_cache.get_or_set(
+                cache_key, lambda: func(*args, **kwargs), timeout=timeout, tags=tags
+            )
+
+        wrapper.uncached = func
+        wrapper.cache_tags = tags
+        return wrapper
+    return decorator
+
+
+def _instance_tenant(instance):
+    from apps.tenants.models import Tenant
+
+    if isinstance(instance, Tenant):
+        return instance.pk
+    return getattr(instance, 'tenant_id', None)
+
+
+def invalidate_on(models, tags):
+    """
+    Invalidate tags for the affected tenant whenever one of models (labels
+    or classes) is saved, deleted, soft deleted, restored or bulk written
+    """
+    from django.db.models.signals import post_save, post_delete
+    from apps.core.signals import record_soft_deleted, record_restored, records_bulk_created, records_bulk_updated
+
+    tags = (tags,) if isinstance(tags, str) else tuple(tags)
+    labels = frozenset(model if isinstance(model, str) else model._meta.label for model in models)
+
+    def _on_change(sender, instance, raw=False, **kwargs):
+        if not raw and sender._meta.label in labels:
+            tenant_cache.invalidate_tags(tags, _instance_tenant(instance))
+
+    def _on_bulk(sender, tenant_id, **kwargs):
+        if sender._meta.label in labels:
+            tenant_cache.invalidate_tags(tags, tenant_id)
+
+    uid = f'tenant_cache_{"_".join(sorted(labels))}_{"_".join(tags)}'
+    for label in labels:
+        post_save.connect(_on_change, sender=label, weak=False, dispatch_uid=f'{uid}_save_{label}')
+        post_delete.connect(_on_change, sender=label, weak=False, dispatch_uid=f'{uid}_delete_{label}')
+    # These signals are sent with model classes, which may not be loaded yet
+    record_soft_deleted.connect(_on_change, weak=False, dispatch_uid=f'{uid}_soft_delete')
+    record_restored.connect(_on_change, weak=False, dispatch_uid=f'{uid}_restore')
+    records_bulk_created.connect(_on_bulk, weak=False, dispatch_uid=f'{uid}_bulk')
+    records_bulk_updated.connect(_on_bulk, weak=False, dispatch_uid=f'{uid}_bulk_update')
@@ -0,0 +1,212 @@
+# apps/core/config_cache.py
+"""
+Two-level cache for per-tenant configuration objects.
+
+Objects that almost never change (configuration rows, the default grading
+system, the active library) are kept in a process-local LRU (L1) and in
+Redis (L2). Every entry is stamped with its tenant's configuration version,
+a single counter kept in Redis. Saving or deleting any registered model
+bumps the version after commit, which retires every L1 and L2 entry of
+that tenant at once.
+
+Within a request the version is read once (ConfigCacheMiddleware resets
+the per-request memo), so any number of lookups cost one Redis read.
+Outside requests the version is checked on every lookup.
+
+Cached instances are shared by all requests of a process: treat them as
+read-only and fetch a fresh row before modifying one. Instances of models
+with encrypted fields are kept in L1 only, so decrypted secrets never
+reach Redis.
+"""
+import contextvars
+import copy
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from apps.core.cache import LocalLRUCache
+from apps.core.utils import metrics
+
+
+VERSION_KEY = 'config:version:{tenant}'
+
+_NONE = ('none',)
+
+_local_cache = LocalLRUCache(
+    max_entries=getattr(settings, 'CONFIG_CACHE', {}).get('L1_MAX_ENTRIES', 2048),
+    timeout=getattr(settings, 'CONFIG_CACHE', {}).get('L1_TIMEOUT', 300),
+)
+_request_versions = contextvars.ContextVar('config_cache_versions', default=None)
+
+
+def _config(name, default):
+    return getattr(settings, 'CONFIG_CACHE', {}).get(name, default)
+
+
+def _cache():
+    return caches[_config('CACHE_ALIAS', 'default')]
+
+
+def _tenant_key(tenant):
+    if tenant is None:
+        return 'public'
+    return str(getattr(tenant, 'pk', tenant))
+
+
+def begin_request():
+    """
+    Start a fresh per-request version memo
+    """
+    return _request_versions.set({})
+
+
+def end_request(token):
+    _request_versions.reset(token)
+
+
+def get_version(tenant):
+    """
+    Configuration version of a tenant, read from Redis at most once per
+    request
+    """
+    tenant_key = _tenant_key(tenant)
+    memo = _request_versions.get()
+    if memo is not None and tenant_key in memo:
+        return memo[tenant_key]
+
+    version_key = VERSION_KEY.format(tenant=tenant_key)
+    version = _cache().get(version_key)
+    if version is None:
+        _cache().add(version_key, 1, None)
+        version = _cache().get(version_key, 1)
+    metrics.increment('config_cache.version_check')
+    if memo is not None:
+        memo[tenant_key] = version
+    return version
+
+
+@lru_cache(maxsize=None)
+def _has_encrypted_fields(model):
+    from encrypted_model_fields.fields import EncryptedMixin
+
+    return any(isinstance(field, EncryptedMixin) for field in model._meta.concrete_fields)
+
+
+def _shareable(value):
+    """
+    Whether a loaded object may be written to Redis. Instances with
+    encrypted fields hold the decrypted values, so they stay in L1 only.
+    """
+    meta = getattr(value, '_meta', None)
+    return meta is None or not _has_encrypted_fields(meta.concrete_model)
+
+
+def get(name, tenant, loader):
+    """
+    Cached object name for tenant, loading it with loader() on a miss
+    """
+    tenant_key = _tenant_key(tenant)
+    version = get_version(tenant)
+    key = f'config:{tenant_key}:{name}:{version}'
+
+    value = _local_cache.get(key)
+    if value is None:
+        value = _cache().get(key)
+        if value is None:
+            metrics.increment('config_cache.miss')
+            loaded = loader()
+            value = _NONE if loaded is None else loaded
+            if _shareable(loaded):
+                _cache().set(key, value, _config('L2_TIMEOUT', 60 * 60 * 24))
+        else:
+            metrics.increment('config_cache.l2_hit')
+        _local_cache.set(key, value)
+    else:
+        metrics.increment('config_cache.l1_hit')
+
+    if isinstance(value, tuple) and value == _NONE:
+        return None
+    # A shallow copy keeps accidental attribute changes out of the shared entry
+    return copy.copy(value)
+
+
+def get_for_tenant(model, tenant, **defaults):
+    """
+    The tenant's row of a one-per-tenant configuration model, created on
+    first use
+    """
+    def load():
+        obj, _ = model.objects.get_or_create(tenant=tenant, defaults=defaults)
+        return obj
+
+    return get(model._meta.label, tenant, load)
+
+
+def bump_version(tenant):
+    """
+    Retire every cached configuration object of a tenant once the current
+    transaction commits
+    """
+    version_key = VERSION_KEY.format(tenant=_tenant_key(tenant))
+
+    def _bump():
+        if not _cache().add(version_key, 1, None):
+            _cache().incr(version_key)
+        memo = _request_versions.get()
+        if memo is not None:
+            memo.pop(_tenant_key(tenant), None)
+        metrics.increment('config_cache.bump')
+
+    transaction.on_commit(_bump)
+
+
+def _instance_tenant(instance):
+    from apps.tenants.models import Tenant
+
+    if isinstance(instance, Tenant):
+        return instance.pk
+    tenant_id = getattr(instance, 'tenant_id', None)
+    if tenant_id is None:
+        from apps.core.utils.tenant import get_current_tenant
+        return get_current_tenant()
+    return tenant_id
+
+
+_tracked = set()
+
+
+def _on_change(sender, instance, raw=False, **kwargs):
+    if not raw and sender._meta.label in _tracked:
+        bump_version(_instance_tenant(instance))
+
+
+def _on_bulk(sender, tenant_id, **kwargs):
+    if sender._meta.label in _tracked:
+        bump_version(tenant_id)
+
+
+def track(*models):
+    """
+    Bump the tenant's configuration version whenever one of models (labels)
+    is saved, deleted, soft deleted, restored or written by the bulk_*_secure
+    manager methods. QuerySet.update() sends no signal: call bump_version()
+    after updating a tracked model that way.
+    """
+    from django.db.models.signals import post_save, post_delete
+    from apps.core.signals import record_soft_deleted, record_restored, records_bulk_created, records_bulk_updated
+
+    _tracked.update(models)
+    for label in models:
+        post_save.connect(_on_change, sender=label, dispatch_uid=f'config_cache_save_{label}')
+        post_delete.connect(_on_change, sender=label, dispatch_uid=f'config_cache_delete_{label}')
+    record_soft_deleted.connect(_on_change, dispatch_uid='config_cache_soft_delete')
+    record_restored.connect(_on_change, dispatch_uid='config_cache_restore')
+    records_bulk_created.connect(_on_bulk, dispatch_uid='config_cache_bulk_create')
+    records_bulk_updated.connect(_on_bulk, dispatch_uid='config_cache_bulk_update')
+
+
+def get_config_cache_stats():
+    counters = metrics.get_counters('config_cache.')
+    return {name.split('.', 1)[1]: value for name, value in counters.items()}
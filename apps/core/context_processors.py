@@ -1,11 +1,71 @@
 
-from django.core.cache import cache
 from django.conf import settings
 from django_tenants.utils import get_public_schema_name
+from apps.core.cache import tenant_cache
 from apps.core.middleware import get_dynamic_tenant
+from apps.core.utils import metrics
 from apps.core.utils.tenant import get_current_tenant
 
 
+class LazyContextValue:
+    """
+    Context value computed on first template access.
+
+    The template engine calls callables when resolving variables, so the
+    wrapped function only runs if a template actually uses the key. The
+    result is memoized on the request, so repeated renders within the same
+    request (includes, partials) reuse it.
+    """
+    def __init__(self, request, key, func):
+        self.request = request
+        self.key = key
+        self.func = func
+
+    def __call__(self):
+        values = _request_values(self.request)
+        if self.key not in values:
+            values[self.key] = self.func()
+            _record_evaluation(self.request, self.key)
+        return values[self.key]
+
+
+class FileSnapshot:
+    """
+    Serializable stand-in for an image field value (exposes name and url)
+    """
+    __slots__ = ('name', 'url')
+
+    def __init__(self, field_file):
+        self.name = field_file.name
+        self.url = field_file.url
+
+    def __str__(self):
+        return self.url
+
+    def __bool__(self):
+        return bool(self.name)
+
+
+def _request_values(request):
+    if not hasattr(request, '_lazy_context_values'):
+        request._lazy_context_values = {}
+    return request._lazy_context_values
+
+
+def _record_evaluation(request, key):
+    """
+    Record which lazy context keys were actually evaluated for this request
+    """
+    if not hasattr(request, 'context_keys_evaluated'):
+        request.context_keys_evaluated = []
+    request.context_keys_evaluated.append(key)
+    metrics.increment(f'context.evaluated.{key}')
+
+
+def _lazy(request, key, func):
+    return LazyContextValue(request, key, func)
+
+
 def tenant_context(request):
     """
     Enhanced tenant context processor for your Tenant model
@@ -19,17 +79,33 @@ def tenant_context(request):
             'is_public_tenant': True,
         }
     
-    # Cache key for tenant data
-    cache_key = f"tenant_context_{tenant.schema_name}_{tenant.id}"
-    cached_data = cache.get(cache_key)
-    
-    if cached_data:
-        return cached_data
+    # Invalidated when the tenant or its configuration changes (CoreConfig.ready)
+    tenant_data = tenant_cache.get_or_set(
+        'tenant_context', lambda: _build_tenant_snapshot(tenant), 3600, tags='tenant', tenant=tenant
+    )
     
+    context = dict(tenant_data)
+    context.update({
+        # Live objects and time-dependent values are never cached
+        'tenant': tenant,
+        'is_trial': tenant.is_trial,
+        'is_trial_active': tenant.is_trial,
+        'is_subscription_active': tenant.is_subscription_active,
+        
+        # User count
+        'current_users': _lazy(request, 'current_users', lambda: _get_user_count(request, tenant)),
+    })
+    return context
+
+
+def _build_tenant_snapshot(tenant):
+    """
+    Slim, serializable snapshot of tenant data for the template context.
+    Only plain values are stored so nothing model-bound is pickled into Redis.
+    """
     # Build comprehensive tenant context based on your model
     tenant_data = {
         # Basic tenant info
-        'tenant': tenant,
         'tenant_name': tenant.name,
         'display_name': tenant.display_name,
         'tenant_code': tenant.slug,  # Using slug as code
@@ -38,9 +114,6 @@ def tenant_context(request):
         # Status & Plan
         'tenant_status': tenant.status,
         'subscription_plan': tenant.plan,
-        'is_trial': tenant.is_trial,
-        'is_trial_active': tenant.is_trial,
-        'is_subscription_active': tenant.is_subscription_active,
         'tenant_is_active': tenant.is_active,
         
         # Limits
@@ -69,9 +142,6 @@ def tenant_context(request):
         'primary_color': '#3B82F6',
         'secondary_color': '#1E40AF',
         
-        # User count
-        'current_users': tenant.get_user_count() if hasattr(tenant, 'get_user_count') else 0,
-        
         # Public flag
         'is_public_tenant': False,
     }
@@ -81,7 +151,7 @@ def tenant_context(request):
         config = tenant.configuration
         tenant_data.update({
             # Branding from configuration
-            'tenant_logo': config.logo,
+            'tenant_logo': FileSnapshot(config.logo) if config.logo else None,
             'primary_color': config.primary_color,
             'secondary_color': config.secondary_color,
             'theme_color': config.primary_color,
@@ -124,46 +194,43 @@ def tenant_context(request):
     #     'youtube': getattr(tenant, 'youtube_url', None),
     # }
     
-    # Cache for 1 hour (3600 seconds)
-    cache.set(cache_key, tenant_data, 3600)
-    
     return tenant_data
 
 
+def _get_user_count(request, tenant):
+    """
+    Active user count for the tenant, shared by all keys that need it
+    """
+    values = _request_values(request)
+    if '_user_count' not in values:
+        values['_user_count'] = tenant.get_user_count() if hasattr(tenant, 'get_user_count') else 0
+    return values['_user_count']
+
+
 def user_permissions(request):
     """
-    Add user permissions to template context
+    Add user permissions to template context.
+    Expensive values are lazy and only computed if a template uses them.
     """
     context = {}
     
     if not request.user.is_authenticated:
         return context
     
+    user = request.user
+    
     # Add user info
     context.update({
-        'user': request.user,
-        'user_role': getattr(request.user, 'role', None),
-        'user_display_name': request.user.get_full_name() or request.user.username,
+        'user': user,
+        'user_role': getattr(user, 'role', None),
+        'user_display_name': user.get_full_name() or user.username,
     })
     
     # Add permissions
-    try:
-        context['user_permissions'] = request.user.get_all_permissions()
-        
-        # Module access permissions
-        context['can_access'] = {
-            'academics': request.user.has_perm('academics.view_course'),
-            'finance': request.user.has_perm('finance.view_finance'),
-            'library': request.user.has_perm('library.view_book'),
-            'reports': request.user.has_perm('reports.view_report'),
-            'settings': request.user.has_perm('settings.change_settings'),
-            'inventory': request.user.has_perm('inventory.view_item'),
-        }
-        
-    except Exception as e:
-        # Fallback if permissions aren't available
-        context['user_permissions'] = set()
-        context['can_access'] = {}
+    context['user_permissions'] = _lazy(request, 'user_permissions', lambda: _get_all_permissions(user))
+    
+    # Module access permissions
+    context['can_access'] = _lazy(request, 'can_access', lambda: _get_module_access(user))
     
     # Add tenant-specific user data if tenant exists
     tenant = getattr(request, 'tenant', None)
@@ -171,34 +238,76 @@ def user_permissions(request):
         
         # Check user count against limits
         if hasattr(tenant, 'get_user_count') and hasattr(tenant, 'max_users'):
-            context['user_count'] = tenant.get_user_count()
+            context['user_count'] = _lazy(request, 'user_count', lambda: _get_user_count(request, tenant))
             context['user_limit'] = tenant.max_users
-            context['can_add_users'] = tenant.get_user_count() < tenant.max_users
+            context['can_add_users'] = _lazy(
+                request, 'can_add_users',
+                lambda: _get_user_count(request, tenant) < tenant.max_users
+            )
         
         # Add notifications count if notifications app exists
-        try:
-            from apps.notifications.models import Notification
-            unread_notifications = Notification.objects.filter(
-                user=request.user, 
-                is_read=False
-            ).count()
-            context['unread_notifications'] = unread_notifications
-        except (ImportError, Exception):
-            context['unread_notifications'] = 0
+        context['unread_notifications'] = _lazy(
+            request, 'unread_notifications', lambda: _get_unread_notifications(user)
+        )
         
         # Add cart items count if store module is enabled
-        if tenant.configuration and hasattr(tenant.configuration, 'enable_store'):
-            if tenant.configuration.enable_store:
-                try:
-                    from apps.store.models import Cart
-                    cart_items_count = Cart.objects.filter(user=request.user).count()
-                    context['cart_items_count'] = cart_items_count
-                except (ImportError, Exception):
-                    context['cart_items_count'] = 0
+        context['cart_items_count'] = _lazy(
+            request, 'cart_items_count', lambda: _get_cart_items_count(user, tenant)
+        )
     
     return context
 
 
+def _get_all_permissions(user):
+    try:
+        return user.get_all_permissions()
+    except Exception:
+        # Fallback if permissions aren't available
+        return set()
+
+
+def _get_module_access(user):
+    try:
+        return {
+            'academics': user.has_perm('academics.view_course'),
+            'finance': user.has_perm('finance.view_finance'),
+            'library': user.has_perm('library.view_book'),
+            'reports': user.has_perm('reports.view_report'),
+            'settings': user.has_perm('settings.change_settings'),
+            'inventory': user.has_perm('inventory.view_item'),
+        }
+    except Exception:
+        return {}
+
+
+def _get_unread_notifications(user):
+    try:
+        from apps.notifications.models import Notification
+        return Notification.objects.filter(
+            user=user, 
+            is_read=False
+        ).count()
+    except (ImportError, Exception):
+        return 0
+
+
+def _get_cart_items_count(user, tenant):
+    try:
+        if tenant.configuration and getattr(tenant.configuration, 'enable_store', False):
+            from apps.store.models import Cart
+            return Cart.objects.filter(user=user).count()
+    except (ImportError, Exception):
+        pass
+    return 0
+
+
+def get_evaluated_context_keys(request):
+    """
+    Lazy context keys that were evaluated while handling this request
+    """
+    return list(getattr(request, 'context_keys_evaluated', []))
+
+
 def system_settings(request):
     """
     Add system-wide settings to template context
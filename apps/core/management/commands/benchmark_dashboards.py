@@ -0,0 +1,141 @@
+import asyncio
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from django_tenants.utils import schema_context
+
+from apps.tenants.models import Tenant
+
+# (name, sync URL, async URL)
+DASHBOARDS = (
+    ('master', 'master_dashboard', 'master_dashboard_async'),
+    ('analytics', 'analytics:dashboard', 'analytics:dashboard_async'),
+)
+
+
+async def _asgi_get(application, host, path, cookie):
+    """
+    Serve one GET request through the ASGI application, returning the status
+    """
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', host.encode()), (b'cookie', cookie.encode())],
+        'client': ('127.0.0.1', 0),
+        'server': (host, 80),
+    }
+    finished = asyncio.Event()
+    request_sent = False
+    status = {}
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await finished.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status['code'] = message['status']
+        elif not message.get('more_body'):
+            finished.set()
+
+    await application(scope, receive, send)
+    return status.get('code')
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the latency of the sync and async master and analytics dashboards, '
+        'served through config.asgi, on a seeded tenant'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('tenant', help='Schema name of the tenant to benchmark')
+        parser.add_argument('--user', help='Email of the user to log in as (default: first superuser)')
+        parser.add_argument('--requests', type=int, default=50, help='Timed requests per view (default: 50)')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per view (default: 3)')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        from config.asgi import application
+
+        tenant = Tenant.objects.filter(schema_name=options['tenant']).first()
+        if tenant is None:
+            raise CommandError(f"Tenant {options['tenant']} does not exist")
+        domain = tenant.get_primary_domain()
+        if domain is None:
+            raise CommandError(f'Tenant {tenant.schema_name} has no domain')
+
+        client = Client(HTTP_HOST=domain.domain)
+        with schema_context(tenant.schema_name):
+            from apps.users.models import User
+
+            users = User._base_manager.filter(tenant=tenant)
+            user = (
+                users.filter(email=options['user']).first() if options['user']
+                else users.filter(is_superuser=True).first()
+            )
+            if user is None:
+                raise CommandError('No user to log in as, pass --user')
+            client.force_login(user)
+        cookie = f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+        async def measure(path):
+            for _ in range(options['warmup']):
+                await _asgi_get(application, domain.domain, path, cookie)
+            timings = []
+            for _ in range(options['requests']):
+                started = time.perf_counter()
+                status = await _asgi_get(application, domain.domain, path, cookie)
+                timings.append((time.perf_counter() - started) * 1000)
+                if status != 200:
+                    raise CommandError(f'{path} returned {status}')
+            return timings
+
+        rows = []
+        try:
+            for name, sync_url, async_url in DASHBOARDS:
+                for variant, url_name in (('sync', sync_url), ('async', async_url)):
+                    timings = asyncio.run(measure(reverse(url_name)))
+                    rows.append({
+                        'dashboard': name,
+                        'variant': variant,
+                        'requests': len(timings),
+                        'mean_ms': round(statistics.fmean(timings), 2),
+                        'p50_ms': round(statistics.median(timings), 2),
+                        'p95_ms': round(statistics.quantiles(timings, n=20)[-1], 2) if len(timings) > 1 else round(timings[0], 2),
+                    })
+        finally:
+            with schema_context(tenant.schema_name):
+                client.logout()
+
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+
+        self.stdout.write(f"{'dashboard':<12} {'variant':<8} {'n':>5} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+        for row in rows:
+            self.stdout.write(
+                f"{row['dashboard']:<12} {row['variant']:<8} {row['requests']:>5} "
+                f"{row['mean_ms']:>9} {row['p50_ms']:>9} {row['p95_ms']:>9}"
+            )
+        for name, _, _ in DASHBOARDS:
+            sync_row, async_row = (row for row in rows if row['dashboard'] == name)
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: sync p50 / async p50 = {sync_row['p50_ms'] / async_row['p50_ms']:.2f}"
+            ))
@@ -0,0 +1,45 @@
+import json
+
+from django.core.management.base import BaseCommand
+from apps.core.utils.perf import get_performance_report, reset
+
+
+class Command(BaseCommand):
+    help = 'Show rolling request performance percentiles per view and tenant'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--view', help='Only views whose name contains this text')
+        parser.add_argument('--tenant', help='Only this tenant schema')
+        parser.add_argument('--sort', default='wall_ms_p95', help='Column to sort by (default: wall_ms_p95)')
+        parser.add_argument('--limit', type=int, default=25)
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+        parser.add_argument('--reset', action='store_true', help='Discard collected samples after reporting')
+
+    def handle(self, *args, **options):
+        rows = get_performance_report(
+            view=options['view'],
+            tenant=options['tenant'],
+            sort=options['sort'],
+            limit=options['limit'],
+        )
+
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+        else:
+            header = (
+                f"{'view':<45} {'tenant':<15} {'n':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+                f"{'db p95':>8} {'q p95':>6} {'dup':>5} {'rep':>5} {'tpl p95':>8} {'cache':>6}"
+            )
+            self.stdout.write(header)
+            for row in rows:
+                ratio = row['cache_hit_ratio']
+                self.stdout.write(
+                    f"{row['view'][:45]:<45} {row['tenant'][:15]:<15} {row['count']:>6} "
+                    f"{row['wall_ms_p50']:>8} {row['wall_ms_p95']:>8} {row['wall_ms_p99']:>8} "
+                    f"{row['db_ms_p95']:>8} {row['queries_p95']:>6g} {row['duplicates_avg']:>5} {row['repeated_avg']:>5} "
+                    f"{row['template_ms_p95']:>8} {'-' if ratio is None else f'{ratio:.0%}':>6}"
+                )
+
+        if options['reset']:
+            reset()
+        self.stdout.write(self.style.SUCCESS(f'{len(rows)} view(s) reported'))
@@ -0,0 +1,146 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django_tenants.utils import schema_context, get_public_schema_name
+
+from apps.core.models import CryptographicModel
+from apps.core.utils.signatures import verify_integrity
+
+
+def _has_tenant(model):
+    return any(field.name == 'tenant' for field in model._meta.concrete_fields)
+
+
+def _signed_models(labels=None):
+    """
+    Split signed models into tenant-schema models and shared models that
+    carry a tenant foreign key
+    """
+    tenant_models, shared_models = [], []
+    for model in apps.get_models():
+        if not issubclass(model, CryptographicModel) or model._meta.proxy or not model._meta.managed:
+            continue
+        if labels and model._meta.label_lower not in labels:
+            continue
+        app_name = model._meta.app_config.name
+        if app_name in settings.TENANT_APPS and app_name not in settings.SHARED_APPS:
+            tenant_models.append(model)
+        elif _has_tenant(model):
+            shared_models.append(model)
+    return tenant_models, shared_models
+
+
+def _verify_table(schema_name, model, tenant_id, chunk_size, resign):
+    """
+    Verify one table inside one schema. Runs in a worker thread, which
+    owns its own database connection.
+    """
+    try:
+        with schema_context(schema_name):
+            queryset = model._base_manager.all()
+            if tenant_id:
+                queryset = queryset.filter(tenant_id=tenant_id)
+            report = verify_integrity(queryset, chunk_size=chunk_size)
+            if resign and report.mismatched:
+                _resign(model, report.mismatched, chunk_size)
+            return schema_name, report
+    finally:
+        connection.close()
+
+
+def _resign(model, pks, chunk_size):
+    for start in range(0, len(pks), chunk_size):
+        instances = list(model._base_manager.filter(pk__in=pks[start:start + chunk_size]))
+        for instance in instances:
+            instance.data_signature = instance.calculate_signature()
+        model._base_manager.bulk_update(instances, ['data_signature'])
+
+
+class Command(BaseCommand):
+    help = 'Verify data integrity signatures for every signed table of one or more tenants'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant',
+            action='append',
+            dest='schemas',
+            help='Schema name of a tenant to verify (repeatable). Defaults to all tenants.'
+        )
+        parser.add_argument(
+            '--model',
+            action='append',
+            dest='models',
+            help='Limit to a model, e.g. students.Student (repeatable).'
+        )
+        parser.add_argument('--workers', type=int, default=4, help='Tables verified in parallel.')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched per round trip.')
+        parser.add_argument(
+            '--resign',
+            action='store_true',
+            help='Rewrite mismatched signatures, e.g. after changing the signature scheme.'
+        )
+        parser.add_argument('--show', type=int, default=10, help='Mismatched ids listed per table.')
+
+    def handle(self, *args, **options):
+        from apps.tenants.models import Tenant
+
+        tenants = Tenant.all_objects.exclude(schema_name=get_public_schema_name())
+        if options['schemas']:
+            tenants = tenants.filter(schema_name__in=options['schemas'])
+        tenants = list(tenants)
+        if not tenants:
+            raise CommandError('No matching tenants found')
+
+        labels = {label.lower() for label in options['models'] or []}
+        tenant_models, shared_models = _signed_models(labels)
+
+        jobs = []
+        for tenant in tenants:
+            jobs += [
+                (tenant.schema_name, model, tenant.id if _has_tenant(model) else None)
+                for model in tenant_models
+            ]
+            jobs += [(get_public_schema_name(), model, tenant.id) for model in shared_models]
+
+        self.stdout.write(f'Verifying {len(jobs)} table(s) across {len(tenants)} tenant(s)')
+
+        checked = unsigned = mismatched = 0
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+            futures = {
+                executor.submit(
+                    _verify_table, schema_name, model, tenant_id,
+                    options['chunk_size'], options['resign']
+                ): (schema_name, model)
+                for schema_name, model, tenant_id in jobs
+            }
+            for future in as_completed(futures):
+                schema_name, model = futures[future]
+                try:
+                    schema_name, report = future.result()
+                except Exception as exc:
+                    self.stdout.write(self.style.ERROR(f'  {schema_name}:{model._meta.label} failed: {exc}'))
+                    continue
+
+                checked += report.checked
+                unsigned += report.unsigned
+                mismatched += len(report.mismatched)
+                if report.mismatched:
+                    ids = ', '.join(str(pk) for pk in report.mismatched[:options['show']])
+                    self.stdout.write(self.style.ERROR(
+                        f'  {schema_name}:{report.label} {len(report.mismatched)} mismatched '
+                        f'of {report.checked}: {ids}'
+                    ))
+                elif report.unsigned:
+                    self.stdout.write(self.style.WARNING(
+                        f'  {schema_name}:{report.label} {report.unsigned} unsigned of {report.checked}'
+                    ))
+
+        summary = f'Checked {checked} row(s): {mismatched} mismatched, {unsigned} unsigned'
+        if mismatched and not options['resign']:
+            raise CommandError(summary)
+        if mismatched:
+            summary += ' (re-signed)'
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -160,7 +160,331 @@ class AuditManager(models.Manager):
         return self.get_queryset().filter(severity__in=['HIGH', 'CRITICAL'])
 
 
-class TenantSoftDeleteManager(SoftDeleteManager, TenantManager):
+class SecureBulkManagerMixin:
+    """
+    Bulk write paths that keep the BaseModel invariants: tenant assignment
+    and isolation, created_by/updated_by, data_signature, usage counters and
+    a single summarized audit entry per call.
+
+    Rows are not passed through full_clean(); as with trusted validation,
+    unique, constraint and foreign key checks are left to the database.
+    """
+    SOFT_DELETE_FIELDS = ('is_active', 'deleted_at', 'deleted_by', 'deletion_reason', 'deletion_category')
+
+    def bulk_create_secure(self, objs, batch_size=500, user=None, tenant=None,
+                           ignore_conflicts=False, audit=True):
+        """
+        Insert objs in batches after filling tenant, audit user and signature
+        """
+        from django.db import transaction
+        from apps.core.utils.signatures import sign_many
+
+        objs = list(objs)
+        if not objs:
+            return []
+
+        with transaction.atomic(using=self.db):
+            self._prepare_bulk(objs, user, tenant, creating=True)
+            sign_many(objs)
+            created = self.model._base_manager.db_manager(self.db).bulk_create(
+                objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts
+            )
+            self._bulk_created(objs, None if ignore_conflicts else objs)
+            if audit:
+                self._audit_bulk('BULK_CREATE', objs, user, batch_size=batch_size)
+        return created
+
+    def bulk_update_secure(self, objs, fields, batch_size=500, user=None, tenant=None, audit=True):
+        """
+        Update fields on objs in batches, refreshing updated_by/updated_at and
+        the data signature of every row
+        """
+        from django.db import transaction
+        from apps.core.utils.signatures import sign_many, touches_signed_fields
+
+        objs = list(objs)
+        if not objs:
+            return 0
+
+        fields = list(fields)
+        with transaction.atomic(using=self.db):
+            self._prepare_bulk(objs, user, tenant, creating=False)
+            if user and self._has_field('updated_by') and 'updated_by' not in fields:
+                fields.append('updated_by')
+            if self._has_field('updated_at'):
+                now = timezone.now()
+                for obj in objs:
+                    obj.updated_at = now
+                if 'updated_at' not in fields:
+                    fields.append('updated_at')
+            if touches_signed_fields(self.model, fields):
+                sign_many(objs)
+                fields.append('data_signature')
+            updated = self.model._base_manager.db_manager(self.db).bulk_update(
+                objs, fields, batch_size=batch_size
+            )
+            self._bulk_updated(objs)
+            if audit:
+                self._audit_bulk('BULK_UPDATE', objs, user, batch_size=batch_size, fields=fields)
+        return updated
+
+    def bulk_upsert_secure(self, objs, unique_fields=None, update_fields=None, batch_size=500,
+                           user=None, tenant=None, audit=True):
+        """
+        Insert objs, updating rows that already exist (INSERT ... ON CONFLICT).
+
+        Conflicts are detected on unique_fields, by default the model's first
+        unique_together. Existing rows keep their primary key, creator and
+        soft-delete state unless those fields are listed in update_fields.
+        With update_fields=[] existing rows are left untouched, like
+        get_or_create, and returned as stored. objs must not repeat a
+        unique key: one statement cannot update a row twice.
+        """
+        from django.db import transaction
+        from apps.core.utils.signatures import sign_many
+
+        objs = list(objs)
+        if not objs:
+            return []
+
+        unique_fields = list(unique_fields or self._conflict_fields())
+        if update_fields is not None and not update_fields:
+            return self._bulk_insert_missing(objs, unique_fields, batch_size, user, tenant, audit)
+        if update_fields is None:
+            excluded = set(unique_fields) | set(self.SOFT_DELETE_FIELDS) | {'tenant', 'created_by'}
+            update_fields = [
+                field.name for field in self.model._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in excluded
+                and not getattr(field, 'auto_now_add', False)
+            ]
+        update_fields = list(update_fields)
+        if 'data_signature' not in update_fields:
+            update_fields.append('data_signature')
+
+        with transaction.atomic(using=self.db):
+            self._prepare_bulk(objs, user, tenant, creating=True)
+            self._check_unique_keys(objs, unique_fields)
+            existing = self._match_existing(objs, unique_fields)
+            sign_many(objs)
+            rows = self.model._base_manager.db_manager(self.db).bulk_create(
+                objs,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=update_fields,
+            )
+            if existing:
+                # Rows that were updated in place may keep values that were
+                # not in update_fields, so they are re-signed from the database
+                stored = list(self.model._base_manager.db_manager(self.db).filter(pk__in=existing))
+                sign_many(stored)
+                self.model._base_manager.db_manager(self.db).bulk_update(
+                    stored, ['data_signature'], batch_size=batch_size
+                )
+            self._bulk_created(objs, [obj for obj in objs if obj.pk not in existing])
+            self._bulk_updated([obj for obj in objs if obj.pk in existing])
+            if audit:
+                self._audit_bulk(
+                    'BULK_UPSERT', objs, user, batch_size=batch_size,
+                    created=len(objs) - len(existing), updated=len(existing)
+                )
+        return rows
+
+    def _bulk_insert_missing(self, objs, unique_fields, batch_size, user, tenant, audit):
+        """
+        bulk_upsert_secure with nothing to update: insert the rows whose key
+        is not stored yet and return the stored rows for the others
+        """
+        from django.db import transaction
+        from apps.core.utils.signatures import sign_many
+
+        with transaction.atomic(using=self.db):
+            self._prepare_bulk(objs, user, tenant, creating=True)
+            self._check_unique_keys(objs, unique_fields)
+            existing = self._match_existing(objs, unique_fields)
+            missing = [obj for obj in objs if obj.pk not in existing]
+            sign_many(missing)
+            self.model._base_manager.db_manager(self.db).bulk_create(
+                missing, batch_size=batch_size, ignore_conflicts=True
+            )
+            stored = self.model._base_manager.db_manager(self.db).in_bulk(existing)
+            self._bulk_created(missing, None)
+            if audit:
+                self._audit_bulk(
+                    'BULK_UPSERT', objs, user, batch_size=batch_size,
+                    created=len(missing), updated=0
+                )
+        return [stored.get(obj.pk, obj) for obj in objs]
+
+    def _check_unique_keys(self, objs, unique_fields):
+        """
+        Reject a batch that repeats a unique key before it reaches the
+        database, which would fail the whole statement
+        """
+        opts = self.model._meta
+        attnames = [opts.get_field(name).attname for name in unique_fields]
+        seen = set()
+        for obj in objs:
+            key = tuple(getattr(obj, attname) for attname in attnames)
+            if key in seen:
+                raise ValueError(
+                    f'{opts.label} batch repeats {dict(zip(unique_fields, key))}; '
+                    'deduplicate objs before upserting'
+                )
+            seen.add(key)
+
+    def _has_field(self, name):
+        return any(field.name == name for field in self.model._meta.concrete_fields)
+
+    def _conflict_fields(self):
+        """
+        Default ON CONFLICT target: the first unique_together, or the first
+        plain UniqueConstraint
+        """
+        opts = self.model._meta
+        if opts.unique_together:
+            return opts.unique_together[0]
+        for constraint in opts.constraints:
+            if isinstance(constraint, models.UniqueConstraint) and constraint.fields and not constraint.condition:
+                return constraint.fields
+        raise FieldError(
+            f'{opts.label} has no unique_together or UniqueConstraint; pass unique_fields explicitly'
+        )
+
+    def _prepare_bulk(self, objs, user, tenant, creating):
+        """
+        Assign and validate the tenant of every row, and stamp the audit user
+        """
+        from django.core.exceptions import ValidationError
+        from apps.core.utils.tenant import get_current_tenant, is_tenant_active
+
+        tenant = tenant or get_current_tenant()
+        tenant_id = tenant.pk if tenant else None
+        has_created_by = self._has_field('created_by')
+        has_updated_by = self._has_field('updated_by')
+
+        for obj in objs:
+            if not obj.tenant_id:
+                if tenant_id is None:
+                    raise ValidationError(
+                        "Tenant context missing. Ensure tenant middleware is configured."
+                    )
+                obj.tenant_id = tenant_id
+            elif tenant_id and obj.tenant_id != tenant_id:
+                raise ValidationError({
+                    'tenant': 'Tenant mismatch detected. Potential security violation.'
+                })
+            if user:
+                if creating and has_created_by and not obj.created_by_id:
+                    obj.created_by = user
+                if has_updated_by:
+                    obj.updated_by = user
+
+        for obj_tenant_id in {obj.tenant_id for obj in objs}:
+            is_active = is_tenant_active(obj_tenant_id)
+            if is_active is None:
+                raise ValidationError({'tenant': 'Referenced tenant does not exist.'})
+            if not is_active:
+                raise ValidationError({'tenant': 'Cannot create record for inactive tenant.'})
+
+    def _match_existing(self, objs, unique_fields):
+        """
+        Point objs that collide with stored rows at those rows' primary keys
+        so that signatures and returned instances match the database.
+        Returns the set of matched primary keys.
+        """
+        from django.core.exceptions import ValidationError
+
+        opts = self.model._meta
+        attnames = [opts.get_field(name).attname for name in unique_fields]
+        lookup = {
+            f'{attname}__in': {getattr(obj, attname) for obj in objs}
+            for attname in attnames
+        }
+        stored = {
+            tuple(row[:-2]): (row[-2], row[-1])
+            for row in self.model._base_manager.db_manager(self.db)
+            .filter(**lookup).values_list(*attnames, 'pk', 'tenant_id')
+        }
+
+        existing = set()
+        for obj in objs:
+            match = stored.get(tuple(getattr(obj, attname) for attname in attnames))
+            if match is None:
+                continue
+            pk, stored_tenant_id = match
+            if stored_tenant_id != obj.tenant_id:
+                raise ValidationError({
+                    'tenant': 'Tenant mismatch detected. Potential security violation.'
+                })
+            obj.pk = pk
+            existing.add(pk)
+        return existing
+
+    def _bulk_created(self, objs, created):
+        """
+        Notify listeners (e.g. tenant usage counters) of inserted rows
+        """
+        from collections import Counter
+        from apps.core.signals import records_bulk_created
+
+        if created is None:
+            for tenant_id in {obj.tenant_id for obj in objs}:
+                records_bulk_created.send(sender=self.model, tenant_id=tenant_id, count=None)
+            return
+        counts = Counter(obj.tenant_id for obj in created if getattr(obj, 'is_active', True))
+        for tenant_id, count in counts.items():
+            records_bulk_created.send(sender=self.model, tenant_id=tenant_id, count=count)
+
+    def _bulk_updated(self, objs):
+        """
+        Notify listeners (e.g. cached configuration) of rows updated in place
+        """
+        from collections import Counter
+        from apps.core.signals import records_bulk_updated
+
+        for tenant_id, count in Counter(obj.tenant_id for obj in objs).items():
+            records_bulk_updated.send(sender=self.model, tenant_id=tenant_id, count=count)
+
+    def _audit_bulk(self, action, objs, user, **details):
+        """
+        Record one audit entry per tenant summarizing a bulk write
+        """
+        from django.db import connection
+        from django_tenants.utils import get_public_schema_name
+
+        # Audit logs live in tenant schemas
+        if getattr(connection, 'schema_name', None) in (None, get_public_schema_name()):
+            return
+
+        from apps.security.models import AuditLog
+
+        label = self.model._meta.label
+        by_tenant = {}
+        for obj in objs:
+            by_tenant.setdefault(obj.tenant_id, []).append(str(obj.pk))
+        for tenant_id, pks in by_tenant.items():
+            AuditLog.objects.create(
+                tenant_id=tenant_id,
+                event_type=action,
+                event_category='DATA_ACCESS',
+                description=f'{action.replace("_", " ").title()} of {len(pks)} {label} record(s)',
+                user=user,
+                user_role=getattr(user, 'role', '') or '',
+                severity='LOW',
+                outcome='SUCCESS',
+                resource_type=self.model.__name__,
+                metadata={
+                    'model': label,
+                    'count': len(pks),
+                    'sample_ids': pks[:20],
+                    **details,
+                },
+            )
+
+
+class TenantSoftDeleteManager(SecureBulkManagerMixin, SoftDeleteManager, TenantManager):
     """
     Manager that combines soft delete and tenant filtering.
     """
@@ -182,4 +506,47 @@ class TenantSoftDeleteManager(SoftDeleteManager, TenantManager):
         if current_tenant:
             queryset = queryset.filter(tenant=current_tenant)
             
-        return queryset
\ No newline at end of file
+        return queryset
+
+
+class AsyncTenantManagerMixin:
+    """
+    Async query helpers for tenant-aware managers.
+
+    The tenant is captured from the calling coroutine and re-applied in the
+    worker thread together with its schema, so results are always scoped to
+    the right tenant. Group the ORM calls of a view into one arun() (or
+    apps.core.utils.tenant.acall_in_tenant) rather than awaiting Django's
+    aget()/acount()/... one by one: each of those is its own thread hop
+    and does not re-apply the tenant schema.
+    """
+    async def arun(self, func, *args, thread_sensitive=True, **kwargs):
+        """
+        Run func(queryset, *args, **kwargs) under the current tenant
+        """
+        from apps.core.utils.tenant import acall_in_tenant
+
+        def _run():
+            return func(self.get_queryset(), *args, **kwargs)
+
+        return await acall_in_tenant(_run, thread_sensitive=thread_sensitive)
+
+    async def alist(self, *args, **kwargs):
+        """
+        Evaluate a filtered queryset into a list
+        """
+        return await self.arun(lambda queryset: list(queryset.filter(*args, **kwargs)))
+
+
+class AsyncTenantManager(AsyncTenantManagerMixin, TenantManager):
+    """
+    TenantManager with async helpers for async views
+    """
+    pass
+
+
+class AsyncTenantSoftDeleteManager(AsyncTenantManagerMixin, TenantSoftDeleteManager):
+    """
+    TenantSoftDeleteManager with async helpers for async views
+    """
+    pass
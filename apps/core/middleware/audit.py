@@ -0,0 +1,17 @@
+# apps/core/middleware/audit.py
+from apps.core.utils.audit import audit_buffer
+
+
+class AuditBufferMiddleware:
+    """
+    Buffer audit and security events for the whole request and write them
+    once the view's transaction has finished, whether it committed or not.
+    Must sit above any middleware that records events.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with audit_buffer():
+            return self.get_response(request)
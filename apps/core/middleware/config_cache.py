@@ -0,0 +1,19 @@
+# apps/core/middleware/config_cache.py
+from apps.core import config_cache
+
+
+class ConfigCacheMiddleware:
+    """
+    Check each tenant's configuration version at most once per request
+    (see apps.core.config_cache)
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = config_cache.begin_request()
+        try:
+            return self.get_response(request)
+        finally:
+            config_cache.end_request(token)
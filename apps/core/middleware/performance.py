@@ -0,0 +1,74 @@
+# apps/core/middleware/performance.py
+import logging
+
+from django.conf import settings
+from django.db import connection
+
+from apps.core.utils import metrics, perf
+from apps.core.utils.queries import check_budget, get_query_budget
+
+
+logger = logging.getLogger(__name__)
+
+
+class PerformanceMiddleware:
+    """
+    Profile a sample of requests (see apps.core.utils.perf). Place it right
+    after TenantMainMiddleware so the tenant schema is known and the rest
+    of the middleware stack is included in the wall time.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not perf.should_profile():
+            return self.get_response(request)
+
+        profile = perf.RequestProfile()
+        token = perf.activate(profile)
+        try:
+            with connection.execute_wrapper(profile):
+                response = self.get_response(request)
+        finally:
+            perf.deactivate(token)
+
+        view_name = self._view_name(request)
+        perf.record_sample(
+            view_name,
+            getattr(connection, 'schema_name', None) or 'public',
+            profile.finish(),
+        )
+        self._check_queries(request, view_name, profile.analyzer)
+        return response
+
+    def process_template_response(self, request, response):
+        # Runs just before the response is rendered; the post-render
+        # callback marks the end of rendering
+        profile = perf.get_current_profile()
+        if profile is not None:
+            profile.render_started()
+            response.add_post_render_callback(lambda rendered: profile.render_finished())
+        return response
+
+    def _check_queries(self, request, view_name, analyzer):
+        """
+        Log repeated query shapes (likely N+1) and declared budget overruns
+        """
+        config = getattr(settings, 'QUERY_BUDGETS', {})
+        threshold = config.get('NPLUSONE_THRESHOLD', 10)
+        if analyzer.repeated(threshold):
+            metrics.increment('perf.nplusone')
+            logger.warning('Possible N+1 queries in %s: %s', view_name, analyzer.report(threshold))
+
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and config.get('ENFORCE', 'off') != 'off':
+            max_queries, max_repeats = get_query_budget(match.func)
+            if max_queries is not None:
+                check_budget(analyzer, max_queries, max_repeats, view_name)
+
+    def _view_name(self, request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return 'unresolved'
+        return match.view_name or match._func_path
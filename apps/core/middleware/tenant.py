@@ -4,7 +4,10 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django_tenants.utils import get_public_schema_name
 from apps.core.utils.tenant import set_current_tenant, clear_tenant, get_current_tenant
-from apps.tenants.models import Tenant, Domain
+from apps.core.utils.tenant_resolution import (
+    resolve_tenant_by_id, resolve_tenant_by_slug, resolve_tenant_by_host
+)
+from apps.core.utils import metrics
 import jwt
 
 User = get_user_model()
@@ -32,7 +35,7 @@ class TenantMiddleware(MiddlewareMixin):
         tenant = self.get_tenant_from_request(request)
         
         if tenant:
-            # Set tenant in thread-local storage
+            # Set tenant in context-local storage
             set_current_tenant(tenant)
             
             # Attach tenant to request object
@@ -40,12 +43,12 @@ class TenantMiddleware(MiddlewareMixin):
             
             # Store in session for consistency
             if hasattr(request, 'session'):
-                request.session['tenant_id'] = str(tenant.id)
+                self._remember_tenant(request, tenant)
         else:
             # If no tenant found, set to public schema
             request.tenant = None
             if hasattr(request, 'session'):
-                request.session.pop('tenant_id', None)
+                self._remember_tenant(request, None)
 
     def process_response(self, request, response):
         """
@@ -53,6 +56,12 @@ class TenantMiddleware(MiddlewareMixin):
         """
         # Clear tenant context
         clear_tenant()
+
+        # Track how many requests end up writing their session row
+        if hasattr(request, 'session'):
+            metrics.increment('session.requests')
+            if request.session.modified:
+                metrics.increment('session.writes')
         
         # Add tenant headers to response for API clients
         if hasattr(request, 'tenant') and request.tenant:
@@ -67,6 +76,23 @@ class TenantMiddleware(MiddlewareMixin):
         """
         clear_tenant()
 
+    def _remember_tenant(self, request, tenant):
+        """
+        Keep the session's tenant_id in sync with the resolved tenant.
+
+        The session is only touched when the tenant actually changes, so
+        ordinary page views do not mark it modified and trigger a write.
+        """
+        tenant_id = str(tenant.id) if tenant else None
+        if request.session.get('tenant_id') == tenant_id:
+            return
+
+        if tenant_id:
+            request.session['tenant_id'] = tenant_id
+        else:
+            request.session.pop('tenant_id', None)
+        metrics.increment('session.tenant_writes')
+
     def get_tenant_from_request(self, request):
         """
         Extract tenant from request using multiple strategies
@@ -74,10 +100,9 @@ class TenantMiddleware(MiddlewareMixin):
         # Strategy 1: Direct session/header override (for debugging/API)
         tenant_id = self._get_tenant_from_debug_header(request)
         if tenant_id:
-            try:
-                return Tenant.objects.get(id=tenant_id, is_active=True)
-            except (Tenant.DoesNotExist, ValueError):
-                pass
+            tenant = resolve_tenant_by_id(tenant_id)
+            if tenant:
+                return tenant
 
         # Strategy 2: Subdomain-based tenant identification (primary method)
         tenant = self._get_tenant_from_subdomain(request)
@@ -141,22 +166,8 @@ class TenantMiddleware(MiddlewareMixin):
                 return None
             
             # Check if this is a valid tenant domain
-            try:
-                # First, try to get by domain name
-                domain = Domain.objects.select_related('tenant').get(
-                    domain=host,
-                    tenant__is_active=True
-                )
-                return domain.tenant
-            except Domain.DoesNotExist:
-                # Fallback to tenant slug/schema name
-                try:
-                    return Tenant.objects.get(
-                        slug=subdomain,
-                        is_active=True
-                    )
-                except (Tenant.DoesNotExist, Tenant.MultipleObjectsReturned):
-                    pass
+            # First, try to get by domain name, then fall back to tenant slug
+            return resolve_tenant_by_host(host) or resolve_tenant_by_slug(subdomain)
         
         return None
 
@@ -169,20 +180,8 @@ class TenantMiddleware(MiddlewareMixin):
             tenant_header = request.headers.get('Tenant-ID')
         
         if tenant_header:
-            try:
-                return Tenant.objects.get(
-                    id=tenant_header,
-                    is_active=True
-                )
-            except (Tenant.DoesNotExist, ValueError):
-                # Try slug if ID doesn't work
-                try:
-                    return Tenant.objects.get(
-                        slug=tenant_header,
-                        is_active=True
-                    )
-                except (Tenant.DoesNotExist, Tenant.MultipleObjectsReturned):
-                    pass
+            # Try slug if ID doesn't work
+            return resolve_tenant_by_id(tenant_header) or resolve_tenant_by_slug(tenant_header)
         
         return None
 
@@ -194,13 +193,9 @@ class TenantMiddleware(MiddlewareMixin):
             # Method 1: Direct user attribute
             tenant_id = getattr(request.user, 'tenant_id', None)
             if tenant_id:
-                try:
-                    return Tenant.objects.get(
-                        id=tenant_id,
-                        is_active=True
-                    )
-                except Tenant.DoesNotExist:
-                    pass
+                tenant = resolve_tenant_by_id(tenant_id)
+                if tenant:
+                    return tenant
             
             # Method 2: JWT token in Authorization header
             auth_header = request.headers.get('Authorization', '')
@@ -212,11 +207,8 @@ class TenantMiddleware(MiddlewareMixin):
                     decoded = jwt.decode(token, options={"verify_signature": False})
                     tenant_id = decoded.get('tenant_id')
                     if tenant_id:
-                        return Tenant.objects.get(
-                            id=tenant_id,
-                            is_active=True
-                        )
-                except (jwt.DecodeError, jwt.InvalidTokenError, Tenant.DoesNotExist):
+                        return resolve_tenant_by_id(tenant_id)
+                except (jwt.DecodeError, jwt.InvalidTokenError):
                     pass
         
         return None
@@ -228,13 +220,10 @@ class TenantMiddleware(MiddlewareMixin):
         if hasattr(request, 'session'):
             tenant_id = request.session.get('tenant_id')
             if tenant_id:
-                try:
-                    return Tenant.objects.get(
-                        id=tenant_id,
-                        is_active=True
-                    )
-                except (Tenant.DoesNotExist, ValueError):
-                    request.session.pop('tenant_id', None)
+                tenant = resolve_tenant_by_id(tenant_id)
+                if tenant:
+                    return tenant
+                request.session.pop('tenant_id', None)
         
         return None
 
@@ -255,13 +244,7 @@ class TenantMiddleware(MiddlewareMixin):
             
             # Check if this looks like a tenant slug
             if tenant_slug and tenant_slug not in ['static', 'media', 'auth', 'login', 'logout']:
-                try:
-                    return Tenant.objects.get(
-                        slug=tenant_slug,
-                        is_active=True
-                    )
-                except (Tenant.DoesNotExist, Tenant.MultipleObjectsReturned):
-                    pass
+                return resolve_tenant_by_slug(tenant_slug)
         
         return None
 
@@ -276,7 +259,7 @@ class TenantContextMiddleware(MiddlewareMixin):
         Ensure tenant is always available on request
         """
         if not hasattr(request, 'tenant'):
-            # Try to get tenant from current thread context
+            # Try to get tenant from current context
             tenant = get_current_tenant()
             if tenant:
                 request.tenant = tenant
@@ -284,9 +267,23 @@ class TenantContextMiddleware(MiddlewareMixin):
                 request.tenant = None
 
 
+def get_session_write_stats():
+    """
+    Session write load as seen by TenantMiddleware
+    """
+    requests = metrics.get_counter('session.requests')
+    writes = metrics.get_counter('session.writes')
+    return {
+        'requests': requests,
+        'session_writes': writes,
+        'tenant_session_writes': metrics.get_counter('session.tenant_writes'),
+        'writes_per_request': round(writes / requests, 4) if requests else 0.0,
+    }
+
+
 # Helper function for context processors
 def get_dynamic_tenant():
     """
-    Get current tenant from thread-local storage
+    Get current tenant from context-local storage
     """
     return get_current_tenant()
\ No newline at end of file
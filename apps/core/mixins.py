@@ -1,4 +1,11 @@
+import asyncio
+from functools import partial
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.db import transaction
+
+from apps.core.utils.tenant import agather_in_tenant, get_current_tenant
 
 
 class RoleRequiredMixin(UserPassesTestMixin):
@@ -33,3 +40,55 @@ class TenantRequiredMixin:
         # if not getattr(request, 'tenant', None):
         #     return HttpResponseForbidden()
         return super().dispatch(request, *args, **kwargs)
+
+
+class DashboardSectionsMixin:
+    """Build a dashboard's context from independent sections.
+
+    Each section is a function taking the tenant and returning a dict of
+    context values. Sections share no state, so AsyncDashboardMixin can run
+    them concurrently.
+    """
+
+    sections = ()
+
+    def get_sections(self):
+        return self.sections
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        tenant = get_current_tenant()
+        for section in self.get_sections():
+            context.update(section(tenant))
+        return context
+
+
+class AsyncDashboardMixin(DashboardSectionsMixin):
+    """Serve a sectioned dashboard from an async view.
+
+    Sections run concurrently on worker threads under the current tenant
+    (see agather_in_tenant); the template is still rendered synchronously.
+    Put it before the login mixin of the sync view it extends. Dashboards
+    only read, and async views cannot run under ATOMIC_REQUESTS, so requests
+    are not wrapped in a transaction.
+    """
+
+    @transaction.non_atomic_requests
+    async def dispatch(self, request, *args, **kwargs):
+        # request.user is loaded lazily from the session, which is sync only
+        await sync_to_async(lambda: request.user.is_authenticated)()
+        # Access checks return a response directly, handlers a coroutine
+        response = super().dispatch(request, *args, **kwargs)
+        if asyncio.iscoroutine(response):
+            response = await response
+        return response
+
+    async def get(self, request, *args, **kwargs):
+        context = super(DashboardSectionsMixin, self).get_context_data(**kwargs)
+        tenant = get_current_tenant()
+        results = await agather_in_tenant(
+            *(partial(section, tenant) for section in self.get_sections()), tenant=tenant
+        )
+        for values in results:
+            context.update(values)
+        return self.render_to_response(context)
@@ -7,7 +7,10 @@ from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 from django.utils.crypto import get_random_string
 from encrypted_model_fields.fields import EncryptedCharField, EncryptedTextField
-from apps.core.managers import SoftDeleteManager, TenantManager, AuditManager, TenantSoftDeleteManager
+from apps.core.managers import (
+    SoftDeleteManager, TenantManager, AuditManager, TenantSoftDeleteManager,
+    AsyncTenantSoftDeleteManager
+)
 
 
 class UUIDModel(models.Model):
@@ -53,11 +56,25 @@ class CryptographicModel(models.Model):
 
     def calculate_signature(self):
         """Calculate SHA-256 signature for data integrity"""
-        import json
-        from django.core import serializers
-        
-        data = serializers.serialize('json', [self])
-        return hashlib.sha256(data.encode()).hexdigest()
+        from apps.core.utils.signatures import compute_signature
+        return compute_signature(self)
+
+    def save_base(self, raw=False, force_insert=False, force_update=False,
+                  using=None, update_fields=None):
+        """
+        Refresh the signature once every save() override has run, and only
+        when the save writes signed values
+        """
+        from apps.core.utils.signatures import touches_signed_fields
+
+        if not raw and touches_signed_fields(type(self), update_fields):
+            self.data_signature = self.calculate_signature()
+            if update_fields is not None:
+                update_fields = frozenset(update_fields) | {'data_signature'}
+        super().save_base(
+            raw=raw, force_insert=force_insert, force_update=force_update,
+            using=using, update_fields=update_fields
+        )
 
     def verify_integrity(self):
         """Verify data hasn't been tampered with"""
@@ -65,6 +82,14 @@ class CryptographicModel(models.Model):
             return self.data_signature == self.calculate_signature()
         return False
 
+    @classmethod
+    def verify_queryset_integrity(cls, queryset=None, chunk_size=2000):
+        """Verify signatures for a queryset (all rows by default) in one pass"""
+        from apps.core.utils.signatures import verify_integrity
+        if queryset is None:
+            queryset = cls._base_manager.all()
+        return verify_integrity(queryset, chunk_size=chunk_size)
+
 
 class TimeStampedModel(models.Model):
     """
@@ -193,6 +218,9 @@ class SoftDeleteModel(models.Model):
             
         self.save(update_fields=update_fields)
 
+        from apps.core.signals import record_soft_deleted
+        record_soft_deleted.send(sender=self.__class__, instance=self, user=user)
+
         # Log the deletion event
         self._log_deletion_event(user, reason)
 
@@ -207,6 +235,7 @@ class SoftDeleteModel(models.Model):
         """
         Restore soft-deleted record with audit trail
         """
+        was_deleted = not self.is_active
         self.is_active = True
         self.deleted_at = None
         self.deleted_by = None
@@ -218,37 +247,45 @@ class SoftDeleteModel(models.Model):
             'deletion_reason', 'deletion_category'
         ])
 
+        if was_deleted:
+            from apps.core.signals import record_restored
+            record_restored.send(sender=self.__class__, instance=self, user=restored_by)
+
         # Log restoration
         self._log_restoration_event(restored_by)
 
     def _log_deletion_event(self, user, reason):
         """Log deletion for security audit"""
-        from apps.security.models import SecurityEvent
-        SecurityEvent.objects.create(
-            event_type='SOFT_DELETE',
-            severity='MEDIUM',
+        from apps.auth.models import SecurityEvent
+        from apps.core.utils.audit import record_audit_event
+        record_audit_event(SecurityEvent(
+            event_type='soft_delete',
+            severity='medium',
             user=user,
             description=f'{self.__class__.__name__} soft deleted: {reason}',
+            tenant_id=getattr(self, 'tenant_id', None),
             metadata={
                 'model': self.__class__.__name__,
                 'object_id': str(self.pk),
                 'deletion_reason': reason
             }
-        )
+        ))
 
     def _log_restoration_event(self, user):
         """Log restoration for audit trail"""
-        from apps.security.models import SecurityEvent
-        SecurityEvent.objects.create(
-            event_type='RESTORE',
-            severity='LOW',
+        from apps.auth.models import SecurityEvent
+        from apps.core.utils.audit import record_audit_event
+        record_audit_event(SecurityEvent(
+            event_type='restore',
+            severity='low',
             user=user,
             description=f'{self.__class__.__name__} restored',
+            tenant_id=getattr(self, 'tenant_id', None),
             metadata={
                 'model': self.__class__.__name__,
                 'object_id': str(self.pk)
             }
-        )
+        ))
 
 
 class TenantAwareModel(models.Model):
@@ -279,25 +316,23 @@ class TenantAwareModel(models.Model):
         if hasattr(self, 'is_superuser') and self.is_superuser:
             return
 
-        from apps.tenants.models import Tenant
-        from apps.core.utils.tenant import get_current_tenant
+        from apps.core.utils.tenant import get_current_tenant, is_tenant_active
         
         if not self.tenant_id:
             raise ValidationError({
                 'tenant': 'Tenant context is required for all tenant-aware models.'
             })
 
-        # Verify tenant exists and is active
-        try:
-            tenant = Tenant.objects.get(id=self.tenant_id)
-            if not tenant.is_active:
-                raise ValidationError({
-                    'tenant': 'Cannot create record for inactive tenant.'
-                })
-        except Tenant.DoesNotExist:
+        # Verify tenant exists and is active (checked once per request/task)
+        is_active = is_tenant_active(self.tenant_id)
+        if is_active is None:
             raise ValidationError({
                 'tenant': 'Referenced tenant does not exist.'
             })
+        if not is_active:
+            raise ValidationError({
+                'tenant': 'Cannot create record for inactive tenant.'
+            })
 
         # Ensure tenant matches current context (security check)
         current_tenant = get_current_tenant()
@@ -306,11 +341,15 @@ class TenantAwareModel(models.Model):
                 'tenant': 'Tenant mismatch detected. Potential security violation.'
             })
 
-    def save(self, *args, **kwargs):
+    def save(self, *args, trusted=False, **kwargs):
         """
-        Auto-set tenant from context with security validation
+        Auto-set tenant from context with security validation.
+
+        Pass trusted=True (or save inside trusted_validation()) to skip
+        unique, constraint and foreign key checks the database enforces.
         """
         from apps.core.utils.tenant import get_current_tenant
+        from apps.core.utils.validation import is_trusted_validation
         
         # Auto-set tenant if not provided
         if not self.tenant_id:
@@ -325,10 +364,28 @@ class TenantAwareModel(models.Model):
                     )
                 self.tenant = current_tenant
 
-        # Run full validation including tenant checks
-        self.full_clean()
+        # Run validation including tenant checks
+        self.validate_for_save(trusted=trusted or is_trusted_validation())
         super().save(*args, **kwargs)
 
+    def validate_for_save(self, trusted=False):
+        """
+        Model validation run on every save. The tenant foreign key is not
+        re-fetched as clean() already checked it is live.
+        """
+        from apps.core.utils.validation import track_validation_queries
+
+        exclude = {'tenant'}
+        if trusted:
+            exclude.update(
+                field.name for field in self._meta.concrete_fields if field.is_relation
+            )
+        with track_validation_queries(trusted):
+            self.full_clean(exclude=exclude, validate_unique=False, validate_constraints=False)
+            if not trusted:
+                self.validate_unique()
+                self.validate_constraints()
+
 
 class RateLimitedModel(models.Model):
     """
@@ -355,25 +412,18 @@ class RateLimitedModel(models.Model):
 
     def check_rate_limit(self, max_requests=100, window_minutes=60):
         """
-        Check if rate limit is exceeded
+        Check if rate limit is exceeded. Requests are counted in the shared
+        rate limiter (apps.core.utils.ratelimit), not on this row.
         """
-        from django.utils import timezone
         from django.core.exceptions import PermissionDenied
+        from apps.core.utils.ratelimit import Rate, hit
         
-        window_start = timezone.now() - timezone.timedelta(minutes=window_minutes)
-        
-        if self.last_request_at and self.last_request_at > window_start:
-            if self.request_count >= max_requests:
-                raise PermissionDenied(
-                    f"Rate limit exceeded: {max_requests} requests per {window_minutes} minutes"
-                )
-        else:
-            # Reset counter if outside window
-            self.request_count = 0
-        
-        self.request_count += 1
-        self.last_request_at = timezone.now()
-        self.save(update_fields=['request_count', 'last_request_at'])
+        key = self.rate_limit_key or f'{self._meta.label_lower}:{self.pk}'
+        result = hit([(f'model:{key}', Rate(max_requests, window_minutes * 60))])
+        if not result.allowed:
+            raise PermissionDenied(
+                f"Rate limit exceeded: {max_requests} requests per {window_minutes} minutes"
+            )
         
         return True
 
@@ -396,21 +446,22 @@ class BaseSharedModel(UUIDModel, CryptographicModel, TimeStampedModel,
         return f"{self.__class__.__name__}[{self.short_id}]"
 
     def save(self, *args, **kwargs):
-        if not self.data_signature:
-            self.data_signature = self.calculate_signature()
         super().save(*args, **kwargs)
 
     def audit_log(self, action, user, details=None, severity='INFO'):
         from apps.security.models import AuditLog
-        return AuditLog.objects.create(
+        from apps.core.utils.audit import record_audit_event
+        return record_audit_event(AuditLog(
             user=user,
-            action=action,
-            resource=self.__class__.__name__,
+            event_type=action,
+            event_category='DATA_ACCESS',
+            description=f'{action} {self.__class__.__name__}',
+            resource_type=self.__class__.__name__,
             resource_id=str(self.id),
-            details=details or {},
+            metadata=details or {},
             severity=severity,
             ip_address=getattr(user, 'last_login_ip', None)
-        )
+        ))
 
 
 class BaseModel(UUIDModel, CryptographicModel, TimeStampedModel, 
@@ -418,7 +469,7 @@ class BaseModel(UUIDModel, CryptographicModel, TimeStampedModel,
     """
     Complete enterprise-grade base model with all security features
     """
-    objects = TenantSoftDeleteManager()
+    objects = AsyncTenantSoftDeleteManager()
 
     class Meta:
         abstract = True
@@ -436,10 +487,7 @@ class BaseModel(UUIDModel, CryptographicModel, TimeStampedModel,
         """
         Enhanced save with integrity protection
         """
-        # Calculate data integrity signature
-        if not self.data_signature:
-            self.data_signature = self.calculate_signature()
-        
+        # Data integrity signature is refreshed in CryptographicModel.save_base
         super().save(*args, **kwargs)
 
     @classmethod
@@ -457,20 +505,25 @@ class BaseModel(UUIDModel, CryptographicModel, TimeStampedModel,
 
     def audit_log(self, action, user, details=None, severity='INFO'):
         """
-        Comprehensive audit logging
+        Comprehensive audit logging. Returns None while events are buffered
+        (see record_audit_event).
         """
         from apps.security.models import AuditLog
+        from apps.core.utils.audit import record_audit_event
         
-        return AuditLog.objects.create(
+        # Buffered until the end of the request (see apps.core.utils.audit)
+        return record_audit_event(AuditLog(
             user=user,
-            action=action,
-            resource=self.__class__.__name__,
+            event_type=action,
+            event_category='DATA_ACCESS',
+            description=f'{action} {self.__class__.__name__}',
+            resource_type=self.__class__.__name__,
             resource_id=str(self.id),
-            tenant=self.tenant,
-            details=details or {},
+            tenant_id=self.tenant_id,
+            metadata=details or {},
             severity=severity,
             ip_address=getattr(user, 'last_login_ip', None)
-        )
+        ))
 
     def to_secure_dict(self, include_sensitive=False):
         """
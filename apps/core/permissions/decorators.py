@@ -108,13 +108,38 @@ def require_tenant_access():
     return decorator
 
 
+def rate_limit(endpoint=None, rate=None):
+    """
+    Rate limit a function-based view per tenant plan and per user, API
+    token or client IP (see apps.core.utils.ratelimit). endpoint defaults
+    to the view's name; rate overrides the configured user/token rate.
+    """
+    from django.http import HttpResponse
+    from apps.core.utils.ratelimit import check_request
+
+    def decorator(view_func):
+        name = endpoint or f'{view_func.__module__}.{view_func.__name__}'
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            result = check_request(request, endpoint=name, rate=rate)
+            if not result.allowed:
+                response = HttpResponse(
+                    "Rate limit exceeded. Please try again later.", status=429
+                )
+                response['Retry-After'] = str(max(int(result.retry_after + 0.999), 1))
+                return response
+            return view_func(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
+
+
 def rate_limit_by_role(requests_per_minute=60):
     """
     Rate limiting decorator based on user role
     """
-    from django.core.cache import cache
-    from django.http import HttpResponseTooManyRequests
-    import time
+    from django.http import HttpResponse
+    from apps.core.utils.ratelimit import Rate, hit
     
     def decorator(view_func):
         @wraps(view_func)
@@ -132,23 +157,13 @@ def rate_limit_by_role(requests_per_minute=60):
             }
             
             limit = role_limits.get(request.user.role, requests_per_minute)
-            ip = request.META.get('REMOTE_ADDR')
-            user_id = request.user.id
-            
-            # Create cache key
-            cache_key = f"rate_limit:{user_id}:{int(time.time() // 60)}"
+            key = f"role:{request.user.id}:{view_func.__module__}.{view_func.__name__}"
             
-            # Get current count
-            current = cache.get(cache_key, 0)
-            
-            if current >= limit:
-                return HttpResponseTooManyRequests(
-                    "Rate limit exceeded. Please try again later."
+            if not hit([(key, Rate(limit, 60))]).allowed:
+                return HttpResponse(
+                    "Rate limit exceeded. Please try again later.", status=429
                 )
             
-            # Increment counter
-            cache.set(cache_key, current + 1, 60)
-            
             return view_func(request, *args, **kwargs)
         return _wrapped_view
     return decorator
\ No newline at end of file
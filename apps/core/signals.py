@@ -0,0 +1,19 @@
+# apps/core/signals.py
+from django.dispatch import Signal
+
+
+# Sent by SoftDeleteModel.delete() after a record has been soft deleted.
+# Arguments: instance, user
+record_soft_deleted = Signal()
+
+# Sent by SoftDeleteModel.restore() after a soft deleted record is restored.
+# Arguments: instance, user
+record_restored = Signal()
+
+# Sent by the bulk_*_secure manager methods after rows were inserted without
+# going through save(). Arguments: tenant_id, count (None when unknown)
+records_bulk_created = Signal()
+
+# Sent by bulk_update_secure() and bulk_upsert_secure() after stored rows
+# were updated without going through save(). Arguments: tenant_id, count
+records_bulk_updated = Signal()
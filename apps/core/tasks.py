@@ -0,0 +1,11 @@
+from celery import shared_task
+
+
+@shared_task(name='core.write_audit_events', ignore_result=True)
+def write_audit_events(payload):
+    """
+    Write a batch of audit/security events handed off by the request
+    audit buffer (see apps.core.utils.audit)
+    """
+    from apps.core.utils.audit import write_serialized_events
+    write_serialized_events(payload)
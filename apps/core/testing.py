@@ -0,0 +1,141 @@
+# apps/core/testing.py
+"""
+Test helpers for query budgets (see apps.core.utils.queries)
+"""
+import asyncio
+from contextlib import contextmanager
+
+from asgiref.sync import async_to_sync
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import connection
+from django.test import AsyncRequestFactory, RequestFactory, TransactionTestCase
+from django.urls import resolve, reverse
+from django_tenants.test.cases import FastTenantTestCase
+
+from apps.core.utils.queries import QueryAnalyzer, get_query_budget
+
+
+class QueryBudgetMixin:
+    """
+    Assertions for query counts and repeated query shapes
+    """
+    # Applied when a view or method does not declare its own max_repeats
+    default_max_repeats = 5
+
+    @contextmanager
+    def assertQueryBudget(self, max_queries, max_repeats=None, label='block'):
+        """
+        Fail if the block issues more than max_queries queries, or repeats
+        one query shape more than max_repeats times
+        """
+        with QueryAnalyzer() as analyzer:
+            yield analyzer
+        analyzer.check(
+            max_queries,
+            self.default_max_repeats if max_repeats is None else max_repeats,
+            label,
+        )
+
+    def assertMethodQueryBudget(self, method, *args, **kwargs):
+        """
+        Call a method decorated with @query_budget and check its budget
+        """
+        max_queries = getattr(method, 'query_budget', None)
+        self.assertIsNotNone(max_queries, f'{method.__qualname__} declares no query budget')
+        with self.assertQueryBudget(
+            max_queries, getattr(method, 'query_max_repeats', None), method.__qualname__
+        ):
+            return method(*args, **kwargs)
+
+    def assertViewQueryBudget(self, url_name, args=None, kwargs=None, data=None, user=None):
+        """
+        Render a view for the test tenant and check its declared budget
+        """
+        from apps.core.utils.tenant import tenant_context
+
+        path = reverse(url_name, args=args, kwargs=kwargs)
+        match = resolve(path)
+        max_queries, max_repeats = get_query_budget(match.func)
+        self.assertIsNotNone(max_queries, f'{url_name} declares no query budget')
+
+        request = self._build_request(RequestFactory(), path, match, data, user)
+        with tenant_context(self.tenant), self.assertQueryBudget(max_queries, max_repeats, url_name):
+            response = match.func(request, *match.args, **match.kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        self.assertEqual(response.status_code, 200, f'{url_name} returned {response.status_code}')
+        return response
+
+    def renderAsyncView(self, url_name, args=None, kwargs=None, data=None, user=None):
+        """
+        Render an async view for the test tenant. Inside the test transaction
+        concurrent sections fall back to the test connection.
+        """
+        from apps.core.utils.tenant import tenant_context
+
+        path = reverse(url_name, args=args, kwargs=kwargs)
+        match = resolve(path)
+        self.assertTrue(asyncio.iscoroutinefunction(match.func), f'{url_name} is not async')
+
+        request = self._build_request(AsyncRequestFactory(), path, match, data, user)
+        with tenant_context(self.tenant):
+            response = async_to_sync(match.func)(request, *match.args, **match.kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        self.assertEqual(response.status_code, 200, f'{url_name} returned {response.status_code}')
+        return response
+
+    def _build_request(self, factory, path, match, data, user):
+        request = factory.get(path, data or {})
+        request.user = user or self.user
+        request.tenant = self.tenant
+        request.resolver_match = match
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        return request
+
+
+class TenantQueryBudgetTestCase(QueryBudgetMixin, FastTenantTestCase):
+    """
+    Budget tests run against a shared test tenant as a superuser
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Budget Test School'
+        tenant.display_name = 'Budget Test School'
+        tenant.contact_email = 'budget-test@example.com'
+
+    def setUp(self):
+        from apps.users.models import User
+
+        super().setUp()
+        self.user = User.objects.create_superuser(
+            email='budget-admin@example.com', password='budget-test', tenant=self.tenant
+        )
+
+
+class TenantTransactionTestCase(TransactionTestCase):
+    """
+    Runs against a real tenant schema with real commits, for code that
+    depends on commit time (on_commit hooks, deferred constraints, other
+    connections). The schema is created for every test, so keep these few.
+    """
+    schema_name = 'transaction_test'
+
+    def setUp(self):
+        from apps.tenants.models import Tenant
+
+        super().setUp()
+        self.tenant = Tenant(
+            schema_name=self.schema_name, name='Transaction Test School',
+            display_name='Transaction Test School', contact_email='transaction-test@example.com',
+        )
+        self.tenant.save(verbosity=0)
+        connection.set_tenant(self.tenant)
+
+    def tearDown(self):
+        connection.set_schema_to_public()
+        self.tenant.delete(force_drop=True)
+        super().tearDown()
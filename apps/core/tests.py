@@ -1,3 +1,350 @@
-from django.test import TestCase
+import json
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from apps.academics.tests import seed_section
+from apps.core import config_cache
+from apps.core.cache import TenantCache, jittered
+from apps.core.testing import TenantQueryBudgetTestCase, TenantTransactionTestCase
+from apps.core.utils.audit import audit_buffer, record_audit_event
+from apps.core.utils.dashboard_metrics import DashboardMetrics, Metric
+from apps.core.utils.queries import QueryAnalyzer, QueryBudgetExceeded, fingerprint, normalize_sql
+from apps.core.utils.ratelimit import get_request_limits
+from apps.security.tests import seed_security
+
+
+class QueryFingerprintTests(SimpleTestCase):
+
+    def test_literals_share_a_fingerprint(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM students_student WHERE id = 1 AND name = 'a'"),
+            fingerprint("SELECT * FROM students_student WHERE id = 42 AND name = 'it''s'"),
+        )
+
+    def test_in_lists_are_collapsed(self):
+        self.assertEqual(
+            normalize_sql('SELECT 1 FROM t WHERE id IN (%s, %s, %s)'),
+            'SELECT ? FROM t WHERE id IN (...)',
+        )
+
+    def test_different_tables_differ(self):
+        self.assertNotEqual(fingerprint('SELECT 1 FROM a'), fingerprint('SELECT 1 FROM b'))
+
+
+class QueryAnalyzerTests(TestCase):
+
+    def _run(self, times):
+        with QueryAnalyzer() as analyzer:
+            with connection.cursor() as cursor:
+                for value in range(times):
+                    cursor.execute('SELECT %s', [value])
+        return analyzer
+
+    def test_repeated_shapes(self):
+        analyzer = self._run(3)
+        self.assertEqual(analyzer.count, 3)
+        self.assertEqual(analyzer.repeated()[0][1], 3)
+
+    def test_check_raises_over_budget(self):
+        analyzer = self._run(3)
+        analyzer.check(max_queries=3, max_repeats=3)
+        with self.assertRaises(QueryBudgetExceeded):
+            analyzer.check(max_queries=2)
+        with self.assertRaises(QueryBudgetExceeded):
+            analyzer.check(max_repeats=2)
+
+
+class TenantCacheTests(TestCase):
+
+    def setUp(self):
+        self.cache = TenantCache()
+        self.calls = 0
+
+    def _compute(self):
+        self.calls += 1
+        return self.calls
+
+    def test_get_or_set_computes_once(self):
+        for _ in range(3):
+            self.assertEqual(self.cache.get_or_set('key', self._compute, tags='finance', tenant='t1'), 1)
+        self.assertEqual(self.calls, 1)
+
+    def test_tag_invalidation_is_per_tenant(self):
+        self.cache.get_or_set('key', self._compute, tags='finance', tenant='t1')
+        self.cache.get_or_set('key', self._compute, tags='finance', tenant='t2')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cache.invalidate_tags('finance', tenant='t1')
+        self.assertIsNone(self.cache.get('key', tags='finance', tenant='t1'))
+        self.assertEqual(self.cache.get('key', tags='finance', tenant='t2'), 2)
+
+    def test_invalidate_tenant_drops_every_tag(self):
+        self.cache.get_or_set('key', self._compute, tags='library', tenant='t1')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cache.invalidate_tenant('t1')
+        self.assertIsNone(self.cache.get('key', tags='library', tenant='t1'))
+
+    def test_jittered_timeout(self):
+        for _ in range(20):
+            self.assertTrue(90 <= jittered(100, 0.1) <= 110)
+
+
+@override_settings(RATE_LIMITS={'ANON': '100/day', 'USER': '1000/hour', 'ENDPOINTS': {'login': '10/m'}})
+class RequestLimitTests(SimpleTestCase):
+
+    def _request(self, **meta):
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.2', **meta)
+        request.user = AnonymousUser()
+        return request
+
+    def test_anonymous_clients_are_keyed_by_forwarded_ip(self):
+        limits = get_request_limits(self._request(HTTP_X_FORWARDED_FOR='203.0.113.7, 10.0.0.2'))
+        self.assertEqual(limits, [('public:anon:203.0.113.7', '100/day')])
+
+    def test_endpoints_share_one_global_limit(self):
+        self.assertEqual(
+            get_request_limits(self._request(), endpoint='students'),
+            get_request_limits(self._request(), endpoint='library'),
+        )
+
+    def test_endpoint_limit_is_added_to_the_global_one(self):
+        self.assertEqual(get_request_limits(self._request(), endpoint='login'), [
+            ('public:anon:10.0.0.2', '100/day'),
+            ('public:anon:10.0.0.2:login', '10/m'),
+        ])
+
+
+class ConfigCacheTests(TestCase):
+
+    def setUp(self):
+        self.loads = 0
+        cache.clear()
+        config_cache._local_cache.clear()
+
+    def _load(self):
+        self.loads += 1
+        return {'loads': self.loads}
+
+    def test_one_version_check_per_request(self):
+        token = config_cache.begin_request()
+        try:
+            with self.assertNumQueries(0):
+                for _ in range(3):
+                    self.assertEqual(config_cache.get('test.value', 't1', self._load), {'loads': 1})
+        finally:
+            config_cache.end_request(token)
+        self.assertEqual(self.loads, 1)
+
+    def test_bump_retires_entries(self):
+        config_cache.get('test.value', 't1', self._load)
+        with self.captureOnCommitCallbacks(execute=True):
+            config_cache.bump_version('t1')
+        self.assertEqual(config_cache.get('test.value', 't1', self._load), {'loads': 2})
+
+    def test_none_is_cached(self):
+        loads = []
+        for _ in range(2):
+            self.assertIsNone(config_cache.get('test.none', 't1', lambda: loads.append(1)))
+        self.assertEqual(len(loads), 1)
+
+    def test_encrypted_configuration_stays_out_of_redis(self):
+        from apps.configuration.models import NotificationConfiguration
+
+        loaded = NotificationConfiguration(email_password='secret')
+        self.assertEqual(config_cache.get('test.notify', 't1', lambda: loaded).email_password, 'secret')
+        config_cache.get('test.value', 't1', self._load)
+        version = config_cache.get_version('t1')
+        self.assertIsNone(cache.get(f'config:t1:test.notify:{version}'))
+        self.assertEqual(cache.get(f'config:t1:test.value:{version}'), {'loads': 1})
+
+
+class DashboardMetricsTests(TenantQueryBudgetTestCase):
+    user_metrics = DashboardMetrics(
+        Metric('total_users', 'users.User'),
+        Metric('superusers', 'users.User', is_superuser=True),
+        Metric('regular_users', 'users.User', is_staff=False),
+        tags='test_users',
+    )
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_one_query_per_model(self):
+        with self.assertQueryBudget(1):
+            values = self.user_metrics.compute(self.tenant)
+        self.assertEqual(values, {'total_users': 1, 'superusers': 1, 'regular_users': 0})
+
+    def test_cached_until_model_changes(self):
+        from apps.users.models import User
+
+        self.user_metrics.get(self.tenant)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.user_metrics.get(self.tenant)['total_users'], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(email='metrics@example.com', password='x', tenant=self.tenant)
+        self.assertEqual(self.user_metrics.get(self.tenant)['total_users'], 2)
+
+
+class CoreQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_section(self.tenant, 3)
+        seed_security(self.tenant, 3)
+
+    def test_master_dashboard(self):
+        self.assertViewQueryBudget('master_dashboard')
+
+    def test_async_master_dashboard(self):
+        sync_response = self.assertViewQueryBudget('master_dashboard')
+        response = self.renderAsyncView('master_dashboard_async')
+        self.assertEqual(response.context_data.keys(), sync_response.context_data.keys())
+        self.assertEqual(response.content, sync_response.content)
+
+    def test_master_dashboard_snapshot(self):
+        response = self.assertViewQueryBudget('master_dashboard_snapshot')
+        self.assertIn('total_students', json.loads(response.content))
+
+
+class TenantResolutionTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        from apps.core.utils import tenant_resolution
+
+        super().setUp()
+        cache.clear()
+        tenant_resolution._local_cache.clear()
+        tenant_resolution._miss_cache.clear()
+        tenant_resolution._generation['value'] = None
+
+    def test_misses_stay_out_of_shared_caches(self):
+        from apps.core.utils import tenant_resolution
+
+        self.assertIsNone(tenant_resolution.resolve_tenant_by_host('unknown.example.com'))
+        self.assertEqual((len(tenant_resolution._local_cache), len(tenant_resolution._miss_cache)), (0, 1))
+        generation = tenant_resolution._get_generation()
+        self.assertIsNone(cache.get(f'tenant_resolution:{generation}:host:unknown.example.com'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(tenant_resolution.resolve_tenant_by_host('unknown.example.com'))
+
+    def test_saving_a_tenant_expires_hits_and_misses(self):
+        from apps.core.utils.tenant_resolution import resolve_tenant_by_slug
+        from apps.tenants.models import Tenant
+
+        old_slug = self.tenant.slug
+        self.assertEqual(resolve_tenant_by_slug(old_slug).pk, self.tenant.pk)
+        self.assertIsNone(resolve_tenant_by_slug('renamed-school'))
+        with self.assertNumQueries(0):
+            resolve_tenant_by_slug(old_slug)
+
+        tenant = Tenant.objects.get(pk=self.tenant.pk)
+        tenant.slug = 'renamed-school'
+        with self.captureOnCommitCallbacks(execute=True):
+            tenant.save()
+        self.assertIsNone(resolve_tenant_by_slug(old_slug))
+        self.assertEqual(resolve_tenant_by_slug('renamed-school').pk, self.tenant.pk)
+
+
+@override_settings(AUDIT_PIPELINE={'MODE': 'buffered', 'USE_CELERY': False})
+class AuditBufferTests(TenantTransactionTestCase):
+
+    def _event(self, description, **kwargs):
+        from apps.security.models import AuditLog
+
+        return AuditLog(event_type='TEST', event_category='DATA_ACCESS', description=description, **kwargs)
+
+    def _saved(self, description):
+        from apps.security.models import AuditLog
+        from apps.core.utils.tenant import tenant_context
+
+        with tenant_context(self.tenant):
+            return AuditLog.objects.get(description=description)
+
+    def test_buffered_events_are_not_returned(self):
+        from apps.core.utils.tenant import tenant_context
+
+        with tenant_context(self.tenant), audit_buffer():
+            self.assertIsNone(record_audit_event(self._event('buffered')))
+        self.assertEqual(self._saved('buffered').tenant_id, self.tenant.pk)
+
+    def test_flushed_after_the_request_rolls_back(self):
+        from apps.core.utils.tenant import tenant_context
+
+        with tenant_context(self.tenant), audit_buffer():
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                record_audit_event(self._event('rolled back'))
+                raise RuntimeError
+        self.assertEqual(self._saved('rolled back').event_type, 'TEST')
+
+    def test_relations_to_rolled_back_rows_are_detached(self):
+        from apps.users.models import User
+        from apps.core.utils.tenant import tenant_context
+
+        with tenant_context(self.tenant), audit_buffer():
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                user = User.objects.create_user(email='gone@example.com', password='x', tenant=self.tenant)
+                record_audit_event(self._event('detached', user=user))
+                raise RuntimeError
+        event = self._saved('detached')
+        self.assertIsNone(event.user_id)
+        self.assertEqual(event.metadata['detached'], {'user': str(user.pk)})
+
+
+class AsyncGatherTests(TenantTransactionTestCase):
+
+    def test_blocks_run_concurrently_on_their_own_connections(self):
+        import threading
+        from asgiref.sync import async_to_sync
+        from django.db import DEFAULT_DB_ALIAS, connections
+        from apps.core.utils.tenant import agather_in_tenant, get_current_tenant
+
+        # Both blocks have to be running at the same time to get past this
+        barrier = threading.Barrier(2, timeout=5)
+        wrappers = []
+
+        def block():
+            from apps.academics.models import Subject
+
+            barrier.wait()
+            wrappers.append(connections[DEFAULT_DB_ALIAS])
+            return connection.schema_name, get_current_tenant().pk, Subject.objects.count()
+
+        results = async_to_sync(agather_in_tenant)(block, block, tenant=self.tenant)
+        self.assertEqual(results, [(self.schema_name, self.tenant.pk, 0)] * 2)
+        self.assertEqual(len({id(wrapper) for wrapper in wrappers}), 2)
+        # Worker connections are handed back on the public schema
+        self.assertEqual([wrapper.schema_name for wrapper in wrappers], ['public', 'public'])
+        self.assertEqual(connection.schema_name, self.schema_name)
+
+
+class PerformanceReportTests(TenantQueryBudgetTestCase):
+
+    def _report(self, user, **params):
+        from unittest import mock
+        from django.urls import reverse
+        from apps.core.views import PerformanceReportView
+
+        request = RequestFactory().get(reverse('performance_report'), params)
+        request.user = user
+        request.tenant = self.tenant
+        with mock.patch('apps.core.utils.perf.get_performance_report', return_value=[]) as report:
+            response = PerformanceReportView.as_view()(request)
+        return response, report
+
+    def test_superusers_may_filter_any_tenant(self):
+        response, report = self._report(self.user, tenant='other_school')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(report.call_args.kwargs['tenant'], 'other_school')
+
+    def test_staff_only_see_their_own_tenant(self):
+        from apps.users.models import User
+
+        staff = User.objects.create_user(
+            email='perf-staff@example.com', password='x', tenant=self.tenant, is_staff=True
+        )
+        response, report = self._report(staff, tenant='other_school')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(report.call_args.kwargs['tenant'], self.tenant.schema_name)
@@ -0,0 +1,31 @@
+# apps/core/throttling.py
+from rest_framework.throttling import BaseThrottle
+
+from apps.core.utils.ratelimit import check_request
+
+
+class TenantRateThrottle(BaseThrottle):
+    """
+    Throttle API requests with the Redis sliding-window limiter, per tenant
+    plan and per user or API token scope (see apps.core.utils.ratelimit).
+
+    Views can set throttle_scope to share or override a per-endpoint limit
+    (RATE_LIMITS['ENDPOINTS']); otherwise the URL name is the endpoint.
+    """
+
+    def allow_request(self, request, view):
+        result = check_request(request, endpoint=self.get_endpoint(request, view))
+        self.retry_after = result.retry_after
+        return result.allowed
+
+    def get_endpoint(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if scope:
+            return scope
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and match.view_name:
+            return match.view_name
+        return view.__class__.__name__
+
+    def wait(self):
+        return self.retry_after or None
@@ -0,0 +1,221 @@
+# apps/core/utils/audit.py
+"""
+Buffered writer for audit and security events.
+
+Inside a request (see AuditBufferMiddleware) events are collected in a
+context-local buffer instead of being inserted one by one inside the
+request transaction. The buffer is flushed after the view's transaction
+has committed or rolled back, so events are kept even when unrelated work
+fails, and each model/schema pair is written with a single bulk insert.
+Large buffers are handed to a Celery task. Outside a buffer scope, or with
+AUDIT_PIPELINE['MODE'] = 'sync' (e.g. in tests), events are saved
+immediately.
+"""
+import contextvars
+import json
+import logging
+import time
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from apps.core.utils import metrics
+
+
+logger = logging.getLogger(__name__)
+
+_buffer = contextvars.ContextVar('audit_buffer', default=None)
+_high_water = {'value': 0}
+# Set after a failed hand-off so requests do not keep waiting on a dead broker
+_celery_unavailable_until = {'value': 0.0}
+
+
+def _config(name, default):
+    return getattr(settings, 'AUDIT_PIPELINE', {}).get(name, default)
+
+
+def record_audit_event(instance):
+    """
+    Queue an unsaved audit/security event instance for writing. Returns the
+    saved instance when it was written immediately, or None when it was
+    buffered: a buffered instance has no row yet and may still be rewritten
+    (FK detached) at flush time, so callers must not keep or reuse it.
+    """
+    if not instance.tenant_id:
+        from apps.core.utils.tenant import get_current_tenant
+        tenant = get_current_tenant()
+        if tenant is not None:
+            instance.tenant_id = tenant.pk
+
+    event = (getattr(connection, 'schema_name', None), instance)
+    pending = _buffer.get()
+    if pending is None or _config('MODE', 'buffered') == 'sync':
+        metrics.increment('audit.sync_writes')
+        write_events([event])
+        return instance
+
+    pending.append(event)
+    metrics.increment('audit.buffered')
+    if len(pending) > _high_water['value']:
+        _high_water['value'] = len(pending)
+
+    if len(pending) >= _config('MAX_BUFFER', 1000):
+        # Backpressure: hand the backlog to a worker instead of growing
+        # the buffer; it is kept for the final flush if that fails
+        if _dispatch(pending):
+            pending.clear()
+        else:
+            metrics.increment('audit.backpressure')
+    return None
+
+
+@contextmanager
+def audit_buffer():
+    """
+    Collect events recorded in this block and write them when it exits
+    """
+    token = _buffer.set([])
+    try:
+        yield
+    finally:
+        pending = _buffer.get()
+        _buffer.reset(token)
+        flush_events(pending)
+
+
+def flush_events(pending):
+    """
+    Write buffered events, via Celery when there are many of them
+    """
+    if not pending:
+        return
+    if len(pending) >= _config('CELERY_THRESHOLD', 200) and _dispatch(pending):
+        return
+    write_events(pending)
+
+
+def write_events(pending):
+    """
+    Bulk insert events grouped by schema and model, each group in its own
+    transaction. A failing group is retried row by row so one bad event
+    cannot take the others down with it.
+    """
+    from django_tenants.utils import schema_context, get_public_schema_name
+    from apps.core.utils.tenant import tenant_context
+
+    groups = {}
+    for schema_name, instance in pending:
+        groups.setdefault((schema_name or get_public_schema_name(), type(instance)), []).append(instance)
+
+    for (schema_name, model), instances in groups.items():
+        with schema_context(schema_name), tenant_context(None):
+            try:
+                with transaction.atomic():
+                    model.objects.bulk_create_secure(instances, audit=False)
+                metrics.increment('audit.flush_batches')
+                metrics.increment('audit.flushed', len(instances))
+            except Exception:
+                logger.warning('Bulk audit write failed for %s, retrying per event', model._meta.label)
+                for instance in instances:
+                    _write_one(instance)
+
+
+def _write_one(instance):
+    """
+    Insert a single event. Events pointing at rows that no longer exist
+    (e.g. a user created in a rolled back transaction) are kept with the
+    relation cleared and the original id preserved in metadata.
+    """
+    try:
+        with transaction.atomic():
+            instance.save_base(force_insert=True)
+        metrics.increment('audit.flushed')
+        return
+    except Exception:
+        pass
+
+    detached = {}
+    for field in instance._meta.concrete_fields:
+        if field.is_relation and field.null and getattr(instance, field.attname) is not None:
+            detached[field.name] = str(getattr(instance, field.attname))
+            setattr(instance, field.attname, None)
+    if hasattr(instance, 'metadata') and isinstance(instance.metadata, dict):
+        instance.metadata = {**instance.metadata, 'detached': detached}
+
+    try:
+        with transaction.atomic():
+            instance.save_base(force_insert=True)
+        metrics.increment('audit.fk_detached')
+        metrics.increment('audit.flushed')
+    except Exception:
+        metrics.increment('audit.failed')
+        logger.exception(
+            'Could not write %s event: %s', instance._meta.label, _serialize_instance(instance)
+        )
+
+
+def _serialize_instance(instance):
+    return {
+        field.attname: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+    }
+
+
+def serialize_events(pending):
+    return json.dumps(
+        [
+            {
+                'model': instance._meta.label,
+                'schema': schema_name,
+                'fields': _serialize_instance(instance),
+            }
+            for schema_name, instance in pending
+        ],
+        cls=DjangoJSONEncoder,
+    )
+
+
+def write_serialized_events(payload):
+    """
+    Rebuild and write events serialized by serialize_events()
+    """
+    pending = []
+    for event in json.loads(payload):
+        model = apps.get_model(event['model'])
+        pending.append((event['schema'], model(**event['fields'])))
+    write_events(pending)
+
+
+def _dispatch(pending):
+    """
+    Send events to a Celery worker. Returns False if no broker is reachable.
+    """
+    if not _config('USE_CELERY', True):
+        return False
+    if time.monotonic() < _celery_unavailable_until['value']:
+        metrics.increment('audit.celery_skipped')
+        return False
+    try:
+        from apps.core.tasks import write_audit_events
+        write_audit_events.apply_async(args=[serialize_events(pending)], retry=False)
+    except Exception:
+        metrics.increment('audit.celery_failed')
+        _celery_unavailable_until['value'] = time.monotonic() + _config('CELERY_RETRY_AFTER', 60)
+        logger.warning('Audit events could not be queued, writing them inline', exc_info=True)
+        return False
+    metrics.increment('audit.celery_dispatched', len(pending))
+    return True
+
+
+def get_audit_stats():
+    """
+    Buffering, flush and backpressure counters for the audit pipeline
+    """
+    counters = metrics.get_counters('audit.')
+    stats = {name.split('.', 1)[1]: value for name, value in counters.items()}
+    stats['buffer_high_water'] = _high_water['value']
+    stats['pending'] = len(_buffer.get() or [])
+    return stats
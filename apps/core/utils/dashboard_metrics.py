@@ -0,0 +1,131 @@
+# apps/core/utils/dashboard_metrics.py
+"""
+Declarative dashboard metrics compiled into conditional aggregates.
+
+An app declares its dashboard figures as Metric objects (a model, the
+lookups a row must match and, for sums, the field to add up). All metrics
+on the same model are computed by a single
+``aggregate(Count('pk', filter=Q(...)), Sum(field, filter=Q(...)), ...)``
+query, so a dashboard costs one query per table instead of one per figure.
+
+DashboardMetrics caches the results per tenant in the tenant cache
+(apps.core.cache) under its tags, which are invalidated whenever one of the
+models is saved or deleted.
+"""
+import logging
+from collections import defaultdict
+
+from django.apps import apps
+from django.db.models import Count, Q, Sum
+
+from apps.core.cache import invalidate_on, tenant_cache
+from apps.core.utils import metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+class Metric:
+    """
+    A dashboard figure: rows of model matching lookups, counted or summed.
+    Lookup values may be callables, evaluated each time the metric is
+    computed (e.g. timezone.localdate).
+    """
+    __slots__ = ('name', 'model', 'sum_field', 'lookups')
+
+    def __init__(self, name, model, sum_field=None, **lookups):
+        self.name = name
+        self.model = model
+        self.sum_field = sum_field
+        self.lookups = lookups
+
+    @property
+    def label(self):
+        return self.model if isinstance(self.model, str) else self.model._meta.label
+
+    def get_model(self):
+        return apps.get_model(self.model) if isinstance(self.model, str) else self.model
+
+    def resolved_lookups(self):
+        return {
+            lookup: value() if callable(value) else value
+            for lookup, value in self.lookups.items()
+        }
+
+    def aggregate(self):
+        lookups = self.resolved_lookups()
+        condition = Q(**lookups) if lookups else None
+        if self.sum_field:
+            return Sum(self.sum_field, filter=condition, default=0)
+        return Count('pk', filter=condition)
+
+
+def compute_metrics(metric_list, queryset_for):
+    """
+    {metric name: value}, one aggregate query per model. queryset_for(model)
+    returns the rows to aggregate over.
+    """
+    by_model = defaultdict(list)
+    for metric in metric_list:
+        by_model[metric.label].append(metric)
+
+    values = {}
+    for label, model_metrics in by_model.items():
+        queryset = queryset_for(model_metrics[0].get_model())
+        values.update(queryset.aggregate(**{
+            metric.name: metric.aggregate() for metric in model_metrics
+        }))
+    return values
+
+
+class DashboardMetrics:
+    """
+    The metrics of one dashboard, computed together and cached per tenant
+    """
+
+    def __init__(self, *metric_list, tags=(), timeout=300):
+        self.metrics = metric_list
+        self.tags = (tags,) if isinstance(tags, str) else tuple(tags)
+        self.timeout = timeout
+        self.key = f'dashboard_metrics:{":".join(self.tags)}'
+        invalidate_on({metric.label for metric in metric_list}, self.tags)
+
+    @property
+    def query_count(self):
+        """
+        Queries issued when the metrics are not cached
+        """
+        return len({metric.label for metric in self.metrics})
+
+    def compute(self, tenant):
+        """
+        Uncached values. Rows come from each model's default manager, so soft
+        deleted rows are left out as everywhere else.
+        """
+        def queryset_for(model):
+            return model._default_manager.filter(tenant=tenant)
+
+        values = compute_metrics(self.metrics, queryset_for)
+        metrics.increment('dashboard_metrics.queries', self.query_count)
+        logger.debug('Computed %s with %d queries', self.key, self.query_count)
+        return values
+
+    def get(self, tenant):
+        """
+        Cached values for a tenant
+        """
+        metrics.increment('dashboard_metrics.requests')
+        return tenant_cache.get_or_set(
+            self.key, lambda: self.compute(tenant), self.timeout, tags=self.tags, tenant=tenant
+        )
+
+
+def get_dashboard_metrics_stats():
+    """
+    Requests served and queries issued by DashboardMetrics
+    """
+    counters = metrics.get_counters('dashboard_metrics.')
+    stats = {name.split('.', 1)[1]: value for name, value in counters.items()}
+    requests = stats.get('requests', 0)
+    stats['queries_per_request'] = round(stats.get('queries', 0) / requests, 3) if requests else 0.0
+    return stats
@@ -0,0 +1,47 @@
+# apps/core/utils/metrics.py
+"""
+Lightweight in-process counters for performance instrumentation
+"""
+import threading
+from collections import defaultdict
+
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+
+
+def increment(name, value=1):
+    """
+    Increment a named counter
+    """
+    with _lock:
+        _counters[name] += value
+
+
+def get_counter(name):
+    """
+    Get the current value of a named counter
+    """
+    return _counters.get(name, 0)
+
+
+def get_counters(prefix=None):
+    """
+    Get a snapshot of all counters, optionally filtered by name prefix
+    """
+    with _lock:
+        if prefix is None:
+            return dict(_counters)
+        return {name: value for name, value in _counters.items() if name.startswith(prefix)}
+
+
+def reset_counters(prefix=None):
+    """
+    Reset counters, optionally only those matching a name prefix
+    """
+    with _lock:
+        if prefix is None:
+            _counters.clear()
+            return
+        for name in [name for name in _counters if name.startswith(prefix)]:
+            del _counters[name]
@@ -0,0 +1,282 @@
+# apps/core/utils/perf.py
+"""
+Per-request performance profiles and rolling percentiles.
+
+PerformanceMiddleware profiles a sample of requests: wall time, database
+time, query and duplicate query counts, repeated query shapes (see
+apps.core.utils.queries), cache hits and misses (reported by
+InstrumentedRedisCache) and template render time. Samples are kept per
+(view, tenant schema) in bounded in-memory reservoirs and periodically
+appended to capped Redis lists, so reports cover every worker process.
+Without a Redis cache, reports are built from the local reservoirs.
+"""
+import contextvars
+import hashlib
+import logging
+import math
+import random
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+
+from apps.core.utils import metrics
+from apps.core.utils.queries import QueryAnalyzer, is_bookkeeping
+
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'perf'
+INDEX_KEY = f'{KEY_PREFIX}:index'
+
+# Sample layout, also the order of values stored in Redis
+SAMPLE_FIELDS = (
+    'wall_ms', 'db_ms', 'queries', 'duplicates', 'repeated', 'cache_hits', 'cache_misses',
+    'template_ms',
+)
+PERCENTILE_FIELDS = ('wall_ms', 'db_ms', 'queries', 'template_ms')
+PERCENTILES = (50, 95, 99)
+
+_current = contextvars.ContextVar('perf_profile', default=None)
+
+_lock = threading.Lock()
+_reservoirs = {}
+_pending = defaultdict(list)
+_last_flush = {'value': time.monotonic()}
+
+
+def _config(name, default):
+    return getattr(settings, 'PERF_MONITORING', {}).get(name, default)
+
+
+class RequestProfile:
+    """
+    Counters for a single profiled request
+    """
+    __slots__ = (
+        'started', 'wall_ms', 'db_ms', 'queries', 'duplicates', 'repeated', 'cache_hits',
+        'cache_misses', 'template_ms', 'analyzer', '_statements', '_render_started',
+    )
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.wall_ms = 0.0
+        self.db_ms = 0.0
+        self.queries = 0
+        self.duplicates = 0
+        self.repeated = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.template_ms = 0.0
+        self.analyzer = QueryAnalyzer()
+        self._statements = set()
+        self._render_started = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Database execute wrapper timing each query
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - start) * 1000
+            self.queries += 1
+            statement = hashlib.blake2b(f'{sql}|{params!r}'.encode(), digest_size=8).digest()
+            if statement in self._statements:
+                self.duplicates += 1
+            else:
+                self._statements.add(statement)
+            if not is_bookkeeping(sql):
+                self.analyzer.record(sql)
+
+    def render_started(self):
+        self._render_started = time.perf_counter()
+
+    def render_finished(self):
+        if self._render_started is not None:
+            self.template_ms += (time.perf_counter() - self._render_started) * 1000
+            self._render_started = None
+
+    def finish(self):
+        self.wall_ms = (time.perf_counter() - self.started) * 1000
+        self.repeated = sum(count - 1 for count in self.analyzer.shapes.values())
+        return tuple(
+            round(value, 2) if isinstance(value, float) else value
+            for value in (getattr(self, name) for name in SAMPLE_FIELDS)
+        )
+
+
+def should_profile():
+    if not _config('ENABLED', True):
+        return False
+    rate = _config('SAMPLE_RATE', 1.0)
+    return rate >= 1 or random.random() < rate
+
+
+def activate(profile):
+    return _current.set(profile)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+def record_cache_lookup(hits, misses):
+    """
+    Called by instrumented cache backends for every read
+    """
+    profile = _current.get()
+    if profile is not None:
+        profile.cache_hits += hits
+        profile.cache_misses += misses
+
+
+def get_current_profile():
+    return _current.get()
+
+
+def record_sample(view_name, schema_name, sample):
+    """
+    Add a finished request's sample to the rolling reservoir for its view
+    """
+    key = f'{view_name}|{schema_name}'
+    size = _config('RESERVOIR_SIZE', 1000)
+    with _lock:
+        reservoir = _reservoirs.get(key)
+        if reservoir is None:
+            reservoir = _reservoirs[key] = deque(maxlen=size)
+        reservoir.append(sample)
+        _pending[key].append(sample)
+    metrics.increment('perf.samples')
+
+    if time.monotonic() - _last_flush['value'] >= _config('FLUSH_INTERVAL', 10):
+        flush()
+
+
+def _redis_client():
+    from django.core.cache import caches
+    from django.core.cache.backends.redis import RedisCache
+
+    cache = caches[_config('CACHE_ALIAS', 'default')]
+    if not isinstance(cache, RedisCache):
+        return None
+    return cache._cache.get_client(KEY_PREFIX, write=True)
+
+
+def flush():
+    """
+    Append pending samples to the shared Redis reservoirs
+    """
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush['value'] = time.monotonic()
+    if not pending:
+        return 0
+
+    client = _redis_client()
+    if client is None:
+        return 0
+
+    size = _config('RESERVOIR_SIZE', 1000)
+    ttl = _config('RETENTION_SECONDS', 86400)
+    try:
+        pipe = client.pipeline(transaction=False)
+        for key, samples in pending.items():
+            redis_key = f'{KEY_PREFIX}:samples:{key}'
+            pipe.rpush(redis_key, *[','.join(str(value) for value in sample) for sample in samples])
+            pipe.ltrim(redis_key, -size, -1)
+            pipe.expire(redis_key, ttl)
+            pipe.sadd(INDEX_KEY, key)
+        pipe.expire(INDEX_KEY, ttl)
+        pipe.execute()
+    except Exception:
+        metrics.increment('perf.flush_failed')
+        logger.warning('Could not flush performance samples', exc_info=True)
+        return 0
+    metrics.increment('perf.flushed', sum(len(samples) for samples in pending.values()))
+    return len(pending)
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _load_samples():
+    """
+    {key: [sample, ...]} from Redis, or from the local reservoirs
+    """
+    client = _redis_client()
+    if client is None:
+        with _lock:
+            return {key: list(samples) for key, samples in _reservoirs.items()}
+
+    keys = sorted(_decode(key) for key in client.smembers(INDEX_KEY))
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.lrange(f'{KEY_PREFIX}:samples:{key}', 0, -1)
+    samples = {}
+    for key, rows in zip(keys, pipe.execute()):
+        if rows:
+            samples[key] = [tuple(float(value) for value in _decode(row).split(',')) for row in rows]
+    return samples
+
+
+def _percentile(ordered, percent):
+    if not ordered:
+        return 0
+    # Nearest-rank percentile
+    index = min(len(ordered) - 1, max(0, math.ceil(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """
+    Percentiles and averages for a list of samples
+    """
+    columns = dict(zip(SAMPLE_FIELDS, zip(*samples)))
+    summary = {'count': len(samples)}
+    for name in PERCENTILE_FIELDS:
+        ordered = sorted(columns[name])
+        for percent in PERCENTILES:
+            summary[f'{name}_p{percent}'] = round(_percentile(ordered, percent), 2)
+    summary['duplicates_avg'] = round(sum(columns['duplicates']) / len(samples), 2)
+    summary['repeated_avg'] = round(sum(columns['repeated']) / len(samples), 2)
+    hits = sum(columns['cache_hits'])
+    lookups = hits + sum(columns['cache_misses'])
+    summary['cache_hits'] = int(hits)
+    summary['cache_misses'] = int(lookups - hits)
+    summary['cache_hit_ratio'] = round(hits / lookups, 3) if lookups else None
+    return summary
+
+
+def get_performance_report(view=None, tenant=None, sort='wall_ms_p95', limit=None):
+    """
+    Rolling percentiles per view and tenant schema, slowest first
+    """
+    flush()
+    rows = []
+    for key, samples in _load_samples().items():
+        view_name, schema_name = key.rsplit('|', 1)
+        if view and view not in view_name:
+            continue
+        if tenant and schema_name != tenant:
+            continue
+        rows.append({'view': view_name, 'tenant': schema_name, **summarize(samples)})
+    rows.sort(key=lambda row: row.get(sort) or 0, reverse=True)
+    return rows[:limit] if limit else rows
+
+
+def reset():
+    """
+    Drop collected samples, locally and in Redis
+    """
+    with _lock:
+        _reservoirs.clear()
+        _pending.clear()
+    client = _redis_client()
+    if client is not None:
+        keys = [_decode(key) for key in client.smembers(INDEX_KEY)]
+        client.delete(INDEX_KEY, *[f'{KEY_PREFIX}:samples:{key}' for key in keys])
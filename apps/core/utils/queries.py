@@ -0,0 +1,188 @@
+# apps/core/utils/queries.py
+"""
+SQL fingerprinting, N+1 detection and query budgets.
+
+A fingerprint is a statement with its literals and parameter placeholders
+normalised away, so the queries an N+1 loop issues for each row share one
+fingerprint. QueryAnalyzer records fingerprints for a block of code and
+reports shapes that repeat.
+
+Views (a ``query_budget`` class attribute, or the decorator on function
+views) and model methods (the decorator) declare how many queries they may
+issue. The test suite enforces these budgets (apps.core.testing).
+PerformanceMiddleware checks them on profiled requests when
+QUERY_BUDGETS['ENFORCE'] is 'warn' or 'raise'.
+"""
+import hashlib
+import logging
+import re
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection
+
+from apps.core.utils import metrics
+
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?|\$\d+')
+_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_VALUES_LIST = re.compile(r'\bVALUES\s*\(.*\)(?:\s*,\s*\(.*\))*', re.IGNORECASE)
+_SAVEPOINT = re.compile(r'^(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\s+\S+', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised when code issues more queries than its declared budget
+    """
+
+
+def normalize_sql(sql):
+    """
+    SQL with literals, placeholders and IN/VALUES lists collapsed
+    """
+    sql = _SAVEPOINT.sub(r'\1 ?', sql.strip())
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    sql = _VALUES_LIST.sub('VALUES (...)', sql)
+    return _WHITESPACE.sub(' ', sql)
+
+
+def fingerprint(sql):
+    """
+    Short stable identifier for the shape of a statement
+    """
+    return hashlib.blake2b(normalize_sql(sql).encode(), digest_size=8).hexdigest()
+
+
+def is_bookkeeping(sql):
+    """
+    Schema switches and savepoints, which are not issued by application code
+    """
+    head = sql.lstrip()[:20].upper()
+    return head.startswith(('SET ', 'SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT'))
+
+
+class QueryAnalyzer:
+    """
+    Record the queries issued inside a ``with`` block, grouped by fingerprint
+    """
+
+    def __init__(self, using=None):
+        from django.db import connections
+
+        self.connection = connections[using] if using else connection
+        self.count = 0
+        self.shapes = Counter()
+        self.samples = {}
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        if not is_bookkeeping(sql):
+            self.record(sql)
+        return execute(sql, params, many, context)
+
+    def record(self, sql):
+        self.count += 1
+        shape = fingerprint(sql)
+        self.shapes[shape] += 1
+        self.samples.setdefault(shape, sql)
+
+    def __enter__(self):
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+
+    def repeated(self, threshold=2):
+        """
+        (fingerprint, count, sample sql) for shapes issued threshold or more
+        times, most repeated first
+        """
+        return [
+            (shape, count, self.samples[shape])
+            for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+    def report(self, threshold=2):
+        lines = [f'{self.count} queries, {len(self.shapes)} distinct shapes']
+        for shape, count, sql in self.repeated(threshold):
+            lines.append(f'  {count}x [{shape}] {normalize_sql(sql)[:300]}')
+        return '\n'.join(lines)
+
+    def check(self, max_queries=None, max_repeats=None, label='block'):
+        """
+        Raise QueryBudgetExceeded if the recorded queries exceed a budget
+        """
+        problems = []
+        if max_queries is not None and self.count > max_queries:
+            problems.append(f'{self.count} queries, budget is {max_queries}')
+        if max_repeats is not None and self.repeated(max_repeats + 1):
+            worst = self.repeated(max_repeats + 1)[0][1]
+            problems.append(f'a query shape ran {worst} times, at most {max_repeats} allowed')
+        if problems:
+            raise QueryBudgetExceeded(f'{label}: ' + '; '.join(problems) + '\n' + self.report())
+
+
+def _enforce_mode():
+    return getattr(settings, 'QUERY_BUDGETS', {}).get('ENFORCE', 'off')
+
+
+def query_budget(max_queries, max_repeats=None):
+    """
+    Declare the query budget of a function view or model method. With
+    QUERY_BUDGETS['ENFORCE'] set to 'warn' or 'raise' the budget is also
+    checked on every call.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            mode = _enforce_mode()
+            if mode == 'off':
+                return func(*args, **kwargs)
+            with QueryAnalyzer() as analyzer:
+                result = func(*args, **kwargs)
+            check_budget(analyzer, max_queries, max_repeats, func.__qualname__, mode)
+            return result
+
+        wrapper.query_budget = max_queries
+        wrapper.query_max_repeats = max_repeats
+        return wrapper
+    return decorator
+
+
+def check_budget(analyzer, max_queries, max_repeats, label, mode=None):
+    """
+    Report a budget overrun according to the enforcement mode
+    """
+    mode = mode or _enforce_mode()
+    try:
+        analyzer.check(max_queries, max_repeats, label)
+    except QueryBudgetExceeded as exc:
+        metrics.increment('queries.budget_exceeded')
+        if mode == 'raise':
+            raise
+        logger.warning('Query budget exceeded in %s', exc)
+
+
+def get_query_budget(view):
+    """
+    (max_queries, max_repeats) declared for a view function or class, or
+    (None, None)
+    """
+    view_class = getattr(view, 'view_class', None) or getattr(view, 'cls', None)
+    for target in (view, view_class):
+        budget = getattr(target, 'query_budget', None)
+        if budget is not None:
+            return budget, getattr(target, 'query_max_repeats', None)
+    return None, None
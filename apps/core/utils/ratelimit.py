@@ -0,0 +1,276 @@
+# apps/core/utils/ratelimit.py
+"""
+Sliding-window rate limiting backed by Redis sorted sets.
+
+Every limited key is a sorted set of request timestamps. A Lua script drops
+entries older than the window, compares the remaining count with the limit
+and records the new request, for all keys of a request in one atomic round
+trip: a request is only counted when every key still has room, so a denied
+request does not use up the tenant's budget. Nothing is written to the
+database.
+
+Policies come from settings.RATE_LIMITS:
+- per tenant, by subscription plan (TENANT_PLANS),
+- per user (USER) or per API token, by token scope (TOKEN, TOKEN_SCOPES),
+- per anonymous client IP (ANON), taken from X-Forwarded-For behind the proxy,
+- per endpoint (ENDPOINTS), an extra limit for each principal on top of
+  its global one.
+
+When the cache is not Redis, windows are kept in process memory. Redis
+errors let requests through unless FAIL_OPEN is disabled.
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+
+from django.conf import settings
+
+from apps.core.utils import metrics
+
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'rl'
+
+_PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+_SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local member = ARGV[2]
+local denied = 0
+local retry_after = 0
+local result = {}
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[1 + i * 2])
+    local window = tonumber(ARGV[2 + i * 2])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    local count = redis.call('ZCARD', key)
+    if count >= limit then
+        if denied == 0 then
+            denied = i
+        end
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        if oldest[2] then
+            local wait = tonumber(oldest[2]) + window - now
+            if wait > retry_after then
+                retry_after = wait
+            end
+        end
+    end
+    result[i + 2] = count
+end
+if denied == 0 then
+    for i, key in ipairs(KEYS) do
+        redis.call('ZADD', key, now, member)
+        redis.call('PEXPIRE', key, tonumber(ARGV[2 + i * 2]))
+        result[i + 2] = result[i + 2] + 1
+    end
+end
+result[1] = denied
+result[2] = retry_after
+return result
+"""
+
+_script = {'value': None}
+_local_lock = threading.Lock()
+_local_windows = {}
+
+
+def _config(name, default):
+    return getattr(settings, 'RATE_LIMITS', {}).get(name, default)
+
+
+class Rate:
+    """
+    A number of requests per window, parsed from '100/minute', '20/s', ...
+    """
+    __slots__ = ('limit', 'window')
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+
+    @classmethod
+    def parse(cls, value):
+        if value is None or isinstance(value, cls):
+            return value
+        limit, period = value.split('/')
+        count = ''.join(ch for ch in period if ch.isdigit()) or '1'
+        unit = period.lstrip('0123456789')[0].lower()
+        return cls(int(limit), int(count) * _PERIODS[unit])
+
+    def __repr__(self):
+        return f'<Rate {self.limit}/{self.window}s>'
+
+
+class RateLimitResult:
+    """
+    Outcome of a rate limit check
+    """
+    __slots__ = ('allowed', 'key', 'limit', 'remaining', 'retry_after')
+
+    def __init__(self, allowed, key=None, limit=None, remaining=None, retry_after=0.0):
+        self.allowed = allowed
+        self.key = key
+        self.limit = limit
+        self.remaining = remaining
+        self.retry_after = retry_after
+
+    def __bool__(self):
+        return self.allowed
+
+    def __repr__(self):
+        return f'<RateLimitResult allowed={self.allowed} key={self.key} retry_after={self.retry_after}>'
+
+
+def _redis_client():
+    from django.core.cache import caches
+    from django.core.cache.backends.redis import RedisCache
+
+    cache = caches[_config('CACHE_ALIAS', 'default')]
+    if not isinstance(cache, RedisCache):
+        return None
+    return cache._cache.get_client(KEY_PREFIX, write=True)
+
+
+def _hit_redis(client, keys, rates, now_ms):
+    if _script['value'] is None:
+        _script['value'] = client.register_script(_SLIDING_WINDOW_SCRIPT)
+    args = [now_ms, f'{now_ms}-{uuid.uuid4().hex[:8]}']
+    for rate in rates:
+        args.extend([rate.limit, rate.window * 1000])
+    reply = _script['value'](keys=keys, args=args, client=client)
+    return int(reply[0]), int(reply[1]) / 1000, [int(count) for count in reply[2:]]
+
+
+def _hit_local(keys, rates, now_ms):
+    with _local_lock:
+        windows = []
+        denied = 0
+        retry_after = 0
+        for index, (key, rate) in enumerate(zip(keys, rates), start=1):
+            window = _local_windows.setdefault(key, deque())
+            while window and window[0] <= now_ms - rate.window * 1000:
+                window.popleft()
+            if len(window) >= rate.limit:
+                denied = denied or index
+                if window:
+                    retry_after = max(retry_after, window[0] + rate.window * 1000 - now_ms)
+            windows.append(window)
+        if not denied:
+            for window in windows:
+                window.append(now_ms)
+        return denied, retry_after / 1000, [len(window) for window in windows]
+
+
+def hit(limits):
+    """
+    Count one request against every (key, rate) pair in limits, or none of
+    them if any is already exhausted. Returns the RateLimitResult for the
+    first exhausted key, or for the key with the least room left.
+    """
+    limits = [(key, Rate.parse(rate)) for key, rate in limits if rate is not None]
+    if not limits:
+        return RateLimitResult(True)
+
+    keys = [f'{KEY_PREFIX}:{key}' for key, _ in limits]
+    rates = [rate for _, rate in limits]
+    now_ms = int(time.time() * 1000)
+
+    client = _redis_client()
+    try:
+        if client is None:
+            denied, retry_after, counts = _hit_local(keys, rates, now_ms)
+        else:
+            denied, retry_after, counts = _hit_redis(client, keys, rates, now_ms)
+    except Exception:
+        metrics.increment('ratelimit.errors')
+        logger.warning('Rate limit check failed', exc_info=True)
+        return RateLimitResult(_config('FAIL_OPEN', True))
+
+    if denied:
+        metrics.increment('ratelimit.denied')
+        key, rate = limits[denied - 1]
+        return RateLimitResult(False, key=key, limit=rate.limit, remaining=0, retry_after=retry_after)
+
+    metrics.increment('ratelimit.allowed')
+    index = min(range(len(limits)), key=lambda i: rates[i].limit - counts[i])
+    return RateLimitResult(
+        True,
+        key=limits[index][0],
+        limit=rates[index].limit,
+        remaining=max(rates[index].limit - counts[index], 0),
+    )
+
+
+def reset(key):
+    """
+    Clear the window for a key (e.g. after a successful login)
+    """
+    client = _redis_client()
+    if client is None:
+        with _local_lock:
+            _local_windows.pop(f'{KEY_PREFIX}:{key}', None)
+        return
+    client.delete(f'{KEY_PREFIX}:{key}')
+
+
+def _token_rate(token):
+    scope_rates = _config('TOKEN_SCOPES', {})
+    rates = [Rate.parse(scope_rates[scope]) for scope in token.scopes or [] if scope in scope_rates]
+    if rates:
+        # The most generous of the token's scopes applies
+        return max(rates, key=lambda rate: rate.limit / rate.window)
+    return _config('TOKEN', None)
+
+
+def get_request_limits(request, endpoint='default', rate=None):
+    """
+    (key, rate) pairs that apply to a request for an endpoint: the tenant's
+    plan limit, one global limit per user, token or client IP, and an
+    endpoint limit for that principal when rate or ENDPOINTS sets one.
+    """
+    from apps.core.utils.tenant import get_current_tenant
+    from apps.security.models import AuditLog
+
+    tenant = getattr(request, 'tenant', None) or get_current_tenant()
+    schema_name = getattr(tenant, 'schema_name', None) or 'public'
+    endpoint_rate = rate or _config('ENDPOINTS', {}).get(endpoint)
+    limits = []
+
+    plan = getattr(tenant, 'plan', None)
+    if plan is not None:
+        limits.append((f'{schema_name}:tenant', _config('TENANT_PLANS', {}).get(plan)))
+
+    user = getattr(request, 'user', None)
+    auth = getattr(request, 'auth', None)
+    if hasattr(auth, 'scopes') and getattr(auth, 'pk', None):
+        principal, principal_rate = f'token:{auth.pk}', _token_rate(auth)
+    elif user is not None and user.is_authenticated:
+        principal, principal_rate = f'user:{user.pk}', _config('USER', None)
+    else:
+        # Behind the proxy REMOTE_ADDR is the proxy's, so the forwarded client
+        # address is used, as for audit logging
+        ip = (AuditLog.get_client_ip(request) or 'unknown').strip()
+        principal, principal_rate = f'anon:{ip}', _config('ANON', None)
+
+    limits.append((f'{schema_name}:{principal}', principal_rate))
+    if endpoint_rate is not None:
+        limits.append((f'{schema_name}:{principal}:{endpoint}', endpoint_rate))
+    return limits
+
+
+def check_request(request, endpoint='default', rate=None):
+    """
+    Count a request against its tenant, principal and endpoint limits
+    """
+    if not _config('ENABLED', True):
+        return RateLimitResult(True)
+    return hit(get_request_limits(request, endpoint=endpoint, rate=rate))
+
+
+def get_ratelimit_stats():
+    counters = metrics.get_counters('ratelimit.')
+    return {name.split('.', 1)[1]: value for name, value in counters.items()}
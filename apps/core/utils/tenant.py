@@ -1,32 +1,70 @@
-import threading
+import asyncio
+import contextvars
 from contextlib import contextmanager
-from django.db import connection
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connection
 
 
-# Thread-local storage for tenant context
-_thread_locals = threading.local()
+# Context-local storage for tenant context. A ContextVar follows the current
+# thread under WSGI and Celery, and the current task under ASGI, so
+# concurrent coroutines never see each other's tenant.
+_current_tenant = contextvars.ContextVar('current_tenant', default=None)
+
+# Tenant liveness already checked in this request/task, {tenant_id: is_active}
+_tenant_liveness = contextvars.ContextVar('tenant_liveness', default=None)
 
 
 def set_current_tenant(tenant):
     """
-    Set the current tenant in thread-local storage
+    Set the current tenant in context-local storage
     """
-    _thread_locals.tenant = tenant
+    _current_tenant.set(tenant)
 
 
 def get_current_tenant():
     """
-    Get the current tenant from thread-local storage
+    Get the current tenant from context-local storage
     """
-    return getattr(_thread_locals, 'tenant', None)
+    return _current_tenant.get()
 
 
 def clear_tenant():
     """
-    Clear tenant from thread-local storage
+    Clear tenant from context-local storage
+    """
+    _current_tenant.set(None)
+    _tenant_liveness.set(None)
+
+
+def is_tenant_active(tenant_id):
+    """
+    Whether a tenant exists and is active: True, False, or None if missing.
+
+    The current tenant is trusted as loaded, other tenants are looked up
+    once and remembered until the context is cleared at the end of the
+    request or task.
     """
-    if hasattr(_thread_locals, 'tenant'):
-        delattr(_thread_locals, 'tenant')
+    from apps.core.utils import metrics
+
+    current = _current_tenant.get()
+    if current is not None and current.pk == tenant_id:
+        metrics.increment('validation.tenant_check.context')
+        return current.is_active
+
+    liveness = _tenant_liveness.get()
+    if liveness is None:
+        liveness = {}
+        _tenant_liveness.set(liveness)
+    if tenant_id in liveness:
+        metrics.increment('validation.tenant_check.cached')
+        return liveness[tenant_id]
+
+    from apps.tenants.models import Tenant
+    metrics.increment('validation.tenant_check.db')
+    liveness[tenant_id] = (
+        Tenant.objects.filter(id=tenant_id).values_list('is_active', flat=True).first()
+    )
+    return liveness[tenant_id]
 
 
 @contextmanager
@@ -34,12 +72,74 @@ def tenant_context(tenant):
     """
     Context manager for temporary tenant switching
     """
-    old_tenant = get_current_tenant()
-    set_current_tenant(tenant)
+    token = _current_tenant.set(tenant)
     try:
         yield
     finally:
-        set_current_tenant(old_tenant)
+        _current_tenant.reset(token)
+
+
+def call_in_tenant(tenant, func, *args, **kwargs):
+    """
+    Call func with tenant as the current tenant and its schema active on
+    the database connection of the calling thread
+    """
+    with tenant_context(tenant):
+        schema_name = getattr(tenant, 'schema_name', None)
+        if schema_name and getattr(connection, 'schema_name', schema_name) != schema_name:
+            from django_tenants.utils import tenant_context as schema_tenant_context
+            with schema_tenant_context(tenant):
+                return func(*args, **kwargs)
+        return func(*args, **kwargs)
+
+
+async def acall_in_tenant(func, *args, tenant=None, thread_sensitive=True, **kwargs):
+    """
+    Run a block of synchronous ORM work from async code under the current
+    (or given) tenant in a single thread hop.
+
+    Pass thread_sensitive=False to run independent blocks concurrently,
+    each on its own worker thread and database connection.
+    """
+    if tenant is None:
+        tenant = get_current_tenant()
+    runner = call_in_tenant if thread_sensitive else _call_in_tenant_and_close
+    return await sync_to_async(runner, thread_sensitive=thread_sensitive)(
+        tenant, func, *args, **kwargs
+    )
+
+
+async def agather_in_tenant(*funcs, tenant=None):
+    """
+    Run independent blocks of synchronous ORM work concurrently, each on its
+    own worker thread and database connection, and return their results in
+    order.
+
+    Inside a transaction (ATOMIC_REQUESTS, tests) the blocks run one after
+    another on the calling connection instead, since other connections
+    cannot see its uncommitted writes.
+    """
+    if tenant is None:
+        tenant = get_current_tenant()
+    if await sync_to_async(lambda: connection.in_atomic_block)():
+        return await acall_in_tenant(lambda: [func() for func in funcs], tenant=tenant)
+    return list(await asyncio.gather(*(
+        acall_in_tenant(func, tenant=tenant, thread_sensitive=False) for func in funcs
+    )))
+
+
+def _call_in_tenant_and_close(tenant, func, *args, **kwargs):
+    """
+    Same as call_in_tenant, but leaves the worker thread's connection on the
+    public schema and closes it once it is past CONN_MAX_AGE, as Django does
+    at the end of a request
+    """
+    try:
+        return call_in_tenant(tenant, func, *args, **kwargs)
+    finally:
+        if hasattr(connection, 'set_schema_to_public'):
+            connection.set_schema_to_public()
+        close_old_connections()
 
 
 def get_tenant_schema(tenant):
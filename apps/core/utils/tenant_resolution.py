@@ -0,0 +1,217 @@
+# apps/core/utils/tenant_resolution.py
+"""
+Cached tenant resolution for TenantMiddleware.
+
+Lookups by id, host and slug are answered from an in-process LRU (L1) backed
+by the shared Redis cache (L2). Entries store a slim snapshot of the tenant
+row that is rehydrated into a ``Tenant`` instance without touching the
+database. Every entry is stamped with a generation number kept in Redis, so a
+single ``invalidate_tenant_resolution()`` call expires all entries across
+processes.
+
+Lookups that match no tenant are keyed by client-controlled input (Host
+header, slug), so they are only remembered in a small, short-lived
+per-process LRU of their own: they can neither evict real tenants from L1
+nor grow Redis.
+"""
+import copy
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from apps.core.cache import LocalLRUCache
+from apps.core.utils import metrics
+
+
+GENERATION_KEY = 'tenant_resolution:generation'
+
+# Marker stored for lookups that did not match any active tenant
+NOT_FOUND = 'not-found'
+
+_config = getattr(settings, 'TENANT_RESOLUTION_CACHE', {})
+_local_cache = LocalLRUCache(
+    max_entries=_config.get('L1_MAX_ENTRIES', 2048),
+    timeout=_config.get('L1_TIMEOUT', 60),
+)
+_miss_cache = LocalLRUCache(
+    max_entries=_config.get('MISS_MAX_ENTRIES', 256),
+    timeout=_config.get('MISS_TIMEOUT', 10),
+)
+_generation = {'value': None, 'checked_at': 0.0}
+
+
+class TenantRecord:
+    """
+    Picklable snapshot of a tenant row, cheap to store in Redis
+    """
+    __slots__ = ('field_names', 'values')
+
+    def __init__(self, field_names, values):
+        self.field_names = field_names
+        self.values = values
+
+    @classmethod
+    def from_tenant(cls, tenant):
+        fields = tenant._meta.concrete_fields
+        return cls(
+            tuple(field.attname for field in fields),
+            tuple(getattr(tenant, field.attname) for field in fields),
+        )
+
+    def to_tenant(self):
+        """
+        Rebuild a Tenant instance as if it had been loaded from the database
+        """
+        from apps.tenants.models import Tenant
+        # JSON fields are copied so callers cannot mutate the cached snapshot
+        values = [
+            copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+            for value in self.values
+        ]
+        return Tenant.from_db(DEFAULT_DB_ALIAS, self.field_names, values)
+
+
+def _get_generation():
+    """
+    Get the current cache generation, re-reading it from Redis at most
+    once per GENERATION_CHECK_INTERVAL seconds
+    """
+    now = time.monotonic()
+    interval = _config.get('GENERATION_CHECK_INTERVAL', 5)
+    if _generation['value'] is None or now - _generation['checked_at'] >= interval:
+        generation = cache.get(GENERATION_KEY)
+        if generation is None:
+            cache.add(GENERATION_KEY, 1, None)
+            generation = cache.get(GENERATION_KEY, 1)
+        if generation != _generation['value']:
+            _local_cache.clear()
+            _miss_cache.clear()
+        _generation['value'] = generation
+        _generation['checked_at'] = now
+    return _generation['value']
+
+
+def _resolve(kind, value, loader):
+    """
+    Resolve a tenant through L1, then L2, then the database
+    """
+    value = str(value).strip().lower()
+    if not value:
+        return None
+
+    generation = _get_generation()
+    key = f"tenant_resolution:{generation}:{kind}:{value}"
+
+    record = _local_cache.get(key) or _miss_cache.get(key)
+    if record is not None:
+        metrics.increment('tenant_resolution.l1_hit')
+    else:
+        record = cache.get(key)
+        if record is not None:
+            metrics.increment('tenant_resolution.l2_hit')
+        else:
+            metrics.increment('tenant_resolution.miss')
+            tenant = loader(value)
+            if tenant is None:
+                _miss_cache.set(key, NOT_FOUND)
+                return None
+            record = TenantRecord.from_tenant(tenant)
+            cache.set(key, record, getattr(settings, 'TENANT_CACHE_TIMEOUT', 300))
+        _local_cache.set(key, record)
+
+    if record == NOT_FOUND:
+        return None
+    return record.to_tenant()
+
+
+def _load_by_id(value):
+    from apps.tenants.models import Tenant
+    try:
+        return Tenant.objects.get(id=uuid.UUID(value), is_active=True)
+    except (Tenant.DoesNotExist, ValueError):
+        return None
+
+
+def _load_by_slug(value):
+    from apps.tenants.models import Tenant
+    try:
+        return Tenant.objects.get(slug=value, is_active=True)
+    except (Tenant.DoesNotExist, Tenant.MultipleObjectsReturned):
+        return None
+
+
+def _load_by_host(value):
+    from apps.tenants.models import Domain
+    try:
+        domain = Domain.objects.select_related('tenant').get(
+            domain=value,
+            tenant__is_active=True
+        )
+        return domain.tenant
+    except Domain.DoesNotExist:
+        return None
+
+
+def resolve_tenant_by_id(tenant_id):
+    """
+    Resolve an active tenant by primary key
+    """
+    if not tenant_id:
+        return None
+    return _resolve('id', tenant_id, _load_by_id)
+
+
+def resolve_tenant_by_slug(slug):
+    """
+    Resolve an active tenant by slug
+    """
+    if not slug:
+        return None
+    return _resolve('slug', slug, _load_by_slug)
+
+
+def resolve_tenant_by_host(host):
+    """
+    Resolve an active tenant by one of its domain names
+    """
+    if not host:
+        return None
+    return _resolve('host', host, _load_by_host)
+
+
+def invalidate_tenant_resolution():
+    """
+    Expire every cached tenant resolution in all processes.
+
+    Runs after the surrounding transaction commits so that concurrent
+    requests cannot repopulate the cache with the old row.
+    """
+    def _invalidate():
+        try:
+            cache.incr(GENERATION_KEY)
+        except ValueError:
+            cache.set(GENERATION_KEY, 1, None)
+        _local_cache.clear()
+        _miss_cache.clear()
+        _generation['value'] = None
+
+    transaction.on_commit(_invalidate)
+
+
+def get_resolution_stats():
+    """
+    Hit/miss counters for the tenant resolution cache
+    """
+    counters = metrics.get_counters('tenant_resolution.')
+    hits = counters.get('tenant_resolution.l1_hit', 0) + counters.get('tenant_resolution.l2_hit', 0)
+    misses = counters.get('tenant_resolution.miss', 0)
+    total = hits + misses
+    return {
+        'l1_hits': counters.get('tenant_resolution.l1_hit', 0),
+        'l2_hits': counters.get('tenant_resolution.l2_hit', 0),
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else 0.0,
+    }
@@ -0,0 +1,79 @@
+# apps/core/utils/validation.py
+"""
+Validation strategy for tenant-aware saves.
+
+By default every save runs full model validation. Callers that already
+hold validated data (bulk imports, internal services) can opt into trusted
+mode, which skips unique, constraint and foreign key existence checks that
+the database enforces anyway. Queries issued during validation are counted
+so the cost of each mode can be compared.
+"""
+import contextvars
+from contextlib import contextmanager
+
+from django.db import connection
+
+from apps.core.utils import metrics
+
+
+_trusted = contextvars.ContextVar('trusted_validation', default=False)
+
+
+@contextmanager
+def trusted_validation():
+    """
+    Run saves in this block with trusted validation
+    """
+    token = _trusted.set(True)
+    try:
+        yield
+    finally:
+        _trusted.reset(token)
+
+
+def is_trusted_validation():
+    return _trusted.get()
+
+
+@contextmanager
+def track_validation_queries(trusted=False):
+    """
+    Count queries issued while validating a single save
+    """
+    counter = [0]
+
+    def count(execute, sql, params, many, context):
+        counter[0] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        yield
+    metrics.increment('validation.saves')
+    metrics.increment('validation.queries', counter[0])
+    if trusted:
+        metrics.increment('validation.trusted_saves')
+        metrics.increment('validation.trusted_queries', counter[0])
+
+
+def get_validation_stats():
+    """
+    Validation query counts per save, overall and for trusted saves
+    """
+    counters = metrics.get_counters('validation.')
+    saves = counters.get('validation.saves', 0)
+    queries = counters.get('validation.queries', 0)
+    trusted_saves = counters.get('validation.trusted_saves', 0)
+    trusted_queries = counters.get('validation.trusted_queries', 0)
+    full_saves = saves - trusted_saves
+    return {
+        'saves': saves,
+        'queries': queries,
+        'queries_per_save': round(queries / saves, 3) if saves else 0.0,
+        'full_queries_per_save': round((queries - trusted_queries) / full_saves, 3) if full_saves else 0.0,
+        'trusted_queries_per_save': round(trusted_queries / trusted_saves, 3) if trusted_saves else 0.0,
+        'tenant_checks': {
+            'context': counters.get('validation.tenant_check.context', 0),
+            'cached': counters.get('validation.tenant_check.cached', 0),
+            'db': counters.get('validation.tenant_check.db', 0),
+        },
+    }
@@ -1,106 +1,115 @@
-from django.views.generic import TemplateView
-from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count, Sum, Q
+from django.views.generic import TemplateView, View
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.http import HttpResponseNotModified, JsonResponse
+from django.db.models import Count
 from django.utils import timezone
+from django.utils.http import parse_etags
+from apps.core.mixins import AsyncDashboardMixin, DashboardSectionsMixin
 from apps.core.utils.tenant import get_current_tenant
 from apps.students.models import Student
 from apps.users.models import User
-from apps.academics.models import SchoolClass
-from apps.finance.models import Invoice, Payment
-from apps.library.models import Book, BookIssue
-from apps.hostel.models import Hostel, HostelAllocation
-from apps.hr.models import Staff
-from apps.inventory.models import Item
-from apps.transportation.models import Vehicle, Route
-from apps.events.models import Event
-from apps.exams.models import Exam
-from apps.security.models import SecurityIncident, AuditLog
-
-class MasterDashboardView(LoginRequiredMixin, TemplateView):
+from apps.security.models import AuditLog
+from apps.tenants.snapshots import METRICS, get_snapshot, snapshot_data
+
+def _snapshot_figures(tenant):
+    # Module figures come from the maintained snapshot (apps.tenants.snapshots)
+    snapshot = get_snapshot(tenant)
+    context = {metric.name: getattr(snapshot, metric.name) for metric in METRICS}
+    context['snapshot_version'] = snapshot.version
+    return context
+
+
+def _student_status_chart(tenant):
+    student_status = Student.objects.filter(tenant=tenant).values('status').annotate(
+        count=Count('id')
+    ).order_by('status')
+    return {
+        'student_status_labels': [item['status'] for item in student_status],
+        'student_status_data': [item['count'] for item in student_status],
+    }
+
+
+def _user_roles_chart(tenant):
+    user_roles = User.objects.filter(tenant=tenant).values('role').annotate(
+        count=Count('id')
+    ).order_by('role')
+    return {
+        'user_roles_labels': [item['role'] for item in user_roles],
+        'user_roles_data': [item['count'] for item in user_roles],
+    }
+
+
+def _recent_activities(tenant):
+    # Last 10 audit logs, evaluated here so async views fetch them concurrently
+    return {
+        'recent_activities': list(AuditLog.objects.filter(
+            tenant=tenant
+        ).select_related('user').order_by('-created_at')[:10]),
+    }
+
+
+class MasterDashboardView(LoginRequiredMixin, DashboardSectionsMixin, TemplateView):
     template_name = 'dashboard/master_dashboard.html'
+    sections = (_snapshot_figures, _student_status_chart, _user_roles_chart, _recent_activities)
+    # Snapshot row, two chart queries, the recent activity list and a cold
+    # configuration cache
+    query_budget = 5
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        tenant = get_current_tenant()
-        
-        # Students Statistics
-        context['total_students'] = Student.objects.filter(tenant=tenant).count()
-        context['active_students'] = Student.objects.filter(tenant=tenant, status='ACTIVE').count()
-        context['alumni'] = Student.objects.filter(tenant=tenant, status='ALUMNI').count()
-        
-        # Users Statistics
-        context['total_users'] = User.objects.filter(tenant=tenant).count()
-        context['active_users'] = User.objects.filter(tenant=tenant, is_active=True).count()
-        context['staff_count'] = Staff.objects.filter(tenant=tenant, is_active=True).count()
-        
-        # Academics Statistics
-        context['total_courses'] = Course.objects.filter(tenant=tenant).count()
-        context['total_classes'] = Class.objects.filter(tenant=tenant).count()
-        
-        # Finance Statistics
-        context['total_invoices'] = Invoice.objects.filter(tenant=tenant).count()
-        context['total_revenue'] = Payment.objects.filter(tenant=tenant).aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        context['pending_invoices'] = Invoice.objects.filter(
-            tenant=tenant, status='PENDING'
-        ).count()
-        
-        # Library Statistics
-        context['total_books'] = Book.objects.filter(tenant=tenant).count()
-        context['books_issued'] = BookIssue.objects.filter(
-            tenant=tenant, return_date__isnull=True
-        ).count()
-        
-        # Hostel Statistics
-        context['total_hostels'] = Hostel.objects.filter(tenant=tenant).count()
-        context['hostel_allocations'] = HostelAllocation.objects.filter(
-            tenant=tenant, is_active=True
-        ).count()
-        
-        # Inventory Statistics
-        context['total_items'] = Item.objects.filter(tenant=tenant, is_active=True).count()
-        context['low_stock_items'] = Item.objects.filter(
-            tenant=tenant, is_active=True, current_stock__lte=10
-        ).count()
-        
-        # Transportation Statistics
-        context['total_vehicles'] = Vehicle.objects.filter(tenant=tenant, is_active=True).count()
-        context['total_routes'] = Route.objects.filter(tenant=tenant, is_active=True).count()
-        
-        # Events Statistics
-        context['upcoming_events'] = Event.objects.filter(
-            tenant=tenant, start_date__gte=timezone.now()
-        ).count()
-        
-        # Exams Statistics
-        context['upcoming_exams'] = Exam.objects.filter(
-            tenant=tenant, start_date__gte=timezone.now()
-        ).count()
-        
-        # Security Statistics
-        context['open_incidents'] = SecurityIncident.objects.filter(
-            tenant=tenant, status='OPEN'
-        ).count()
-        context['recent_audits'] = AuditLog.objects.filter(tenant=tenant).count()
-        
-        # Chart Data - Student Status Distribution
-        student_status = Student.objects.filter(tenant=tenant).values('status').annotate(
-            count=Count('id')
-        )
-        context['student_status_labels'] = [item['status'] for item in student_status]
-        context['student_status_data'] = [item['count'] for item in student_status]
-        
-        # Chart Data - User Roles Distribution
-        user_roles = User.objects.filter(tenant=tenant).values('role').annotate(
-            count=Count('id')
+
+class AsyncMasterDashboardView(AsyncDashboardMixin, MasterDashboardView):
+    """
+    MasterDashboardView with its sections queried concurrently
+    """
+
+
+class MasterDashboardSnapshotView(LoginRequiredMixin, View):
+    """
+    Master dashboard figures as JSON. The ETag changes whenever the
+    snapshot does, so pages can poll with If-None-Match cheaply.
+    """
+    query_budget = 1
+
+    def get(self, request, *args, **kwargs):
+        snapshot = get_snapshot(get_current_tenant())
+        etag = snapshot.etag
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = JsonResponse(snapshot_data(snapshot))
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class PerformanceReportView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """
+    Rolling request performance percentiles per view and tenant.
+    Superusers see every tenant; other staff only their own tenant.
+    """
+
+    def test_func(self):
+        user = self.request.user
+        return user.is_superuser or (user.is_staff and self._own_schema() is not None)
+
+    def _own_schema(self):
+        tenant = getattr(self.request, 'tenant', None) or get_current_tenant()
+        return getattr(tenant, 'schema_name', None)
+
+    def get(self, request, *args, **kwargs):
+        from apps.core.utils.perf import get_performance_report
+
+        try:
+            limit = int(request.GET.get('limit', 50))
+        except ValueError:
+            limit = 50
+        if request.user.is_superuser:
+            tenant = request.GET.get('tenant')
+        else:
+            tenant = self._own_schema()
+        rows = get_performance_report(
+            view=request.GET.get('view'),
+            tenant=tenant,
+            sort=request.GET.get('sort', 'wall_ms_p95'),
+            limit=limit,
         )
-        context['user_roles_labels'] = [item['role'] for item in user_roles]
-        context['user_roles_data'] = [item['count'] for item in user_roles]
-        
-        # Recent Activities (last 10 audit logs)
-        context['recent_activities'] = AuditLog.objects.filter(
-            tenant=tenant
-        ).order_by('-created_at')[:10]
-        
-        return context
+        return JsonResponse({'generated_at': timezone.now().isoformat(), 'views': rows})
@@ -1,3 +1,43 @@
+from datetime import date, time
+
 from django.test import TestCase
 
-# Create your tests here.
+from apps.academics.tests import seed_academic_year
+from apps.core.testing import TenantQueryBudgetTestCase
+
+
+def seed_events(tenant, count):
+    """
+    Create count categories with one event each in the current year
+    """
+    from apps.events.models import Event, EventCategory
+
+    year = seed_academic_year(tenant)
+    categories = [EventCategory(tenant=tenant, name=f'Category {n}', code=f'CAT-{n}') for n in range(count)]
+    EventCategory.objects.bulk_create_secure(categories, tenant=tenant, audit=False)
+    events = [
+        Event(
+            tenant=tenant, title=f'Event {n}', slug=f'event-{n}', category=category, event_type='CULTURAL',
+            start_date=date(2025, 12, 1), end_date=date(2025, 12, 1), start_time=time(10), end_time=time(12),
+            academic_year=year,
+        )
+        for n, category in enumerate(categories)
+    ]
+    Event.objects.bulk_create_secure(events, tenant=tenant, audit=False)
+    return events
+
+
+class EventQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_events(self.tenant, 3)
+
+    def test_dashboard(self):
+        self.assertViewQueryBudget('events:dashboard')
+
+    def test_category_list(self):
+        self.assertViewQueryBudget('events:category_list')
+
+    def test_event_list(self):
+        self.assertViewQueryBudget('events:event_list')
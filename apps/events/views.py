@@ -9,6 +9,7 @@ from .models import Event, EventCategory, EventRegistration
 class EventDashboardView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
     template_name = 'events/dashboard.html'
     permission_required = 'events.view_event'
+    query_budget = 6
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -28,6 +29,7 @@ class EventCategoryListView(LoginRequiredMixin, PermissionRequiredMixin, ListVie
     template_name = 'events/category_list.html'
     context_object_name = 'categories'
     permission_required = 'events.view_eventcategory'
+    query_budget = 3
 
 class EventCategoryCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = EventCategory
@@ -68,6 +70,10 @@ class EventListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'events/event_list.html'
     context_object_name = 'events'
     permission_required = 'events.view_event'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('category')
 
 class EventDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
     model = Event
@@ -21,6 +21,13 @@ class ExamAdmin(admin.ModelAdmin):
     search_fields = ('name', 'code')
     inlines = [ExamSubjectInline]
     date_hierarchy = 'start_date'
+    actions = ['rank_results']
+
+    @admin.action(description='Recompute ranks of selected exams')
+    def rank_results(self, request, queryset):
+        for exam in queryset:
+            exam.rank_results()
+        self.message_user(request, f'Ranked {queryset.count()} exam(s).')
 
 @admin.register(ExamSubject)
 class ExamSubjectAdmin(admin.ModelAdmin):
@@ -49,7 +56,10 @@ class SubjectResultInline(admin.TabularInline):
 
 @admin.register(ExamResult)
 class ExamResultAdmin(admin.ModelAdmin):
-    list_display = ('student', 'exam', 'total_marks_obtained', 'percentage', 'overall_grade', 'result_status', 'rank')
+    list_display = (
+        'student', 'exam', 'total_marks_obtained', 'percentage', 'overall_grade', 'result_status',
+        'rank', 'section_rank'
+    )
     list_filter = ('result_status', 'exam', 'overall_grade')
     search_fields = ('student__first_name', 'student__last_name', 'exam__name')
     inlines = [SubjectResultInline]
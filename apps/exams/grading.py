@@ -0,0 +1,101 @@
+# apps/exams/grading.py
+"""
+In-memory grade boundary lookup.
+
+A GradingScale holds the grades of one grading system sorted by
+min_percentage, so a percentage is graded with a bisect instead of a range
+query on Grade. Scales are kept in the configuration cache
+(apps.core.config_cache), which tracks Grade and GradingSystem: saving or
+deleting either retires every cached scale of the tenant.
+
+Cached scales and their Grade instances are shared by the process; treat
+them as read-only.
+"""
+from bisect import bisect_right
+from decimal import Decimal
+
+
+class GradingScale:
+    """
+    Sorted grade boundaries of one grading system
+    """
+    def __init__(self, grading_system_id, grades):
+        self.grading_system_id = grading_system_id
+        self.grades = sorted(grades, key=lambda grade: grade.min_percentage)
+        self.minimums = [grade.min_percentage for grade in self.grades]
+
+    def grade_for(self, percentage):
+        """
+        Grade with min_percentage <= percentage <= max_percentage, or None.
+
+        Ranges may touch but not overlap (Grade.clean), so a percentage on a
+        shared boundary matches the grade at the bisect point and the one
+        before it; the first by (order, min_percentage) wins, as the
+        Grade ordering would have it.
+        """
+        if percentage is None:
+            return None
+        if not isinstance(percentage, Decimal):
+            percentage = Decimal(str(percentage))
+        index = bisect_right(self.minimums, percentage)
+        candidates = [
+            grade for grade in self.grades[max(index - 2, 0):index]
+            if percentage <= grade.max_percentage
+        ]
+        return min(candidates, key=lambda grade: (grade.order, grade.min_percentage), default=None)
+
+    def grade_many(self, percentages):
+        """
+        Grades for a sequence of percentages, in order. Repeated
+        percentages are looked up once.
+        """
+        graded = {}
+        grades = []
+        for percentage in percentages:
+            if percentage not in graded:
+                graded[percentage] = self.grade_for(percentage)
+            grades.append(graded[percentage])
+        return grades
+
+
+def get_scale(grading_system=None, tenant=None):
+    """
+    Cached GradingScale of a grading system, by default the tenant's
+    default system; None when there is no grading system
+    """
+    from apps.core import config_cache
+    from apps.core.utils.tenant import get_current_tenant
+    from apps.exams.models import Grade, GradingSystem
+
+    tenant = tenant or get_current_tenant()
+    if grading_system is None:
+        grading_system = GradingSystem.get_default(tenant)
+        if grading_system is None:
+            return None
+    grading_system_id = getattr(grading_system, 'pk', grading_system)
+
+    return config_cache.get(
+        f'exams.GradingScale.{grading_system_id}',
+        tenant,
+        lambda: GradingScale(grading_system_id, list(Grade.objects.filter(grading_system_id=grading_system_id))),
+    )
+
+
+def grade_for(percentage, grading_system=None, tenant=None):
+    """
+    Grade of one percentage on a grading system (default: the tenant's)
+    """
+    scale = get_scale(grading_system, tenant)
+    return scale.grade_for(percentage) if scale is not None else None
+
+
+def grade_many(percentages, grading_system=None, tenant=None):
+    """
+    Grades of many percentages on one grading system (default: the
+    tenant's), resolving the scale once. None for ungraded percentages.
+    """
+    percentages = list(percentages)
+    scale = get_scale(grading_system, tenant)
+    if scale is None:
+        return [None] * len(percentages)
+    return scale.grade_many(percentages)
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django_tenants.utils import get_public_schema_name, schema_context
+
+from apps.exams.models import Exam
+from apps.exams.ranking import COMPETITION, RANK_FUNCTIONS, rank_exam
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Recompute class and section ranks of exam results, one UPDATE per exam'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant',
+            action='append',
+            dest='schemas',
+            help='Schema name of a tenant to rank (repeatable). Defaults to all tenants.'
+        )
+        parser.add_argument(
+            '--exam',
+            action='append',
+            dest='exams',
+            help='Code of an exam to rank (repeatable). Defaults to all published exams.'
+        )
+        parser.add_argument(
+            '--method',
+            choices=sorted(RANK_FUNCTIONS),
+            default=COMPETITION,
+            help='Ranking method (default: competition)'
+        )
+
+    def handle(self, *args, **options):
+        tenants = Tenant.all_objects.exclude(schema_name=get_public_schema_name())
+        if options['schemas']:
+            tenants = tenants.filter(schema_name__in=options['schemas'])
+
+        ranked = 0
+        for tenant in tenants:
+            with schema_context(tenant.schema_name):
+                exams = Exam.objects.filter(tenant=tenant)
+                if options['exams']:
+                    exams = exams.filter(code__in=options['exams'])
+                else:
+                    exams = exams.filter(is_published=True)
+                for exam in exams:
+                    changed = rank_exam(exam, options['method'])
+                    self.stdout.write(f'  {tenant.schema_name} {exam.code}: results re-ranked={changed}')
+                    ranked += 1
+        self.stdout.write(self.style.SUCCESS(f'Ranked {ranked} exam(s)'))
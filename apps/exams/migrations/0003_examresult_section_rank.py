@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='examresult',
+            name='section_rank',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Section Rank'),
+        ),
+        migrations.AddField(
+            model_name='examresult',
+            name='section_total_students',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Section Total Students'),
+        ),
+    ]
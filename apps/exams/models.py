@@ -12,9 +12,12 @@ from django.urls import reverse
 from encrypted_model_fields.fields import EncryptedCharField
 
 # Import core base models
+from apps.core import config_cache
 from apps.core.models import BaseModel, UUIDModel, TimeStampedModel
+from apps.core.utils.tenant import get_current_tenant
 from apps.academics.models import Subject, SchoolClass, Section, AcademicYear
 from apps.students.models import Student
+from apps.exams import grading
 
 
 def exam_document_upload_path(instance, filename):
@@ -223,12 +226,22 @@ class Exam(BaseModel):
                 self.status = "COMPLETED"
         
         # Set published timestamp
-        if self.is_published and not self.published_at:
+        publishing = self.is_published and not self.published_at
+        if publishing:
             self.published_at = timezone.now()
             
         self.full_clean()
         super().save(*args, **kwargs)
 
+        # Rank all results once, when the exam is first published
+        if publishing:
+            self.rank_results()
+
+    def rank_results(self, method=None):
+        """Recompute class and section ranks of all results (see apps.exams.ranking)"""
+        from apps.exams.ranking import COMPETITION, rank_exam
+        return rank_exam(self, method or COMPETITION)
+
     def get_absolute_url(self):
         return reverse('exams:exam_detail', kwargs={'pk': self.pk}) 
 
@@ -349,8 +362,18 @@ class GradingSystem(BaseModel):
         """Ensure only one default grading system"""
         if self.is_default:
             GradingSystem.objects.filter(is_default=True).update(is_default=False)
+            # update() sends no signal; retire the cached default and scales
+            config_cache.bump_version(self.tenant_id)
         super().save(*args, **kwargs)
 
+    @classmethod
+    def get_default(cls, tenant=None):
+        """Cached default grading system of a tenant (see apps.core.config_cache)"""
+        tenant = tenant or get_current_tenant()
+        return config_cache.get(
+            'exams.GradingSystem.default', tenant, lambda: cls.objects.filter(is_default=True).first()
+        )
+
 
 class Grade(BaseModel):
     """
@@ -489,6 +512,12 @@ class ExamResult(BaseModel):
     )
     rank = models.PositiveIntegerField(null=True, blank=True, verbose_name=_("Class Rank"))
     total_students = models.PositiveIntegerField(default=0, verbose_name=_("Total Students"))
+    section_rank = models.PositiveIntegerField(null=True, blank=True, verbose_name=_("Section Rank"))
+    section_total_students = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name=_("Section Total Students")
+    )
     
     # Additional information
     attendance_percentage = models.DecimalField(
@@ -539,42 +568,12 @@ class ExamResult(BaseModel):
         if not self.percentage:
             return None
             
-        grading_system = GradingSystem.objects.filter(is_default=True).first()
-        if not grading_system:
-            return None
-            
-        grade = Grade.objects.filter(
-            grading_system=grading_system,
-            min_percentage__lte=self.percentage,
-            max_percentage__gte=self.percentage
-        ).first()
-        
-        return grade
+        # Boundaries are cached per grading system (apps.exams.grading)
+        return grading.grade_for(self.percentage, tenant=self.tenant)
 
-    def update_rank(self):
-        """Update rank based on percentage"""
-        if not self.percentage:
-            return
-            
-        # Get all results for this exam ordered by percentage descending
-        results = ExamResult.objects.filter(
-            exam=self.exam,
-            percentage__isnull=False
-        ).order_by('-percentage', 'student__roll_number')
-        
-        current_rank = 0
-        last_percentage = None
-        rank_increment = 0
-        
-        for result in results:
-            rank_increment += 1
-            if result.percentage != last_percentage:
-                current_rank = rank_increment
-                last_percentage = result.percentage
-                
-            result.rank = current_rank
-            result.total_students = results.count()
-            result.save(update_fields=['rank', 'total_students'])
+    def update_rank(self, method=None):
+        """Re-rank every result of this exam (see apps.exams.ranking)"""
+        return self.exam.rank_results(method)
 
     def clean(self):
         """Validate result data"""
@@ -608,11 +607,9 @@ class ExamResult(BaseModel):
         if self.is_published and not self.published_at:
             self.published_at = timezone.now()
             
+        # Ranks are recomputed for the whole exam on publish, or explicitly
+        # through update_rank(), not on every result save
         super().save(*args, **kwargs)
-        
-        # Update rank after save
-        if self.percentage is not None:
-            self.update_rank()
 
 
 class SubjectResult(BaseModel):
@@ -740,15 +737,7 @@ class SubjectResult(BaseModel):
 
     def determine_grade(self):
         """Determine grade based on subject percentage"""
-        grading_system = GradingSystem.objects.filter(is_default=True).first()
-        if not grading_system:
-            return None
-            
-        return Grade.objects.filter(
-            grading_system=grading_system,
-            min_percentage__lte=self.percentage,
-            max_percentage__gte=self.percentage
-        ).first()
+        return grading.grade_for(self.percentage, tenant=self.tenant)
 
 
 class MarkSheet(BaseModel):
@@ -844,19 +833,10 @@ class MarkSheet(BaseModel):
 
     def generate_mark_sheet_number(self):
         """Generate unique mark sheet number"""
-        prefix = f"MS-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
-        last_sheet = MarkSheet.objects.filter(
-            mark_sheet_number__startswith=prefix,
-            tenant=self.tenant
-        ).order_by('mark_sheet_number').last()
+        from apps.tenants.sequences import next_document_number
         
-        if last_sheet:
-            last_number = int(last_sheet.mark_sheet_number.split('-')[-1])
-            new_number = last_number + 1
-        else:
-            new_number = 1
-            
-        return f"{prefix}{new_number:06d}"
+        prefix = f"MS-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
+        return next_document_number(self, 'mark_sheet_number', prefix, width=6)
 
     def verify_mark_sheet(self, user):
         """Verify mark sheet"""
@@ -0,0 +1,104 @@
+# apps/exams/ranking.py
+"""
+Set-based exam ranking.
+
+rank_exam() recomputes rank and total_students (class level) and
+section_rank and section_total_students (section level) for every result
+of an exam in a single UPDATE ... FROM (SELECT ... RANK() OVER ...)
+statement. Only rows whose values change are written, and those are
+re-signed from the database afterwards, since ranks are signed fields.
+
+Results without a percentage, and soft-deleted results, are not ranked
+and get NULL ranks. Section ranks follow the student's current section.
+Ranking runs when an exam is published, or explicitly through rank_exam()
+and the rank_exams management command; saving a result does not re-rank.
+"""
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.core.utils.queries import query_budget
+from apps.core.utils.signatures import sign_many
+
+COMPETITION = 'competition'
+DENSE = 'dense'
+
+# Window function per ranking method: competition ranking leaves gaps
+# after ties (1, 2, 2, 4), dense ranking does not (1, 2, 2, 3)
+RANK_FUNCTIONS = {
+    COMPETITION: 'RANK',
+    DENSE: 'DENSE_RANK',
+}
+
+RANK_FIELDS = ('rank', 'total_students', 'section_rank', 'section_total_students')
+
+
+def _rank_sql(method):
+    from apps.exams.models import ExamResult
+    from apps.students.models import Student
+
+    qn = connection.ops.quote_name
+
+    def column(model, name):
+        return qn(model._meta.get_field(name).column)
+
+    result_table = qn(ExamResult._meta.db_table)
+    student_table = qn(Student._meta.db_table)
+    pk = column(ExamResult, 'id')
+    percentage = f'r.{column(ExamResult, "percentage")}'
+    section = f's.{column(Student, "section")}'
+    ranked = f'r.{column(ExamResult, "is_active")} AND {percentage} IS NOT NULL'
+    # Ranked rows sort ahead of the others, so their ranks are unaffected
+    order = f'ORDER BY ({ranked}) DESC, {percentage} DESC'
+    function = RANK_FUNCTIONS[method]
+    targets = {name: column(ExamResult, name) for name in RANK_FIELDS}
+
+    return f"""
+        UPDATE {result_table} AS result
+        SET {targets['rank']} = ranked.rank,
+            {targets['total_students']} = ranked.total_students,
+            {targets['section_rank']} = ranked.section_rank,
+            {targets['section_total_students']} = ranked.section_total_students,
+            {column(ExamResult, 'updated_at')} = %s
+        FROM (
+            SELECT
+                r.{pk} AS id,
+                CASE WHEN {ranked} THEN {function}() OVER ({order}) END AS rank,
+                COUNT(*) FILTER (WHERE {ranked}) OVER () AS total_students,
+                CASE WHEN {ranked} AND {section} IS NOT NULL
+                    THEN {function}() OVER (PARTITION BY {section} {order}) END AS section_rank,
+                CASE WHEN {section} IS NOT NULL
+                    THEN COUNT(*) FILTER (WHERE {ranked}) OVER (PARTITION BY {section}) END
+                    AS section_total_students
+            FROM {result_table} AS r
+            JOIN {student_table} AS s ON s.{column(Student, 'id')} = r.{column(ExamResult, 'student')}
+            WHERE r.{column(ExamResult, 'exam')} = %s
+        ) AS ranked
+        WHERE result.{pk} = ranked.id
+          AND ({' OR '.join(
+              f'result.{target} IS DISTINCT FROM ranked.{name}' for name, target in targets.items()
+          )})
+        RETURNING result.{pk}
+    """
+
+
+@query_budget(5)
+def rank_exam(exam, method=COMPETITION):
+    """
+    Rank every result of an exam by percentage, highest first, at class
+    and section level. method is COMPETITION or DENSE. Returns the number
+    of results whose ranks changed.
+    """
+    from apps.exams.models import ExamResult
+
+    if method not in RANK_FUNCTIONS:
+        raise ValueError(f'Unknown ranking method {method!r}')
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(_rank_sql(method), [timezone.now(), exam.pk])
+            changed = [row[0] for row in cursor.fetchall()]
+        if changed:
+            stored = list(ExamResult._base_manager.filter(pk__in=changed))
+            sign_many(stored)
+            ExamResult._base_manager.bulk_update(stored, ['data_signature'], batch_size=1000)
+    return len(changed)
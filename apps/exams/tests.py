@@ -1,3 +1,232 @@
+from datetime import date
+from decimal import Decimal
+
 from django.test import TestCase
 
-# Create your tests here.
+from apps.academics.tests import seed_section
+from apps.core.testing import TenantQueryBudgetTestCase
+
+
+def seed_exams(tenant, count):
+    """
+    Create count exam types, each with an exam for one class, and a
+    grading system
+    """
+    from apps.exams.models import Exam, ExamType, GradingSystem
+
+    section, students = seed_section(tenant, 1)
+    exam_types = [
+        ExamType(tenant=tenant, name=f'Exam Type {n}', code=f'ET-{n}', weightage=Decimal('25'))
+        for n in range(count)
+    ]
+    ExamType.objects.bulk_create_secure(exam_types, tenant=tenant, audit=False)
+    exams = [
+        Exam(
+            tenant=tenant, name=f'Exam {n}', code=f'EX-{n}', exam_type=exam_type,
+            academic_year=students[0].academic_year, class_name=section.class_name,
+            start_date=date(2025, 9, 15), end_date=date(2025, 9, 20), total_marks=500,
+        )
+        for n, exam_type in enumerate(exam_types)
+    ]
+    Exam.objects.bulk_create_secure(exams, tenant=tenant, audit=False)
+    GradingSystem.objects.bulk_create_secure([
+        GradingSystem(tenant=tenant, name=f'Grading {n}', code=f'GS-{n}', is_default=n == 0)
+        for n in range(count)
+    ], tenant=tenant, audit=False)
+    return exams
+
+
+class ExamQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_exams(self.tenant, 3)
+
+    def test_dashboard(self):
+        self.assertViewQueryBudget('exams:dashboard')
+
+    def test_exam_type_list(self):
+        self.assertViewQueryBudget('exams:exam_type_list')
+
+    def test_exam_list(self):
+        self.assertViewQueryBudget('exams:exam_list')
+
+    def test_grading_system_list(self):
+        self.assertViewQueryBudget('exams:grading_system_list')
+
+
+class ExamRankingTests(TenantQueryBudgetTestCase):
+
+    # Section A: 90, 80, 80, 70 and one result without marks; section B: 80, 60
+    PERCENTAGES = ['90', '80', '80', '70', None, '80', '60']
+
+    def setUp(self):
+        super().setUp()
+        from apps.academics.models import Section
+        from apps.exams.models import Exam, ExamResult, ExamType
+        from apps.students.models import Student
+
+        section, students = seed_section(self.tenant, len(self.PERCENTAGES))
+        self.section_b = Section.objects.create(
+            tenant=self.tenant, class_name=section.class_name, name='B', code='B'
+        )
+        Student.objects.filter(pk__in=[students[5].pk, students[6].pk]).update(section=self.section_b)
+
+        exam_type = ExamType.objects.create(tenant=self.tenant, name='Mid-Term', code='MID', weightage=50)
+        self.exam = Exam.objects.create(
+            tenant=self.tenant, name='Mid-Term', code='MID-5A', exam_type=exam_type,
+            academic_year=students[0].academic_year, class_name=section.class_name,
+            start_date=date(2025, 9, 15), end_date=date(2025, 9, 20), total_marks=500,
+        )
+        self.results = [
+            ExamResult(
+                exam=self.exam, student=student,
+                percentage=Decimal(percentage) if percentage else None,
+            )
+            for student, percentage in zip(students, self.PERCENTAGES)
+        ]
+        ExamResult.objects.bulk_create_secure(self.results, tenant=self.tenant, audit=False)
+
+    def _ranks(self, *fields):
+        from apps.exams.models import ExamResult
+
+        stored = {
+            pk: tuple(values)
+            for pk, *values in ExamResult.objects.filter(exam=self.exam).values_list('pk', *fields)
+        }
+        return [stored[result.pk] for result in self.results]
+
+    def test_competition_ranking_in_one_statement(self):
+        from apps.exams.ranking import rank_exam
+
+        with self.assertQueryBudget(rank_exam.query_budget) as analyzer:
+            changed = rank_exam(self.exam)
+        self.assertEqual(changed, len(self.results))
+        updates = [shape for shape, sql in analyzer.samples.items() if 'RANK() OVER' in sql]
+        self.assertEqual([analyzer.shapes[shape] for shape in updates], [1])
+        self.assertEqual(
+            self._ranks('rank', 'total_students'),
+            [(1, 6), (2, 6), (2, 6), (5, 6), (None, 6), (2, 6), (6, 6)],
+        )
+
+    def test_dense_ranking(self):
+        from apps.exams.ranking import DENSE, rank_exam
+
+        rank_exam(self.exam, DENSE)
+        self.assertEqual(self._ranks('rank'), [(1,), (2,), (2,), (3,), (None,), (2,), (4,)])
+
+    def test_section_ranks(self):
+        from apps.exams.ranking import rank_exam
+
+        rank_exam(self.exam)
+        self.assertEqual(
+            self._ranks('section_rank', 'section_total_students'),
+            [(1, 4), (2, 4), (2, 4), (4, 4), (None, 4), (1, 2), (2, 2)],
+        )
+
+    def test_unchanged_ranks_are_not_rewritten_and_stay_signed(self):
+        from apps.core.utils.signatures import verify_integrity
+        from apps.exams.models import ExamResult
+        from apps.exams.ranking import rank_exam
+
+        rank_exam(self.exam)
+        self.assertEqual(rank_exam(self.exam), 0)
+        self.assertTrue(verify_integrity(ExamResult.objects.filter(exam=self.exam)).ok)
+
+    def test_ranks_are_deferred_until_publish(self):
+        from apps.exams.models import ExamResult
+
+        result = ExamResult.objects.get(pk=self.results[3].pk)
+        result.percentage = Decimal('95')
+        result.save()
+        self.assertEqual(self._ranks('rank')[3], (None,))
+
+        self.exam.is_published = True
+        self.exam.save()
+        self.assertEqual(self._ranks('rank'), [(2,), (3,), (3,), (1,), (None,), (3,), (6,)])
+
+
+class GradingScaleTests(TenantQueryBudgetTestCase):
+
+    # (grade, min, max, grade point); 80-90 and 90-100 share a boundary,
+    # nothing covers 33-40
+    BOUNDARIES = [
+        ('A', '90', '100', '10'),
+        ('B', '80', '90', '8'),
+        ('C', '40', '79.99', '6'),
+        ('E', '0', '32.99', '0'),
+    ]
+
+    def setUp(self):
+        super().setUp()
+        from django.core.cache import cache
+        from apps.core import config_cache
+        from apps.exams.models import Grade, GradingSystem
+
+        cache.clear()
+        config_cache._local_cache.clear()
+        self.system = GradingSystem.objects.create(
+            tenant=self.tenant, name='CBSE', code='CBSE', is_default=True
+        )
+        Grade.objects.bulk_create_secure([
+            Grade(
+                grading_system=self.system, grade=grade, description=grade, order=order,
+                min_percentage=Decimal(low), max_percentage=Decimal(high), grade_point=Decimal(point),
+            )
+            for order, (grade, low, high, point) in enumerate(self.BOUNDARIES)
+        ], tenant=self.tenant, audit=False)
+
+    def _grades(self, percentages):
+        from apps.exams.grading import grade_many
+
+        return [grade.grade if grade else None for grade in grade_many(percentages, tenant=self.tenant)]
+
+    def test_boundaries(self):
+        self.assertEqual(
+            self._grades([100, '90', Decimal('89.99'), 80, 79.995, 40, 35, 0, None]),
+            ['A', 'A', 'B', 'B', None, 'C', None, 'E', None],
+        )
+
+    def test_scale_is_loaded_once(self):
+        from apps.exams.grading import grade_for
+
+        grade_for(75, tenant=self.tenant)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._grades([95, 85, 75] * 100), ['A', 'B', 'C'] * 100)
+
+    def test_changing_a_grade_retires_the_scale(self):
+        from apps.exams.models import Grade
+
+        self.assertEqual(self._grades([85]), ['B'])
+        grade = Grade.objects.get(grading_system=self.system, grade='B')
+        grade.min_percentage = Decimal('86')
+        with self.captureOnCommitCallbacks(execute=True):
+            grade.save()
+        self.assertEqual(self._grades([85, 86]), [None, 'B'])
+
+    def test_changing_the_default_system_retires_the_scale(self):
+        from apps.exams.models import GradingSystem
+
+        self.assertEqual(self._grades([85]), ['B'])
+        with self.captureOnCommitCallbacks(execute=True):
+            GradingSystem.objects.create(tenant=self.tenant, name='Pass/Fail', code='PF', is_default=True)
+        self.assertEqual(self._grades([85]), [None])
+
+    def test_bulk_writes_retire_the_scale(self):
+        from apps.exams.models import Grade
+
+        self.assertEqual(self._grades([35]), [None])
+        with self.captureOnCommitCallbacks(execute=True):
+            Grade.objects.bulk_create_secure([
+                Grade(
+                    grading_system=self.system, grade='D', description='D', order=4,
+                    min_percentage=Decimal('33'), max_percentage=Decimal('39.99'), grade_point=Decimal('4'),
+                )
+            ], tenant=self.tenant, audit=False)
+        self.assertEqual(self._grades([35]), ['D'])
+
+        grade = Grade.objects.get(grading_system=self.system, grade='D')
+        grade.min_percentage = Decimal('36')
+        with self.captureOnCommitCallbacks(execute=True):
+            Grade.objects.bulk_update_secure([grade], ['min_percentage'], tenant=self.tenant, audit=False)
+        self.assertEqual(self._grades([35]), [None])
@@ -9,6 +9,7 @@ from .models import ExamType, Exam, ExamSubject, GradingSystem, Grade, ExamResul
 class ExamDashboardView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
     template_name = 'exams/dashboard.html'
     permission_required = 'exams.view_exam'
+    query_budget = 6
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -28,6 +29,7 @@ class ExamTypeListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'exams/exam_type_list.html'
     context_object_name = 'exam_types'
     permission_required = 'exams.view_examtype'
+    query_budget = 3
 
 class ExamTypeCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = ExamType
@@ -68,6 +70,10 @@ class ExamListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'exams/exam_list.html'
     context_object_name = 'exams'
     permission_required = 'exams.view_exam'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('exam_type', 'academic_year')
 
 class ExamDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
     model = Exam
@@ -118,6 +124,7 @@ class GradingSystemListView(LoginRequiredMixin, PermissionRequiredMixin, ListVie
     template_name = 'exams/grading_system_list.html'
     context_object_name = 'grading_systems'
     permission_required = 'exams.view_gradingsystem'
+    query_budget = 3
 
 class GradingSystemCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = GradingSystem
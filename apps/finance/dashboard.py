@@ -0,0 +1,12 @@
+from apps.core.utils.dashboard_metrics import DashboardMetrics, Metric
+
+
+PENDING_INVOICE_STATUSES = ('ISSUED', 'PARTIALLY_PAID', 'OVERDUE')
+
+DASHBOARD_METRICS = DashboardMetrics(
+    Metric('total_invoices', 'finance.Invoice'),
+    Metric('pending_payments', 'finance.Invoice', sum_field='due_amount', status__in=PENDING_INVOICE_STATUSES),
+    Metric('overdue_invoices', 'finance.Invoice', is_overdue=True),
+    Metric('total_collected', 'finance.Payment', sum_field='amount', status='COMPLETED'),
+    tags='finance',
+)
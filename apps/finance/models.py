@@ -439,25 +439,14 @@ class Invoice(BaseModel):
     def generate_invoice_number(self):
         """Generate unique invoice number"""
         from apps.configuration.models import FinancialConfiguration
+        from apps.tenants.sequences import next_document_number
         
         config = FinancialConfiguration.get_for_tenant(self.tenant)
         prefix = f"{config.invoice_prefix}-{timezone.now().year}-"
         
-        last_invoice = Invoice.objects.filter(
-            invoice_number__startswith=prefix,
-            tenant=self.tenant
-        ).order_by('invoice_number').last()
-        
-        if last_invoice:
-            try:
-                last_num = int(last_invoice.invoice_number.split('-')[-1])
-                new_num = last_num + 1
-            except ValueError:
-                new_num = 1
-        else:
-            new_num = config.invoice_start_number
-            
-        return f"{prefix}{new_num:05d}"
+        return next_document_number(
+            self, 'invoice_number', prefix, width=5, start=config.invoice_start_number
+        )
 
     @property
     def is_fully_paid(self):
@@ -784,19 +773,10 @@ class Payment(BaseModel):
 
     def generate_payment_number(self):
         """Generate unique payment number"""
-        prefix = f"PAY-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
-        last_payment = Payment.objects.filter(
-            payment_number__startswith=prefix,
-            tenant=self.tenant
-        ).order_by('payment_number').last()
+        from apps.tenants.sequences import next_document_number
         
-        if last_payment:
-            last_num = int(last_payment.payment_number.split('-')[-1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
-            
-        return f"{prefix}{new_num:05d}"
+        prefix = f"PAY-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
+        return next_document_number(self, 'payment_number', prefix, width=5)
 
     def verify_payment(self, user):
         """Verify payment"""
@@ -935,19 +915,10 @@ class Refund(BaseModel):
 
     def generate_refund_number(self):
         """Generate unique refund number"""
-        prefix = f"REF-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
-        last_refund = Refund.objects.filter(
-            refund_number__startswith=prefix,
-            tenant=self.tenant
-        ).order_by('refund_number').last()
+        from apps.tenants.sequences import next_document_number
         
-        if last_refund:
-            last_num = int(last_refund.refund_number.split('-')[-1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
-            
-        return f"{prefix}{new_num:05d}"
+        prefix = f"REF-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
+        return next_document_number(self, 'refund_number', prefix, width=5)
 
     def approve(self, user):
         """Approve refund"""
@@ -1178,19 +1149,10 @@ class Expense(BaseModel):
 
     def generate_expense_number(self):
         """Generate unique expense number"""
-        prefix = f"EXP-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
-        last_expense = Expense.objects.filter(
-            expense_number__startswith=prefix,
-            tenant=self.tenant
-        ).order_by('expense_number').last()
+        from apps.tenants.sequences import next_document_number
         
-        if last_expense:
-            last_num = int(last_expense.expense_number.split('-')[-1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
-            
-        return f"{prefix}{new_num:05d}"
+        prefix = f"EXP-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
+        return next_document_number(self, 'expense_number', prefix, width=5)
 
     def submit_for_approval(self):
         """Submit expense for approval"""
@@ -1421,19 +1383,10 @@ class FinancialTransaction(BaseModel):
 
     def generate_transaction_number(self):
         """Generate unique transaction number"""
-        prefix = f"TRN-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
-        last_transaction = FinancialTransaction.objects.filter(
-            transaction_number__startswith=prefix,
-            tenant=self.tenant
-        ).order_by('transaction_number').last()
+        from apps.tenants.sequences import next_document_number
         
-        if last_transaction:
-            last_num = int(last_transaction.transaction_number.split('-')[-1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
-            
-        return f"{prefix}{new_num:05d}"
+        prefix = f"TRN-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
+        return next_document_number(self, 'transaction_number', prefix, width=5)
 
 
 class BankAccount(BaseModel):
@@ -1,3 +1,71 @@
+from datetime import date
+from decimal import Decimal
+
 from django.test import TestCase
 
-# Create your tests here.
+from apps.academics.tests import seed_section
+from apps.core.testing import TenantQueryBudgetTestCase
+
+
+def seed_invoices(tenant, count):
+    """
+    Create count students with one paid invoice each, plus fee structures
+    and discounts for their class
+    """
+    from apps.finance.models import FeeDiscount, FeeStructure, Invoice, Payment
+
+    section, students = seed_section(tenant, count)
+    year = students[0].academic_year
+    FeeStructure.objects.bulk_create_secure([
+        FeeStructure(
+            tenant=tenant, name=fee_type.title(), academic_year=year, class_name=section.class_name,
+            fee_type=fee_type, frequency='YEARLY', amount=Decimal('1000'), due_day=10,
+        )
+        for fee_type in ['TUITION', 'ADMISSION', 'EXAMINATION'][:count]
+    ], tenant=tenant, audit=False)
+    FeeDiscount.objects.bulk_create_secure([
+        FeeDiscount(
+            tenant=tenant, name=f'Discount {n}', code=f'DISC-{n}', discount_type='PERCENTAGE',
+            value=Decimal('10'), applicable_to='ALL_STUDENTS',
+            valid_from=date(2025, 4, 1), valid_until=date(2026, 3, 31),
+        )
+        for n in range(count)
+    ], tenant=tenant, audit=False)
+    invoices = [
+        Invoice(
+            tenant=tenant, invoice_number=f'INV-{n}', student=student, academic_year=year,
+            due_date=date(2025, 5, 10), total_amount=Decimal('1000'), due_amount=Decimal('1000'),
+        )
+        for n, student in enumerate(students)
+    ]
+    Invoice.objects.bulk_create_secure(invoices, tenant=tenant, audit=False)
+    Payment.objects.bulk_create_secure([
+        Payment(
+            tenant=tenant, invoice=invoice, payment_number=f'PAY-{n}',
+            amount=Decimal('1000'), payment_method='CASH',
+        )
+        for n, invoice in enumerate(invoices)
+    ], tenant=tenant, audit=False)
+    return invoices
+
+
+class FinanceQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_invoices(self.tenant, 3)
+
+    def test_dashboard(self):
+        self.assertViewQueryBudget('finance:dashboard')
+
+    def test_fee_structure_list(self):
+        self.assertViewQueryBudget('finance:fee_structure_list')
+
+    def test_fee_discount_list(self):
+        self.assertViewQueryBudget('finance:fee_discount_list')
+
+    def test_invoice_list(self):
+        self.assertViewQueryBudget('finance:invoice_list')
+
+    def test_payment_list(self):
+        self.assertViewQueryBudget('finance:payment_list')
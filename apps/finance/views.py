@@ -5,23 +5,22 @@ from django.contrib import messages
 from django.db.models import Sum, Count
 from apps.core.permissions.mixins import PermissionRequiredMixin
 from apps.core.utils.tenant import get_current_tenant
+from .dashboard import DASHBOARD_METRICS
 from .models import FeeStructure, FeeDiscount, Invoice, Payment
 
 class FinanceDashboardView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
     template_name = 'finance/dashboard.html'
     permission_required = 'finance.view_invoice'
+    query_budget = 3
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         tenant = get_current_tenant()
         
-        context['total_invoices'] = Invoice.objects.filter(tenant=tenant).count()
-        context['pending_payments'] = Invoice.objects.filter(tenant=tenant, status__in=['ISSUED', 'PARTIALLY_PAID', 'OVERDUE']).aggregate(Sum('due_amount'))['due_amount__sum'] or 0
-        context['total_collected'] = Payment.objects.filter(tenant=tenant, status='COMPLETED').aggregate(Sum('amount'))['amount__sum'] or 0
-        context['overdue_invoices'] = Invoice.objects.filter(tenant=tenant, is_overdue=True).count()
-        
+        context.update(DASHBOARD_METRICS.get(tenant))
         return context
 
+
 # ==================== FEE STRUCTURE ====================
 
 class FeeStructureListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
@@ -29,6 +28,10 @@ class FeeStructureListView(LoginRequiredMixin, PermissionRequiredMixin, ListView
     template_name = 'finance/fee_structure_list.html'
     context_object_name = 'fee_structures'
     permission_required = 'finance.view_feestructure'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('class_name')
 
 class FeeStructureCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = FeeStructure
@@ -73,6 +76,7 @@ class FeeDiscountListView(LoginRequiredMixin, PermissionRequiredMixin, ListView)
     template_name = 'finance/fee_discount_list.html'
     context_object_name = 'discounts'
     permission_required = 'finance.view_feediscount'
+    query_budget = 3
 
 class FeeDiscountCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = FeeDiscount
@@ -117,6 +121,10 @@ class InvoiceListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'finance/invoice_list.html'
     context_object_name = 'invoices'
     permission_required = 'finance.view_invoice'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('student')
 
 class InvoiceDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
     model = Invoice
@@ -165,6 +173,10 @@ class PaymentListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'finance/payment_list.html'
     context_object_name = 'payments'
     permission_required = 'finance.view_payment'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('invoice')
 
 class PaymentDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
     model = Payment
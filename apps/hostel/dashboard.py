@@ -0,0 +1,10 @@
+from apps.core.utils.dashboard_metrics import DashboardMetrics, Metric
+
+
+DASHBOARD_METRICS = DashboardMetrics(
+    Metric('total_hostels', 'hostel.Hostel'),
+    Metric('total_rooms', 'hostel.Room'),
+    Metric('total_allocations', 'hostel.HostelAllocation'),
+    Metric('pending_leaves', 'hostel.LeaveApplication', status='PENDING'),
+    tags='hostel',
+)
@@ -5,6 +5,7 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from apps.core.models import BaseModel
+from apps.core.utils.queries import query_budget
 
 
 class Hostel(BaseModel):
@@ -79,7 +80,11 @@ class Hostel(BaseModel):
         return self.name
 
     @property
+    @query_budget(1)
     def current_occupancy(self):
+        # List views annotate the total to avoid a query per row
+        if hasattr(self, 'occupied_beds'):
+            return self.occupied_beds or 0
         return self.rooms.aggregate(
             total=models.Sum('current_occupancy')
         )['total'] or 0
@@ -1,3 +1,58 @@
+from decimal import Decimal
+
 from django.test import TestCase
 
-# Create your tests here.
+from apps.academics.tests import seed_section
+from apps.core.testing import TenantQueryBudgetTestCase
+from apps.users.tests import seed_users
+
+
+def seed_hostels(tenant, count):
+    """
+    Create count hostels with a warden and one room each, and allocate a
+    student to every room
+    """
+    from apps.hostel.models import Hostel, HostelAllocation, Room
+
+    wardens = seed_users(tenant, count, prefix='warden')
+    hostels = [
+        Hostel(
+            tenant=tenant, name=f'Hostel {n}', code=f'H-{n}', hostel_type='COED', warden=warden,
+            total_rooms=1, total_capacity=2, hostel_fee=Decimal('5000'),
+        )
+        for n, warden in enumerate(wardens)
+    ]
+    Hostel.objects.bulk_create_secure(hostels, tenant=tenant, audit=False)
+    rooms = [
+        Room(
+            tenant=tenant, hostel=hostel, room_number='101', room_type='DOUBLE', floor=1,
+            total_beds=2, current_occupancy=1,
+        )
+        for hostel in hostels
+    ]
+    Room.objects.bulk_create_secure(rooms, tenant=tenant, audit=False)
+    _, students = seed_section(tenant, count)
+    HostelAllocation.objects.bulk_create_secure([
+        HostelAllocation(tenant=tenant, student=student, hostel=room.hostel, room=room, monthly_fee=Decimal('5000'))
+        for student, room in zip(students, rooms)
+    ], tenant=tenant, audit=False)
+    return hostels
+
+
+class HostelQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_hostels(self.tenant, 3)
+
+    def test_dashboard(self):
+        self.assertViewQueryBudget('hostel:dashboard')
+
+    def test_hostel_list(self):
+        self.assertViewQueryBudget('hostel:hostel_list')
+
+    def test_room_list(self):
+        self.assertViewQueryBudget('hostel:room_list')
+
+    def test_allocation_list(self):
+        self.assertViewQueryBudget('hostel:allocation_list')
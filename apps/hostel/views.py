@@ -5,21 +5,19 @@ from django.contrib import messages
 from django.db.models import Sum, Count
 from apps.core.permissions.mixins import PermissionRequiredMixin
 from apps.core.utils.tenant import get_current_tenant
+from .dashboard import DASHBOARD_METRICS
 from .models import Hostel, Room, HostelAllocation, LeaveApplication
 
 class HostelDashboardView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
     template_name = 'hostel/dashboard.html'
     permission_required = 'hostel.view_hostel'
+    query_budget = 5
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         tenant = get_current_tenant()
         
-        context['total_hostels'] = Hostel.objects.filter(tenant=tenant, is_active=True).count()
-        context['total_rooms'] = Room.objects.filter(tenant=tenant).count()
-        context['total_allocations'] = HostelAllocation.objects.filter(tenant=tenant, is_active=True).count()
-        context['pending_leaves'] = LeaveApplication.objects.filter(tenant=tenant, status='PENDING').count()
-        
+        context.update(DASHBOARD_METRICS.get(tenant))
         return context
 
 # ==================== HOSTEL ====================
@@ -29,6 +27,12 @@ class HostelListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'hostel/hostel_list.html'
     context_object_name = 'hostels'
     permission_required = 'hostel.view_hostel'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('warden').annotate(
+            occupied_beds=Sum('rooms__current_occupancy')
+        )
 
 class HostelDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
     model = Hostel
@@ -79,6 +83,7 @@ class RoomListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'hostel/room_list.html'
     context_object_name = 'rooms'
     permission_required = 'hostel.view_room'
+    query_budget = 3
 
 class RoomCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = Room
@@ -119,6 +124,10 @@ class HostelAllocationListView(LoginRequiredMixin, PermissionRequiredMixin, List
     template_name = 'hostel/allocation_list.html'
     context_object_name = 'allocations'
     permission_required = 'hostel.view_hostelallocation'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('student', 'room__hostel')
 
 class HostelAllocationCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = HostelAllocation
@@ -161,6 +170,7 @@ class LeaveApplicationListView(LoginRequiredMixin, PermissionRequiredMixin, List
     template_name = 'hostel/leave_list.html'
     context_object_name = 'leaves'
     permission_required = 'hostel.view_leaveapplication'
+    query_budget = 3
 
 class LeaveApplicationCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = LeaveApplication
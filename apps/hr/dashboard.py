@@ -0,0 +1,10 @@
+from apps.core.utils.dashboard_metrics import DashboardMetrics, Metric
+
+
+DASHBOARD_METRICS = DashboardMetrics(
+    Metric('total_staff', 'hr.Staff'),
+    Metric('active_staff', 'hr.Staff', employment_status='ACTIVE'),
+    Metric('total_departments', 'hr.Department'),
+    Metric('total_designations', 'hr.Designation'),
+    tags='hr',
+)
@@ -6,6 +6,7 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from apps.core.models import BaseModel
+from apps.core.utils.queries import query_budget
 
 # Phone regex for validation
 phone_regex = RegexValidator(
@@ -50,7 +51,11 @@ class Department(BaseModel):
         return self.name
 
     @property
+    @query_budget(1)
     def staff_count(self):
+        # List views annotate the count to avoid a query per row
+        if hasattr(self, 'active_staff'):
+            return self.active_staff
         return self.staff_members.filter(is_active=True).count()
 
     @property
@@ -1,3 +1,58 @@
+from datetime import date
+from decimal import Decimal
+
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.testing import TenantQueryBudgetTestCase
+from apps.users.tests import seed_users
+
+
+def seed_staff(tenant, count):
+    """
+    Create count departments, each headed by one of count staff members
+    """
+    from apps.hr.models import Department, Designation, Staff
+
+    users = seed_users(tenant, count, role='teacher', prefix='staff')
+    departments = [
+        Department(tenant=tenant, name=f'Department {n}', code=f'DEP-{n}', head_of_department=user)
+        for n, user in enumerate(users)
+    ]
+    Department.objects.bulk_create_secure(departments, tenant=tenant, audit=False)
+    designations = [
+        Designation(
+            tenant=tenant, title=f'Designation {n}', code=f'DES-{n}', category='TEACHING',
+            min_salary=Decimal('30000'), max_salary=Decimal('60000'),
+        )
+        for n in range(count)
+    ]
+    Designation.objects.bulk_create_secure(designations, tenant=tenant, audit=False)
+    staff = [
+        Staff(
+            tenant=tenant, user=user, employee_id=f'EMP-{n}', date_of_birth=date(1985, 1, 1), gender='F',
+            blood_group='A+', marital_status='SINGLE', department=department, designation=designation,
+            employment_type='PERMANENT', joining_date=date(2020, 6, 1), basic_salary=Decimal('40000'),
+        )
+        for n, (user, department, designation) in enumerate(zip(users, departments, designations))
+    ]
+    Staff.objects.bulk_create_secure(staff, tenant=tenant, audit=False)
+    return staff
+
+
+class HRQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_staff(self.tenant, 3)
+
+    def test_dashboard(self):
+        self.assertViewQueryBudget('hr:dashboard')
+
+    def test_department_list(self):
+        self.assertViewQueryBudget('hr:department_list')
+
+    def test_designation_list(self):
+        self.assertViewQueryBudget('hr:designation_list')
+
+    def test_staff_list(self):
+        self.assertViewQueryBudget('hr:staff_list')
@@ -2,24 +2,22 @@ from django.views.generic import ListView, DetailView, CreateView, UpdateView, D
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
 from django.contrib import messages
-from django.db.models import Count
+from django.db.models import Count, Q
 from apps.core.permissions.mixins import PermissionRequiredMixin
 from apps.core.utils.tenant import get_current_tenant
+from .dashboard import DASHBOARD_METRICS
 from .models import Department, Designation, Staff
 
 class HRDashboardView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
     template_name = 'hr/dashboard.html'
     permission_required = 'hr.view_staff'
+    query_budget = 4
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         tenant = get_current_tenant()
         
-        context['total_staff'] = Staff.objects.filter(tenant=tenant, is_active=True).count()
-        context['total_departments'] = Department.objects.filter(tenant=tenant).count()
-        context['total_designations'] = Designation.objects.filter(tenant=tenant).count()
-        context['active_staff'] = Staff.objects.filter(tenant=tenant, employment_status='ACTIVE').count()
-        
+        context.update(DASHBOARD_METRICS.get(tenant))
         return context
 
 # ==================== DEPARTMENT ====================
@@ -29,6 +27,12 @@ class DepartmentListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'hr/department_list.html'
     context_object_name = 'departments'
     permission_required = 'hr.view_department'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('head_of_department').annotate(
+            active_staff=Count('staff_members', filter=Q(staff_members__is_active=True))
+        )
 
 class DepartmentCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = Department
@@ -69,6 +73,7 @@ class DesignationListView(LoginRequiredMixin, PermissionRequiredMixin, ListView)
     template_name = 'hr/designation_list.html'
     context_object_name = 'designations'
     permission_required = 'hr.view_designation'
+    query_budget = 3
 
 class DesignationCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = Designation
@@ -111,6 +116,10 @@ class StaffListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'hr/staff_list.html'
     context_object_name = 'staff_members'
     permission_required = 'hr.view_staff'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('user')
 
 class StaffDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
     model = Staff
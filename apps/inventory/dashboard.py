@@ -0,0 +1,12 @@
+from django.db.models import F
+
+from apps.core.utils.dashboard_metrics import DashboardMetrics, Metric
+
+
+DASHBOARD_METRICS = DashboardMetrics(
+    Metric('total_items', 'inventory.Item'),
+    Metric('low_stock_items', 'inventory.Item', current_stock__lte=F('low_stock_threshold')),
+    Metric('total_suppliers', 'inventory.Supplier'),
+    Metric('total_categories', 'inventory.Category'),
+    tags='inventory',
+)
@@ -6,6 +6,7 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from apps.core.models import BaseModel
+from apps.core.utils.queries import query_budget
 
 
 class Category(BaseModel):
@@ -61,7 +62,11 @@ class Category(BaseModel):
         return self.name
 
     @property
+    @query_budget(1)
     def items_count(self):
+        # List views annotate the count to avoid a query per row
+        if hasattr(self, 'active_items'):
+            return self.active_items
         return self.items.filter(is_active=True).count()
 
     @property
@@ -663,19 +668,10 @@ class PurchaseOrder(BaseModel):
 
     def generate_po_number(self):
         """Generate unique purchase order number"""
-        prefix = f"PO-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
-        last_po = PurchaseOrder.objects.filter(
-            po_number__startswith=prefix,
-            tenant=self.tenant
-        ).order_by('po_number').last()
+        from apps.tenants.sequences import next_document_number
         
-        if last_po:
-            last_num = int(last_po.po_number.split('-')[-1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
-            
-        return f"{prefix}{new_num:05d}"
+        prefix = f"PO-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
+        return next_document_number(self, 'po_number', prefix, width=5)
 
     def calculate_totals(self):
         """Calculate order totals from items"""
@@ -919,19 +915,10 @@ class IssueRequest(BaseModel):
 
     def generate_issue_number(self):
         """Generate unique issue number"""
-        prefix = f"ISS-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
-        last_issue = IssueRequest.objects.filter(
-            issue_number__startswith=prefix,
-            tenant=self.tenant
-        ).order_by('issue_number').last()
+        from apps.tenants.sequences import next_document_number
         
-        if last_issue:
-            last_num = int(last_issue.issue_number.split('-')[-1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
-            
-        return f"{prefix}{new_num:05d}"
+        prefix = f"ISS-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
+        return next_document_number(self, 'issue_number', prefix, width=5)
 
     def approve(self, user):
         """Approve issue request"""
@@ -1,3 +1,59 @@
+from decimal import Decimal
+
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.testing import TenantQueryBudgetTestCase
+from apps.users.tests import seed_users
+
+
+def seed_items(tenant, count):
+    """
+    Create count subcategories with one item each, a supplier per item and
+    a purchase movement per item
+    """
+    from apps.inventory.models import Category, Item, StockMovement, Supplier
+
+    parent = Category.objects.create(tenant=tenant, name='Stationery', code='STA')
+    categories = [
+        Category(tenant=tenant, name=f'Category {n}', code=f'CAT-{n}', parent_category=parent)
+        for n in range(count)
+    ]
+    Category.objects.bulk_create_secure(categories, tenant=tenant, audit=False)
+    Supplier.objects.bulk_create_secure([
+        Supplier(tenant=tenant, name=f'Supplier {n}', code=f'SUP-{n}') for n in range(count)
+    ], tenant=tenant, audit=False)
+    items = [
+        Item(tenant=tenant, name=f'Item {n}', code=f'ITM-{n}', barcode=f'BAR-{n}', category=category)
+        for n, category in enumerate(categories)
+    ]
+    Item.objects.bulk_create_secure(items, tenant=tenant, audit=False)
+    clerks = seed_users(tenant, count, prefix='clerk')
+    StockMovement.objects.bulk_create_secure([
+        StockMovement(
+            tenant=tenant, item=item, movement_type='PURCHASE', quantity=Decimal('10'), performed_by=clerk,
+        )
+        for item, clerk in zip(items, clerks)
+    ], tenant=tenant, audit=False)
+    return items
+
+
+class InventoryQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_items(self.tenant, 3)
+
+    def test_dashboard(self):
+        self.assertViewQueryBudget('inventory:dashboard')
+
+    def test_category_list(self):
+        self.assertViewQueryBudget('inventory:category_list')
+
+    def test_supplier_list(self):
+        self.assertViewQueryBudget('inventory:supplier_list')
+
+    def test_item_list(self):
+        self.assertViewQueryBudget('inventory:item_list')
+
+    def test_stock_movement_list(self):
+        self.assertViewQueryBudget('inventory:stock_movement_list')
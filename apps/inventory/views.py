@@ -2,24 +2,22 @@ from django.views.generic import ListView, DetailView, CreateView, UpdateView, D
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
 from django.contrib import messages
-from django.db.models import Sum, Count
+from django.db.models import Sum, Count, F, Q
 from apps.core.permissions.mixins import PermissionRequiredMixin
 from apps.core.utils.tenant import get_current_tenant
+from .dashboard import DASHBOARD_METRICS
 from .models import Category, Supplier, Item, StockMovement, PurchaseOrder
 
 class InventoryDashboardView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
     template_name = 'inventory/dashboard.html'
     permission_required = 'inventory.view_item'
+    query_budget = 4
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         tenant = get_current_tenant()
         
-        context['total_items'] = Item.objects.filter(tenant=tenant, is_active=True).count()
-        context['low_stock_items'] = Item.objects.filter(tenant=tenant, is_active=True, current_stock__lte=models.F('low_stock_threshold')).count()
-        context['total_suppliers'] = Supplier.objects.filter(tenant=tenant, is_active=True).count()
-        context['total_categories'] = Category.objects.filter(tenant=tenant, is_active=True).count()
-        
+        context.update(DASHBOARD_METRICS.get(tenant))
         return context
 
 # ==================== CATEGORY ====================
@@ -29,6 +27,12 @@ class CategoryListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'inventory/category_list.html'
     context_object_name = 'categories'
     permission_required = 'inventory.view_category'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('parent_category').annotate(
+            active_items=Count('items', filter=Q(items__is_active=True))
+        )
 
 class CategoryCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = Category
@@ -73,6 +77,7 @@ class SupplierListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'inventory/supplier_list.html'
     context_object_name = 'suppliers'
     permission_required = 'inventory.view_supplier'
+    query_budget = 3
 
 class SupplierCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = Supplier
@@ -115,6 +120,10 @@ class ItemListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'inventory/item_list.html'
     context_object_name = 'items'
     permission_required = 'inventory.view_item'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('category')
 
 class ItemDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
     model = Item
@@ -165,6 +174,10 @@ class StockMovementListView(LoginRequiredMixin, PermissionRequiredMixin, ListVie
     template_name = 'inventory/stock_movement_list.html'
     context_object_name = 'movements'
     permission_required = 'inventory.view_stockmovement'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('item', 'performed_by')
 
 class StockMovementCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = StockMovement
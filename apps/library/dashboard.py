@@ -0,0 +1,10 @@
+from apps.core.utils.dashboard_metrics import DashboardMetrics, Metric
+
+
+DASHBOARD_METRICS = DashboardMetrics(
+    Metric('total_books', 'library.Book'),
+    Metric('available_books', 'library.Book', available_copies__gt=0),
+    Metric('issued_books', 'library.BookIssue', status='ISSUED'),
+    Metric('overdue_books', 'library.BookIssue', status='OVERDUE'),
+    tags='library',
+)
@@ -4,7 +4,9 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from apps.core import config_cache
 from apps.core.models import BaseModel
+from apps.core.utils.queries import query_budget
 
 
 class Library(BaseModel):
@@ -116,6 +118,13 @@ class Library(BaseModel):
             self.is_active
         )
 
+    @classmethod
+    def get_active(cls, tenant):
+        """Cached active library of a tenant (see apps.core.config_cache)"""
+        return config_cache.get(
+            'library.Library.active', tenant, lambda: cls.objects.filter(tenant=tenant, is_active=True).first()
+        )
+
 
 class Author(BaseModel):
     """
@@ -160,7 +169,11 @@ class Author(BaseModel):
         return self.name
 
     @property
+    @query_budget(1)
     def books_count(self):
+        # List views annotate the count to avoid a query per row
+        if hasattr(self, 'book_total'):
+            return self.book_total
         return self.books.count()
 
     @property
@@ -710,7 +723,7 @@ class BookIssue(BaseModel):
         
         # Set due date based on member type
         if not self.due_date:
-            library = Library.objects.filter(tenant=self.tenant, is_active=True).first()
+            library = Library.get_active(self.tenant)
             if library:
                 if self.member.role == 'student':
                     days = library.issue_duration_students
@@ -722,19 +735,10 @@ class BookIssue(BaseModel):
 
     def generate_issue_number(self):
         """Generate unique issue number"""
-        prefix = f"LIB-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
-        last_issue = BookIssue.objects.filter(
-            issue_number__startswith=prefix,
-            tenant=self.tenant
-        ).order_by('issue_number').last()
+        from apps.tenants.sequences import next_document_number
         
-        if last_issue:
-            last_num = int(last_issue.issue_number.split('-')[-1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
-            
-        return f"{prefix}{new_num:05d}"
+        prefix = f"LIB-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
+        return next_document_number(self, 'issue_number', prefix, width=5)
 
     @property
     def is_overdue(self):
@@ -750,7 +754,7 @@ class BookIssue(BaseModel):
     def calculated_fine(self):
         """Calculate fine based on overdue days"""
         if self.is_overdue:
-            library = Library.objects.filter(tenant=self.tenant, is_active=True).first()
+            library = Library.get_active(self.tenant)
             if library:
                 fine = self.overdue_days * library.fine_per_day
                 return min(fine, library.max_fine_amount)
@@ -767,7 +771,7 @@ class BookIssue(BaseModel):
 
     def renew(self, renewed_by):
         """Renew the book issue"""
-        library = Library.objects.filter(tenant=self.tenant, is_active=True).first()
+        library = Library.get_active(self.tenant)
         if library:
             if self.member.role == 'student':
                 days = library.issue_duration_students
@@ -1177,7 +1181,7 @@ class LibraryMember(BaseModel):
         if self.is_blacklisted:
             return False
         
-        library = Library.objects.filter(tenant=self.tenant, is_active=True).first()
+        library = Library.get_active(self.tenant)
         if library:
             if self.user.role == 'student':
                 return self.current_books_issued < library.max_books_per_student
@@ -1,3 +1,61 @@
+from datetime import date
+
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.testing import TenantQueryBudgetTestCase
+from apps.users.tests import seed_users
+
+
+def seed_books(tenant, count):
+    """
+    Create count books, each with an author, a copy and an issue to a member
+    """
+    from apps.library.models import Author, Book, BookCategory, BookCopy, BookIssue, Publisher
+
+    category = BookCategory.objects.create(tenant=tenant, name='Fiction', code='FIC')
+    publisher = Publisher.objects.create(tenant=tenant, name='Budget Press')
+    books = [
+        Book(
+            tenant=tenant, isbn=f'978-0-00-00000{n}', title=f'Book {n}', category=category,
+            publisher=publisher, publication_year=2020, shelf_number=f'S{n}',
+        )
+        for n in range(count)
+    ]
+    Book.objects.bulk_create_secure(books, tenant=tenant, audit=False)
+    authors = [Author(tenant=tenant, name=f'Author {n}') for n in range(count)]
+    Author.objects.bulk_create_secure(authors, tenant=tenant, audit=False)
+    for book, author in zip(books, authors):
+        book.authors.add(author)
+    copies = [
+        BookCopy(tenant=tenant, book=book, copy_number='1', barcode=f'BC-{n}', accession_number=f'ACC-{n}')
+        for n, book in enumerate(books)
+    ]
+    BookCopy.objects.bulk_create_secure(copies, tenant=tenant, audit=False)
+    members = seed_users(tenant, count, role='student', prefix='reader')
+    BookIssue.objects.bulk_create_secure([
+        BookIssue(
+            tenant=tenant, member=member, book_copy=copy, issue_number=f'ISS-{n}',
+            due_date=date(2025, 7, 15), issued_by=member,
+        )
+        for n, (member, copy) in enumerate(zip(members, copies))
+    ], tenant=tenant, audit=False)
+    return books
+
+
+class LibraryQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_books(self.tenant, 3)
+
+    def test_dashboard(self):
+        self.assertViewQueryBudget('library:dashboard')
+
+    def test_book_list(self):
+        self.assertViewQueryBudget('library:book_list')
+
+    def test_author_list(self):
+        self.assertViewQueryBudget('library:author_list')
+
+    def test_book_issue_list(self):
+        self.assertViewQueryBudget('library:book_issue_list')
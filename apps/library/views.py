@@ -5,21 +5,19 @@ from django.contrib import messages
 from django.db.models import Sum, Count
 from apps.core.permissions.mixins import PermissionRequiredMixin
 from apps.core.utils.tenant import get_current_tenant
+from .dashboard import DASHBOARD_METRICS
 from .models import Library, Book, Author, Publisher, BookCategory, BookIssue
 
 class LibraryDashboardView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
     template_name = 'library/dashboard.html'
     permission_required = 'library.view_book'
+    query_budget = 3
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         tenant = get_current_tenant()
         
-        context['total_books'] = Book.objects.filter(tenant=tenant, is_active=True).count()
-        context['available_books'] = Book.objects.filter(tenant=tenant, is_active=True, available_copies__gt=0).count()
-        context['issued_books'] = BookIssue.objects.filter(tenant=tenant, status='ISSUED').count()
-        context['overdue_books'] = BookIssue.objects.filter(tenant=tenant, status='OVERDUE').count()
-        
+        context.update(DASHBOARD_METRICS.get(tenant))
         return context
 
 # ==================== BOOK ====================
@@ -29,6 +27,10 @@ class BookListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'library/book_list.html'
     context_object_name = 'books'
     permission_required = 'library.view_book'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('category', 'publisher')
 
 class BookDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
     model = Book
@@ -81,6 +83,10 @@ class AuthorListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'library/author_list.html'
     context_object_name = 'authors'
     permission_required = 'library.view_author'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().annotate(book_total=Count('books'))
 
 class AuthorCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = Author
@@ -121,6 +127,10 @@ class BookIssueListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'library/book_issue_list.html'
     context_object_name = 'issues'
     permission_required = 'library.view_bookissue'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('member', 'book_copy__book')
 
 class BookIssueCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = BookIssue
@@ -1,3 +1,39 @@
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.testing import TenantQueryBudgetTestCase
+
+
+def seed_tenants(count):
+    """
+    Create count active tenant rows with two domains each. Rows are bulk
+    inserted, so no schemas are created.
+    """
+    from apps.tenants.models import Domain, Tenant
+
+    tenants = [
+        Tenant(
+            name=f'School {n}', display_name=f'School {n}', slug=f'school-{n}', schema_name=f'school_{n}',
+            status=Tenant.STATUS_ACTIVE,
+        )
+        for n in range(count)
+    ]
+    Tenant.objects.bulk_create(tenants)
+    Domain.objects.bulk_create([
+        Domain(tenant=tenant, domain=f'{prefix}.school-{n}.example.com', is_primary=prefix == 'www')
+        for n, tenant in enumerate(tenants)
+        for prefix in ('www', 'portal')
+    ])
+    return tenants
+
+
+class PublicQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_tenants(3)
+
+    def test_tenant_list(self):
+        response = self.assertViewQueryBudget('tenant_list')
+        domains = {tenant.slug: tenant.primary_domain for tenant in response.context_data['tenants']}
+        for n in range(3):
+            self.assertEqual(domains[f'school-{n}'], f'www.school-{n}.example.com')
@@ -1,5 +1,6 @@
+from django.db.models import OuterRef, Subquery
 from django.views.generic import TemplateView, ListView, DetailView
-from apps.tenants.models import Tenant
+from apps.tenants.models import Domain, Tenant
 
 class HomeView(TemplateView):
     template_name = 'public/home.html'
@@ -17,12 +18,17 @@ class TenantListView(ListView):
     template_name = 'public/tenant_list.html'
     context_object_name = 'tenants'
     paginate_by = 12
+    query_budget = 3
 
     def get_queryset(self):
+        # Primary domain (else the oldest) per tenant, instead of a query per card
+        domains = Domain.objects.cross_tenant().filter(tenant=OuterRef('pk'), is_active=True)
         return Tenant.objects.filter(
             status=Tenant.STATUS_ACTIVE,
             is_active=True
-        ).exclude(schema_name='public').order_by('name')
+        ).exclude(schema_name='public').annotate(
+            primary_domain=Subquery(domains.order_by('-is_primary', 'created_at').values('domain')[:1])
+        ).order_by('name')
 
 class TenantDetailView(DetailView):
     model = Tenant
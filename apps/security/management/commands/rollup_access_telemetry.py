@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from apps.security.telemetry import rollup_access
+
+
+class Command(BaseCommand):
+    help = (
+        'Roll up closed hours of dashboard access counters from Redis into the access rollup table. '
+        'Run hourly from cron (e.g. "5 * * * *") when Celery beat is not running.'
+    )
+
+    def handle(self, *args, **options):
+        hours = rollup_access()
+        self.stdout.write(self.style.SUCCESS(f'Rolled up {hours} hour(s) of access telemetry'))
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:28
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tenants', '0004_tenantsequence'),
+        ('security', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccessRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path_bucket', models.CharField(max_length=100, verbose_name='Path Bucket')),
+                ('hour', models.DateTimeField(verbose_name='Hour')),
+                ('hits', models.PositiveIntegerField(default=0, verbose_name='Hits')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='access_rollups', to='tenants.tenant', verbose_name='Tenant')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='access_rollups', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Access Rollup',
+                'verbose_name_plural': 'Access Rollups',
+                'db_table': 'security_access_rollups',
+                'ordering': ['-hour'],
+                'indexes': [models.Index(fields=['tenant', 'hour'], name='security_ac_tenant__713915_idx')],
+                'unique_together': {('tenant', 'user', 'path_bucket', 'hour')},
+            },
+        ),
+    ]
@@ -535,7 +535,7 @@ class AuditLog(BaseModel):
     @classmethod
     def log_event(cls, event_type, description, user=None, severity="MEDIUM", 
                   outcome="UNKNOWN", request=None, resource=None, metadata=None):
-        """Convenience method to log security events"""
+        """Convenience method to log security events. Returns None while events are buffered."""
         audit_log = cls(
             event_type=event_type,
             description=description,
@@ -559,8 +559,8 @@ class AuditLog(BaseModel):
             audit_log.resource_id = str(getattr(resource, 'id', ''))
             audit_log.resource_name = str(resource)
         
-        audit_log.save()
-        return audit_log
+        from apps.core.utils.audit import record_audit_event
+        return record_audit_event(audit_log)
 
     @staticmethod
     def get_client_ip(request):
@@ -743,19 +743,10 @@ class SecurityIncident(BaseModel):
 
     def generate_incident_id(self):
         """Generate unique incident ID"""
-        prefix = f"INC-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
-        last_incident = SecurityIncident.objects.filter(
-            incident_id__startswith=prefix,
-            tenant=self.tenant
-        ).order_by('incident_id').last()
+        from apps.tenants.sequences import next_document_number
         
-        if last_incident:
-            last_num = int(last_incident.incident_id.split('-')[-1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
-            
-        return f"{prefix}{new_num:04d}"
+        prefix = f"INC-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
+        return next_document_number(self, 'incident_id', prefix, width=4)
 
     def add_timeline_event(self, event_type, description, user):
         """Add event to incident timeline"""
@@ -1083,19 +1074,10 @@ class SecurityScan(BaseModel):
 
     def generate_scan_id(self):
         """Generate unique scan ID"""
-        prefix = f"SCAN-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
-        last_scan = SecurityScan.objects.filter(
-            scan_id__startswith=prefix,
-            tenant=self.tenant
-        ).order_by('scan_id').last()
+        from apps.tenants.sequences import next_document_number
         
-        if last_scan:
-            last_num = int(last_scan.scan_id.split('-')[-1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
-            
-        return f"{prefix}{new_num:04d}"
+        prefix = f"SCAN-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
+        return next_document_number(self, 'scan_id', prefix, width=4)
 
     def start_scan(self):
         """Start the security scan"""
@@ -1103,4 +1085,47 @@ class SecurityScan(BaseModel):
         self.started_at = timezone.now()
         self.save()
         # Implementation to trigger actual scan
-        pass
\ No newline at end of file
+        pass
+
+
+class AccessRollup(models.Model):
+    """
+    Hourly dashboard access counts per user and path bucket, rolled up from
+    the Redis counters in apps.security.telemetry
+    """
+    tenant = models.ForeignKey(
+        "tenants.Tenant",
+        on_delete=models.CASCADE,
+        related_name="access_rollups",
+        verbose_name=_("Tenant")
+    )
+    user = models.ForeignKey(
+        "users.User",
+        on_delete=models.CASCADE,
+        related_name="access_rollups",
+        verbose_name=_("User")
+    )
+    path_bucket = models.CharField(
+        max_length=100,
+        verbose_name=_("Path Bucket")
+    )
+    hour = models.DateTimeField(
+        verbose_name=_("Hour")
+    )
+    hits = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Hits")
+    )
+
+    class Meta:
+        db_table = "security_access_rollups"
+        verbose_name = _("Access Rollup")
+        verbose_name_plural = _("Access Rollups")
+        ordering = ["-hour"]
+        unique_together = [['tenant', 'user', 'path_bucket', 'hour']]
+        indexes = [
+            models.Index(fields=['tenant', 'hour']),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.path_bucket} @ {self.hour:%Y-%m-%d %H:00}: {self.hits}"
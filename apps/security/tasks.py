@@ -0,0 +1,11 @@
+from celery import shared_task
+
+
+@shared_task(name='security.rollup_access_telemetry', ignore_result=True)
+def rollup_access_telemetry():
+    """
+    Fold closed hours of dashboard access counters into AccessRollup
+    (see apps.security.telemetry). Meant to run a few minutes past each hour.
+    """
+    from apps.security.telemetry import rollup_access
+    rollup_access()
@@ -0,0 +1,380 @@
+# apps/security/telemetry.py
+"""
+Dashboard access telemetry.
+
+Instead of writing a SecurityEvent row per request, each access to a
+tracked area increments a counter keyed by (user, path bucket) in an
+hourly Redis hash of the tenant's schema. Each schema keeps a set of its
+pending hours, and a global set lists the schemas with pending hours, so
+a tenant's dashboard reads only its own hashes.
+
+rollup_access() folds closed hours into the compact AccessRollup table,
+one row per tenant/user/bucket/hour, and deletes the hashes. Rollups
+overwrite rather than add, so re-running one is harmless. It runs hourly
+from Celery beat (security.rollup_access_telemetry, see
+CELERY_BEAT_SCHEDULE) or from cron through the rollup_access_telemetry
+command; counters not rolled up within RETENTION_HOURS expire.
+
+A sample of raw accesses can still be written as SecurityEvent rows
+through the audit pipeline (ACCESS_TELEMETRY['RAW_SAMPLE_RATE']). When the
+cache is not Redis, counters are kept in process memory, which is enough
+for development and tests.
+"""
+import datetime
+import logging
+import random
+import re
+import threading
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+
+from apps.core.utils import metrics
+
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'access_telemetry'
+SCHEMAS_KEY = f'{KEY_PREFIX}:schemas'
+HOUR_FORMAT = '%Y%m%d%H'
+
+_ID_SEGMENT = re.compile(
+    r'^(\d+|[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12})$',
+    re.IGNORECASE,
+)
+
+_local_lock = threading.Lock()
+# {schema: {hour label: {field: hits}}}
+_local_counters = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+
+
+def _config(name, default):
+    return getattr(settings, 'ACCESS_TELEMETRY', {}).get(name, default)
+
+
+def is_tracked_path(path):
+    return any(path.startswith(prefix) for prefix in _config('PATHS', ('/dashboard/',)))
+
+
+def path_bucket(path):
+    """
+    Collapse a path to its leading segments with ids replaced, so that
+    /dashboard/students/42/edit/ and /dashboard/students/7/ share a bucket
+    """
+    segments = [segment for segment in path.split('/') if segment]
+    segments = [
+        ':id' if _ID_SEGMENT.match(segment) else segment
+        for segment in segments[:_config('BUCKET_DEPTH', 2)]
+    ]
+    return ('/' + '/'.join(segments) + '/' if segments else '/')[:100]
+
+
+def hour_start(moment=None):
+    moment = timezone.localtime(moment or timezone.now(), datetime.timezone.utc)
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _hour_key(schema_name, hour_label):
+    return f'{KEY_PREFIX}:{schema_name}:{hour_label}'
+
+
+def _hours_key(schema_name):
+    return f'{KEY_PREFIX}:{schema_name}:hours'
+
+
+def _parse_hour(value):
+    return datetime.datetime.strptime(value, HOUR_FORMAT).replace(tzinfo=datetime.timezone.utc)
+
+
+def _redis_client():
+    """
+    Raw Redis client behind the telemetry cache, or None for other backends
+    """
+    from django.core.cache import caches
+    from django.core.cache.backends.redis import RedisCache
+
+    cache = caches[_config('CACHE_ALIAS', 'default')]
+    if not isinstance(cache, RedisCache):
+        return None
+    return cache._cache.get_client(KEY_PREFIX, write=True)
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def record_access(request, moment=None):
+    """
+    Count one access to a tracked path by the request's user
+    """
+    from django.db import connection
+
+    hour_label = hour_start(moment).strftime(HOUR_FORMAT)
+    schema_name = getattr(connection, 'schema_name', None) or 'public'
+    bucket = path_bucket(request.path)
+    field = f'{request.user.pk}|{bucket}'
+
+    client = _redis_client()
+    if client is None:
+        with _local_lock:
+            _local_counters[schema_name][hour_label][field] += 1
+    else:
+        key = _hour_key(schema_name, hour_label)
+        retention = _config('RETENTION_HOURS', 72) * 3600
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.hincrby(key, field, 1)
+            pipe.expire(key, retention)
+            pipe.sadd(_hours_key(schema_name), hour_label)
+            pipe.expire(_hours_key(schema_name), retention)
+            pipe.sadd(SCHEMAS_KEY, schema_name)
+            pipe.execute()
+        except Exception:
+            metrics.increment('access_telemetry.dropped')
+            logger.warning('Could not record dashboard access for %s', bucket, exc_info=True)
+            return
+    metrics.increment('access_telemetry.recorded')
+
+    sample_rate = _config('RAW_SAMPLE_RATE', 0.0)
+    if sample_rate and random.random() < sample_rate:
+        _record_sample(request, bucket, sample_rate)
+
+
+def _record_sample(request, bucket, sample_rate):
+    from apps.auth.models import SecurityEvent
+    from apps.core.utils.audit import record_audit_event
+
+    record_audit_event(SecurityEvent(
+        user=request.user,
+        event_type='dashboard_access',
+        severity='low',
+        description=f'Accessed {request.path}',
+        ip_address=request.META.get('REMOTE_ADDR'),
+        user_agent=request.META.get('HTTP_USER_AGENT', ''),
+        metadata={
+            'path': request.path,
+            'path_bucket': bucket,
+            'method': request.method,
+            'role': getattr(request.user, 'role', None),
+            'sample_rate': sample_rate,
+        },
+    ))
+    metrics.increment('access_telemetry.sampled')
+
+
+def _pending_schemas(client):
+    if client is None:
+        with _local_lock:
+            return sorted(_local_counters)
+    return sorted(_decode(value) for value in client.smembers(SCHEMAS_KEY))
+
+
+def _pending_hours(client, schema_name):
+    if client is None:
+        with _local_lock:
+            return sorted(_local_counters.get(schema_name, {}))
+    return sorted(_decode(value) for value in client.smembers(_hours_key(schema_name)))
+
+
+def _read_hours(client, schema_name, hour_labels):
+    """
+    {hour label: {(user_id, bucket): hits}} for hours of one schema that
+    have not been rolled up, read in one round trip
+    """
+    if client is None:
+        with _local_lock:
+            raw = [dict(_local_counters.get(schema_name, {}).get(label, {})) for label in hour_labels]
+    else:
+        pipe = client.pipeline(transaction=False)
+        for hour_label in hour_labels:
+            pipe.hgetall(_hour_key(schema_name, hour_label))
+        raw = [
+            {_decode(field): int(hits) for field, hits in fields.items()}
+            for fields in pipe.execute()
+        ]
+    hours = {}
+    for hour_label, fields in zip(hour_labels, raw):
+        counts = {}
+        for field, hits in fields.items():
+            user_id, bucket = field.split('|', 1)
+            counts[(user_id, bucket)] = hits
+        hours[hour_label] = counts
+    return hours
+
+
+def _discard_hour(client, schema_name, hour_label):
+    if client is None:
+        with _local_lock:
+            hours = _local_counters.get(schema_name, {})
+            hours.pop(hour_label, None)
+            if not hours:
+                _local_counters.pop(schema_name, None)
+        return
+    pipe = client.pipeline(transaction=False)
+    pipe.delete(_hour_key(schema_name, hour_label))
+    pipe.srem(_hours_key(schema_name), hour_label)
+    pipe.execute()
+    # A hit recorded meanwhile re-adds the schema, so it is only dropped
+    # once its hours set is empty
+    if not client.scard(_hours_key(schema_name)):
+        client.srem(SCHEMAS_KEY, schema_name)
+
+
+def _known_user_ids(user_ids):
+    """
+    Counter user ids that still belong to a user. Counters of hard-deleted
+    users (or malformed ids) cannot satisfy the AccessRollup.user FK.
+    """
+    from apps.users.models import User
+
+    parsed = {}
+    for user_id in user_ids:
+        try:
+            parsed[user_id] = uuid.UUID(user_id)
+        except ValueError:
+            continue
+    existing = set(User._base_manager.filter(pk__in=parsed.values()).values_list('pk', flat=True))
+    return {user_id for user_id, pk in parsed.items() if pk in existing}
+
+
+def rollup_access(before=None):
+    """
+    Write closed hours from Redis into AccessRollup and drop them from Redis.
+    Returns the number of schema hours rolled up. An hour that fails is
+    logged and left in Redis for the next run; the others still go through.
+    """
+    from django.db import transaction
+    from django_tenants.utils import schema_context
+    from apps.security.models import AccessRollup
+    from apps.tenants.models import Tenant
+
+    cutoff = hour_start(before)
+    client = _redis_client()
+    rolled = 0
+
+    schemas = _pending_schemas(client)
+    tenants = Tenant.all_objects.in_bulk(schemas, field_name='schema_name')
+    for schema_name in schemas:
+        closed = [label for label in _pending_hours(client, schema_name) if _parse_hour(label) < cutoff]
+        if not closed:
+            continue
+        tenant = tenants.get(schema_name)
+        if tenant is None:
+            logger.warning('Dropping access telemetry for unknown schema %s', schema_name)
+            for hour_label in closed:
+                _discard_hour(client, schema_name, hour_label)
+            continue
+
+        for hour_label, counts in _read_hours(client, schema_name, closed).items():
+            hour = _parse_hour(hour_label)
+            try:
+                known = _known_user_ids({user_id for user_id, _ in counts})
+                rows = [
+                    AccessRollup(tenant=tenant, user_id=user_id, path_bucket=bucket, hour=hour, hits=hits)
+                    for (user_id, bucket), hits in counts.items()
+                    if user_id in known
+                ]
+                with schema_context(schema_name), transaction.atomic():
+                    AccessRollup.objects.bulk_create(
+                        rows,
+                        batch_size=1000,
+                        update_conflicts=True,
+                        unique_fields=['tenant', 'user', 'path_bucket', 'hour'],
+                        update_fields=['hits'],
+                    )
+            except Exception:
+                metrics.increment('access_telemetry.rollup_failed')
+                logger.exception('Could not roll up access telemetry for %s hour %s', schema_name, hour_label)
+                continue
+            if len(rows) < len(counts):
+                metrics.increment('access_telemetry.unknown_users', len(counts) - len(rows))
+            metrics.increment('access_telemetry.rollup_rows', len(rows))
+            _discard_hour(client, schema_name, hour_label)
+            rolled += 1
+    return rolled
+
+
+def _live_counts(tenant, since=None, until=None, user=None):
+    """
+    Counts for the tenant from hours still held in Redis, as
+    {hour: {(user_id, bucket): hits}}. Only the tenant's own hashes are read.
+    """
+    client = _redis_client()
+    live = {}
+    try:
+        hour_labels = []
+        for hour_label in _pending_hours(client, tenant.schema_name):
+            hour = _parse_hour(hour_label)
+            if (since and hour < hour_start(since)) or (until and hour >= until):
+                continue
+            hour_labels.append(hour_label)
+        for hour_label, counts in _read_hours(client, tenant.schema_name, hour_labels).items():
+            if user is not None:
+                user_id = str(getattr(user, 'pk', user))
+                counts = {key: hits for key, hits in counts.items() if key[0] == user_id}
+            live[_parse_hour(hour_label)] = counts
+    except Exception:
+        logger.warning('Live access telemetry unavailable', exc_info=True)
+    return live
+
+
+def get_access_summary(tenant, since=None, until=None, user=None, group_by='path_bucket', limit=10):
+    """
+    Access counts grouped by 'path_bucket', 'user' or 'hour', highest first
+    (oldest first for 'hour'). Hours not rolled up yet are read from Redis.
+    """
+    from apps.security.models import AccessRollup
+
+    columns = {'path_bucket': 'path_bucket', 'user': 'user_id', 'hour': 'hour'}
+    column = columns[group_by]
+
+    live = _live_counts(tenant, since=since, until=until, user=user)
+
+    queryset = AccessRollup.objects.filter(tenant=tenant).exclude(hour__in=list(live))
+    if since is not None:
+        queryset = queryset.filter(hour__gte=hour_start(since))
+    if until is not None:
+        queryset = queryset.filter(hour__lt=until)
+    if user is not None:
+        queryset = queryset.filter(user=user)
+
+    totals = defaultdict(int)
+    for key, hits in queryset.values_list(column).annotate(total=Sum('hits')).order_by():
+        totals[str(key) if group_by == 'user' else key] += hits
+    for hour, counts in live.items():
+        for (user_id, bucket), hits in counts.items():
+            key = {'path_bucket': bucket, 'user': user_id, 'hour': hour}[group_by]
+            totals[key] += hits
+
+    if group_by == 'hour':
+        rows = sorted(totals.items())
+    else:
+        rows = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    if limit:
+        rows = rows[-limit:] if group_by == 'hour' else rows[:limit]
+    return [{group_by: key, 'hits': hits} for key, hits in rows]
+
+
+def get_hourly_access(tenant, hours=24, user=None):
+    """
+    Hits per hour for the last hours, including empty hours
+    """
+    current = hour_start()
+    since = current - datetime.timedelta(hours=hours - 1)
+    totals = {
+        row['hour']: row['hits']
+        for row in get_access_summary(tenant, since=since, user=user, group_by='hour', limit=None)
+    }
+    series = []
+    for offset in range(hours):
+        hour = since + datetime.timedelta(hours=offset)
+        series.append({'hour': hour, 'hits': totals.get(hour, 0)})
+    return series
+
+
+def get_telemetry_stats():
+    counters = metrics.get_counters('access_telemetry.')
+    return {name.split('.', 1)[1]: value for name, value in counters.items()}
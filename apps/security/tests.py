@@ -1,3 +1,140 @@
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.testing import TenantQueryBudgetTestCase
+from apps.users.tests import seed_users
+
+
+def seed_security(tenant, count):
+    """
+    Create count policies, incidents and audit log entries, each incident
+    and entry from a different user
+    """
+    from apps.security.models import AuditLog, SecurityIncident, SecurityPolicy
+
+    users = seed_users(tenant, count, prefix='auditor')
+    SecurityPolicy.objects.bulk_create_secure([
+        SecurityPolicy(tenant=tenant, name=f'Policy {n}', code=f'POL-{n}', policy_type='PASSWORD')
+        for n in range(count)
+    ], tenant=tenant, audit=False)
+    SecurityIncident.objects.bulk_create_secure([
+        SecurityIncident(
+            tenant=tenant, title=f'Incident {n}', incident_id=f'INC-{n}',
+            incident_type='UNAUTHORIZED_ACCESS', reporter=user,
+        )
+        for n, user in enumerate(users)
+    ], tenant=tenant, audit=False)
+    AuditLog.objects.bulk_create_secure([
+        AuditLog(tenant=tenant, user=user, event_type='LOGIN', event_category='AUTHENTICATION')
+        for user in users
+    ], tenant=tenant, audit=False)
+    return users
+
+
+class SecurityQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_security(self.tenant, 3)
+
+    def test_dashboard(self):
+        self.assertViewQueryBudget('security:dashboard')
+
+    def test_list_views(self):
+        for url_name in ('security:policy_list', 'security:audit_log_list', 'security:incident_list'):
+            with self.subTest(view=url_name):
+                self.assertViewQueryBudget(url_name)
+
+
+class AccessTelemetryTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        from django.core.cache import cache
+        from apps.security import telemetry
+
+        cache.clear()
+        telemetry._local_counters.clear()
+
+    def _access(self, path, moment=None, schema_name=None):
+        from unittest import mock
+        from django.db import connection
+        from django.test import RequestFactory
+        from apps.security.telemetry import record_access
+
+        request = RequestFactory().get(path)
+        request.user = self.user
+        with mock.patch.object(connection, 'schema_name', schema_name or self.tenant.schema_name):
+            record_access(request, moment)
+
+    def test_tenants_only_read_their_own_counters(self):
+        from apps.security.telemetry import get_access_summary
+
+        self._access('/dashboard/students/42/')
+        self._access('/dashboard/students/7/')
+        self._access('/dashboard/finance/', schema_name='other_school')
+        self.assertEqual(
+            get_access_summary(self.tenant),
+            [{'path_bucket': '/dashboard/students/', 'hits': 2}],
+        )
+
+    def test_rollup_moves_closed_hours_to_the_table(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.security.models import AccessRollup
+        from apps.security.telemetry import _pending_schemas, _redis_client, get_access_summary, rollup_access
+
+        earlier = timezone.now() - timedelta(hours=2)
+        self._access('/dashboard/students/42/', moment=earlier)
+        self._access('/dashboard/students/', moment=earlier)
+        self._access('/dashboard/finance/', moment=earlier, schema_name='other_school')
+
+        self.assertEqual(rollup_access(), 1)
+        self.assertEqual(
+            list(AccessRollup.objects.filter(tenant=self.tenant).values_list('path_bucket', 'hits')),
+            [('/dashboard/students/', 2)],
+        )
+        self.assertEqual(_pending_schemas(_redis_client()), [])
+        self.assertEqual(
+            get_access_summary(self.tenant),
+            [{'path_bucket': '/dashboard/students/', 'hits': 2}],
+        )
+
+    def test_counters_of_deleted_users_are_dropped(self):
+        import uuid
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.security import telemetry
+        from apps.security.models import AccessRollup
+
+        earlier = timezone.now() - timedelta(hours=2)
+        self._access('/dashboard/students/', moment=earlier)
+        hour_label = telemetry.hour_start(earlier).strftime(telemetry.HOUR_FORMAT)
+        telemetry._local_counters[self.tenant.schema_name][hour_label][f'{uuid.uuid4()}|/dashboard/finance/'] += 3
+
+        self.assertEqual(telemetry.rollup_access(), 1)
+        self.assertEqual(
+            list(AccessRollup.objects.filter(tenant=self.tenant).values_list('user_id', 'path_bucket')),
+            [(self.user.pk, '/dashboard/students/')],
+        )
+
+    def test_a_failing_hour_does_not_stop_the_rollup(self):
+        from datetime import timedelta
+        from unittest import mock
+        from django.db import IntegrityError
+        from django.utils import timezone
+        from apps.security import telemetry
+        from apps.security.models import AccessRollup
+
+        now = timezone.now()
+        self._access('/dashboard/students/', moment=now - timedelta(hours=3))
+        self._access('/dashboard/finance/', moment=now - timedelta(hours=2))
+
+        bulk_create = AccessRollup.objects.bulk_create
+        with mock.patch.object(
+            AccessRollup.objects, 'bulk_create', side_effect=[IntegrityError('boom'), mock.DEFAULT],
+            wraps=bulk_create,
+        ):
+            self.assertEqual(telemetry.rollup_access(), 1)
+        self.assertEqual(len(telemetry._pending_hours(telemetry._redis_client(), self.tenant.schema_name)), 1)
+        self.assertEqual(telemetry.rollup_access(), 1)
+        self.assertEqual(AccessRollup.objects.filter(tenant=self.tenant).count(), 2)
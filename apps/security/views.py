@@ -1,15 +1,20 @@
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView
+from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
 from django.contrib import messages
 from django.db.models import Count
+from django.utils import timezone
+from datetime import timedelta
 from apps.core.permissions.mixins import PermissionRequiredMixin
 from apps.core.utils.tenant import get_current_tenant
 from .models import SecurityPolicy, AuditLog, SecurityIncident
+from . import telemetry
 
 class SecurityDashboardView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
     template_name = 'security/dashboard.html'
     permission_required = 'security.view_securitypolicy'
+    query_budget = 9
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -20,6 +25,20 @@ class SecurityDashboardView(LoginRequiredMixin, PermissionRequiredMixin, Templat
         context['open_incidents'] = SecurityIncident.objects.filter(tenant=tenant, status='OPEN').count()
         context['recent_audits'] = AuditLog.objects.filter(tenant=tenant).count()
         
+        # Dashboard access telemetry for the last 24 hours
+        since = timezone.now() - timedelta(hours=24)
+        context['access_by_path'] = telemetry.get_access_summary(tenant, since=since, group_by='path_bucket')
+        access_by_user = telemetry.get_access_summary(tenant, since=since, group_by='user')
+        users = {
+            str(pk): user
+            for pk, user in get_user_model().objects.in_bulk([row['user'] for row in access_by_user]).items()
+        }
+        for row in access_by_user:
+            row['user'] = users.get(row['user'], row['user'])
+        context['access_by_user'] = access_by_user
+        context['access_hourly'] = telemetry.get_hourly_access(tenant, hours=24)
+        context['access_total'] = sum(row['hits'] for row in context['access_hourly'])
+        
         return context
 
 # ==================== SECURITY POLICY ====================
@@ -29,6 +48,7 @@ class SecurityPolicyListView(LoginRequiredMixin, PermissionRequiredMixin, ListVi
     template_name = 'security/policy_list.html'
     context_object_name = 'policies'
     permission_required = 'security.view_securitypolicy'
+    query_budget = 3
 
 class SecurityPolicyCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = SecurityPolicy
@@ -74,6 +94,10 @@ class AuditLogListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     context_object_name = 'logs'
     permission_required = 'security.view_auditlog'
     paginate_by = 50
+    query_budget = 4
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('user')
 
 # ==================== SECURITY INCIDENT ====================
 
@@ -82,6 +106,7 @@ class SecurityIncidentListView(LoginRequiredMixin, PermissionRequiredMixin, List
     template_name = 'security/incident_list.html'
     context_object_name = 'incidents'
     permission_required = 'security.view_securityincident'
+    query_budget = 3
 
 class SecurityIncidentDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
     model = SecurityIncident
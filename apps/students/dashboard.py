@@ -0,0 +1,10 @@
+from apps.core.utils.dashboard_metrics import DashboardMetrics, Metric
+
+
+DASHBOARD_METRICS = DashboardMetrics(
+    Metric('total_students', 'students.Student'),
+    Metric('active_students', 'students.Student', status='ACTIVE'),
+    Metric('alumni', 'students.Student', status='ALUMNI'),
+    Metric('suspended', 'students.Student', status='SUSPENDED'),
+    tags='students',
+)
@@ -13,6 +13,7 @@ from encrypted_model_fields.fields import EncryptedCharField, EncryptedTextField
 
 # Import core base models
 from apps.core.models import BaseModel, UUIDModel, TimeStampedModel, SoftDeleteModel
+from apps.core.utils.queries import query_budget
 
 # Phone regex for validation
 phone_regex = RegexValidator(
@@ -380,22 +381,13 @@ class Student(BaseModel):
         return ""
 
     # ==================== METHODS ====================
+    @query_budget(1)
     def get_attendance_percentage(self, start_date=None, end_date=None):
         """Calculate attendance percentage for given period"""
-        from apps.academics.models import Attendance
-        attendances = Attendance.objects.filter(student=self)
-        
-        if start_date:
-            attendances = attendances.filter(date__gte=start_date)
-        if end_date:
-            attendances = attendances.filter(date__lte=end_date)
-            
-        total_classes = attendances.count()
-        if total_classes == 0:
-            return 0.0
-            
-        present_classes = attendances.filter(status="PRESENT").count()
-        return (present_classes / total_classes) * 100
+        # Whole months come from the attendance rollups (apps.academics.rollups)
+        from apps.academics.rollups import attendance_percentages
+        students = Student._base_manager.filter(pk=self.pk)
+        return attendance_percentages(students, start_date, end_date).get(self.pk, 0.0)
 
     def get_academic_performance(self):
         """Get academic performance summary"""
@@ -478,10 +470,15 @@ class Student(BaseModel):
     def get_aadhaar(self):
         return self.get_document("AADHAAR")
 
+    @query_budget(1)
     def has_required_documents(self):
         """Check if student has all required documents"""
-        required_docs = ["PHOTO", "BIRTH_CERTIFICATE", "AADHAAR"]
-        return all(self.get_document(doc) for doc in required_docs)
+        required_docs = {"PHOTO", "BIRTH_CERTIFICATE", "AADHAAR"}
+        found = set(
+            self.documents.filter(doc_type__in=required_docs)
+            .values_list('doc_type', flat=True).distinct()
+        )
+        return found == required_docs
 
     # ==================== VALIDATION & CLEANING ====================
     def clean(self):
@@ -535,19 +532,10 @@ class Student(BaseModel):
 
     def generate_admission_number(self):
         """Generate unique admission number"""
-        prefix = f"ADM-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
-        last_student = Student.objects.filter(
-            admission_number__startswith=prefix,
-            tenant=self.tenant
-        ).order_by('admission_number').last()
+        from apps.tenants.sequences import next_document_number
         
-        if last_student:
-            last_number = int(last_student.admission_number.split('-')[-1])
-            new_number = last_number + 1
-        else:
-            new_number = 1
-            
-        return f"{prefix}{new_number:04d}"
+        prefix = f"ADM-{timezone.now().year}-{self.tenant.schema_name.upper()}-"
+        return next_document_number(self, 'admission_number', prefix, width=4)
 
     # ==================== API SERIALIZATION ====================
     def to_api_dict(self, include_sensitive=False):
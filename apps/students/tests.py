@@ -1,3 +1,17 @@
 from django.test import TestCase
 
-# Create your tests here.
+from apps.academics.tests import seed_section
+from apps.core.testing import TenantQueryBudgetTestCase
+
+
+class StudentQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_section(self.tenant, 3)
+
+    def test_dashboard(self):
+        self.assertViewQueryBudget('students:dashboard')
+
+    def test_student_list(self):
+        self.assertViewQueryBudget('students:student_list')
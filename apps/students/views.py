@@ -5,21 +5,19 @@ from django.contrib import messages
 from django.db.models import Count
 from apps.core.permissions.mixins import PermissionRequiredMixin
 from apps.core.utils.tenant import get_current_tenant
+from .dashboard import DASHBOARD_METRICS
 from .models import Student
 
 class StudentDashboardView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
     template_name = 'students/dashboard.html'
     permission_required = 'students.view_student'
+    query_budget = 2
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         tenant = get_current_tenant()
         
-        context['total_students'] = Student.objects.filter(tenant=tenant).count()
-        context['active_students'] = Student.objects.filter(tenant=tenant, status='ACTIVE').count()
-        context['alumni'] = Student.objects.filter(tenant=tenant, status='ALUMNI').count()
-        context['suspended'] = Student.objects.filter(tenant=tenant, status='SUSPENDED').count()
-        
+        context.update(DASHBOARD_METRICS.get(tenant))
         return context
 
 # ==================== STUDENT ====================
@@ -29,6 +27,7 @@ class StudentListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'students/student_list.html'
     context_object_name = 'students'
     permission_required = 'students.view_student'
+    query_budget = 3
 
 class StudentDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
     model = Student
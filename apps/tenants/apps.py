@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class TenantsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.tenants'
+
+    def ready(self):
+        from apps.tenants import snapshots, usage
+        usage.connect_signals()
+        snapshots.connect_signals()
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from apps.tenants.models import Tenant
+from apps.tenants.snapshots import rebuild_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Recompute per-tenant master dashboard snapshots from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant',
+            action='append',
+            dest='schemas',
+            help='Schema name of a tenant to rebuild (repeatable). Defaults to all tenants.'
+        )
+
+    def handle(self, *args, **options):
+        tenants = Tenant.all_objects.all()
+        if options['schemas']:
+            tenants = tenants.filter(schema_name__in=options['schemas'])
+
+        rows = rebuild_snapshots(tenants)
+
+        for snapshot in rows:
+            self.stdout.write(
+                f'  {snapshot.tenant.schema_name}: students={snapshot.total_students} '
+                f'users={snapshot.total_users} invoices={snapshot.total_invoices}'
+            )
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt dashboard snapshots for {len(rows)} tenant(s)'))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from apps.tenants.models import Tenant
+from apps.tenants.usage import reconcile_tenant_usage
+
+
+class Command(BaseCommand):
+    help = 'Recompute per-tenant usage counters (users, students, staff, storage) in bulk'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant',
+            action='append',
+            dest='schemas',
+            help='Schema name of a tenant to reconcile (repeatable). Defaults to all tenants.'
+        )
+
+    def handle(self, *args, **options):
+        tenants = Tenant.all_objects.all()
+        if options['schemas']:
+            tenants = tenants.filter(schema_name__in=options['schemas'])
+
+        rows = reconcile_tenant_usage(tenants)
+
+        for usage in rows:
+            self.stdout.write(
+                f'  {usage.tenant_id}: users={usage.active_users} '
+                f'students={usage.students} staff={usage.staff} storage={usage.storage_mb:.2f} MB'
+            )
+        self.stdout.write(self.style.SUCCESS(f'Reconciled usage for {len(rows)} tenant(s)'))
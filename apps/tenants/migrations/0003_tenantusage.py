@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:07
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tenants', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantUsage',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True, verbose_name='Universal ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Creation Timestamp')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='Last Modification Timestamp')),
+                ('active_users', models.IntegerField(default=0, verbose_name='Active Users')),
+                ('students', models.IntegerField(default=0, verbose_name='Students')),
+                ('staff', models.IntegerField(default=0, verbose_name='Staff')),
+                ('storage_mb', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Storage Used (MB)')),
+                ('reconciled_at', models.DateTimeField(blank=True, null=True, verbose_name='Last Reconciled')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_created', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('tenant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='usage', to='tenants.tenant', verbose_name='Tenant')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_updated', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+            ],
+            options={
+                'verbose_name': 'Tenant Usage',
+                'verbose_name_plural': 'Tenant Usage',
+                'db_table': 'tenant_usage',
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:23
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tenants', '0003_tenantusage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantSequence',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True, verbose_name='Universal ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Creation Timestamp')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='Last Modification Timestamp')),
+                ('name', models.CharField(help_text='Usually <app_label>.<model>.<field>', max_length=100, verbose_name='Sequence Name')),
+                ('prefix', models.CharField(blank=True, max_length=100, verbose_name='Number Prefix')),
+                ('period', models.PositiveIntegerField(default=0, help_text='Year for yearly sequences, 0 for sequences that never reset', verbose_name='Period')),
+                ('last_value', models.BigIntegerField(default=0, verbose_name='Last Allocated Value')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_created', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sequences', to='tenants.tenant', verbose_name='Tenant')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_updated', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+            ],
+            options={
+                'verbose_name': 'Tenant Sequence',
+                'verbose_name_plural': 'Tenant Sequences',
+                'db_table': 'tenant_sequences',
+                'unique_together': {('tenant', 'name', 'prefix', 'period')},
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tenants', '0004_tenantsequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True, verbose_name='Universal ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Creation Timestamp')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='Last Modification Timestamp')),
+                ('total_students', models.IntegerField(default=0, verbose_name='Students')),
+                ('active_students', models.IntegerField(default=0, verbose_name='Active Students')),
+                ('alumni', models.IntegerField(default=0, verbose_name='Alumni')),
+                ('total_users', models.IntegerField(default=0, verbose_name='Users')),
+                ('active_users', models.IntegerField(default=0, verbose_name='Active Users')),
+                ('staff_count', models.IntegerField(default=0, verbose_name='Active Staff')),
+                ('total_courses', models.IntegerField(default=0, verbose_name='Subjects')),
+                ('total_classes', models.IntegerField(default=0, verbose_name='Classes')),
+                ('total_invoices', models.IntegerField(default=0, verbose_name='Invoices')),
+                ('pending_invoices', models.IntegerField(default=0, verbose_name='Pending Invoices')),
+                ('total_books', models.IntegerField(default=0, verbose_name='Books')),
+                ('books_issued', models.IntegerField(default=0, verbose_name='Books Issued')),
+                ('total_hostels', models.IntegerField(default=0, verbose_name='Hostels')),
+                ('hostel_allocations', models.IntegerField(default=0, verbose_name='Hostel Allocations')),
+                ('total_items', models.IntegerField(default=0, verbose_name='Inventory Items')),
+                ('low_stock_items', models.IntegerField(default=0, verbose_name='Low Stock Items')),
+                ('total_vehicles', models.IntegerField(default=0, verbose_name='Vehicles')),
+                ('total_routes', models.IntegerField(default=0, verbose_name='Routes')),
+                ('upcoming_events', models.IntegerField(default=0, verbose_name='Upcoming Events')),
+                ('upcoming_exams', models.IntegerField(default=0, verbose_name='Upcoming Exams')),
+                ('open_incidents', models.IntegerField(default=0, verbose_name='Open Incidents')),
+                ('recent_audits', models.IntegerField(default=0, verbose_name='Audit Log Entries')),
+                ('total_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Revenue Collected')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='Version')),
+                ('recomputed_at', models.DateTimeField(blank=True, null=True, verbose_name='Last Recomputed')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_created', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('tenant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_snapshot', to='tenants.tenant', verbose_name='Tenant')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_updated', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+            ],
+            options={
+                'verbose_name': 'Dashboard Snapshot',
+                'verbose_name_plural': 'Dashboard Snapshots',
+                'db_table': 'tenant_dashboard_snapshots',
+            },
+        ),
+    ]
@@ -1,8 +1,11 @@
+from decimal import Decimal
+
 from django.db import models
 from django.utils.text import slugify
 
 from django_tenants.models import TenantMixin, DomainMixin
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
+from apps.core import config_cache
 from apps.core.models import UUIDModel, TimeStampedModel, BaseModel, BaseSharedModel
 
 class Tenant(TenantMixin, BaseSharedModel):
@@ -145,8 +148,8 @@ class Tenant(TenantMixin, BaseSharedModel):
     @property
     def branding_info(self):
         """Get complete branding information"""
-        if hasattr(self, 'configuration'):
-            config = self.configuration
+        config = TenantConfiguration.get_for_tenant(self)
+        if config:
             return {
                 'name': self.name,
                 'logo': config.logo.url if config.logo else '/static/images/logo.png',
@@ -165,15 +168,16 @@ class Tenant(TenantMixin, BaseSharedModel):
     def audit_log(self, action, user=None, metadata=None, severity='MEDIUM'):
         """Create security audit log entry"""
         from apps.auth.models import SecurityEvent  # Adjust import path
+        from apps.core.utils.audit import record_audit_event
         
-        SecurityEvent.objects.create(
+        record_audit_event(SecurityEvent(
             tenant=self,
             user=user,
             event_type=action,
             severity=severity,
             description=f"Tenant {self.name}: {action}",
             metadata=metadata or {}
-        )
+        ))
 
     def clean(self):
         """
@@ -210,10 +214,13 @@ class Tenant(TenantMixin, BaseSharedModel):
                 (not self.subscription_ends_at or 
                  self.subscription_ends_at > timezone.now()))
 
+    def get_usage(self):
+        """Get the incrementally maintained usage counters for this tenant"""
+        return TenantUsage.get_for_tenant(self)
+
     def get_user_count(self):
         """Get current active user count"""
-        from apps.users.models import User
-        return User.objects.filter(tenant=self, is_active=True).count()
+        return self.get_usage().active_users
 
     def can_add_user(self):
         """Check if tenant can add more users"""
@@ -240,12 +247,14 @@ class Tenant(TenantMixin, BaseSharedModel):
     def validate_tenant_limits(self):
         """Validate tenant against plan limits"""
         errors = {}
+        usage = self.get_usage()
         
-        user_count = self.get_user_count()
+        user_count = usage.active_users
         if user_count > self.max_users:
             errors['max_users'] = f'User limit exceeded: {user_count}/{self.max_users}'
             
-        # Add storage validation when storage tracking is implemented
+        if usage.storage_mb > self.max_storage_mb:
+            errors['max_storage_mb'] = f'Storage limit exceeded: {usage.storage_mb}/{self.max_storage_mb} MB'
         return errors
 
     def save(self, *args, **kwargs):
@@ -265,6 +274,10 @@ class Tenant(TenantMixin, BaseSharedModel):
         # Save tenant first
         super().save(*args, **kwargs)
 
+        # Cached resolutions may hold the old slug/status (covers suspend/activate)
+        from apps.core.utils.tenant_resolution import invalidate_tenant_resolution
+        invalidate_tenant_resolution()
+
         # After save: auto create schema & configuration
         if is_new and getattr(self, "auto_create_schema", False):
             from django_tenants.utils import schema_context
@@ -365,6 +378,9 @@ class Domain(DomainMixin, BaseModel):
             ).exclude(id=self.id).update(is_primary=False)
         
         super().save(*args, **kwargs)
+
+        from apps.core.utils.tenant_resolution import invalidate_tenant_resolution
+        invalidate_tenant_resolution()
     
     @property
     def verification_url(self):
@@ -376,18 +392,20 @@ class Domain(DomainMixin, BaseModel):
     @property
     def logo(self):
         """Get tenant logo from configuration"""
-        if hasattr(self, 'configuration') and self.configuration.logo:
-            return self.configuration.logo
+        config = TenantConfiguration.get_for_tenant(self.tenant)
+        if config and config.logo:
+            return config.logo
         return None
     
     @property
     def branding(self):
         """Get complete branding information"""
-        if hasattr(self, 'configuration'):
+        config = TenantConfiguration.get_for_tenant(self.tenant)
+        if config:
             return {
-                'logo': self.configuration.logo,
-                'primary_color': self.configuration.primary_color,
-                'secondary_color': self.configuration.secondary_color,
+                'logo': config.logo,
+                'primary_color': config.primary_color,
+                'secondary_color': config.secondary_color,
             }
         return None
 
@@ -494,6 +512,13 @@ class TenantConfiguration(UUIDModel, TimeStampedModel):
     def __str__(self):
         return f"Configuration for {self.tenant.name}"
 
+    @classmethod
+    def get_for_tenant(cls, tenant):
+        """Cached configuration of a tenant, or None (see apps.core.config_cache)"""
+        return config_cache.get(
+            cls._meta.label, tenant, lambda: cls.objects.filter(tenant=tenant).first()
+        )
+
     def get_password_policy(self):
         """Get comprehensive password policy"""
         base_policy = {
@@ -528,6 +553,172 @@ class TenantConfiguration(UUIDModel, TimeStampedModel):
     
     def validate_storage_limit(self, file_size_mb):
         """Check if file upload is within storage limits"""
-        # Implement storage tracking logic
-        current_usage = 0  # Get from storage tracking model
-        return current_usage + file_size_mb <= self.tenant.max_storage_mb
\ No newline at end of file
+        current_usage = TenantUsage.get_for_tenant(self.tenant).storage_mb
+        return current_usage + Decimal(str(file_size_mb)) <= self.tenant.max_storage_mb
+
+
+class TenantUsage(UUIDModel, TimeStampedModel):
+    """
+    Per-tenant usage counters, maintained incrementally by signals
+    (see apps.tenants.usage) and periodically reconciled in bulk
+    """
+    tenant = models.OneToOneField(
+        Tenant,
+        on_delete=models.CASCADE,
+        related_name='usage',
+        verbose_name='Tenant'
+    )
+    
+    active_users = models.IntegerField(
+        default=0,
+        verbose_name='Active Users'
+    )
+    
+    students = models.IntegerField(
+        default=0,
+        verbose_name='Students'
+    )
+    
+    staff = models.IntegerField(
+        default=0,
+        verbose_name='Staff'
+    )
+    
+    storage_mb = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name='Storage Used (MB)'
+    )
+    
+    reconciled_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Last Reconciled'
+    )
+
+    class Meta:
+        db_table = 'tenant_usage'
+        verbose_name = 'Tenant Usage'
+        verbose_name_plural = 'Tenant Usage'
+
+    def __str__(self):
+        return f"Usage for {self.tenant_id}"
+
+    @classmethod
+    def get_for_tenant(cls, tenant):
+        """Get the usage row, seeding it from a full recount if missing"""
+        try:
+            return cls.objects.get(tenant=tenant)
+        except cls.DoesNotExist:
+            from apps.tenants.usage import reconcile_tenant_usage
+            reconcile_tenant_usage([tenant])
+            return cls.objects.get(tenant=tenant)
+
+
+class DashboardSnapshot(UUIDModel, TimeStampedModel):
+    """
+    Master dashboard figures of a tenant, maintained incrementally by
+    signals and periodically recomputed (see apps.tenants.snapshots)
+    """
+    tenant = models.OneToOneField(
+        Tenant,
+        on_delete=models.CASCADE,
+        related_name='dashboard_snapshot',
+        verbose_name='Tenant'
+    )
+
+    total_students = models.IntegerField(default=0, verbose_name='Students')
+    active_students = models.IntegerField(default=0, verbose_name='Active Students')
+    alumni = models.IntegerField(default=0, verbose_name='Alumni')
+    total_users = models.IntegerField(default=0, verbose_name='Users')
+    active_users = models.IntegerField(default=0, verbose_name='Active Users')
+    staff_count = models.IntegerField(default=0, verbose_name='Active Staff')
+    total_courses = models.IntegerField(default=0, verbose_name='Subjects')
+    total_classes = models.IntegerField(default=0, verbose_name='Classes')
+    total_invoices = models.IntegerField(default=0, verbose_name='Invoices')
+    pending_invoices = models.IntegerField(default=0, verbose_name='Pending Invoices')
+    total_books = models.IntegerField(default=0, verbose_name='Books')
+    books_issued = models.IntegerField(default=0, verbose_name='Books Issued')
+    total_hostels = models.IntegerField(default=0, verbose_name='Hostels')
+    hostel_allocations = models.IntegerField(default=0, verbose_name='Hostel Allocations')
+    total_items = models.IntegerField(default=0, verbose_name='Inventory Items')
+    low_stock_items = models.IntegerField(default=0, verbose_name='Low Stock Items')
+    total_vehicles = models.IntegerField(default=0, verbose_name='Vehicles')
+    total_routes = models.IntegerField(default=0, verbose_name='Routes')
+    upcoming_events = models.IntegerField(default=0, verbose_name='Upcoming Events')
+    upcoming_exams = models.IntegerField(default=0, verbose_name='Upcoming Exams')
+    open_incidents = models.IntegerField(default=0, verbose_name='Open Incidents')
+    recent_audits = models.IntegerField(default=0, verbose_name='Audit Log Entries')
+    total_revenue = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name='Revenue Collected'
+    )
+
+    # Bumped on every change, used as the snapshot's ETag
+    version = models.PositiveBigIntegerField(default=0, verbose_name='Version')
+    recomputed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Last Recomputed'
+    )
+
+    class Meta:
+        db_table = 'tenant_dashboard_snapshots'
+        verbose_name = 'Dashboard Snapshot'
+        verbose_name_plural = 'Dashboard Snapshots'
+
+    def __str__(self):
+        return f"Dashboard snapshot for {self.tenant_id}"
+
+    @property
+    def etag(self):
+        return f'"{self.tenant_id}-{self.version}"'
+
+
+class TenantSequence(UUIDModel, TimeStampedModel):
+    """
+    Per-tenant document number counter (see apps.tenants.sequences).
+    Rows are locked while a number is allocated, so numbers are unique and
+    gap-free when allocated inside the transaction that uses them.
+    """
+    tenant = models.ForeignKey(
+        Tenant,
+        on_delete=models.CASCADE,
+        related_name='sequences',
+        verbose_name='Tenant'
+    )
+    
+    name = models.CharField(
+        max_length=100,
+        verbose_name='Sequence Name',
+        help_text='Usually <app_label>.<model>.<field>'
+    )
+    
+    prefix = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name='Number Prefix'
+    )
+    
+    period = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Period',
+        help_text='Year for yearly sequences, 0 for sequences that never reset'
+    )
+    
+    last_value = models.BigIntegerField(
+        default=0,
+        verbose_name='Last Allocated Value'
+    )
+
+    class Meta:
+        db_table = 'tenant_sequences'
+        verbose_name = 'Tenant Sequence'
+        verbose_name_plural = 'Tenant Sequences'
+        unique_together = [['tenant', 'name', 'prefix', 'period']]
+
+    def __str__(self):
+        return f"{self.name} {self.prefix}{self.last_value}"
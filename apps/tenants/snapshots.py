@@ -0,0 +1,334 @@
+# apps/tenants/snapshots.py
+"""
+Incremental maintenance of DashboardSnapshot rows.
+
+Every snapshot column is declared once as a Metric (see
+apps.core.utils.dashboard_metrics). Signals apply the change a single save
+or delete makes to each metric with F() expressions, inside the transaction
+that changed the row, so the snapshot rolls back with it. Tracked rows
+remember the values they were loaded with, so a status change moves the row
+from one metric to the other.
+
+rebuild_snapshots() recomputes every metric with one conditional aggregate
+per model (compute_metrics) and upserts the rows. Celery beat runs it
+hourly (tenants.rebuild_dashboard_snapshots, see CELERY_BEAT_SCHEDULE) as a
+safety net for changes that bypass signals (queryset updates, raw SQL) and
+for time-based metrics such as upcoming events, which go stale as days pass.
+A snapshot not recomputed since before today is rebuilt when it is read,
+so date-based metrics roll over even without beat.
+
+Audit logs are written on almost every request, so recent_audits is left
+to the periodic rebuild rather than locking the snapshot row per insert.
+"""
+from collections import defaultdict
+
+from django.db.models import F
+from django.db.models.signals import post_init, post_save, post_delete
+from django.utils import timezone
+
+from apps.core.managers import SoftDeleteManager
+from apps.core.signals import records_bulk_created
+from apps.core.utils.dashboard_metrics import Metric, compute_metrics
+
+
+def _contribution(metric, values):
+    """
+    What a row with these field values adds to a metric
+    """
+    for lookup, expected in metric.resolved_lookups().items():
+        field, _, operator = lookup.partition('__')
+        if not _matches(values.get(field), operator or 'exact', expected):
+            return 0
+    if metric.sum_field:
+        return values.get(metric.sum_field) or 0
+    return 1
+
+
+def _metric_fields(metric):
+    names = {lookup.split('__', 1)[0] for lookup in metric.lookups}
+    if metric.sum_field:
+        names.add(metric.sum_field)
+    return names
+
+
+def _matches(value, operator, expected):
+    if operator == 'isnull':
+        return (value is None) == expected
+    if operator == 'in':
+        return value in expected
+    if value is None:
+        return False
+    if operator == 'exact':
+        return value == expected
+    if operator == 'gte':
+        return value >= expected
+    if operator == 'lte':
+        return value <= expected
+    if operator == 'gt':
+        return value > expected
+    if operator == 'lt':
+        return value < expected
+    raise ValueError(f'Unsupported snapshot lookup: {operator}')
+
+
+_DEFERRED = object()
+
+PENDING_INVOICE_STATUSES = ('ISSUED', 'PARTIALLY_PAID', 'OVERDUE')
+
+METRICS = (
+    Metric('total_students', 'students.Student'),
+    Metric('active_students', 'students.Student', status='ACTIVE'),
+    Metric('alumni', 'students.Student', status='ALUMNI'),
+    Metric('total_users', 'users.User'),
+    Metric('active_users', 'users.User', is_active=True),
+    Metric('staff_count', 'hr.Staff'),
+    Metric('total_courses', 'academics.Subject'),
+    Metric('total_classes', 'academics.SchoolClass'),
+    Metric('total_invoices', 'finance.Invoice'),
+    Metric('pending_invoices', 'finance.Invoice', status__in=PENDING_INVOICE_STATUSES),
+    Metric('total_revenue', 'finance.Payment', sum_field='amount', status='COMPLETED'),
+    Metric('total_books', 'library.Book'),
+    Metric('books_issued', 'library.BookIssue', actual_return_date__isnull=True),
+    Metric('total_hostels', 'hostel.Hostel'),
+    Metric('hostel_allocations', 'hostel.HostelAllocation'),
+    Metric('total_items', 'inventory.Item'),
+    Metric('low_stock_items', 'inventory.Item', current_stock__lte=10),
+    Metric('total_vehicles', 'transportation.Vehicle'),
+    Metric('total_routes', 'transportation.Route'),
+    Metric('upcoming_events', 'events.Event', start_date__gte=timezone.localdate),
+    Metric('upcoming_exams', 'exams.Exam', start_date__gte=timezone.localdate),
+    Metric('open_incidents', 'security.SecurityIncident', status='OPEN'),
+    Metric('recent_audits', 'security.AuditLog'),
+)
+
+METRICS_BY_MODEL = defaultdict(list)
+for _metric in METRICS:
+    METRICS_BY_MODEL[_metric.model].append(_metric)
+
+# Models whose metrics are only refreshed by rebuilds, not by signals
+REBUILD_ONLY_MODELS = frozenset({'security.AuditLog'})
+
+
+def _is_soft_deletable(model):
+    # Soft deleted rows are hidden by the default manager, so they do not
+    # count. Some models drop the is_active field they inherit.
+    if not isinstance(model._default_manager, SoftDeleteManager):
+        return False
+    return any(field.name == 'is_active' for field in model._meta.concrete_fields)
+
+
+_tracked_fields_cache = {}
+
+
+def _tracked_fields(model):
+    """
+    Model fields the metrics of a model depend on
+    """
+    fields = _tracked_fields_cache.get(model)
+    if fields is None:
+        names = {'tenant'}
+        for metric in METRICS_BY_MODEL[model._meta.label]:
+            names |= _metric_fields(metric)
+        if _is_soft_deletable(model):
+            names.add('is_active')
+        fields = _tracked_fields_cache[model] = tuple(model._meta.get_field(name) for name in names)
+    return fields
+
+
+def _raw_values(model, instance):
+    # Deferred fields (only()/defer()) are missing from __dict__
+    return tuple(instance.__dict__.get(field.attname, _DEFERRED) for field in _tracked_fields(model))
+
+
+def _row_values(model, raw):
+    """
+    {field name: value} from _raw_values(), or None if a field was deferred
+    """
+    values = {}
+    for field, value in zip(_tracked_fields(model), raw):
+        if value is _DEFERRED:
+            return None
+        values[field.name] = field.to_python(value) if value is not None else None
+    return values
+
+
+def _contributions(model, values):
+    if values is None:
+        return {}
+    if _is_soft_deletable(model) and not values.get('is_active'):
+        return {}
+    return {
+        metric.name: _contribution(metric, values)
+        for metric in METRICS_BY_MODEL[model._meta.label]
+    }
+
+
+def adjust_snapshot(tenant_id, **deltas):
+    """
+    Atomically apply metric deltas, e.g. adjust_snapshot(tenant_id, alumni=1)
+    """
+    from apps.tenants.models import DashboardSnapshot
+
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not tenant_id or not deltas:
+        return
+
+    updates = {name: F(name) + delta for name, delta in deltas.items()}
+    updated = DashboardSnapshot.objects.filter(tenant_id=tenant_id).update(
+        version=F('version') + 1, updated_at=timezone.now(), **updates
+    )
+    if not updated:
+        # First change for this tenant: seed the row from a full recompute,
+        # which already includes the row being saved
+        from apps.tenants.models import Tenant
+        rebuild_snapshots(Tenant.all_objects.filter(id=tenant_id))
+
+
+def _on_init(sender, instance, **kwargs):
+    # Kept raw: conversion only happens for rows that are saved or deleted
+    instance._snapshot_raw = _raw_values(sender, instance)
+
+
+def _on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    after = _row_values(sender, _raw_values(sender, instance))
+    before = None if created else _row_values(sender, instance._snapshot_raw)
+    if after is None or (before is None and not created):
+        # Loaded without its tracked fields, so the change is unknown
+        rebuild_snapshots_for(instance.tenant_id, sender)
+    else:
+        old = _contributions(sender, before)
+        new = _contributions(sender, after)
+        adjust_snapshot(after['tenant'] or (before or {}).get('tenant'), **{
+            name: new.get(name, 0) - old.get(name, 0) for name in set(old) | set(new)
+        })
+    instance._snapshot_raw = _raw_values(sender, instance)
+
+
+def _on_delete(sender, instance, **kwargs):
+    values = _row_values(sender, instance._snapshot_raw)
+    if values is None:
+        rebuild_snapshots_for(instance.tenant_id, sender)
+        return
+    old = _contributions(sender, values)
+    adjust_snapshot(values['tenant'], **{name: -value for name, value in old.items()})
+
+
+def _on_bulk_create(sender, tenant_id, count, **kwargs):
+    metrics = METRICS_BY_MODEL.get(sender._meta.label)
+    if not metrics or sender._meta.label in REBUILD_ONLY_MODELS:
+        return
+    if count is not None and all(not metric.lookups and not metric.sum_field for metric in metrics):
+        adjust_snapshot(tenant_id, **{metric.name: count for metric in metrics})
+    else:
+        rebuild_snapshots_for(tenant_id, sender)
+
+
+def connect_signals():
+    for label in METRICS_BY_MODEL:
+        if label in REBUILD_ONLY_MODELS:
+            continue
+        post_init.connect(_on_init, sender=label, dispatch_uid=f'dashboard_snapshot_init_{label}')
+        post_save.connect(_on_save, sender=label, dispatch_uid=f'dashboard_snapshot_save_{label}')
+        post_delete.connect(_on_delete, sender=label, dispatch_uid=f'dashboard_snapshot_delete_{label}')
+    records_bulk_created.connect(_on_bulk_create, dispatch_uid='dashboard_snapshot_bulk_create')
+
+
+def _compute(tenant, labels):
+    """
+    {metric: value} for the given models, one aggregate query per model
+    """
+    def queryset_for(model):
+        queryset = model._base_manager.filter(tenant_id=tenant.id)
+        if _is_soft_deletable(model):
+            queryset = queryset.filter(is_active=True)
+        return queryset
+
+    return compute_metrics(
+        [metric for label in labels for metric in METRICS_BY_MODEL[label]], queryset_for
+    )
+
+
+def rebuild_snapshots(tenants=None):
+    """
+    Recompute every metric for the given tenants (all tenants by default)
+    and upsert their snapshots in one statement
+    """
+    from django_tenants.utils import schema_context, get_public_schema_name
+    from apps.tenants.models import DashboardSnapshot, Tenant
+
+    if tenants is None:
+        tenants = Tenant.all_objects.all()
+    tenants = [tenant for tenant in tenants if tenant.schema_name != get_public_schema_name()]
+    if not tenants:
+        return []
+
+    now = timezone.now()
+    rows = []
+    for tenant in tenants:
+        with schema_context(tenant.schema_name):
+            values = _compute(tenant, METRICS_BY_MODEL)
+        rows.append(DashboardSnapshot(tenant=tenant, recomputed_at=now, version=1, **values))
+
+    names = [metric.name for metric in METRICS]
+    DashboardSnapshot.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['tenant'],
+        update_fields=[*names, 'recomputed_at', 'updated_at'],
+    )
+    # The upsert cannot increment, so bump versions separately
+    DashboardSnapshot.objects.filter(tenant__in=tenants).update(version=F('version') + 1)
+    return rows
+
+
+def rebuild_snapshots_for(tenant_id, model):
+    """
+    Recompute the metrics of one model for one tenant
+    """
+    from django_tenants.utils import schema_context
+    from apps.tenants.models import DashboardSnapshot, Tenant
+
+    label = model if isinstance(model, str) else model._meta.label
+    tenant = Tenant.all_objects.filter(id=tenant_id).first()
+    if tenant is None or label not in METRICS_BY_MODEL:
+        return
+    with schema_context(tenant.schema_name):
+        values = _compute(tenant, [label])
+    updated = DashboardSnapshot.objects.filter(tenant_id=tenant_id).update(
+        version=F('version') + 1, updated_at=timezone.now(), **values
+    )
+    if not updated:
+        rebuild_snapshots([tenant])
+
+
+def get_snapshot(tenant):
+    """
+    The tenant's snapshot, computed on first use and on the first read of
+    each day
+    """
+    from apps.tenants.models import DashboardSnapshot
+
+    snapshot = DashboardSnapshot.objects.filter(tenant=tenant).first()
+    if snapshot is None or _recomputed_before_today(snapshot):
+        rebuild_snapshots([tenant])
+        snapshot = DashboardSnapshot.objects.get(tenant=tenant)
+    return snapshot
+
+
+def _recomputed_before_today(snapshot):
+    # Date-based metrics are evaluated against the day of the last rebuild
+    return snapshot.recomputed_at is None or timezone.localdate(snapshot.recomputed_at) < timezone.localdate()
+
+
+def snapshot_data(snapshot):
+    """
+    JSON-ready metric values of a snapshot
+    """
+    data = {metric.name: getattr(snapshot, metric.name) for metric in METRICS}
+    data['total_revenue'] = str(data['total_revenue'])
+    data['version'] = snapshot.version
+    data['updated_at'] = snapshot.updated_at.isoformat() if snapshot.updated_at else None
+    data['recomputed_at'] = snapshot.recomputed_at.isoformat() if snapshot.recomputed_at else None
+    return data
@@ -0,0 +1,11 @@
+from celery import shared_task
+
+
+@shared_task(name='tenants.rebuild_dashboard_snapshots', ignore_result=True)
+def rebuild_dashboard_snapshots():
+    """
+    Recompute every tenant's dashboard snapshot from scratch (see
+    apps.tenants.snapshots). Scheduled hourly in CELERY_BEAT_SCHEDULE.
+    """
+    from apps.tenants.snapshots import rebuild_snapshots
+    rebuild_snapshots()
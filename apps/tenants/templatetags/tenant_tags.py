@@ -1,5 +1,6 @@
 from django import template
 from apps.core.utils.tenant import get_current_tenant
+from apps.tenants.models import TenantConfiguration
 
 register = template.Library()
 
@@ -16,8 +17,8 @@ def tenant_feature_enabled(feature_name):
     # Check if tenant has configuration and if the feature is in allowed_modules
     # This assumes 'allowed_modules' or similar logic exists.
     # Adjust based on actual model structure.
-    if hasattr(tenant, 'configuration') and tenant.configuration:
-        config = tenant.configuration
+    config = TenantConfiguration.get_for_tenant(tenant)
+    if config:
         # Map feature names to config fields
         feature_map = {
             'library': config.enable_library,
@@ -1,3 +1,133 @@
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.testing import TenantQueryBudgetTestCase, TenantTransactionTestCase
+from apps.public.tests import seed_tenants
+from apps.tenants.models import DashboardSnapshot
+from apps.tenants.snapshots import rebuild_snapshots
+
+
+class TenantQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_tenants(3)
+
+    def test_dashboard(self):
+        self.assertViewQueryBudget('tenants:dashboard')
+
+
+class DashboardSnapshotTests(TenantQueryBudgetTestCase):
+
+    def _snapshot(self):
+        return DashboardSnapshot.objects.get(tenant=self.tenant)
+
+    def test_rebuild_matches_counts(self):
+        rebuild_snapshots([self.tenant])
+        snapshot = self._snapshot()
+        self.assertEqual(snapshot.total_users, 1)
+        self.assertEqual(snapshot.active_users, 1)
+
+    def test_signals_keep_snapshot_current(self):
+        from apps.users.models import User
+
+        rebuild_snapshots([self.tenant])
+        version = self._snapshot().version
+        user = User.objects.create_user(email='snapshot@example.com', password='x', tenant=self.tenant)
+        snapshot = self._snapshot()
+        self.assertEqual((snapshot.total_users, snapshot.active_users), (2, 2))
+        self.assertGreater(snapshot.version, version)
+
+        user = User.objects.get(pk=user.pk)
+        user.is_active = False
+        user.save()
+        snapshot = self._snapshot()
+        self.assertEqual((snapshot.total_users, snapshot.active_users), (2, 1))
+
+    def test_snapshot_from_an_earlier_day_is_rebuilt_on_read(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.tenants.snapshots import get_snapshot
+
+        rebuild_snapshots([self.tenant])
+        yesterday = timezone.now() - timedelta(days=1)
+        DashboardSnapshot.objects.filter(tenant=self.tenant).update(recomputed_at=yesterday, total_users=0)
+        snapshot = get_snapshot(self.tenant)
+        self.assertEqual(snapshot.total_users, 1)
+        self.assertEqual(timezone.localdate(snapshot.recomputed_at), timezone.localdate())
+
+
+class TenantUsageTests(TenantQueryBudgetTestCase):
+
+    def _usage(self):
+        from apps.tenants.models import TenantUsage
+        return TenantUsage.objects.get(tenant=self.tenant)
+
+    def setUp(self):
+        super().setUp()
+        from apps.tenants.usage import reconcile_tenant_usage
+        reconcile_tenant_usage([self.tenant])
+
+    def test_saving_is_active_moves_the_user_count(self):
+        from apps.users.models import User
+
+        user = User.objects.create_user(email='usage@example.com', password='x', tenant=self.tenant)
+        self.assertEqual(self._usage().active_users, 2)
+        user = User.objects.get(pk=user.pk)
+        user.is_active = False
+        user.save()
+        self.assertEqual(self._usage().active_users, 1)
+        user.is_active = True
+        user.save()
+        self.assertEqual(self._usage().active_users, 2)
+
+    def test_set_active_adjusts_counts(self):
+        from apps.tenants.usage import set_active
+        from apps.users.models import User
+
+        User.objects.create_user(email='usage@example.com', password='x', tenant=self.tenant)
+        users = User.objects.filter(tenant=self.tenant)
+        self.assertEqual(set_active(users, False), 2)
+        self.assertEqual(self._usage().active_users, 0)
+        self.assertEqual(set_active(users, False), 0)
+        self.assertEqual(self._usage().active_users, 0)
+
+    def test_storage_follows_uploads_and_deletes(self):
+        import tempfile
+        from decimal import Decimal
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.test import override_settings
+        from apps.tenants.usage import reconcile_tenant_usage
+
+        from apps.users.models import User
+
+        user = User.objects.create_user(email='usage@example.com', password='x', tenant=self.tenant)
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            user.avatar = SimpleUploadedFile('avatar.png', b'x' * 1024 * 1024)
+            user.save()
+            self.assertEqual(self._usage().storage_mb, Decimal('1.00'))
+
+            reconcile_tenant_usage([self.tenant])
+            self.assertEqual(self._usage().storage_mb, Decimal('1.00'))
+
+            user.hard_delete()
+            self.assertEqual(self._usage().storage_mb, Decimal('0.00'))
+
+
+class SequenceConcurrencyTests(TenantTransactionTestCase):
+
+    def test_concurrent_writers_get_unique_numbers(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from django.db import connection
+        from apps.tenants.sequences import reserve_values
+
+        def allocate(_):
+            # Each worker thread has its own connection, so allocations
+            # really contend for the sequence row
+            try:
+                return [reserve_values(self.tenant, 'tests.number', prefix='T-') for _ in range(25)]
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            values = [value for chunk in pool.map(allocate, range(8)) for value in chunk]
+        self.assertEqual(sorted(values), list(range(1, 201)))
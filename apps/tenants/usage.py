@@ -0,0 +1,298 @@
+# apps/tenants/usage.py
+"""
+Incremental maintenance of TenantUsage counters.
+
+Counters are adjusted with F() expressions inside the transaction that
+creates, activates, deactivates, soft-deletes, restores or removes the
+tracked record, so they roll back together with it. Tracked records
+remember the is_active value they were loaded with, so a save that toggles
+it moves the record in or out of the count.
+
+storage_mb is the size of the files referenced by tenant records' file
+fields. Saving a record with a new file adds the difference in size, and
+deleting the row releases its files.
+
+reconcile_tenant_usage() recomputes every counter, storage included, as a
+safety net for changes that bypass these signals (raw SQL, and queryset
+updates not made through set_active()).
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.apps import apps
+from django.db import models, transaction
+from django.db.models import Count, F
+from django.db.models.signals import post_init, post_save, post_delete
+from django.utils import timezone
+
+from apps.core.signals import records_bulk_created
+
+
+# Model label -> TenantUsage counter it drives
+TRACKED_MODELS = {
+    'users.User': 'active_users',
+    'students.Student': 'students',
+    'hr.Staff': 'staff',
+}
+
+
+def adjust_usage(tenant_id, **deltas):
+    """
+    Atomically apply counter deltas, e.g. adjust_usage(tenant_id, students=1)
+    """
+    from apps.tenants.models import TenantUsage
+
+    if not tenant_id or not deltas:
+        return
+
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    updated = TenantUsage.objects.filter(tenant_id=tenant_id).update(
+        updated_at=timezone.now(), **updates
+    )
+    if not updated:
+        # First change for this tenant: seed the row from a full count,
+        # which already includes the record being saved
+        from apps.tenants.models import Tenant
+        reconcile_tenant_usage(Tenant.all_objects.filter(id=tenant_id))
+
+
+def record_storage(tenant, delta_mb):
+    """
+    Record storage added (positive) or released (negative) by a tenant
+    """
+    adjust_usage(getattr(tenant, 'pk', tenant), storage_mb=delta_mb)
+
+
+def set_active(queryset, is_active):
+    """
+    queryset.update(is_active=is_active) that keeps the usage counter of the
+    queryset's model in step. Returns the number of rows changed.
+    """
+    changing = queryset.exclude(is_active=is_active)
+    counter = _counter_for(queryset.model)
+    if counter is None:
+        return changing.update(is_active=is_active)
+
+    with transaction.atomic():
+        # Re-selected by pk so the lock applies to plain rows, without the
+        # queryset's joins
+        rows = queryset.model._base_manager.filter(pk__in=changing.values('pk')).exclude(is_active=is_active)
+        per_tenant = defaultdict(int)
+        for tenant_id in rows.select_for_update().values_list('tenant_id', flat=True):
+            per_tenant[tenant_id] += 1
+        updated = rows.update(is_active=is_active)
+        for tenant_id, count in per_tenant.items():
+            adjust_usage(tenant_id, **{counter: count if is_active else -count})
+    return updated
+
+
+def _counter_for(sender):
+    return TRACKED_MODELS.get(sender._meta.label)
+
+
+_file_fields_cache = {}
+
+
+def _file_fields(model):
+    fields = _file_fields_cache.get(model)
+    if fields is None:
+        fields = _file_fields_cache[model] = tuple(
+            field for field in model._meta.concrete_fields if isinstance(field, models.FileField)
+        )
+    return fields
+
+
+def _storage_models():
+    """
+    Tenant-aware models with file fields
+    """
+    return [
+        model for model in apps.get_models()
+        if _file_fields(model) and any(field.name == 'tenant' for field in model._meta.concrete_fields)
+    ]
+
+
+def _file_name(value):
+    # __dict__ holds the stored name until the field is first accessed
+    name = getattr(value, 'name', value)
+    return name or None
+
+
+def _file_size(field, name):
+    if not name:
+        return 0
+    try:
+        return field.storage.size(name)
+    except (OSError, NotImplementedError):
+        return 0
+
+
+def _to_mb(size):
+    return Decimal(size) / (1024 * 1024)
+
+
+def _loaded_state(sender, instance):
+    is_active = instance.__dict__.get('is_active') if _counter_for(sender) else None
+    files = tuple(_file_name(instance.__dict__.get(field.attname)) for field in _file_fields(sender))
+    return is_active, files
+
+
+def _on_init(sender, instance, **kwargs):
+    instance._usage_loaded = _loaded_state(sender, instance)
+
+
+def _on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    was_active, old_files = (None, ()) if created else instance._usage_loaded
+    is_active, new_files = _loaded_state(sender, instance)
+    deltas = {}
+
+    # Soft deletes and restores are saves that toggle is_active
+    counter = _counter_for(sender)
+    if counter and created:
+        deltas[counter] = 1 if is_active else 0
+    elif counter and was_active is None:
+        # Loaded without is_active, so the change is unknown
+        from apps.tenants.models import Tenant
+        reconcile_tenant_usage(Tenant.all_objects.filter(id=instance.tenant_id), storage=False)
+    elif counter and was_active != is_active:
+        deltas[counter] = 1 if is_active else -1
+
+    size = 0
+    for index, field in enumerate(_file_fields(sender)):
+        old_name = old_files[index] if old_files else None
+        if new_files[index] != old_name:
+            size += _file_size(field, new_files[index]) - _file_size(field, old_name)
+    if size:
+        deltas['storage_mb'] = _to_mb(size)
+
+    adjust_usage(instance.tenant_id, **{name: delta for name, delta in deltas.items() if delta})
+    instance._usage_loaded = (is_active, new_files)
+
+
+def _on_delete(sender, instance, **kwargs):
+    deltas = {}
+    counter = _counter_for(sender)
+    if counter and instance.is_active:
+        deltas[counter] = -1
+    size = sum(
+        _file_size(field, _file_name(instance.__dict__.get(field.attname)))
+        for field in _file_fields(sender)
+    )
+    if size:
+        deltas['storage_mb'] = -_to_mb(size)
+    adjust_usage(instance.tenant_id, **deltas)
+
+
+def _on_bulk_create(sender, tenant_id, count, **kwargs):
+    counter = _counter_for(sender)
+    if not counter:
+        return
+    if count is None:
+        # Inserted rows are unknown (conflicts ignored), recount instead
+        from apps.tenants.models import Tenant
+        reconcile_tenant_usage(Tenant.all_objects.filter(id=tenant_id))
+    elif count:
+        adjust_usage(tenant_id, **{counter: count})
+
+
+def connect_signals():
+    labels = set(TRACKED_MODELS) | {model._meta.label for model in _storage_models()}
+    for label in labels:
+        post_init.connect(_on_init, sender=label, dispatch_uid=f'tenant_usage_init_{label}')
+        post_save.connect(_on_save, sender=label, dispatch_uid=f'tenant_usage_save_{label}')
+        post_delete.connect(_on_delete, sender=label, dispatch_uid=f'tenant_usage_delete_{label}')
+    records_bulk_created.connect(_on_bulk_create, dispatch_uid='tenant_usage_bulk_create')
+
+
+def _count_by_tenant(model, tenant_ids):
+    """
+    Active record counts per tenant in a single grouped query
+    """
+    rows = (
+        model.all_objects
+        .filter(tenant_id__in=tenant_ids, is_active=True)
+        .order_by()
+        .values('tenant_id')
+        .annotate(total=Count('id'))
+    )
+    return {row['tenant_id']: row['total'] for row in rows}
+
+
+def _storage_by_tenant(tenant_id):
+    """
+    Size in bytes of the files referenced by a tenant's records
+    """
+    size = 0
+    for model in _storage_models():
+        fields = _file_fields(model)
+        rows = (
+            model._base_manager.filter(tenant_id=tenant_id)
+            .order_by()
+            .values_list(*[field.attname for field in fields])
+            .iterator()
+        )
+        for names in rows:
+            size += sum(_file_size(field, name) for field, name in zip(fields, names))
+    return size
+
+
+def reconcile_tenant_usage(tenants=None, storage=True):
+    """
+    Recompute user, student and staff counters and, unless storage is
+    False, storage_mb for the given tenants (all tenants by default), and
+    upsert them in one statement. Storage is measured by asking the file
+    storage for the size of every referenced file, so it is the costly
+    part of a reconcile.
+    """
+    from django_tenants.utils import schema_context, get_public_schema_name
+    from apps.tenants.models import Tenant, TenantUsage
+
+    if tenants is None:
+        tenants = Tenant.all_objects.all()
+    tenants = list(tenants)
+    if not tenants:
+        return []
+
+    tenant_ids = [tenant.id for tenant in tenants]
+    counts = defaultdict(dict)
+
+    # Users live in the public schema, so one grouped query covers every tenant
+    User = apps.get_model('users', 'User')
+    for tenant_id, total in _count_by_tenant(User, tenant_ids).items():
+        counts[tenant_id]['active_users'] = total
+
+    # Students, staff and most files live in each tenant's own schema
+    Student = apps.get_model('students', 'Student')
+    Staff = apps.get_model('hr', 'Staff')
+    for tenant in tenants:
+        if tenant.schema_name == get_public_schema_name():
+            continue
+        with schema_context(tenant.schema_name):
+            counts[tenant.id]['students'] = _count_by_tenant(Student, [tenant.id]).get(tenant.id, 0)
+            counts[tenant.id]['staff'] = _count_by_tenant(Staff, [tenant.id]).get(tenant.id, 0)
+            if storage:
+                counts[tenant.id]['storage_mb'] = _to_mb(_storage_by_tenant(tenant.id))
+
+    now = timezone.now()
+    rows = [
+        TenantUsage(
+            tenant_id=tenant_id,
+            active_users=counts[tenant_id].get('active_users', 0),
+            students=counts[tenant_id].get('students', 0),
+            staff=counts[tenant_id].get('staff', 0),
+            storage_mb=counts[tenant_id].get('storage_mb', 0),
+            reconciled_at=now,
+        )
+        for tenant_id in tenant_ids
+    ]
+    update_fields = ['active_users', 'students', 'staff', 'reconciled_at', 'updated_at']
+    if storage:
+        update_fields.append('storage_mb')
+    return TenantUsage.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['tenant'],
+        update_fields=update_fields,
+    )
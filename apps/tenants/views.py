@@ -9,6 +9,7 @@ from .models import Tenant, Domain, TenantConfiguration
 class TenantDashboardView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
     template_name = 'tenants/dashboard.html'
     permission_required = 'tenants.view_tenant'
+    query_budget = 6
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -27,6 +28,7 @@ class TenantListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'tenants/tenant_list.html'
     context_object_name = 'tenants'
     permission_required = 'tenants.view_tenant'
+    query_budget = 3
 
 class TenantDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
     model = Tenant
@@ -75,6 +77,7 @@ class DomainListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'tenants/domain_list.html'
     context_object_name = 'domains'
     permission_required = 'tenants.view_domain'
+    query_budget = 3
 
 class DomainCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = Domain
@@ -0,0 +1,10 @@
+from apps.core.utils.dashboard_metrics import DashboardMetrics, Metric
+
+
+DASHBOARD_METRICS = DashboardMetrics(
+    Metric('total_vehicles', 'transportation.Vehicle'),
+    Metric('under_maintenance', 'transportation.Vehicle', under_maintenance=True),
+    Metric('total_routes', 'transportation.Route'),
+    Metric('total_allocations', 'transportation.TransportAllocation'),
+    tags='transportation',
+)
@@ -5,6 +5,7 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from apps.core.models import BaseModel, TenantAwareModel
+from apps.core.utils.queries import query_budget
 
 
 class Vehicle(BaseModel, TenantAwareModel):
@@ -197,7 +198,11 @@ class Route(BaseModel, TenantAwareModel):
         return f"{self.name} ({self.start_point} to {self.end_point})"
 
     @property
+    @query_budget(1)
     def student_count(self):
+        # List views annotate the count to avoid a query per row
+        if hasattr(self, 'active_students'):
+            return self.active_students
         return self.students.filter(is_active=True).count()
 
     @property
@@ -1,3 +1,39 @@
+from datetime import date
+
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.testing import TenantQueryBudgetTestCase
+from apps.users.tests import seed_users
+
+
+def seed_vehicles(tenant, count):
+    """
+    Create count buses, each with its own driver
+    """
+    from apps.transportation.models import Vehicle
+
+    drivers = seed_users(tenant, count, prefix='driver')
+    vehicles = [
+        Vehicle(
+            tenant=tenant, vehicle_number=f'KA-01-{n:04}', registration_number=f'REG-{n}', driver=driver,
+            make='Tata', model='Starbus', year=2020, fuel_type='DIESEL', seating_capacity=40,
+            registration_date=date(2020, 1, 1), registration_expiry=date(2035, 1, 1),
+            insurance_expiry=date(2026, 1, 1), fitness_expiry=date(2026, 1, 1),
+        )
+        for n, driver in enumerate(drivers)
+    ]
+    Vehicle.objects.bulk_create_secure(vehicles, tenant=tenant, audit=False)
+    return vehicles
+
+
+class TransportationQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_vehicles(self.tenant, 3)
+
+    def test_dashboard(self):
+        self.assertViewQueryBudget('transportation:dashboard')
+
+    def test_vehicle_list(self):
+        self.assertViewQueryBudget('transportation:vehicle_list')
@@ -2,24 +2,22 @@ from django.views.generic import ListView, DetailView, CreateView, UpdateView, D
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
 from django.contrib import messages
-from django.db.models import Count
+from django.db.models import Count, Q
 from apps.core.permissions.mixins import PermissionRequiredMixin
 from apps.core.utils.tenant import get_current_tenant
+from .dashboard import DASHBOARD_METRICS
 from .models import Vehicle, Route, TransportAllocation
 
 class TransportationDashboardView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
     template_name = 'transportation/dashboard.html'
     permission_required = 'transportation.view_vehicle'
+    query_budget = 4
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         tenant = get_current_tenant()
         
-        context['total_vehicles'] = Vehicle.objects.filter(tenant=tenant, is_active=True).count()
-        context['total_routes'] = Route.objects.filter(tenant=tenant, is_active=True).count()
-        context['total_allocations'] = TransportAllocation.objects.filter(tenant=tenant, is_active=True).count()
-        context['under_maintenance'] = Vehicle.objects.filter(tenant=tenant, under_maintenance=True).count()
-        
+        context.update(DASHBOARD_METRICS.get(tenant))
         return context
 
 # ==================== VEHICLE ====================
@@ -29,6 +27,10 @@ class VehicleListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'transportation/vehicle_list.html'
     context_object_name = 'vehicles'
     permission_required = 'transportation.view_vehicle'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('driver')
 
 class VehicleCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = Vehicle
@@ -75,6 +77,12 @@ class RouteListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'transportation/route_list.html'
     context_object_name = 'routes'
     permission_required = 'transportation.view_route'
+    query_budget = 3
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('vehicle').annotate(
+            active_students=Count('students', filter=Q(students__is_active=True))
+        )
 
 class RouteCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = Route
@@ -117,6 +125,7 @@ class TransportAllocationListView(LoginRequiredMixin, PermissionRequiredMixin, L
     template_name = 'transportation/allocation_list.html'
     context_object_name = 'allocations'
     permission_required = 'transportation.view_transportallocation'
+    query_budget = 3
 
 class TransportAllocationCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     model = TransportAllocation
@@ -7,6 +7,7 @@ from django.utils.html import format_html
 from django.db.models import Q
 from django.urls import reverse
 from django.utils import timezone
+from apps.tenants.usage import set_active
 from .models import User
 
 
@@ -235,7 +236,7 @@ class UserAdmin(BaseUserAdmin):
     # Custom actions
     @admin.action(description=_('Activate selected users'))
     def activate_users(self, request, queryset):
-        count = queryset.update(is_active=True)
+        count = set_active(queryset, True)
         self.message_user(
             request,
             _(f'Successfully activated {count} user(s).'),
@@ -246,7 +247,7 @@ class UserAdmin(BaseUserAdmin):
     def deactivate_users(self, request, queryset):
         # Prevent deactivating yourself
         filtered_queryset = queryset.exclude(id=request.user.id)
-        count = filtered_queryset.update(is_active=False)
+        count = set_active(filtered_queryset, False)
         self.message_user(
             request,
             _(f'Successfully deactivated {count} user(s).'),
@@ -251,21 +251,33 @@ class User(AbstractUser, BaseModel):
         from apps.auth.models import RolePermission
         return RolePermission.get_permissions_for_role(self.role)
 
+    def get_compiled_permissions(self):
+        """Get the compiled permission set for this user's role and tenant"""
+        # Keyed by (role, tenant) so that changing either recompiles
+        key = (self.role, self.tenant_id)
+        cached = getattr(self, '_role_perm_cache', None)
+        if cached is None or cached[0] != key:
+            from apps.auth.permission_compiler import get_role_permissions
+            cached = self._role_perm_cache = (key, get_role_permissions(self.role, self.tenant_id))
+        return cached[1]
+
     def has_perm(self, perm, obj=None):
-        """Check if user has specific permission"""
+        """
+        Check if user has specific permission. The role's tenant-specific
+        grants count as well as the global ones, and perm may be given as
+        'app_label.codename' or as a bare codename.
+        """
         if self.is_superuser:
             return True
             
-        user_perms = self.get_role_permissions()
-        return perm in user_perms
+        return perm in self.get_compiled_permissions()
 
     def has_module_perms(self, app_label):
         """Check if user has any permissions in the given app"""
         if self.is_superuser:
             return True
             
-        user_perms = self.get_role_permissions()
-        return any(perm.startswith(f"{app_label}.") for perm in user_perms)
+        return self.get_compiled_permissions().has_module(app_label)
     
 
     def generate_verification_token(self):
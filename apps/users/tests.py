@@ -1,3 +1,28 @@
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.testing import TenantQueryBudgetTestCase
+
+
+def seed_users(tenant, count, role='staff', prefix='member'):
+    """
+    Create count users of one role in the tenant
+    """
+    from apps.users.models import User
+
+    return [
+        User.objects.create_user(
+            email=f'{prefix}-{n}@example.com', tenant=tenant,
+            first_name=prefix.title(), last_name=str(n), role=role,
+        )
+        for n in range(count)
+    ]
+
+
+class UserQueryBudgetTests(TenantQueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_users(self.tenant, 3)
+
+    def test_dashboard(self):
+        self.assertViewQueryBudget('users:dashboard')
@@ -12,6 +12,7 @@ from .models import User
 class UserDashboardView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
     template_name = 'users/dashboard.html'
     permission_required = 'users.view_user'
+    query_budget = 6
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -31,6 +32,7 @@ class UserListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = 'users/user_list.html'
     context_object_name = 'users'
     permission_required = 'users.view_user'
+    query_budget = 3
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -5,6 +5,12 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+
+Tenants are resolved by the (synchronous) django-tenants middleware as under
+WSGI. Async views run their ORM work through apps.core.utils.tenant
+(acall_in_tenant, agather_in_tenant), which re-applies the request's tenant
+and schema on each worker thread, e.g. the async master and analytics
+dashboards (apps.core.mixins.AsyncDashboardMixin).
 """
 
 import os
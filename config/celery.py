@@ -0,0 +1,16 @@
+"""
+Celery application for the config project.
+
+Workers run with ``celery -A config worker`` and periodic tasks are sent
+by ``celery -A config beat`` from CELERY_BEAT_SCHEDULE in settings.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+app = Celery('config')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -8,6 +8,7 @@ import os
 from pathlib import Path
 from datetime import timedelta
 import environ
+from celery.schedules import crontab
 
 APP_VERSION = '1.0.0'
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -113,6 +114,9 @@ DATABASE_ROUTERS = (
 # Middleware
 MIDDLEWARE = [
     'django_tenants.middleware.TenantMainMiddleware',  # Must be first
+    'apps.core.middleware.performance.PerformanceMiddleware',
+    'apps.core.middleware.audit.AuditBufferMiddleware',
+    'apps.core.middleware.config_cache.ConfigCacheMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -125,6 +129,7 @@ MIDDLEWARE = [
     # Custom tenant middleware
     'apps.core.middleware.tenant.TenantMiddleware',
     'apps.core.middleware.tenant.TenantContextMiddleware',
+    'apps.core.middleware.dashboard.DashboardAccessMiddleware',
     # 'apps.core.middleware.security.SecurityHeadersMiddleware',
 ]
 
@@ -172,6 +177,10 @@ DATABASES = {
         'HOST': env('DB_HOST', default='localhost'),
         'PORT': env('DB_PORT', default='5432'),
         'ATOMIC_REQUESTS': True,
+        # Persistent connections also let async dashboards reuse the
+        # connections of their worker threads (agather_in_tenant)
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=0),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -257,13 +266,28 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'apps.core.throttling.TenantRateThrottle',
     ],
-    'DEFAULT_THROTTLE_RATES': {
-        'anon': '100/day',
-        'user': '1000/hour',
-    }
+}
+
+# Sliding-window rate limits (apps.core.utils.ratelimit), kept in Redis
+RATE_LIMITS = {
+    'ENABLED': True,
+    'FAIL_OPEN': True,  # let requests through when Redis is unavailable
+    'ANON': '100/day',  # per client IP (X-Forwarded-For), all endpoints
+    'USER': '1000/hour',  # per user, all endpoints
+    'TOKEN': '1000/hour',  # per API token, all endpoints, tokens without a listed scope
+    'TOKEN_SCOPES': {
+        'read': '5000/hour',
+        'write': '1000/hour',
+    },
+    'TENANT_PLANS': {  # whole tenant, all endpoints
+        'basic': '20000/hour',
+        'professional': '100000/hour',
+        'enterprise': None,  # unlimited
+    },
+    'ENDPOINTS': {},  # throttle_scope or URL name -> extra per-principal rate on that endpoint
+    'CACHE_ALIAS': 'default',
 }
 
 # JWT Configuration
@@ -482,10 +506,34 @@ LOGGING = {
 # Cache configuration (tenant-aware)
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'BACKEND': 'apps.core.cache.InstrumentedRedisCache',
         'LOCATION': 'redis://127.0.0.1:6379/1',
     }
 }
+# Tenant cache layer (apps.core.cache.TenantCache)
+TENANT_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'DEFAULT_TIMEOUT': 300,
+    # TTLs are spread by +/- this fraction
+    'JITTER': 0.1,
+    # Seconds an expired entry is still served while one worker refreshes it
+    'STALE_GRACE': 60,
+    # Single-flight lock lifetime and how long other workers wait for it
+    'LOCK_TIMEOUT': 30,
+    'LOCK_WAIT': 5,
+    # Higher values recompute earlier before expiry (0 disables)
+    'EARLY_RECOMPUTE_BETA': 1.0,
+}
+
+# Two-level configuration cache (apps.core.config_cache)
+CONFIG_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'L1_MAX_ENTRIES': 2048,
+    # L1 entries are also checked against the tenant's version on every request
+    'L1_TIMEOUT': 300,
+    'L2_TIMEOUT': 60 * 60 * 24,
+}
+
 # Celery configuration (tenant-aware)
 CELERY_BROKER_URL = env('CELERY_BROKER_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = env('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
@@ -494,6 +542,21 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Periodic tasks sent by `celery -A config beat`. Without beat, run the
+# matching management commands from cron on the same schedule.
+CELERY_BEAT_SCHEDULE = {
+    # rollup_access_telemetry: Redis counters expire after ACCESS_TELEMETRY['RETENTION_HOURS']
+    'rollup-access-telemetry': {
+        'task': 'security.rollup_access_telemetry',
+        'schedule': crontab(minute=5),
+    },
+    # rebuild_dashboard_snapshots: corrects queryset updates, rolls date-based metrics over
+    'rebuild-dashboard-snapshots': {
+        'task': 'tenants.rebuild_dashboard_snapshots',
+        'schedule': crontab(minute=15),
+    },
+}
+
 # File upload limits
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
@@ -502,6 +565,49 @@ FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 TENANT_LIMIT_SET_CACHE = True
 TENANT_CACHE_TIMEOUT = 300  # 5 minutes
 
+# Tenant resolution cache used by TenantMiddleware (L1 in-process, L2 Redis)
+TENANT_RESOLUTION_CACHE = {
+    'L1_MAX_ENTRIES': 2048,
+    'L1_TIMEOUT': 60,  # seconds
+    'GENERATION_CHECK_INTERVAL': 5,  # seconds between Redis generation checks
+    'MISS_MAX_ENTRIES': 256,  # unknown hosts/slugs remembered per process only
+    'MISS_TIMEOUT': 10,  # seconds
+}
+
+# Audit/security event pipeline (apps.core.utils.audit)
+AUDIT_PIPELINE = {
+    'MODE': env('AUDIT_PIPELINE_MODE', default='buffered'),  # 'sync' writes every event immediately (tests)
+    'CELERY_THRESHOLD': 200,  # buffered events handed to a Celery worker at the end of a request
+    'MAX_BUFFER': 1000,  # events held per request before handing them off early
+    'USE_CELERY': True,
+    'CELERY_RETRY_AFTER': 60,  # seconds to write inline after the broker was unreachable
+}
+
+# Request profiling (apps.core.utils.perf)
+PERF_MONITORING = {
+    'ENABLED': env.bool('PERF_MONITORING_ENABLED', default=True),
+    'SAMPLE_RATE': env.float('PERF_SAMPLE_RATE', default=0.1),  # share of requests profiled
+    'RESERVOIR_SIZE': 1000,  # most recent samples kept per view and tenant
+    'FLUSH_INTERVAL': 10,  # seconds between pushes of local samples to Redis
+    'RETENTION_SECONDS': 86400,
+    'CACHE_ALIAS': 'default',
+}
+
+# Query budgets and N+1 detection (apps.core.utils.queries)
+QUERY_BUDGETS = {
+    'ENFORCE': env('QUERY_BUDGET_ENFORCE', default='off'),  # 'off', 'warn' or 'raise'
+    'NPLUSONE_THRESHOLD': 10,  # repeats of one query shape logged as a likely N+1
+}
+
+# Dashboard access telemetry (apps.security.telemetry)
+ACCESS_TELEMETRY = {
+    'PATHS': ('/dashboard/', '/portal/', '/admin/', '/staff/'),
+    'BUCKET_DEPTH': 2,  # leading path segments kept per bucket
+    'RETENTION_HOURS': 72,  # Redis counters not rolled up by then are dropped
+    'RAW_SAMPLE_RATE': env.float('ACCESS_TELEMETRY_SAMPLE_RATE', default=0.0),  # share of hits also written as SecurityEvent
+    'CACHE_ALIAS': 'default',
+}
+
 # Encryption key for encrypted model fields
 # Generate a secure key: python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"
 # Encryption key for encrypted model fields
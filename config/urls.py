@@ -50,6 +50,9 @@ urlpatterns = [
     
     # Master Dashboard
     path('dashboard/', core_views.MasterDashboardView.as_view(), name='master_dashboard'),
+    path('dashboard/async/', core_views.AsyncMasterDashboardView.as_view(), name='master_dashboard_async'),
+    path('dashboard/snapshot/', core_views.MasterDashboardSnapshotView.as_view(), name='master_dashboard_snapshot'),
+    path('dashboard/performance/', core_views.PerformanceReportView.as_view(), name='performance_report'),
     
     path('', include('apps.public.urls')),
     # path('accounts/login/', core_views.auth_signin, name='login'),